@@ -2,13 +2,189 @@
 Streamlit Web Interface for LinkedIn Job Search URL Builder
 """
 
+import io
+from datetime import datetime, timezone
+
 import streamlit as st
 
+from app_resources import get_hydrator, get_job_store, get_metrics_server, get_resolver
+from bulk_generator import RESULT_COLUMNS, SPEC_COLUMNS, BulkJob
+from fetch_pipeline import FetchError
+from job_hydration import LazyJob
+from job_store import SORT_COLUMNS, page_key
 from linkedin_url_builder import LinkedInURLBuilder
+from warmup import record_first_render
+
+BULK_PAGE_SIZE = 50
+JOBS_PAGE_SIZES = [25, 50, 100, 200]
+JOB_VIEW_COLUMNS = ["posted_at", "title", "company", "location", "url"]
+
+
+def render_job_results():
+    """
+    Paged view over the job store.
+
+    Filtering, sorting and paging run in SQLite; the session only keeps the
+    widget values, the match count (recounted once the store changes) and the
+    keyset of each page it has visited, and renders a single page, whatever
+    the store's size.
+    """
+    st.header("💼 Fetched Jobs")
+    store = get_job_store()
+
+    col1, col2, col3, col4 = st.columns([3, 2, 1, 1])
+    with col1:
+        text = st.text_input("Filter jobs", placeholder="Title or company contains...", key="jobs_text")
+    with col2:
+        sort_by = st.selectbox(
+            "Sort jobs by",
+            options=list(SORT_COLUMNS),
+            format_func=lambda x: x.replace("_", " ").title(),
+            key="jobs_sort",
+        )
+    with col3:
+        descending = st.toggle("Descending", value=True, key="jobs_desc")
+    with col4:
+        page_size = st.selectbox("Rows per page", options=JOBS_PAGE_SIZES, index=1, key="jobs_page_size")
+
+    # COUNT(*) with a filter scans the table; redo it only when the filter or the store changes
+    count_key = (text, store.version())
+    cached = st.session_state.get("jobs_count")
+    if cached is None or cached[0] != count_key:
+        cached = st.session_state["jobs_count"] = (count_key, store.count(text=text))
+    total = cached[1]
+    if not total:
+        st.info("No fetched jobs match. Jobs appear here once the poller has stored results.")
+        return
+
+    page_count = -(-total // page_size)
+    page_number = st.number_input(
+        "Jobs page", min_value=1, max_value=page_count, value=1, step=1, help=f"{total:,} jobs in {page_count:,} pages"
+    )
+    # Page number -> keyset of the row before it; reset whenever the filter or order changes
+    view = (text, sort_by, descending, page_size)
+    if st.session_state.get("jobs_view") != view:
+        st.session_state["jobs_view"] = view
+        st.session_state["jobs_keysets"] = {1: None}
+    keysets = st.session_state["jobs_keysets"]
+    page_number = int(page_number)
+    if page_number not in keysets:
+        known = max(page for page in keysets if page < page_number)
+        if known > 1 and keysets[known] is None:
+            keysets[page_number] = None  # an earlier page is already past the end
+        else:
+            skip = (page_number - known) * page_size
+            keysets[page_number] = store.seek(sort_by, descending, skip, after=keysets[known], text=text)
+    after = keysets[page_number]
+    if page_number > 1 and after is None:
+        # The store shrank below this page since the count; clamp to the first page
+        st.warning(f"Page {page_number:,} no longer exists, showing page 1.")
+        keysets.clear()
+        keysets[1] = None
+        page_number = 1
+    rows = store.query(sort_by=sort_by, descending=descending, limit=page_size, after=after, text=text)
+    if rows:
+        keysets[page_number + 1] = page_key(rows[-1], sort_by)
+    for row in rows:
+        row["posted_at"] = datetime.fromtimestamp(row["posted_at"], tz=timezone.utc) if row["posted_at"] else None
+    st.dataframe(
+        rows,
+        column_order=JOB_VIEW_COLUMNS,
+        column_config={
+            "posted_at": st.column_config.DatetimeColumn("Posted", format="YYYY-MM-DD HH:mm"),
+            "url": st.column_config.LinkColumn("Link"),
+        },
+        use_container_width=True,
+        hide_index=True,
+    )
+    st.caption(f"Showing {len(rows):,} of {total:,} jobs")
+    render_job_details(rows)
+
+
+def render_job_details(rows: list[dict]):
+    """Description and criteria of one job on the page, fetched only when it is selected."""
+    with st.expander("🔎 Job details"):
+        labels = {row["job_id"]: f"{row['title']} | {row['company']}" for row in rows}
+        job_id = st.selectbox("Job", options=[None, *labels], format_func=lambda x: labels.get(x, "Select a job..."))
+        if job_id is None:
+            return
+        job = LazyJob(next(row for row in rows if row["job_id"] == job_id), get_hydrator())
+        try:
+            st.markdown(
+                f"**{job['seniority'] or 'Seniority n/a'}** · {job['employment_type'] or 'Employment type n/a'} · "
+                f"{job['industries'] or 'Industry n/a'} · {job['applicants']}"
+            )
+            st.text(job["description"] or "No description found.")
+        except FetchError as e:
+            st.error(f"Could not load job details: {e}")
+
+
+@st.fragment(run_every=0.5)
+def render_bulk_progress():
+    """Progress of the running bulk job; reruns the page once it has finished."""
+    job = st.session_state.get("bulk_job")
+    if job is None:
+        return
+    if job.done:
+        st.rerun()
+    st.progress(job.fraction, text=f"Generating URLs... {job.processed:,} so far")
+
+
+def render_bulk_upload():
+    """
+    Bulk-upload panel: generate URLs for every row of an uploaded CSV.
+
+    Generation runs on a background thread (``BulkJob``); only the progress
+    fragment reruns while it works, so the rest of the page stays usable.
+    """
+    st.header("📄 Bulk Upload")
+    st.markdown(
+        "Upload a CSV with one search per row. Supported columns: " + ", ".join(f"`{column}`" for column in SPEC_COLUMNS)
+    )
+
+    uploaded = st.file_uploader("Searches CSV", type=["csv"], help="Only the `keywords` column is required")
+
+    if uploaded is not None and st.button("⚙️ Generate URLs for all rows", use_container_width=True):
+        # Stop and drop the previous run before starting a new one
+        previous = st.session_state.pop("bulk_job", None)
+        if previous is not None:
+            previous.close()
+        # BytesIO shares the upload's bytes; the job reads it while Streamlit keeps its own buffer
+        st.session_state["bulk_job"] = BulkJob(io.BytesIO(uploaded.getvalue()), uploaded.size, resolver=get_resolver())
+
+    job = st.session_state.get("bulk_job")
+    if job is None:
+        return
+    if not job.done:
+        render_bulk_progress()
+        return
+    if job.error is not None:
+        st.error(f"Could not read the uploaded CSV: {job.error}")
+        return
+
+    spool = job.spool
+    if spool.error_count:
+        st.warning(f"{spool.error_count:,} of {len(spool):,} rows could not be converted (see the `error` column)")
+    else:
+        st.success(f"✅ {len(spool):,} URLs generated")
+
+    page_count = spool.page_count(BULK_PAGE_SIZE)
+    page_number = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1, help=f"{page_count:,} pages")
+    st.dataframe(spool.page(int(page_number) - 1, BULK_PAGE_SIZE), column_order=RESULT_COLUMNS, use_container_width=True)
+
+    export_format = st.radio("Download format", options=["csv", "jsonl"], horizontal=True, format_func=str.upper)
+    st.download_button(
+        f"⬇️ Download {export_format.upper()}",
+        data=job.export_file(export_format),
+        file_name=f"linkedin_urls.{export_format}",
+        mime="text/csv" if export_format == "csv" else "application/jsonl",
+        use_container_width=True,
+    )
 
 
 def main():
     st.set_page_config(page_title="LinkedIn Job Search URL Builder", page_icon="🔍", layout="wide")
+    get_metrics_server()
 
     st.title("🔍 LinkedIn Job Search URL Builder")
     st.markdown("Create optimized LinkedIn job search URLs with advanced filtering options")
@@ -235,7 +411,7 @@ def main():
         else:
             try:
                 # Build the URL
-                builder = LinkedInURLBuilder()
+                builder = LinkedInURLBuilder(resolver=get_resolver())
                 url_builder = builder.set_keywords(keywords)
 
                 # Handle location based on method
@@ -307,6 +483,14 @@ def main():
             except Exception as e:
                 st.error(f"Error generating URL: {str(e)}")
 
+    # Bulk upload
+    st.markdown("---")
+    render_bulk_upload()
+
+    # Fetched jobs
+    st.markdown("---")
+    render_job_results()
+
     # Help section
     st.markdown("---")
     with st.expander("ℹ️ Help & Tips"):
@@ -345,6 +529,8 @@ def main():
         """
         )
 
+    record_first_render()
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,58 @@
+"""
+Process-wide resources shared by every Streamlit session and page.
+
+Each factory runs once per server process thanks to ``st.cache_resource``;
+the returned objects must therefore be safe to use from concurrent sessions.
+"""
+
+import sys
+from typing import Optional
+
+import streamlit as st
+
+import metrics
+from geo_harvest import load_resolver
+from job_hydration import JobHydrator
+from job_store import JobStore
+from resolver_cache import SharedResolver
+
+
+@st.cache_resource
+def get_resolver() -> SharedResolver:
+    """Return the shared geo ID / location alias / facet code resolver, with any harvested geo IDs."""
+    return load_resolver()
+
+
+@st.cache_resource
+def get_job_store() -> JobStore:
+    """Return the job store (path from ``LINKEDIN_JOB_STORE``, default ``jobs.db``)."""
+    return JobStore()
+
+
+@st.cache_resource
+def get_hydrator() -> JobHydrator:
+    """Return the job-detail hydrator, so sessions share its cache and in-flight fetches."""
+    return JobHydrator()
+
+
+@st.cache_resource
+def get_metrics_server() -> Optional[object]:
+    """
+    Enable instrumentation if ``LINKEDIN_METRICS`` is set, once per process.
+
+    With ``LINKEDIN_METRICS_PORT`` also set, ``/metrics`` is served on that port
+    (plus the instance number ``start_app.py`` assigns) in Prometheus text
+    format. Returns the HTTP server, or None, also when the port is taken:
+    the failure is reported once instead of on every script run.
+    """
+    if not metrics.enable_from_env():
+        return None
+    metrics.register_resolver(get_resolver())
+    port = metrics.metrics_port_from_env()
+    if not port:
+        return None
+    try:
+        return metrics.start_metrics_server(port)
+    except OSError as e:
+        print(f"[METRICS] Could not serve /metrics on port {port}: {e}", file=sys.stderr)
+        return None
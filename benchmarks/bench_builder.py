@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks for the URL builder hot paths.
+
+Each operation runs at every scale in ``--scales`` (default 1, 1k and 1M
+operations); the metric is the median wall time for the whole batch, named
+``<operation>[<scale>]``. Exits non-zero when a metric is slower than the
+stored baseline allows.
+
+Usage:
+    python benchmarks/bench_builder.py [--scales 1,1000] [--output builder.json] [--update-baseline]
+"""
+
+import argparse
+import sys
+from collections.abc import Iterator
+from itertools import repeat
+
+from harness import BASELINE_DIR, add_common_arguments, median_seconds, report
+
+from bulk_generator import iter_chunks
+from linkedin_url_builder import LinkedInURLBuilder, build_from_spec, create_optimized_url
+from resolver_cache import SharedResolver
+
+BASELINE_PATH = BASELINE_DIR / "builder.json"
+DEFAULT_SCALES = (1, 1_000, 1_000_000)
+
+SPEC = {
+    "keywords": "Senior Python Developer",
+    "location": "Turkey (All)",
+    "distance": "25",
+    "time_filter": "24 hours",
+    "sort_by": "date_posted",
+    "experience_levels": "mid_senior,director",
+    "job_types": "full_time",
+    "remote_options": "remote,hybrid",
+}
+
+
+def configured_builder(resolver=None) -> LinkedInURLBuilder:
+    return build_from_spec(SPEC, resolver)
+
+
+def bench_build_url(n: int) -> None:
+    builder = configured_builder()
+    for _ in range(n):
+        builder.build_url()
+
+
+def bench_get_params_summary(n: int) -> None:
+    builder = configured_builder()
+    for _ in range(n):
+        builder.get_params_summary()
+
+
+def bench_set_location_by_name(n: int) -> None:
+    builder = LinkedInURLBuilder()
+    for _ in range(n):
+        builder.set_location_by_name("Turkey (All)")
+
+
+def bench_set_location_by_name_cached(n: int) -> None:
+    builder = LinkedInURLBuilder(resolver=SharedResolver())
+    for _ in range(n):
+        builder.set_location_by_name("Turkey (All)")
+
+
+def bench_create_optimized_url(n: int) -> None:
+    for _ in range(n):
+        create_optimized_url(
+            "Senior Python Developer",
+            location="Istanbul",
+            experience_levels=["mid_senior"],
+            job_types=["full_time"],
+            remote_options=["remote", "hybrid"],
+        )
+
+
+def bench_batch_generation(n: int) -> None:
+    specs: Iterator[dict[str, str]] = repeat(SPEC, n)
+    for _ in iter_chunks(specs):
+        pass
+
+
+def bench_batch_generation_cached(n: int) -> None:
+    specs: Iterator[dict[str, str]] = repeat(SPEC, n)
+    for _ in iter_chunks(specs, resolver=SharedResolver()):
+        pass
+
+
+BENCHMARKS = {
+    "build_url": bench_build_url,
+    "get_params_summary": bench_get_params_summary,
+    "set_location_by_name": bench_set_location_by_name,
+    "set_location_by_name_cached": bench_set_location_by_name_cached,
+    "create_optimized_url": bench_create_optimized_url,
+    "batch_generation": bench_batch_generation,
+    "batch_generation_cached": bench_batch_generation_cached,
+}
+
+
+def parse_scales(value: str) -> list[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark URL builder hot paths")
+    parser.add_argument(
+        "--scales",
+        type=parse_scales,
+        default=list(DEFAULT_SCALES),
+        help="Comma-separated operation counts (default: 1,1000,1000000)",
+    )
+    parser.add_argument("--only", default="", help="Comma-separated benchmark names to run (default: all)")
+    add_common_arguments(parser)
+    args = parser.parse_args()
+
+    selected = [name.strip() for name in args.only.split(",") if name.strip()] or list(BENCHMARKS)
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    metrics = {}
+    for name in selected:
+        for scale in args.scales:
+            # Fewer repeats at large scales; a 1M batch is already long enough to be stable
+            repeats = 7 if scale < 10_000 else (3 if scale < 1_000_000 else 1)
+            metrics[f"{name}[{scale}]"] = median_seconds(lambda name=name, scale=scale: BENCHMARKS[name](scale), repeats)
+
+    sys.exit(report("builder", metrics, BASELINE_PATH, args.tolerance, args.output, args.update_baseline, args.min_delta))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Job export throughput: rows/second for CSV, JSONL and compressed variants.
+
+Fills a job store with ``--rows`` synthetic postings (10 million by default,
+spread over 1000 saved searches; the store is kept with ``--store`` so the
+fill is paid once), then exports all of it in every format in ``--formats``.
+Metrics are the wall time per export, ``export[csv]``, ``export[jsonl.gz]``,
+...; rows/s and the process's peak RSS are printed alongside, and the peak
+must not grow with ``--rows``.
+
+Usage:
+    python benchmarks/bench_export.py [--rows 10000000] [--store /tmp/export-bench.db] [--formats csv,jsonl,csv.gz]
+    python benchmarks/bench_export.py --rows 100000 --formats csv,jsonl  # quick check
+"""
+
+import argparse
+import os
+import resource
+import sqlite3
+import sys
+import tempfile
+import time
+
+from harness import BASELINE_DIR, add_common_arguments, report
+
+from fetch_pipeline import SavedSearch
+from job_export import export_to_path
+from job_store import JOB_COLUMNS, JobStore
+from search_mix import iter_search_mix
+
+BASELINE_PATH = BASELINE_DIR / "export.json"
+
+SEARCHES = 1000
+FILL_BATCH = 50_000
+
+
+def fill_store(path: str, rows: int, searches: list[SavedSearch]) -> None:
+    """Insert synthetic postings until the store at ``path`` holds ``rows`` jobs."""
+    JobStore(path).close()  # create the schema
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode = OFF")
+    connection.execute("PRAGMA synchronous = OFF")
+    present = connection.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+    sql = f"INSERT INTO jobs ({', '.join(JOB_COLUMNS)}) VALUES ({', '.join('?' for _ in JOB_COLUMNS)})"
+    started = time.perf_counter()
+    for start in range(present, rows, FILL_BATCH):
+        batch = []
+        for job_id in range(start, min(rows, start + FILL_BATCH)):
+            search = searches[job_id % len(searches)]
+            batch.append(
+                (
+                    job_id,
+                    f"Senior Python Developer {job_id % 997}",
+                    f"Company {job_id % 5003}",
+                    "Ankara, Turkey",
+                    "Build and run data pipelines, REST APIs and internal tools in Python.",
+                    1_714_521_600 + job_id % 2_592_000,
+                    f"https://www.linkedin.com/jobs/view/{job_id}/",
+                    search.fingerprint,
+                    "4",
+                    "F",
+                    "2",
+                    1_714_521_600,
+                )
+            )
+        connection.executemany(sql, batch)
+        connection.commit()
+    connection.close()
+    if rows > present:
+        print(f"[BENCH] Filled {rows - present} rows in {time.perf_counter() - started:.1f}s")
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming job export")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="Jobs in the store (default: 10000000)")
+    parser.add_argument("--store", help="Benchmark store to create or reuse (default: a temporary file)")
+    parser.add_argument(
+        "--formats",
+        default="csv,jsonl,csv.gz,jsonl.gz",
+        help="Comma-separated output suffixes (default: csv,jsonl,csv.gz,jsonl.gz)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows per chunk (default: 5000)")
+    add_common_arguments(parser)
+    args = parser.parse_args()
+
+    searches = [SavedSearch(str(index), spec) for index, spec in enumerate(iter_search_mix(SEARCHES))]
+    with tempfile.TemporaryDirectory() as directory:
+        store_path = args.store or os.path.join(directory, "jobs.db")
+        fill_store(store_path, args.rows, searches)
+        store = JobStore(store_path)
+        rows = store.count()
+        baseline_rss = peak_rss_mb()
+        print(f"[BENCH] {rows} jobs, chunks of {args.chunk_size}, peak RSS before export {baseline_rss:.0f} MB")
+
+        metrics = {}
+        for suffix in (value.strip() for value in args.formats.split(",") if value.strip()):
+            output = os.path.join(directory, f"jobs.{suffix}")
+            started = time.perf_counter()
+            written = export_to_path(store, output, searches=searches, chunk_size=args.chunk_size)
+            elapsed = time.perf_counter() - started
+            assert written == rows
+            metrics[f"export[{suffix}]"] = elapsed
+            size = os.path.getsize(output) / 1024 / 1024
+            print(
+                f"  {suffix:<10} {rows / elapsed:>10,.0f} rows/s  {elapsed:>7.1f}s  {size:>8.0f} MB  "
+                f"peak RSS {peak_rss_mb():.0f} MB"
+            )
+            os.remove(output)
+        store.close()
+
+    sys.exit(report("export", metrics, BASELINE_PATH, args.tolerance, args.output, args.update_baseline, args.min_delta))
+
+
+if __name__ == "__main__":
+    main()
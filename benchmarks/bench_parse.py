@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Parse-stage throughput: in-process parsing versus a process pool.
+
+Parses ``--pages`` synthetic results pages (``--cards`` job cards each) once
+inline and once through ``ParsePool`` at every worker count in ``--workers``
+(default 1, 2, 4 and 8). Metrics are the median wall time for the whole
+batch, ``parse[inline]`` and ``parse[workers=N]``; the speedup over inline
+parsing is printed alongside. Scaling is bounded by the machine's cores.
+
+Usage:
+    python benchmarks/bench_parse.py [--pages 400] [--workers 1,2,4,8] [--output parse.json]
+"""
+
+import argparse
+import os
+import sys
+
+from harness import BASELINE_DIR, add_common_arguments, median_seconds, report
+
+from fetch_pipeline import SavedSearch
+from parse_pool import ParsePool, parse_compact
+from replay_server import synthetic_results_page
+from search_mix import iter_search_mix
+
+BASELINE_PATH = BASELINE_DIR / "parse.json"
+
+
+def make_pages(count: int, cards: int) -> list[bytes]:
+    searches = (SavedSearch(str(index), spec) for index, spec in enumerate(iter_search_mix(count)))
+    return [synthetic_results_page(search.url, cards) for search in searches]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the process-pool parse stage")
+    parser.add_argument("--pages", type=int, default=400, help="Pages per batch (default: 400)")
+    parser.add_argument("--cards", type=int, default=60, help="Job cards per page (default: 60)")
+    parser.add_argument("--workers", default="1,2,4,8", help="Comma-separated worker counts (default: 1,2,4,8)")
+    parser.add_argument("--chunksize", type=int, default=4, help="Pages per task sent to a worker (default: 4)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per configuration; the median is reported")
+    add_common_arguments(parser)
+    args = parser.parse_args()
+
+    pages = make_pages(args.pages, args.cards)
+    expected = sum(len(parse_compact(page)) for page in pages)
+    metrics = {"parse[inline]": median_seconds(lambda: [parse_compact(page) for page in pages], args.repeat)}
+
+    for workers in (int(value) for value in args.workers.split(",") if value.strip()):
+        with ParsePool(workers) as pool:
+            pool.warm()
+
+            def run():
+                parsed = sum(len(records) for records in pool.parse_many(pages, args.chunksize))
+                assert parsed == expected
+
+            metrics[f"parse[workers={workers}]"] = median_seconds(run, args.repeat)
+
+    inline = metrics["parse[inline]"]
+    print(f"[BENCH] {args.pages} pages, {expected} job cards, {os.cpu_count()} CPUs")
+    for name, seconds in metrics.items():
+        print(f"  {name:<20} {args.pages / seconds:>9.1f} pages/s  speedup x{inline / seconds:.2f}")
+
+    sys.exit(report("parse", metrics, BASELINE_PATH, args.tolerance, args.output, args.update_baseline, args.min_delta))
+
+
+if __name__ == "__main__":
+    main()
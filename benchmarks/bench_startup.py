@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for the web UI.
+
+Measures, as medians over ``--runs`` launches:
+  time_to_ready        launch -> Streamlit health endpoint answers (via start_app.py)
+  cold_first_render    fresh interpreter -> first script run of app.py completed
+  warm_first_render    first script run of app.py after warmup.prewarm() in the same process
+
+Exits non-zero when any metric is slower than the stored baseline allows.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 3] [--output startup.json] [--update-baseline]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from harness import BASELINE_DIR, PROJECT_DIR, add_common_arguments, report
+
+import start_app
+
+BASELINE_PATH = BASELINE_DIR / "startup.json"
+
+FIRST_RENDER_SCRIPT = """
+import sys, time
+sys.path.insert(0, {project!r})
+if {prewarm!r}:
+    import warmup
+    warmup.prewarm()
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+AppTest.from_file({app!r}).run(timeout=120)
+print(time.perf_counter() - start)
+"""
+
+
+def measure_time_to_ready(port: int, timeout: float) -> float:
+    """Launch one instance, wait for health, stop it; returns seconds to ready."""
+    start_app.start_instance(port)
+    try:
+        time_to_ready = start_app.wait_and_report(port, timeout)
+    finally:
+        start_app.stop_instance(port)
+        start_app.report_file(port).unlink(missing_ok=True)
+    if time_to_ready is None:
+        raise RuntimeError(f"Instance on port {port} did not become healthy within {timeout:.0f}s")
+    return time_to_ready
+
+
+def measure_first_render(prewarm: bool) -> float:
+    """Run app.py once in a fresh interpreter; cold runs include interpreter start and imports."""
+    script = FIRST_RENDER_SCRIPT.format(project=str(PROJECT_DIR), app=str(PROJECT_DIR / "app.py"), prewarm=prewarm)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    total = time.perf_counter() - start
+    return total if not prewarm else float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark web UI startup")
+    parser.add_argument("--runs", type=int, default=3, help="Launches per metric (default: 3)")
+    parser.add_argument("--base-port", type=int, default=8701, help="First port to try for benchmark instances")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds to wait for an instance to become healthy")
+    add_common_arguments(parser)
+    args = parser.parse_args()
+
+    # Keep benchmark runs away from the real job store
+    os.environ["LINKEDIN_JOB_STORE"] = ":memory:"
+
+    ready, cold, warm = [], [], []
+    for _ in range(args.runs):
+        port = start_app.allocate_ports(1, args.base_port)[0]
+        ready.append(measure_time_to_ready(port, args.timeout))
+        cold.append(measure_first_render(prewarm=False))
+        warm.append(measure_first_render(prewarm=True))
+
+    metrics = {
+        "time_to_ready": statistics.median(ready),
+        "cold_first_render": statistics.median(cold),
+        "warm_first_render": statistics.median(warm),
+    }
+    sys.exit(report("startup", metrics, BASELINE_PATH, args.tolerance, args.output, args.update_baseline, args.min_delta))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Shared helpers for benchmark scripts: JSON results and baseline comparison.
+
+Every benchmark produces a flat ``{metric_name: seconds}`` mapping. Results
+are compared against a stored baseline; a metric regresses when it is slower
+than ``baseline * (1 + tolerance)`` and by more than ``min_delta`` seconds
+(which keeps microsecond-scale metrics from failing on timer noise).
+"""
+
+import json
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Callable
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+# Make the top-level modules importable when a benchmark is run as a script
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+
+def median_seconds(func: Callable[[], object], repeat: int = 5) -> float:
+    """Run ``func`` ``repeat`` times and return the median wall time."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def load_baseline(path: Path) -> dict[str, float]:
+    """Load a baseline file; a missing file means no baseline yet."""
+    try:
+        return json.loads(path.read_text())["metrics"]
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path: Path, metrics: Mapping[str, float]) -> None:
+    """Store ``metrics`` as the new baseline, with the machine it was recorded on."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"machine": machine_info(), "metrics": dict(sorted(metrics.items()))}
+    path.write_text(json.dumps(payload, indent=2) + "\n")
+
+
+def compare_to_baseline(
+    metrics: Mapping[str, float],
+    baseline: Mapping[str, float],
+    tolerance: float,
+    min_delta: float = 0.0,
+) -> list[str]:
+    """Return a message for every metric slower than its baseline allows."""
+    regressions = []
+    for name, value in metrics.items():
+        if name not in baseline:
+            continue
+        limit = baseline[name] * (1 + tolerance)
+        if value > limit and value - baseline[name] > min_delta:
+            regressions.append(f"{name}: {value:.6f}s > {limit:.6f}s (baseline {baseline[name]:.6f}s +{tolerance:.0%})")
+    return regressions
+
+
+def machine_info() -> dict[str, str]:
+    """Describe the machine so results from different hosts aren't confused."""
+    return {"python": platform.python_version(), "platform": platform.platform(), "processor": platform.processor()}
+
+
+def report(
+    name: str,
+    metrics: Mapping[str, float],
+    baseline_path: Path,
+    tolerance: float,
+    output: str = "",
+    update_baseline: bool = False,
+    min_delta: float = 0.0,
+) -> int:
+    """
+    Print results, optionally write them as JSON, and compare with the baseline.
+
+    Returns the process exit code: 1 if any metric regressed, else 0.
+    """
+    baseline = load_baseline(baseline_path)
+    regressions = compare_to_baseline(metrics, baseline, tolerance, min_delta)
+    results = {
+        "benchmark": name,
+        "machine": machine_info(),
+        "metrics": dict(metrics),
+        "baseline": baseline,
+        "tolerance": tolerance,
+        "min_delta": min_delta,
+        "regressions": regressions,
+    }
+
+    print(f"[BENCH] {name}")
+    for metric, value in metrics.items():
+        reference = f"  (baseline {baseline[metric]:.6f}s)" if metric in baseline else ""
+        print(f"  {metric:<45} {value:.6f}s{reference}")
+
+    if output:
+        Path(output).write_text(json.dumps(results, indent=2) + "\n")
+        print(f"[BENCH] Results written to {output}")
+
+    if update_baseline:
+        save_baseline(baseline_path, metrics)
+        print(f"[BENCH] Baseline updated: {baseline_path}")
+        return 0
+
+    if regressions:
+        print("[FAIL] Performance regressions:")
+        for message in regressions:
+            print(f"  {message}")
+        return 1
+    print("[PASS] No regressions" if baseline else "[INFO] No baseline yet; run with --update-baseline to record one")
+    return 0
+
+
+def add_common_arguments(parser) -> None:
+    """Add the ``--output``, ``--tolerance``, ``--min-delta`` and ``--update-baseline`` options."""
+    parser.add_argument("--output", "-o", default="", help="Write JSON results to this file")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown vs. baseline (0.5 = +50%%)")
+    parser.add_argument(
+        "--min-delta",
+        type=float,
+        default=0.001,
+        help="Ignore slowdowns smaller than this many seconds (default: 0.001)",
+    )
+    parser.add_argument("--update-baseline", action="store_true", help="Record the results as the new baseline")
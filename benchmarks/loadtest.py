@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Local load generator for the builder, the CLI batch mode and HTTP surfaces.
+
+Replays a synthetic search mix (``search_mix.py``) at increasing concurrency
+and reports throughput and tail latency per level:
+
+  builder    in-process ``build_from_spec(...).build_url()`` calls on a thread pool
+  cli-batch  concurrent ``python cli.py --batch`` processes, each converting a
+             ``--batch-size``-row CSV (one operation = one batch job)
+  http       GET requests against ``--url`` on localhost, e.g. a Streamlit
+             instance's /_stcore/health or a poller's /metrics endpoint
+  pipeline   fetch → parse → store of the search mix against an in-process
+             replay server (synthetic pages, optional latency/errors/429s);
+             ``--parse-workers N`` parses in a process pool
+
+Usage:
+    python benchmarks/loadtest.py builder --concurrency 1,2,4,8 --duration 5
+    python benchmarks/loadtest.py cli-batch --batch-size 1000 --concurrency 1,2,4
+    python benchmarks/loadtest.py http --url http://127.0.0.1:8501/_stcore/health
+    python benchmarks/loadtest.py pipeline --latency 0.05 --error-rate 0.02 --rate-limit-rate 0.05
+"""
+
+import argparse
+import csv
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+from harness import PROJECT_DIR, machine_info
+
+from bulk_generator import SPEC_COLUMNS
+from fetch_pipeline import SavedSearch, SearchPoller, parse_job_cards
+from job_store import JobStore
+from latency_histogram import LogHistogram
+from linkedin_url_builder import build_from_spec
+from parse_pool import ParsePool
+from replay_server import ReplayBehavior, replay_transport, start_replay_server
+from search_mix import iter_search_mix
+
+
+def run_level(operation: Callable[[int], None], concurrency: int, duration: float, max_ops: int) -> dict[str, float]:
+    """
+    Run ``operation`` from ``concurrency`` workers for ``duration`` seconds (or ``max_ops`` operations).
+
+    Each worker calls ``operation(sequence_number)`` in a loop; latencies go into
+    one shared histogram.
+    """
+    histogram = LogHistogram()
+    lock = threading.Lock()
+    errors = 0
+    issued = 0
+    deadline = time.perf_counter() + duration
+
+    def next_sequence():
+        nonlocal issued
+        with lock:
+            if time.perf_counter() >= deadline or (max_ops and issued >= max_ops):
+                return None
+            issued += 1
+            return issued
+
+    def worker():
+        nonlocal errors
+        while (sequence := next_sequence()) is not None:
+            start = time.perf_counter()
+            try:
+                operation(sequence)
+            except Exception:
+                with lock:
+                    errors += 1
+                continue
+            elapsed = time.perf_counter() - start
+            with lock:
+                histogram.record(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+    wall = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "operations": histogram.count,
+        "errors": errors,
+        "seconds": wall,
+        "throughput": histogram.count / wall if wall else 0.0,
+        **histogram.percentiles((50, 95, 99, 99.9)),
+    }
+
+
+def builder_operation(mix_size: int = 10_000) -> Callable[[int], None]:
+    specs = list(iter_search_mix(mix_size))
+
+    def operation(sequence: int) -> None:
+        build_from_spec(specs[sequence % mix_size]).build_url()
+
+    return operation
+
+
+def cli_batch_operation(batch_size: int, workdir: Path) -> Callable[[int], None]:
+    batch_file = workdir / "searches.csv"
+    with open(batch_file, "w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=SPEC_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(iter_search_mix(batch_size))
+
+    def operation(sequence: int) -> None:
+        subprocess.run(
+            [
+                sys.executable,
+                str(PROJECT_DIR / "cli.py"),
+                "--batch",
+                str(batch_file),
+                "--output",
+                str(workdir / f"{sequence}.csv"),
+            ],
+            check=True,
+            capture_output=True,
+        )
+        (workdir / f"{sequence}.csv").unlink()
+
+    return operation
+
+
+def http_operation(url: str, timeout: float) -> Callable[[int], None]:
+    def operation(sequence: int) -> None:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            response.read()
+            if response.status >= 400:
+                raise RuntimeError(f"HTTP {response.status}")
+
+    return operation
+
+
+def pipeline_operation(base_url: str, timeout: float, pool=None, mix_size: int = 1000) -> Callable[[int], None]:
+    searches = [SavedSearch(str(index), spec) for index, spec in enumerate(iter_search_mix(mix_size))]
+    parse = pool.parse if pool is not None else parse_job_cards
+    poller = SearchPoller(JobStore(":memory:"), replay_transport(base_url), timeout=timeout, parse=parse)
+
+    def operation(sequence: int) -> None:
+        poller.poll_search(searches[sequence % mix_size])
+
+    return operation
+
+
+def format_table(results: list[dict[str, float]]) -> str:
+    lines = [f"{'conc':>5} {'ops':>9} {'errors':>7} {'ops/s':>10} {'p50':>10} {'p95':>10} {'p99':>10} {'p99.9':>10}"]
+    for level in results:
+        lines.append(
+            f"{level['concurrency']:>5} {level['operations']:>9} {level['errors']:>7} {level['throughput']:>10.1f} "
+            + " ".join(f"{level[key] * 1000:>8.2f}ms" for key in ("p50", "p95", "p99", "p99.9"))
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test the builder, CLI batch mode or a local HTTP endpoint",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("target", choices=["builder", "cli-batch", "http", "pipeline"], help="What to load")
+    parser.add_argument(
+        "--concurrency",
+        default="1,2,4,8",
+        help="Comma-separated concurrency levels, run in order (default: 1,2,4,8)",
+    )
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per concurrency level (default: 5)")
+    parser.add_argument("--max-ops", type=int, default=0, help="Stop a level after this many operations (0 = no limit)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per CLI batch job (cli-batch)")
+    parser.add_argument("--url", default="http://127.0.0.1:8501/_stcore/health", help="Endpoint to load (http)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Request timeout in seconds (http, pipeline)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Replay server latency in seconds (pipeline)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Replay server random extra latency (pipeline)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of HTTP 500 responses (pipeline)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of HTTP 429 responses (pipeline)")
+    parser.add_argument("--parse-workers", type=int, default=0, help="Parse in N worker processes (pipeline; 0 = inline)")
+    parser.add_argument("--output", "-o", default="", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+
+    server = pool = None
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.target == "builder":
+            operation = builder_operation()
+        elif args.target == "cli-batch":
+            operation = cli_batch_operation(args.batch_size, Path(workdir))
+        elif args.target == "pipeline":
+            behavior = ReplayBehavior(
+                args.latency, args.jitter, args.error_rate, args.rate_limit_rate, synthesize=True, seed=0
+            )
+            server = start_replay_server(behavior=behavior)
+            if args.parse_workers:
+                pool = ParsePool(args.parse_workers)
+                pool.warm()
+            operation = pipeline_operation(server.base_url, args.timeout, pool)
+        else:
+            operation = http_operation(args.url, args.timeout)
+
+        results = []
+        for concurrency in levels:
+            results.append(run_level(operation, concurrency, args.duration, args.max_ops))
+            print(f"[LOAD] {args.target}: concurrency {concurrency} done", file=sys.stderr)
+
+    if pool is not None:
+        pool.close()
+    if server is not None:
+        server.shutdown()
+        print(f"[LOAD] Replay server responses: {server.stats}", file=sys.stderr)
+
+    print(format_table(results))
+    if args.output:
+        payload = {"target": args.target, "machine": machine_info(), "levels": results}
+        Path(args.output).write_text(json.dumps(payload, indent=2) + "\n")
+
+
+if __name__ == "__main__":
+    main()
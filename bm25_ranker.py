@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Incremental BM25 ranking of fetched jobs against a search's keywords.
+
+LinkedIn's ``sortBy`` only offers relevance (``R``) or date (``DD``), so the
+postings a saved search fetched are re-ranked locally by how well their
+title, company and description match the search's ``keywords``.
+
+All BM25 statistics are kept up to date as postings arrive: document count,
+total length, per-term document frequencies and postings of
+``(document, term frequency)``. Adding a posting only touches its own terms,
+so re-ranking after each poll needs no rebuild. Postings are ``array``
+columns, and a query is scored over them with NumPy:
+
+    idf(t) = ln(1 + (N - df(t) + 0.5) / (df(t) + 0.5))
+    score(d) = sum over query terms of idf(t) * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(d) / avglen))
+
+Command line (indexes the job store, then prints each saved search's best matches):
+    python bm25_ranker.py --searches searches.json --limit 10
+
+Example:
+    >>> ranker = BM25Ranker()
+    >>> ranker.add_jobs([
+    ...     {"job_id": 1, "title": "Senior Python Developer", "company": "Acme"},
+    ...     {"job_id": 2, "title": "Java Developer", "company": "Globex"},
+    ... ])
+    2
+    >>> [job_id for job_id, _ in ranker.rank("python developer")]
+    [1, 2]
+"""
+
+import argparse
+import math
+import sys
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from typing import Any, Optional
+
+import numpy as np
+
+from fetch_pipeline import load_saved_searches
+from job_collection import StringPool
+from job_index import tokenize
+from job_store import DEFAULT_STORE_PATH, JobStore
+
+RANKED_FIELDS = ("title", "company", "description")
+
+_MAX_TF = 0xFFFF
+
+
+class BM25Ranker:
+    """
+    BM25 scores of stored postings for a keyword query, with incrementally maintained term statistics.
+
+    Re-adding a job ID replaces the earlier version of the posting. Replaced
+    and removed postings stay in the postings arrays but no longer count
+    towards the statistics or results.
+    """
+
+    def __init__(self, fields: tuple[str, ...] = RANKED_FIELDS, k1: float = 1.2, b: float = 0.75):
+        self.fields = fields
+        self.k1 = k1
+        self.b = b
+        self.terms = StringPool()
+        self.fingerprints = StringPool()
+        self.document_frequency = array("I")
+        self._postings_docs: list[array] = []  # per term: document numbers, ascending
+        self._postings_tf: list[array] = []  # per term: term frequency in that document
+        self.doc_job_ids = array("q")
+        self.doc_lengths = array("I")
+        self.doc_search = array("I")  # code into ``fingerprints``
+        self._doc_alive = array("B")
+        self._doc_terms: list[Optional[array]] = []  # term codes, to update statistics on removal
+        self._doc_by_job: dict[int, int] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_by_job)
+
+    def __contains__(self, job_id: int) -> bool:
+        return job_id in self._doc_by_job
+
+    @classmethod
+    def from_store(cls, store, **filters: Any) -> "BM25Ranker":
+        """Index every posting in a ``JobStore`` (see ``JobStore.query`` for filters)."""
+        ranker = cls()
+        ranker.add_jobs(store.iter_jobs(**filters))
+        return ranker
+
+    @property
+    def average_length(self) -> float:
+        return self.total_length / len(self) if len(self) else 0.0
+
+    def add_job(self, job: Mapping[str, Any]) -> None:
+        """Add one posting (a job dict as stored by ``JobStore``) to the statistics."""
+        job_id = int(job["job_id"])
+        self.remove(job_id)
+        frequencies: Counter = Counter()
+        for field in self.fields:
+            frequencies.update(tokenize(str(job.get(field) or "")))
+        doc = len(self.doc_job_ids)
+        self.doc_job_ids.append(job_id)
+        length = sum(frequencies.values())
+        self.doc_lengths.append(length)
+        self.doc_search.append(self.fingerprints.code(str(job.get("search_fingerprint") or "")))
+        self._doc_alive.append(1)
+        self._doc_by_job[job_id] = doc
+        self.total_length += length
+
+        codes = array("I")
+        for term, frequency in frequencies.items():
+            code = self.terms.code(term)
+            if code == len(self._postings_docs):
+                self._postings_docs.append(array("I"))
+                self._postings_tf.append(array("H"))
+                self.document_frequency.append(0)
+            self._postings_docs[code].append(doc)
+            self._postings_tf[code].append(min(frequency, _MAX_TF))
+            self.document_frequency[code] += 1
+            codes.append(code)
+        self._doc_terms.append(codes)
+
+    def add_jobs(self, jobs: Iterable[Mapping[str, Any]]) -> int:
+        """Add many postings; returns how many were added."""
+        count = 0
+        for job in jobs:
+            self.add_job(job)
+            count += 1
+        return count
+
+    def remove(self, job_id: int) -> bool:
+        """Drop a posting from the statistics and results; returns whether it was indexed."""
+        doc = self._doc_by_job.pop(job_id, None)
+        if doc is None:
+            return False
+        self._doc_alive[doc] = 0
+        self.total_length -= self.doc_lengths[doc]
+        for code in self._doc_terms[doc]:
+            self.document_frequency[code] -= 1
+        self._doc_terms[doc] = None
+        return True
+
+    def idf(self, term: str) -> float:
+        """Inverse document frequency of an (already tokenized) term."""
+        code = self.terms.lookup(term)
+        frequency = self.document_frequency[code] if code is not None else 0
+        return math.log(1 + (len(self) - frequency + 0.5) / (frequency + 0.5))
+
+    def scores(self, keywords: str, search_fingerprint: Optional[str] = None) -> np.ndarray:
+        """BM25 score of every document number for ``keywords`` (0 for removed or non-matching postings)."""
+        scores = np.zeros(len(self.doc_job_ids))
+        if not len(self):
+            return scores
+        lengths = np.frombuffer(self.doc_lengths, dtype=np.uint32)
+        norms = self.k1 * (1 - self.b + self.b * lengths / (self.average_length or 1.0))
+        for term in set(tokenize(keywords)):
+            code = self.terms.lookup(term)
+            if code is None or not self.document_frequency[code]:
+                continue
+            docs = np.frombuffer(self._postings_docs[code], dtype=np.uint32)
+            frequencies = np.frombuffer(self._postings_tf[code], dtype=np.uint16).astype(np.float64)
+            # Each document appears once per term, so fancy-index accumulation is safe
+            scores[docs] += self.idf(term) * frequencies * (self.k1 + 1) / (frequencies + norms[docs])
+        scores *= np.frombuffer(self._doc_alive, dtype=np.uint8)
+        if search_fingerprint is not None:
+            code = self.fingerprints.lookup(search_fingerprint)
+            if code is None:
+                scores[:] = 0
+            else:
+                scores *= np.frombuffer(self.doc_search, dtype=np.uint32) == code
+        return scores
+
+    def rank(
+        self, keywords: str, limit: Optional[int] = 50, search_fingerprint: Optional[str] = None
+    ) -> list[tuple[int, float]]:
+        """
+        ``(job_id, score)`` of the postings matching any keyword, best first.
+
+        Args:
+            keywords: Free text, e.g. a spec's ``keywords``.
+            limit: Maximum number of results (None for all).
+            search_fingerprint: Only postings fetched by this search.
+        """
+        scores = self.scores(keywords, search_fingerprint)
+        matched = np.flatnonzero(scores > 0)
+        if limit is not None and len(matched) > limit:
+            matched = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+        # Best score first; ties go to the posting added last
+        ordered = matched[np.lexsort((-matched, -scores[matched]))]
+        return [(self.doc_job_ids[doc], float(scores[doc])) for doc in ordered.tolist()]
+
+    def rank_search(self, search, limit: Optional[int] = 50) -> list[tuple[int, float]]:
+        """Rank the postings a ``SavedSearch`` fetched against its own keywords."""
+        return self.rank(search.spec.get("keywords") or "", limit, search.fingerprint)
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the postings and per-document arrays (excluding the term pool)."""
+        postings = sum(
+            docs.itemsize * len(docs) + tfs.itemsize * len(tfs) for docs, tfs in zip(self._postings_docs, self._postings_tf)
+        )
+        doc_terms = sum(codes.itemsize * len(codes) for codes in self._doc_terms if codes is not None)
+        per_doc = 8 + 4 + 4 + 1
+        return postings + doc_terms + per_doc * len(self.doc_job_ids) + 4 * len(self.document_frequency)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank each saved search's stored jobs against its keywords (BM25)")
+    parser.add_argument("--searches", "-f", required=True, help="JSON file with saved search specs")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help=f"Job store path (default: {DEFAULT_STORE_PATH})")
+    parser.add_argument("--limit", type=int, default=10, help="Jobs to show per search (default: 10)")
+    args = parser.parse_args()
+
+    try:
+        searches = load_saved_searches(args.searches)
+    except (OSError, ValueError) as e:
+        print(f"Error loading saved searches: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    store = JobStore(args.store)
+    ranker = BM25Ranker.from_store(store)
+    print(f"[RANK] {len(ranker)} jobs, {len(ranker.terms)} terms")
+    for search in searches:
+        print(f"\n{search.name}: {search.spec.get('keywords') or '(no keywords)'}")
+        for job_id, score in ranker.rank_search(search, args.limit):
+            job = store.get(job_id)
+            print(f"  {score:6.2f}  {job['title']} | {job['company']} | {job['url']}")
+
+
+if __name__ == "__main__":
+    main()
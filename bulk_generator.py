@@ -0,0 +1,299 @@
+"""
+Bulk URL generation for spreadsheets of job searches.
+
+Rows are read from a CSV stream, turned into LinkedIn URLs chunk by chunk and
+spooled to a temporary JSONL file on disk, so memory use stays flat no matter
+how many rows are uploaded. Results can then be paged through or streamed back
+out as CSV or JSONL. ``BulkJob`` runs the generation on a background thread
+so the web UI stays responsive while a large upload is converted.
+"""
+
+import csv
+import io
+import json
+import tempfile
+import threading
+import weakref
+from array import array
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import IO, Any, Optional
+
+from linkedin_url_builder import build_from_spec
+
+# Columns understood in an uploaded CSV (header names are case-insensitive)
+SPEC_COLUMNS = (
+    "keywords",
+    "location",
+    "geo_id",
+    "distance",
+    "time_filter",
+    "custom_hours",
+    "sort_by",
+    "experience_levels",
+    "job_types",
+    "remote_options",
+    "job_id",
+)
+
+# Applied to every row unless the row provides its own value (matches the CLI defaults)
+DEFAULT_SPEC = {"distance": "25", "time_filter": "24 hours", "sort_by": "date_posted"}
+
+RESULT_COLUMNS = ("row", "keywords", "location", "url", "error")
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def iter_csv_specs(stream: IO[str]) -> Iterator[dict[str, str]]:
+    """Yield one search spec per CSV row, keeping only known columns."""
+    reader = csv.DictReader(stream)
+    for raw in reader:
+        spec = {}
+        for key, value in raw.items():
+            if key is None:
+                continue
+            column = key.strip().lower()
+            if column in SPEC_COLUMNS and value is not None and value.strip():
+                spec[column] = value.strip()
+        yield spec
+
+
+def generate_url(row_number: int, spec: dict[str, str], resolver=None) -> dict[str, Any]:
+    """Build the URL for one spec; errors are captured in the result instead of raised."""
+    result = {
+        "row": row_number,
+        "keywords": spec.get("keywords", ""),
+        "location": spec.get("location", spec.get("geo_id", "")),
+        "url": "",
+        "error": "",
+    }
+    if not spec.get("keywords"):
+        result["error"] = "missing keywords"
+        return result
+    try:
+        result["url"] = build_from_spec({**DEFAULT_SPEC, **spec}, resolver).build_url()
+    except (ValueError, OverflowError) as e:
+        result["error"] = str(e)
+    return result
+
+
+def iter_chunks(
+    specs: Iterable[dict[str, str]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resolver=None,
+) -> Iterator[list[dict[str, Any]]]:
+    """Generate URLs lazily, yielding lists of at most ``chunk_size`` results."""
+    numbered = enumerate(specs, start=1)
+    while True:
+        chunk = [generate_url(row_number, spec, resolver) for row_number, spec in islice(numbered, chunk_size)]
+        if not chunk:
+            return
+        yield chunk
+
+
+class ResultSpool:
+    """
+    Disk-backed store of generated results with random page access.
+
+    Each result is one JSON line in a temporary file; only the byte offset of
+    every line is kept in memory (8 bytes per row).
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        self._file = tempfile.TemporaryFile(mode="w+b", dir=directory)
+        self._offsets = array("q")
+        self.error_count = 0
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def extend(self, results: Iterable[dict[str, Any]]) -> None:
+        """Append results to the end of the spool."""
+        self._file.seek(0, io.SEEK_END)
+        for result in results:
+            self._offsets.append(self._file.tell())
+            self._file.write(json.dumps(result, ensure_ascii=False).encode("utf-8") + b"\n")
+            if result.get("error"):
+                self.error_count += 1
+
+    def page(self, page_number: int, page_size: int) -> list[dict[str, Any]]:
+        """Return the results on a zero-based page."""
+        start = page_number * page_size
+        if start < 0 or start >= len(self._offsets):
+            return []
+        self._file.flush()
+        self._file.seek(self._offsets[start])
+        return [json.loads(self._file.readline()) for _ in range(min(page_size, len(self._offsets) - start))]
+
+    def page_count(self, page_size: int) -> int:
+        """Number of pages needed to show every result."""
+        return max(1, -(-len(self._offsets) // page_size))
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        self._file.flush()
+        self._file.seek(0)
+        for line in self._file:
+            yield json.loads(line)
+
+    def iter_jsonl(self) -> Iterator[bytes]:
+        """Stream the spool as JSONL bytes."""
+        self._file.flush()
+        self._file.seek(0)
+        yield from self._file
+
+    def iter_csv(self) -> Iterator[bytes]:
+        """Stream the spool as CSV bytes, one encoded row at a time."""
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=RESULT_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for result in self:
+            writer.writerow(result)
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        if not self._offsets:
+            yield buffer.getvalue().encode("utf-8")
+
+    def export_file(self, fmt: str = "csv") -> IO[bytes]:
+        """Write the spool in ``fmt`` ("csv" or "jsonl") to a temporary file and return it rewound."""
+        if fmt not in ("csv", "jsonl"):
+            raise ValueError(f"Unsupported export format: {fmt}")
+        chunks = self.iter_csv() if fmt == "csv" else self.iter_jsonl()
+        target = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+        for chunk in chunks:
+            target.write(chunk)
+        target.seek(0)
+        return target
+
+    def close(self) -> None:
+        """Delete the backing file."""
+        self._file.close()
+
+
+def write_results(results: Iterable[dict[str, Any]], out: IO[str], fmt: str = "csv") -> tuple[int, int]:
+    """Stream results to a text file as CSV or JSONL; returns ``(rows written, rows with errors)``."""
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError(f"Unsupported export format: {fmt}")
+    writer = csv.DictWriter(out, fieldnames=RESULT_COLUMNS, extrasaction="ignore") if fmt == "csv" else None
+    if writer is not None:
+        writer.writeheader()
+    written = errors = 0
+    for result in results:
+        if writer is not None:
+            writer.writerow(result)
+        else:
+            out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        written += 1
+        if result.get("error"):
+            errors += 1
+    return written, errors
+
+
+def generate_into_spool(
+    stream: IO[str],
+    spool: ResultSpool,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    resolver=None,
+) -> Iterator[int]:
+    """
+    Generate URLs for every row in ``stream`` into ``spool``.
+
+    Yields the number of rows processed so far after each chunk so callers can
+    report progress.
+    """
+    for chunk in iter_chunks(iter_csv_specs(stream), chunk_size, resolver):
+        spool.extend(chunk)
+        yield len(spool)
+
+
+class BulkJob:
+    """
+    Generate URLs for an uploaded CSV into a ``ResultSpool`` on a background thread.
+
+    The caller returns immediately and polls ``processed``/``fraction``; the
+    spool may only be read once ``done`` is true. A failure that ends the run
+    (e.g. a file that isn't UTF-8) is kept in ``error``.
+
+    The CSV export is written once, as the job finishes, and each export is
+    kept for later downloads (``export_file``). The temporary files are
+    deleted by ``close`` or, at the latest, when the job is garbage collected
+    (e.g. its Streamlit session ended).
+
+    Args:
+        source: The uploaded CSV as a binary stream.
+        size: Size of ``source`` in bytes, for ``fraction``.
+        chunk_size: Rows generated between progress updates.
+        resolver: Passed through to the builder.
+        directory: Where the spool's temporary file is created.
+    """
+
+    def __init__(
+        self,
+        source: IO[bytes],
+        size: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        resolver=None,
+        directory: Optional[str] = None,
+    ):
+        self.spool = ResultSpool(directory)
+        self.processed = 0
+        self.error: Optional[Exception] = None
+        self._exports: dict[str, IO[bytes]] = {}  # format -> finished export file
+        self._exports_lock = threading.Lock()
+        self._cleanup = weakref.finalize(self, _close_files, self.spool, self._exports)
+        self._source = source
+        self._size = max(size, 1)
+        self._position = 0
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(chunk_size, resolver), name="bulk-generate", daemon=True)
+        self._thread.start()
+
+    def _run(self, chunk_size: int, resolver) -> None:
+        stream = io.TextIOWrapper(self._source, encoding="utf-8-sig", newline="")
+        try:
+            for processed in generate_into_spool(stream, self.spool, chunk_size, resolver):
+                self.processed = processed
+                self._position = self._source.tell()
+                if self._cancelled.is_set():
+                    return
+            self.export_file("csv")
+        except Exception as e:
+            self.error = e
+        finally:
+            stream.detach()  # leave the source open for its owner
+
+    @property
+    def done(self) -> bool:
+        return not self._thread.is_alive()
+
+    @property
+    def fraction(self) -> float:
+        """Share of the upload read so far (1.0 once done)."""
+        return 1.0 if self.done else min(self._position / self._size, 1.0)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes; returns False on timeout."""
+        self._thread.join(timeout)
+        return self.done
+
+    def export_file(self, fmt: str = "csv") -> IO[bytes]:
+        """The results in ``fmt`` (see ``ResultSpool.export_file``), written on first request and then reused, rewound."""
+        with self._exports_lock:
+            export = self._exports.get(fmt)
+            if export is None:
+                export = self._exports[fmt] = self.spool.export_file(fmt)
+            export.seek(0)
+            return export
+
+    def close(self) -> None:
+        """Stop the job if it is still running and delete its spool and exports."""
+        self._cancelled.set()
+        self._thread.join()
+        self._cleanup()
+
+
+def _close_files(spool: ResultSpool, exports: dict[str, IO[bytes]]) -> None:
+    for export in exports.values():
+        export.close()
+    exports.clear()
+    spool.close()
@@ -3,8 +3,11 @@ Command Line Interface for LinkedIn Job Search URL Builder
 """
 
 import argparse
+import io
 import sys
+from itertools import chain
 
+from geo_harvest import load_resolver
 from linkedin_url_builder import LinkedInURLBuilder
 
 
@@ -15,6 +18,39 @@ def parse_list_argument(value: str) -> list[str]:
     return [item.strip() for item in value.split(",") if item.strip()]
 
 
+def run_batch(source: str, output: str = "-", fmt: str = "csv", metrics_file: str = "") -> int:
+    """Stream a searches CSV through the bulk generator; returns the process exit code."""
+    from bulk_generator import iter_chunks, iter_csv_specs, write_results
+
+    if metrics_file:
+        import metrics
+
+        metrics.enable()
+
+    in_stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8-sig", newline="") if source == "-" else None
+    try:
+        if in_stream is None:
+            in_stream = open(source, encoding="utf-8-sig", newline="")
+        out_stream = sys.stdout if output == "-" else open(output, "w", encoding="utf-8", newline="")
+    except OSError as e:
+        print(f"Error opening batch files: {e}", file=sys.stderr)
+        return 1
+
+    try:
+        results = iter_chunks(iter_csv_specs(in_stream), resolver=load_resolver())
+        rows, errors = write_results(chain.from_iterable(results), out_stream, fmt)
+    finally:
+        in_stream.close()
+        if out_stream is not sys.stdout:
+            out_stream.close()
+
+    if metrics_file:
+        metrics.write_textfile(metrics_file)
+
+    print(f"Generated {rows - errors} URLs ({errors} rows with errors)", file=sys.stderr)
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate optimized LinkedIn job search URLs",
@@ -24,6 +60,8 @@ Examples:
   python cli.py "Python Developer" --location "San Francisco" --time "4 hours"
   python cli.py "Data Scientist" --distance 50 --experience mid_senior,director
   python cli.py "Remote Software Engineer" --remote remote,hybrid --sort date_posted
+  python cli.py --batch searches.csv --output urls.csv
+  python cli.py '"backend engineer" AND (Python OR Go OR Kotlin OR Rust)' --max-url-length 2000
 
 Time filter options:
   1 hour, 2 hours, 4 hours, 8 hours, 12 hours, 24 hours,
@@ -41,7 +79,7 @@ Remote options:
     )
 
     # Required arguments
-    parser.add_argument("keywords", help='Job keywords or title (e.g., "Python Developer")')
+    parser.add_argument("keywords", nargs="?", help='Job keywords or title (e.g., "Python Developer")')
 
     # Optional arguments
     parser.add_argument(
@@ -107,8 +145,36 @@ Remote options:
 
     parser.add_argument("--job-id", help="Specific LinkedIn job ID to reference")
 
+    parser.add_argument(
+        "--max-url-length",
+        type=int,
+        metavar="N",
+        help="Split the keywords' OR-terms across several URLs so that none is longer than N characters",
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        help="Enable instrumentation and write Prometheus text-format metrics to this file on exit",
+    )
+
+    parser.add_argument(
+        "--batch",
+        metavar="CSV",
+        help="Generate URLs for every row of a searches CSV ('-' for stdin) instead of a single search",
+    )
+
+    parser.add_argument("--output", "-o", default="-", help="Batch output file (default: stdout)")
+
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv", help="Batch output format (default: csv)")
+
     args = parser.parse_args()
 
+    if args.batch:
+        sys.exit(run_batch(args.batch, args.output, args.format, args.metrics_file))
+
+    if not args.keywords:
+        parser.error("keywords are required unless --batch is given")
+
     # Validate time filter
     if args.time not in LinkedInURLBuilder.TIME_FILTERS and not args.custom_hours:
         print(f"Warning: '{args.time}' is not a recognized time filter.")
@@ -116,9 +182,14 @@ Remote options:
         print("Using default: 24 hours")
         args.time = "24 hours"
 
+    if args.metrics_file:
+        import metrics
+
+        metrics.enable()
+
     # Build URL
     try:
-        builder = LinkedInURLBuilder()
+        builder = LinkedInURLBuilder(resolver=load_resolver())
 
         url_builder = (
             builder.set_keywords(args.keywords)
@@ -153,8 +224,16 @@ Remote options:
         final_url = url_builder.build_url()
 
         # Output
-        print("LinkedIn Job Search URL:")
-        print(final_url)
+        if args.max_url_length and len(final_url) > args.max_url_length:
+            from keyword_query import split_builder
+
+            urls = [part.build_url() for part in split_builder(url_builder, args.max_url_length)]
+            print(f"LinkedIn Job Search URLs ({len(urls)}, keywords split to fit {args.max_url_length} characters):")
+            print("\n".join(urls))
+            final_url = "\n".join(urls)
+        else:
+            print("LinkedIn Job Search URL:")
+            print(final_url)
 
         if args.summary:
             params_summary = url_builder.get_params_summary()
@@ -174,6 +253,9 @@ Remote options:
             except Exception as e:
                 print(f"\nWarning: Could not copy to clipboard: {e}")
 
+        if args.metrics_file:
+            metrics.write_textfile(args.metrics_file)
+
     except Exception as e:
         print(f"Error generating URL: {e}", file=sys.stderr)
         sys.exit(1)
@@ -0,0 +1,195 @@
+"""
+Near-duplicate job posting detection with MinHash and LSH banding.
+
+The same role is often reposted under a new job ID, or by several agencies,
+so the job store's ID-based dedup keeps every copy. This module flags such
+postings by the similarity of their text instead.
+
+Each posting's title, company and description are tokenized (see
+``job_index.tokenize``) and cut into overlapping word shingles. A MinHash
+signature of ``num_perm`` values estimates the Jaccard similarity of two
+shingle sets: the fraction of equal signature values. Signatures are split
+into bands of ``rows`` values and each band is hashed into a bucket; two
+postings become candidates when any band lands in the same bucket. Only the
+candidates are compared, so checking a new posting costs a few dictionary
+lookups however many postings are indexed. The band layout is chosen so that
+the candidate probability rises steeply around ``threshold``.
+
+Example:
+    >>> index = NearDuplicateIndex(threshold=0.7)
+    >>> index.add_job({"job_id": 1, "title": "Senior Python Developer", "company": "Acme",
+    ...                "description": "Build data pipelines in Python and SQL for our analytics team"})
+    []
+    >>> [job_id for job_id, _ in index.add_job({"job_id": 2, "title": "Senior Python Developer",
+    ...     "company": "Acme", "description": "Build data pipelines in Python and SQL for our analytics team!"})]
+    [1]
+"""
+
+import zlib
+from collections.abc import Iterable, Mapping
+from functools import cache
+from typing import Any
+
+import numpy as np
+
+from job_index import tokenize
+
+DEDUP_FIELDS = ("title", "company", "description")
+
+# Universal hashing (a * x + b) mod p over 32-bit shingle hashes; with a, b and x
+# all below 2**32, a * x + b stays below 2**64, so the uint64 arithmetic is exact
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def _candidate_probability(similarity: float, bands: int, rows: int) -> float:
+    """Chance that two postings with Jaccard ``similarity`` share at least one band."""
+    return 1 - (1 - similarity**rows) ** bands
+
+
+@cache
+def optimal_bands(threshold: float, num_perm: int) -> tuple[int, int]:
+    """
+    ``(bands, rows)`` with ``bands * rows <= num_perm`` whose candidate curve
+    ``1 - (1 - s**rows)**bands`` best separates similarities below and above
+    ``threshold`` (false positive and false negative areas weighted equally).
+    """
+    steps = 200
+    width = 1 - threshold
+    best, best_error = (1, num_perm), float("inf")
+    for bands in range(1, num_perm + 1):
+        for rows in range(1, num_perm // bands + 1):
+            below = sum(_candidate_probability(threshold * (i + 0.5) / steps, bands, rows) for i in range(steps))
+            above = sum(1 - _candidate_probability(threshold + width * (i + 0.5) / steps, bands, rows) for i in range(steps))
+            error = (below * threshold + above * width) / steps
+            if error < best_error:
+                best, best_error = (bands, rows), error
+    return best
+
+
+def _is_empty(signature: np.ndarray) -> bool:
+    return bool((signature == _MAX_HASH).all())
+
+
+class NearDuplicateIndex:
+    """
+    LSH index of MinHash signatures, updated as postings are ingested.
+
+    Re-adding a job ID replaces the earlier version of the posting.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        num_perm: int = 128,
+        shingle_size: int = 3,
+        fields: tuple[str, ...] = DEDUP_FIELDS,
+        seed: int = 1,
+    ):
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.fields = fields
+        self.bands, self.rows = optimal_bands(threshold, num_perm)
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 1 << 32, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.randint(0, 1 << 32, size=(num_perm, 1), dtype=np.uint64)
+        self.signatures: dict[int, np.ndarray] = {}
+        self._buckets: list[dict[int, list[int]]] = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    def __contains__(self, job_id: int) -> bool:
+        return job_id in self.signatures
+
+    @classmethod
+    def from_store(cls, store, threshold: float = 0.8, **filters: Any) -> "NearDuplicateIndex":
+        """Index every posting in a ``JobStore`` (see ``JobStore.query`` for filters)."""
+        index = cls(threshold)
+        index.add_jobs(store.iter_jobs(**filters))
+        return index
+
+    def shingles(self, job: Mapping[str, Any]) -> set[str]:
+        """Overlapping word shingles of the posting's fields (never spanning two fields)."""
+        shingles: set[str] = set()
+        size = self.shingle_size
+        for field in self.fields:
+            tokens = tokenize(str(job.get(field) or ""))
+            if 0 < len(tokens) < size:
+                shingles.add(" ".join(tokens))
+            for start in range(len(tokens) - size + 1):
+                shingles.add(" ".join(tokens[start : start + size]))
+        return shingles
+
+    def signature(self, job: Mapping[str, Any]) -> np.ndarray:
+        """MinHash signature (``num_perm`` uint32 values); all ``0xFFFFFFFF`` for a posting without text."""
+        shingles = self.shingles(job)
+        if not shingles:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint32)
+        hashes = np.fromiter((zlib.crc32(shingle.encode()) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+        # One row per permutation (crc32 values are below 2**32, so nothing overflows)
+        permuted = ((self._a * hashes + self._b) % _MERSENNE_PRIME) & _MAX_HASH
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray) -> list[int]:
+        rows = self.rows
+        return [hash(signature[band * rows : (band + 1) * rows].tobytes()) for band in range(self.bands)]
+
+    def similarity(self, first: int, second: int) -> float:
+        """Estimated Jaccard similarity of two indexed postings."""
+        return float(np.count_nonzero(self.signatures[first] == self.signatures[second])) / self.num_perm
+
+    def query(self, job: Mapping[str, Any]) -> list[tuple[int, float]]:
+        """Indexed postings similar to ``job`` as ``(job_id, similarity)``, most similar first."""
+        signature = self.signature(job)
+        return [] if _is_empty(signature) else self._matches(signature, int(job["job_id"]))
+
+    def _matches(self, signature: np.ndarray, job_id: int) -> list[tuple[int, float]]:
+        candidates: set[int] = set()
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(buckets.get(key, ()))
+        candidates.discard(job_id)
+        matches = []
+        for candidate in candidates:
+            similarity = float(np.count_nonzero(self.signatures[candidate] == signature)) / self.num_perm
+            if similarity >= self.threshold:
+                matches.append((candidate, similarity))
+        matches.sort(key=lambda match: (-match[1], match[0]))
+        return matches
+
+    def add_job(self, job: Mapping[str, Any]) -> list[tuple[int, float]]:
+        """Index one posting; returns the near-duplicates that were already indexed (see ``query``)."""
+        job_id = int(job["job_id"])
+        self.remove(job_id)
+        signature = self.signature(job)
+        if _is_empty(signature):
+            return []
+        matches = self._matches(signature, job_id)
+        self.signatures[job_id] = signature
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            buckets.setdefault(key, []).append(job_id)
+        return matches
+
+    def add_jobs(self, jobs: Iterable[Mapping[str, Any]]) -> dict[int, int]:
+        """Index many postings; returns ``{job_id: most similar earlier job_id}`` for the near-duplicates."""
+        duplicates = {}
+        for job in jobs:
+            matches = self.add_job(job)
+            if matches:
+                duplicates[int(job["job_id"])] = matches[0][0]
+        return duplicates
+
+    def remove(self, job_id: int) -> bool:
+        """Drop a posting from the index; returns whether it was indexed."""
+        signature = self.signatures.pop(job_id, None)
+        if signature is None:
+            return False
+        for buckets, key in zip(self._buckets, self._band_keys(signature)):
+            bucket = buckets[key]
+            bucket.remove(job_id)
+            if not bucket:
+                del buckets[key]
+        return True
@@ -0,0 +1,100 @@
+"""
+Offline facet filtering of fetched jobs with NumPy masks.
+
+Applies a builder spec's facets (``f_E`` experience, ``f_JT`` job type,
+``f_WT`` remote/on-site, ``f_TPR`` time posted) to a ``JobCollection``
+without refetching. The collection's columns are wrapped as NumPy arrays
+without copying (``array('q')`` as int64, pooled string codes as uint32).
+Each facet is evaluated by looking up a small per-value table, indexed by
+the codes, so the work per record is a few vectorized array operations.
+
+Stored jobs know their facets from the search that found them (see
+``SavedSearch.facets``); a search that allowed several values records all of
+them (``"2,3"``), and such a job matches a filter asking for any of those
+values. Jobs without a recorded value are excluded unless
+``include_unknown=True``.
+
+Example:
+    jobs = JobCollection.from_store(JobStore("jobs.db"))
+    facets = FacetFilter(jobs)
+    recent_senior = facets.apply({"experience_levels": "mid_senior", "time_filter": "1 week"})
+"""
+
+import time
+from array import array
+from collections.abc import Mapping
+from typing import Any, Optional, Union
+
+import numpy as np
+
+from fetch_pipeline import FACET_COLUMNS
+from job_collection import JobCollection
+from linkedin_url_builder import LinkedInURLBuilder, build_from_spec
+
+Spec = Union[Mapping[str, Any], LinkedInURLBuilder]
+
+
+def facet_params(spec: Spec) -> dict[str, str]:
+    """The ``f_E`` / ``f_JT`` / ``f_WT`` / ``f_TPR`` parameters a spec (or builder) would put in its URL."""
+    builder = spec if isinstance(spec, LinkedInURLBuilder) else build_from_spec(spec)
+    return {param: value for param, value in builder.params.items() if param in FACET_COLUMNS or param == "f_TPR"}
+
+
+class FacetFilter:
+    """
+    Evaluate builder facets against a ``JobCollection``.
+
+    Rows appended to the collection after construction are picked up on the
+    next call.
+    """
+
+    def __init__(self, collection: JobCollection, include_unknown: bool = False):
+        self.collection = collection
+        self.include_unknown = include_unknown
+
+    def _column(self, name: str) -> np.ndarray:
+        if name in self.collection.ints:
+            return np.frombuffer(self.collection.ints[name], dtype=np.int64)
+        return np.frombuffer(self.collection.codes[name], dtype=np.uint32)
+
+    def _value_table(self, column: str, wanted: set[str]) -> np.ndarray:
+        """Boolean per pooled value: does the recorded code list share a code with ``wanted``?"""
+        strings = self.collection.pools[column].strings
+        table = np.zeros(max(len(strings), 1), dtype=bool)
+        for code, value in enumerate(strings):
+            recorded = set(filter(None, value.split(",")))
+            table[code] = bool(recorded & wanted) if recorded else self.include_unknown
+        return table
+
+    def mask(self, spec: Spec, now: Optional[float] = None) -> np.ndarray:
+        """Boolean mask over the collection's rows for the spec's facets."""
+        result = np.ones(len(self.collection), dtype=bool)
+        for param, value in facet_params(spec).items():
+            if param == "f_TPR":
+                now = time.time() if now is None else now
+                posted_at = self._column("posted_at")
+                since = posted_at >= int(now) - int(value[1:])
+                if self.include_unknown:
+                    since |= posted_at == 0
+                result &= since
+            else:
+                column = FACET_COLUMNS[param]
+                result &= self._value_table(column, set(value.split(",")))[self._column(column)]
+        return result
+
+    def count(self, spec: Spec, now: Optional[float] = None) -> int:
+        return int(np.count_nonzero(self.mask(spec, now)))
+
+    def apply(self, spec: Spec, now: Optional[float] = None) -> JobCollection:
+        """New collection with the rows matching the spec's facets."""
+        indices = np.flatnonzero(self.mask(spec, now))
+        result = JobCollection(self.collection.pools)
+        # Gather the array columns with NumPy; only titles and URLs go through Python lists
+        for name, values in self.collection.ints.items():
+            result.ints[name] = array(values.typecode, self._column(name)[indices].tobytes())
+        for name, values in self.collection.codes.items():
+            result.codes[name] = array(values.typecode, self._column(name)[indices].tobytes())
+        positions = indices.tolist()
+        for name, values in self.collection.text.items():
+            result.text[name] = [values[index] for index in positions]
+        return result
@@ -0,0 +1,341 @@
+"""
+Fetch → parse → store pipeline for saved searches.
+
+A saved search is a named builder spec (see ``build_from_spec``). Polling a
+search fetches its LinkedIn results page, parses the job cards and stores the
+postings that weren't seen before. Each stage is timed per search fingerprint
+so slow searches can be told apart by where their time goes.
+"""
+
+import calendar
+import heapq
+import json
+import time
+import urllib.error
+import urllib.request
+from collections import deque
+from collections.abc import Iterable, Mapping
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import metrics
+from job_store import JobStore
+from latency_histogram import LatencyTracker
+from linkedin_url_builder import build_from_spec
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) linkedin-job-searcher"
+DEFAULT_TIMEOUT = 15.0
+
+STAGES = ("fetch", "parse", "store")
+
+# Builder facet parameter -> job store column
+FACET_COLUMNS = {"f_E": "experience", "f_JT": "job_type", "f_WT": "workplace"}
+
+# transport(url, timeout) -> response body
+Transport = Callable[[str, float], bytes]
+
+
+class FetchError(Exception):
+    """A results page could not be fetched; ``status`` is the HTTP status if there was one."""
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(FetchError):
+    """A search was not fetched because its circuit breaker is open (see ``retry_policy.CircuitBreaker``)."""
+
+    def __init__(self, fingerprint: str, retry_in: float):
+        super().__init__(f"Search {fingerprint} is parked for another {retry_in:.0f}s", retry_after=retry_in)
+        self.fingerprint = fingerprint
+
+
+class SavedSearch:
+    """A named search spec with its URL and fingerprint."""
+
+    def __init__(self, name: str, spec: Mapping[str, Any]):
+        self.name = name
+        self.spec = dict(spec)
+        builder = build_from_spec(self.spec)
+        self.url = builder.build_url()
+        self.fingerprint = builder.fingerprint()
+        # Facet codes the search was restricted to, recorded on the jobs it finds
+        self.facets = {column: builder.params[param] for param, column in FACET_COLUMNS.items() if builder.params.get(param)}
+
+    def __repr__(self) -> str:
+        return f"SavedSearch({self.name!r}, fingerprint={self.fingerprint!r})"
+
+
+def load_saved_searches(path: str) -> list[SavedSearch]:
+    """
+    Load saved searches from a JSON file.
+
+    The file holds a list of spec objects; an optional ``name`` field labels
+    each one (defaults to its keywords), e.g.
+    ``[{"name": "py-ankara", "keywords": "Python", "location": "Ankara", "time_filter": "1 hour"}]``.
+
+    Raises:
+        ValueError: If the file isn't JSON or isn't a list of objects.
+    """
+    entries = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+        raise ValueError(f"{path}: expected a list of saved search objects")
+    searches = []
+    for entry in entries:
+        spec = {key: value for key, value in entry.items() if key != "name"}
+        searches.append(SavedSearch(entry.get("name") or spec.get("keywords", ""), spec))
+    return searches
+
+
+def urllib_transport(url: str, timeout: float = DEFAULT_TIMEOUT) -> bytes:
+    """Fetch ``url`` with urllib; HTTP and network failures raise ``FetchError``."""
+    request = urllib.request.Request(url, headers={"User-Agent": USER_AGENT, "Accept-Language": "en-US,en;q=0.9"})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.read()
+    except urllib.error.HTTPError as e:
+        retry_after = e.headers.get("Retry-After") if e.headers else None
+        raise FetchError(
+            f"HTTP {e.code} for {url}",
+            status=e.code,
+            retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+        ) from e
+    except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+        raise FetchError(f"Could not fetch {url}: {e}") from e
+
+
+class JobCardParser(HTMLParser):
+    """Collect job cards from a LinkedIn job search results page."""
+
+    # CSS class of the element holding each record field
+    FIELD_CLASSES = {
+        "base-search-card__title": "title",
+        "base-search-card__subtitle": "company",
+        "job-search-card__location": "location",
+    }
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.jobs: list[dict[str, Any]] = []
+        self._job: Optional[dict[str, Any]] = None
+        self._field: Optional[str] = None
+        self._field_tag = ""
+        self._text: list[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        attributes = dict(attrs)
+        urn = attributes.get("data-entity-urn") or ""
+        if urn.startswith("urn:li:jobPosting:"):
+            self._finish_job()
+            job_id = urn.rsplit(":", 1)[1]
+            # A card without a numeric ID can't be stored or deduplicated; skip it (and its fields)
+            if job_id.isdigit():
+                self._job = {"job_id": int(job_id), "title": "", "company": "", "location": "", "url": ""}
+            return
+        if self._job is None:
+            return
+
+        classes = (attributes.get("class") or "").split()
+        if tag == "a" and "base-card__full-link" in classes and attributes.get("href"):
+            self._job["url"] = attributes["href"].split("?", 1)[0]
+        elif tag == "time" and attributes.get("datetime"):
+            self._job["posted_at"] = _parse_date(attributes["datetime"])
+        elif self._field is None:
+            for css_class, field in self.FIELD_CLASSES.items():
+                if css_class in classes:
+                    self._field, self._field_tag, self._text = field, tag, []
+                    break
+
+    def handle_data(self, data):
+        if self._field is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if self._field is not None and tag == self._field_tag:
+            self._job[self._field] = " ".join("".join(self._text).split())
+            self._field = None
+
+    def close(self):
+        super().close()
+        self._finish_job()
+
+    def _finish_job(self):
+        if self._job is not None:
+            self.jobs.append(self._job)
+            self._job = None
+            self._field = None
+
+
+def _parse_date(value: str) -> int:
+    """``YYYY-MM-DD`` (or an ISO timestamp) to epoch seconds; 0 if unparseable."""
+    try:
+        return calendar.timegm(time.strptime(value[:10], "%Y-%m-%d"))
+    except ValueError:
+        return 0
+
+
+def parse_job_cards(page: bytes, fingerprint: str = "", fetched_at: Optional[int] = None) -> list[dict[str, Any]]:
+    """Parse a results page into job records tagged with the originating search."""
+    parser = JobCardParser()
+    parser.feed(page.decode("utf-8", errors="replace"))
+    parser.close()
+    fetched_at = int(time.time()) if fetched_at is None else fetched_at
+    for job in parser.jobs:
+        job["search_fingerprint"] = fingerprint
+        job["fetched_at"] = fetched_at
+    return parser.jobs
+
+
+class SearchPoller:
+    """
+    Poll saved searches into a job store, timing every stage per search.
+
+    Example:
+        poller = SearchPoller(JobStore("jobs.db"))
+        new_jobs = poller.poll_search(SavedSearch("py", {"keywords": "Python", "time_filter": "1 hour"}))
+        poller.tracker.summary()  # {fingerprint: {"fetch": {"p50": ..., "p95": ..., "p99": ...}, ...}}
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        transport: Transport = urllib_transport,
+        tracker: Optional[LatencyTracker] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        retry=None,
+        breaker=None,
+        parse: Callable[..., list[dict[str, Any]]] = parse_job_cards,
+        dedup=None,
+        ranker=None,
+        notifier=None,
+        parse_pool=None,
+    ):
+        self.store = store
+        self.transport = transport
+        self.parse = parse  # e.g. parse_pool.ParsePool.parse to parse in worker processes
+        self.tracker = tracker or LatencyTracker()
+        self.timeout = timeout
+        self.retry = retry  # retry_policy.RetryPolicy
+        self.breaker = breaker  # retry_policy.CircuitBreaker
+        self.dedup = dedup  # dedup.NearDuplicateIndex
+        self.duplicates: dict[int, int] = {}  # new job ID -> earlier near-duplicate's job ID
+        self.ranker = ranker  # bm25_ranker.BM25Ranker, kept current with every new job
+        self.notifier = notifier  # notifier.Notifier, told about every search's new jobs
+        self.parse_pool = parse_pool  # parse_pool.ParsePool: poll_all parses in it while fetching the next search
+        self.retries = 0
+        self.clock = time.monotonic
+        self.sleep = time.sleep
+
+    def _timed(self, search: SavedSearch, stage: str, func: Callable, *args):
+        start = time.perf_counter()
+        try:
+            with metrics.stage_timer(stage):
+                return func(*args)
+        finally:
+            self.tracker.record(search.fingerprint, stage, time.perf_counter() - start)
+
+    def poll_search(self, search: SavedSearch) -> list[Mapping[str, Any]]:
+        """Fetch, parse and store one search; returns the jobs that were new."""
+        page = self._timed(search, "fetch", self.transport, search.url, self.timeout)
+        return self._ingest(search, self._timed(search, "parse", self.parse, page, search.fingerprint))
+
+    def _ingest(self, search: SavedSearch, jobs: list[dict[str, Any]]) -> list[Mapping[str, Any]]:
+        """Store one search's parsed jobs and hand the new ones to dedup, ranker and notifier."""
+        if search.facets:
+            for job in jobs:
+                job.update(search.facets)
+        new_jobs = self._timed(search, "store", self.store.add_new_jobs, jobs)
+        if self.dedup is not None:
+            for job in new_jobs:
+                matches = self.dedup.add_job(job)
+                if matches:
+                    self.duplicates[int(job["job_id"])] = matches[0][0]
+        if self.ranker is not None:
+            self.ranker.add_jobs(new_jobs)
+        if self.notifier is not None and new_jobs:
+            self.notifier.publish(search, new_jobs)
+        return new_jobs
+
+    def poll_all(self, searches: Iterable[SavedSearch]) -> dict[str, Any]:
+        """
+        Poll every search once.
+
+        Returns ``{fingerprint: number of new jobs}``; a search that fails to
+        fetch maps to its (last) ``FetchError`` instead, and a search parked
+        by the circuit breaker to a ``CircuitOpenError``.
+
+        With a retry policy, retryable failures are rescheduled with backoff
+        instead of retried on the spot: every search gets its first attempt
+        before anyone's retry, so healthy searches aren't held up by failing
+        ones.
+
+        With a ``parse_pool``, fetched pages are parsed in its worker processes
+        while the next searches are fetched, up to one page per worker ahead;
+        the parse stage then times how long the pipeline waited for a result.
+        """
+        results: dict[str, Any] = {}
+        pending: list[tuple[float, int, int, SavedSearch]] = []  # (due, order, attempt, search)
+        parsing: deque = deque()  # (search, future of its jobs), oldest first
+        for order, search in enumerate(searches):
+            if self.retry is not None and self.retry.budget is not None:
+                self.retry.budget.record_attempt()
+            self._attempt(search, 1, order, results, pending, parsing)
+            self._collect(parsing, results)
+        while pending:
+            due, order, attempt, search = heapq.heappop(pending)
+            wait = due - self.clock()
+            if wait > 0:
+                self._collect(parsing, results, wait_all=True)  # idle anyway
+                self.sleep(max(0.0, due - self.clock()))
+            self._attempt(search, attempt, order, results, pending, parsing)
+            self._collect(parsing, results)
+        self._collect(parsing, results, wait_all=True)
+        return results
+
+    def _collect(self, parsing: deque, results: dict[str, Any], wait_all: bool = False) -> None:
+        """Store pool-parsed pages in order: those already done, one past the pool's capacity, or all."""
+        while parsing and (wait_all or parsing[0][1].done() or len(parsing) > self.parse_pool.workers):
+            search, future = parsing.popleft()
+            try:
+                results[search.fingerprint] = len(self._ingest(search, self._timed(search, "parse", future.result)))
+            except Exception:
+                if self.breaker is not None:
+                    self.breaker.record_failure(search.fingerprint)
+                raise
+            if self.breaker is not None:
+                self.breaker.record_success(search.fingerprint)
+
+    def _attempt(
+        self, search: SavedSearch, attempt: int, order: int, results: dict[str, Any], pending: list, parsing: deque
+    ) -> None:
+        fingerprint = search.fingerprint
+        if self.breaker is not None and not self.breaker.allow(fingerprint):
+            results[fingerprint] = CircuitOpenError(fingerprint, self.breaker.retry_in(fingerprint))
+            return
+        try:
+            if self.parse_pool is None:
+                results[fingerprint] = len(self.poll_search(search))
+            else:
+                # Parsed and stored by _collect, which also settles the breaker
+                page = self._timed(search, "fetch", self.transport, search.url, self.timeout)
+                parsing.append((search, self.parse_pool.submit(page, fingerprint)))
+                return
+        except FetchError as e:
+            results[fingerprint] = e
+            if self.breaker is not None:
+                self.breaker.record_failure(fingerprint)
+            if self.retry is not None and self.retry.should_retry(e, attempt):
+                self.retries += 1
+                due = self.clock() + self.retry.delay(attempt, e.retry_after)
+                heapq.heappush(pending, (due, order, attempt + 1, search))
+        except Exception:
+            # Not a fetch failure, but it still has to settle a half-open trial or the search stays parked
+            if self.breaker is not None:
+                self.breaker.record_failure(fingerprint)
+            raise
+        else:
+            if self.breaker is not None:
+                self.breaker.record_success(fingerprint)
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Harvest LinkedIn geo IDs from exported browser history and bookmarks.
+
+Instead of copying ``geoId=...`` from the address bar by hand, point this at
+history/bookmark exports (HTML, JSON, CSV or plain text, optionally
+gzipped, or a Chrome ``History`` / Firefox ``places.sqlite`` database, which
+is read from a copy so it works while the browser is running). Every
+LinkedIn jobs URL with both a ``location`` and a ``geoId`` yields a
+location -> geo ID pair, which is merged into the geo ID store
+(``geo_ids.json``, or ``LINKEDIN_GEO_IDS``) that ``load_resolver`` reads for
+the web app and ``cli.py``. Saved searches (``build_from_spec`` in the poller
+and pipelines) don't use it, so their URLs and fingerprints stay stable;
+give those a ``geo_id`` instead.
+
+Files are scanned in fixed-size chunks, so memory use doesn't depend on the
+file size (minified single-line JSON included). Only the distinct pairs are
+kept, with how often each was seen; when a location appears with several geo
+IDs, the most frequent one wins.
+
+Examples:
+  python geo_harvest.py bookmarks.html history.json.gz
+  python geo_harvest.py ~/.config/google-chrome/Default/History --dry-run
+  python geo_harvest.py export.csv --store my_geo_ids.json
+"""
+
+import argparse
+import gzip
+import html
+import json
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Optional
+
+from linkedin_url_builder import LinkedInURLBuilder
+from resolver_cache import LookupCache, SharedResolver
+
+DEFAULT_GEO_STORE = os.environ.get("LINKEDIN_GEO_IDS", "geo_ids.json")
+
+CHUNK_SIZE = 1 << 20
+
+# URLs longer than this are cut off rather than buffered further
+MAX_URL_LENGTH = 64 * 1024
+
+_URL_RE = re.compile(rb"https?://(?:[a-z0-9-]+\.)*linkedin\.com/jobs/[^\s\"'<>\\]*", re.IGNORECASE)
+# Bytes kept from the end of a chunk, enough for a URL start cut off mid-host
+_CARRY_LENGTH = 256
+_SQLITE_HEADER = b"SQLite format 3\x00"
+_HISTORY_QUERIES = (
+    "SELECT url FROM urls WHERE url LIKE '%linkedin.com/jobs%'",  # Chrome, Edge, Brave
+    "SELECT url FROM moz_places WHERE url LIKE '%linkedin.com/jobs%'",  # Firefox
+)
+
+
+def scan_urls(chunks: Iterable[bytes]) -> Iterator[str]:
+    """
+    LinkedIn jobs URLs found in a stream of byte chunks.
+
+    A URL split across two chunks is carried over; at most one partial URL
+    (up to ``MAX_URL_LENGTH``) is held between chunks.
+    """
+    carry = b""
+    for chunk in chunks:
+        buffer = carry + chunk
+        carry_from = max(0, len(buffer) - _CARRY_LENGTH)
+        for match in _URL_RE.finditer(buffer):
+            if match.end() == len(buffer) and match.end() - match.start() < MAX_URL_LENGTH:
+                carry_from = match.start()  # may continue in the next chunk
+                break
+            yield _decode_url(match.group())
+            carry_from = max(carry_from, match.end())
+        carry = buffer[carry_from:]
+    for match in _URL_RE.finditer(carry):
+        yield _decode_url(match.group())
+
+
+def _decode_url(raw: bytes) -> str:
+    url = raw.decode("utf-8", errors="replace")
+    # HTML bookmark exports escape "&" as "&amp;"
+    return html.unescape(url) if "&amp;" in url or "&#" in url else url
+
+
+def _read_chunks(path: str, chunk_size: int) -> Iterator[bytes]:
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as handle:
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _history_urls(path: str) -> Iterator[str]:
+    # A running browser keeps its history database locked, so read a copy (with its WAL, if any)
+    with tempfile.TemporaryDirectory(prefix="geo_harvest_") as directory:
+        copy = os.path.join(directory, "history.sqlite")
+        shutil.copyfile(path, copy)
+        if os.path.exists(f"{path}-wal"):
+            shutil.copyfile(f"{path}-wal", f"{copy}-wal")
+        connection = sqlite3.connect(copy)
+        try:
+            for query in _HISTORY_QUERIES:
+                try:
+                    cursor = connection.execute(query)
+                except sqlite3.OperationalError as e:
+                    if "no such table" in str(e):
+                        continue  # not this browser's schema
+                    raise
+                for (url,) in cursor:
+                    yield from scan_urls([url.encode("utf-8")])
+        finally:
+            connection.close()
+
+
+def iter_linkedin_urls(path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """LinkedIn jobs URLs in an export file or browser history database."""
+    with open(path, "rb") as handle:
+        is_sqlite = handle.read(len(_SQLITE_HEADER)) == _SQLITE_HEADER
+    if is_sqlite:
+        return _history_urls(path)
+    return scan_urls(_read_chunks(path, chunk_size))
+
+
+def geo_pair(url: str) -> Optional[tuple[str, str]]:
+    """``(location key, geo ID)`` from a jobs URL carrying both, else None."""
+    params = LinkedInURLBuilder.from_url(url).params
+    geo_id = params.get("geoId", "").strip()
+    location = params.get("location", "").strip()
+    if not geo_id.isdigit() or not location:
+        return None
+    key = LinkedInURLBuilder.normalize_location_key(location)
+    return (key, geo_id) if key else None
+
+
+class GeoHarvest:
+    """
+    Distinct location -> geo ID pairs seen so far, with counts.
+
+    Example:
+        >>> harvest = GeoHarvest()
+        >>> harvest.add_url("https://www.linkedin.com/jobs/search/?location=Ankara%2C%20Turkey&geoId=105215666")
+        True
+        >>> harvest.geo_ids()
+        {'ankara_turkey': '105215666'}
+    """
+
+    def __init__(self, cache_urls: int = 10_000):
+        self.counts: dict[str, Counter] = {}  # location key -> Counter of geo IDs
+        self.urls = 0
+        self.pairs_seen = 0
+        # Histories revisit the same searches over and over; parse each distinct URL once
+        self._pairs = LookupCache(max_entries=cache_urls)
+
+    def add_url(self, url: str) -> bool:
+        """Count one URL; returns whether it carried a location/geo ID pair."""
+        self.urls += 1
+        if "geoId=" not in url or "location=" not in url:
+            return False
+        pair = self._pairs.get_or_compute(url, lambda: geo_pair(url))
+        if pair is None:
+            return False
+        self.pairs_seen += 1
+        key, geo_id = pair
+        self.counts.setdefault(key, Counter())[geo_id] += 1
+        return True
+
+    def add_file(self, path: str, chunk_size: int = CHUNK_SIZE) -> int:
+        """Harvest every URL in a file; returns the number of URLs read."""
+        count = 0
+        for url in iter_linkedin_urls(path, chunk_size):
+            self.add_url(url)
+            count += 1
+        return count
+
+    def geo_ids(self) -> dict[str, str]:
+        """Location key -> most frequently seen geo ID (ties go to the one seen first)."""
+        return {key: counts.most_common(1)[0][0] for key, counts in self.counts.items()}
+
+    def conflicts(self) -> dict[str, list[str]]:
+        """Location keys seen with more than one geo ID, most frequent first."""
+        return {key: [geo_id for geo_id, _ in counts.most_common()] for key, counts in self.counts.items() if len(counts) > 1}
+
+
+def load_geo_ids(path: str = DEFAULT_GEO_STORE) -> dict[str, str]:
+    """Location key -> geo ID pairs from the geo ID store; empty if it doesn't exist yet."""
+    try:
+        with open(path, encoding="utf-8") as handle:
+            data = json.load(handle)
+    except FileNotFoundError:
+        return {}
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object of location -> geo ID")
+    return {str(key): str(value) for key, value in data.items()}
+
+
+def load_resolver(path: str = DEFAULT_GEO_STORE) -> SharedResolver:
+    """``SharedResolver`` with the store's geo IDs; an unreadable store is reported on stderr and skipped."""
+    try:
+        geo_ids = load_geo_ids(path)
+    except (OSError, ValueError) as e:
+        print(f"[GEO] Ignoring the geo ID store: {e}", file=sys.stderr)
+        geo_ids = {}
+    return SharedResolver(geo_ids)
+
+
+def merge_geo_ids(geo_ids: Mapping[str, str], path: str = DEFAULT_GEO_STORE) -> dict[str, int]:
+    """
+    Merge pairs into the geo ID store (harvested IDs replace stored ones).
+
+    The file is replaced atomically. Returns counts of ``added``, ``changed``
+    and ``unchanged`` location keys.
+    """
+    stored = load_geo_ids(path)
+    counts = {"added": 0, "changed": 0, "unchanged": 0}
+    for key, geo_id in geo_ids.items():
+        previous = stored.get(key)
+        counts["added" if previous is None else "unchanged" if previous == geo_id else "changed"] += 1
+        stored[key] = geo_id
+    if counts["added"] or counts["changed"]:
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, delete=False, suffix=".tmp") as handle:
+            json.dump(dict(sorted(stored.items())), handle, indent=2, ensure_ascii=False)
+            handle.write("\n")
+        os.replace(handle.name, path)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Harvest LinkedIn geo IDs from browser history and bookmark exports",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("files", nargs="+", help="Export files (HTML/JSON/CSV/text, .gz) or browser history databases")
+    parser.add_argument(
+        "--store", default=DEFAULT_GEO_STORE, help=f"Geo ID store to merge into (default: {DEFAULT_GEO_STORE})"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Print the harvested pairs without saving them")
+    args = parser.parse_args()
+
+    harvest = GeoHarvest()
+    for path in args.files:
+        try:
+            urls = harvest.add_file(path)
+        except (OSError, sqlite3.Error) as e:
+            print(f"[ERROR] {path}: {e}", file=sys.stderr)
+            continue
+        print(f"[SCAN] {path}: {urls} LinkedIn jobs URLs")
+
+    geo_ids = harvest.geo_ids()
+    print(f"[GEO] {len(geo_ids)} locations from {harvest.pairs_seen} URLs with a location and geo ID")
+    for key, geo_ids_seen in harvest.conflicts().items():
+        print(f"[CONFLICT] {key}: {', '.join(geo_ids_seen)} (keeping {geo_ids[key]})")
+    if args.dry_run:
+        for key, geo_id in sorted(geo_ids.items()):
+            print(f"  {key}: {geo_id}")
+        return
+    try:
+        counts = merge_geo_ids(geo_ids, args.store)
+    except (OSError, ValueError) as e:
+        print(f"Error updating {args.store}: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(f"[SAVE] {args.store}: {counts['added']} added, {counts['changed']} changed, {counts['unchanged']} unchanged")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+"""
+Compact, column-oriented collection of job postings.
+
+A list of job dicts costs around a kilobyte per posting: every dict, key
+table and field string is a separate Python object. ``JobCollection`` keeps
+one column per field instead:
+
+* ``job_id``, ``posted_at`` and ``fetched_at`` as ``array('q')`` (8 bytes each),
+* low-cardinality strings (company, location, search fingerprint and the
+  experience / job type / workplace facets) as ``array('I')`` codes into a
+  shared ``StringPool`` (4 bytes each, every distinct value stored once),
+* titles and URLs as plain lists of strings.
+
+Descriptions are not kept; fetch them from the ``JobStore`` when needed.
+
+Measured on 100k synthetic postings (see ``tests/test_job_collection.py``),
+``memory_bytes()`` comes to roughly 240 bytes per record versus roughly 830
+for the same postings as a list of dicts (``dicts_memory_bytes``, which counts
+shared string objects only once, so rows loaded from SQLite cost more). The
+titles and URLs are most of what is left.
+
+Rows are exposed through ``JobRow`` views (``__slots__``, no per-row dict),
+created on access.
+
+Example:
+    >>> jobs = JobCollection()
+    >>> jobs.append({"job_id": 4185657072, "title": "Python Developer", "company": "Acme", "posted_at": 1714521600})
+    >>> jobs[0].company
+    'Acme'
+    >>> len(jobs.filter(lambda row: row.posted_at >= 1714500000))
+    1
+"""
+
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any, Callable, Optional, Union
+
+INT_COLUMNS = ("job_id", "posted_at", "fetched_at")
+POOLED_COLUMNS = ("company", "location", "search_fingerprint", "experience", "job_type", "workplace")
+TEXT_COLUMNS = ("title", "url")
+COLUMNS = INT_COLUMNS + TEXT_COLUMNS + POOLED_COLUMNS
+
+
+class StringPool:
+    """Interned strings addressed by small integer codes."""
+
+    __slots__ = ("strings", "_codes")
+
+    def __init__(self):
+        self.strings: list[str] = []
+        self._codes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    def code(self, value: str) -> int:
+        """Code for ``value``, adding it to the pool if it is new."""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.strings)
+            self.strings.append(sys.intern(value))
+        return code
+
+    def lookup(self, value: str) -> Optional[int]:
+        """Code for ``value`` if it is in the pool, else None (never adds)."""
+        return self._codes.get(value)
+
+    def memory_bytes(self) -> int:
+        return sys.getsizeof(self.strings) + sys.getsizeof(self._codes) + sum(sys.getsizeof(string) for string in self.strings)
+
+
+class JobRow:
+    """Read-only view of one posting in a ``JobCollection``."""
+
+    __slots__ = ("_collection", "_index")
+
+    def __init__(self, collection: "JobCollection", index: int):
+        self._collection = collection
+        self._index = index
+
+    def __getattr__(self, name: str) -> Any:
+        return self._collection.value(name, self._index)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, JobRow) and self.as_dict() == other.as_dict()
+
+    def __repr__(self) -> str:
+        return f"JobRow(job_id={self.job_id}, title={self.title!r}, company={self.company!r})"
+
+    def as_dict(self) -> dict[str, Any]:
+        return {column: self._collection.value(column, self._index) for column in COLUMNS}
+
+
+class JobCollection:
+    """
+    Column-oriented postings with append, slice and filter.
+
+    Collections created by slicing or filtering share the string pools of
+    their parent, so codes stay comparable between them.
+    """
+
+    def __init__(self, pools: Optional[dict[str, StringPool]] = None):
+        self.pools = pools if pools is not None else {column: StringPool() for column in POOLED_COLUMNS}
+        self.ints = {column: array("q") for column in INT_COLUMNS}
+        self.codes = {column: array("I") for column in POOLED_COLUMNS}
+        self.text: dict[str, list[str]] = {column: [] for column in TEXT_COLUMNS}
+
+    @classmethod
+    def from_jobs(cls, jobs: Iterable[Mapping[str, Any]]) -> "JobCollection":
+        collection = cls()
+        collection.extend(jobs)
+        return collection
+
+    @classmethod
+    def from_store(cls, store, **filters: Any) -> "JobCollection":
+        """Load postings from a ``JobStore`` one batch at a time (see ``JobStore.query`` for filters)."""
+        return cls.from_jobs(store.iter_jobs(**filters))
+
+    def __len__(self) -> int:
+        return len(self.ints["job_id"])
+
+    def append(self, job: Mapping[str, Any]) -> None:
+        """Add one posting (a job dict as stored by ``JobStore``)."""
+        for column in INT_COLUMNS:
+            self.ints[column].append(int(job.get(column) or 0))
+        for column in TEXT_COLUMNS:
+            self.text[column].append(str(job.get(column) or ""))
+        for column in POOLED_COLUMNS:
+            self.codes[column].append(self.pools[column].code(str(job.get(column) or "")))
+
+    def extend(self, jobs: Iterable[Mapping[str, Any]]) -> None:
+        for job in jobs:
+            self.append(job)
+
+    def value(self, column: str, index: int) -> Any:
+        """Value of ``column`` for the posting at ``index``."""
+        if column in self.ints:
+            return self.ints[column][index]
+        if column in self.codes:
+            return self.pools[column].strings[self.codes[column][index]]
+        if column in self.text:
+            return self.text[column][index]
+        raise AttributeError(column)
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[JobRow, "JobCollection"]:
+        if isinstance(key, slice):
+            return self._copy_columns(lambda column: column[key])
+        length = len(self)
+        if key < 0:
+            key += length
+        if not 0 <= key < length:
+            raise IndexError("job index out of range")
+        return JobRow(self, key)
+
+    def __iter__(self) -> Iterator[JobRow]:
+        for index in range(len(self)):
+            yield JobRow(self, index)
+
+    def take(self, indices: Iterable[int]) -> "JobCollection":
+        """New collection with the postings at ``indices``, in that order."""
+        indices = list(indices)
+        return self._copy_columns(lambda column: _gather(column, indices))
+
+    def filter(self, predicate: Callable[[JobRow], bool]) -> "JobCollection":
+        """New collection with the postings for which ``predicate(row)`` is true."""
+        return self.take(index for index in range(len(self)) if predicate(JobRow(self, index)))
+
+    def where(self, column: str, value: str) -> "JobCollection":
+        """Postings whose pooled ``column`` (e.g. ``company``) equals ``value``; compares codes only."""
+        code = self.pools[column].lookup(value)
+        if code is None:
+            return JobCollection(self.pools)
+        codes = self.codes[column]
+        return self.take(index for index in range(len(codes)) if codes[index] == code)
+
+    def _copy_columns(self, select: Callable) -> "JobCollection":
+        copy = JobCollection(self.pools)
+        copy.ints = {column: select(values) for column, values in self.ints.items()}
+        copy.codes = {column: select(values) for column, values in self.codes.items()}
+        copy.text = {column: select(values) for column, values in self.text.items()}
+        return copy
+
+    def memory_bytes(self, include_pools: bool = True) -> int:
+        """Approximate bytes held by the columns (and, by default, the shared string pools)."""
+        total = sys.getsizeof(self)
+        total += sum(values.buffer_info()[1] * values.itemsize for values in self.ints.values())
+        total += sum(values.buffer_info()[1] * values.itemsize for values in self.codes.values())
+        for values in self.text.values():
+            total += sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values)
+        if include_pools:
+            total += sum(pool.memory_bytes() for pool in self.pools.values())
+        return total
+
+
+def _gather(column, indices: list[int]):
+    if isinstance(column, array):
+        return array(column.typecode, [column[index] for index in indices])
+    return [column[index] for index in indices]
+
+
+def dicts_memory_bytes(jobs: list[Mapping[str, Any]]) -> int:
+    """Approximate bytes held by a list of job dicts, for comparison with ``JobCollection.memory_bytes``."""
+    total = sys.getsizeof(jobs)
+    seen: set[int] = set()
+    for job in jobs:
+        total += sys.getsizeof(job)
+        for value in job.values():
+            if id(value) not in seen:
+                seen.add(id(value))
+                total += sys.getsizeof(value)
+    return total
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Streaming export of stored jobs to CSV or JSONL, optionally compressed.
+
+Jobs are read from the store in ``job_id`` order one chunk at a time
+(keyset paging, see ``JobStore.iter_batches``) and written out before the
+next chunk is read, so memory use depends on ``chunk_size`` and not on the
+size of the store. With the saved searches file, every row also carries the
+name and spec of the search that found the job.
+
+The format and compression follow the output name (``jobs.csv``,
+``jobs.jsonl.gz``, ``jobs.csv.bz2``, ``jobs.jsonl.xz``) unless given
+explicitly. Files are written under a temporary name and moved into place
+when complete, so a reader never sees a half-written export.
+
+Command line:
+    python job_export.py --output jobs.csv.gz --searches searches.json
+    python job_export.py --output - --format jsonl --days 7 | jq .title
+    python job_export.py --output recent.jsonl --days 1 --details  # also fetch descriptions and criteria
+
+Example:
+    >>> import io
+    >>> store = JobStore(":memory:")
+    >>> store.add_jobs([{"job_id": 1, "title": "Python Developer", "company": "Acme"}])
+    1
+    >>> out = io.StringIO()
+    >>> export_jobs(store, out, "jsonl", columns=("job_id", "title", "company"))
+    1
+    >>> out.getvalue()
+    '{"job_id": 1, "title": "Python Developer", "company": "Acme", "search_name": "", "search_spec": null}\\n'
+"""
+
+import argparse
+import bz2
+import csv
+import gzip
+import json
+import lzma
+import os
+import sys
+import time
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import IO, Any, Optional
+
+from fetch_pipeline import SavedSearch, load_saved_searches
+from job_hydration import DETAIL_FIELDS, JobHydrator
+from job_store import DEFAULT_STORE_PATH, JOB_COLUMNS, JobStore
+from retry_policy import RetryBudget, RetryPolicy
+
+DEFAULT_CHUNK_SIZE = 5000
+
+FORMATS = ("csv", "jsonl")
+
+# Compression by file suffix -> opener taking (path, mode, encoding, newline)
+COMPRESSORS = {
+    ".gz": lambda path, mode, **kwargs: gzip.open(path, mode, compresslevel=6, **kwargs),
+    ".bz2": lambda path, mode, **kwargs: bz2.open(path, mode, **kwargs),
+    ".xz": lambda path, mode, **kwargs: lzma.open(path, mode, **kwargs),
+}
+
+# Columns appended to every row: the originating saved search
+SEARCH_COLUMNS = ("search_name", "search_spec")
+
+
+def output_format(path: str) -> tuple[str, str]:
+    """
+    ``(format, compression suffix)`` from an output name.
+
+    Example:
+        >>> output_format("exports/jobs.jsonl.gz")
+        ('jsonl', '.gz')
+    """
+    suffixes = Path(path).suffixes
+    compression = suffixes.pop() if suffixes and suffixes[-1] in COMPRESSORS else ""
+    fmt = suffixes[-1].lstrip(".") if suffixes else ""
+    return (fmt if fmt in FORMATS else "csv"), compression
+
+
+def export_jobs(
+    store: JobStore,
+    out: IO[str],
+    fmt: str = "csv",
+    searches: Iterable[SavedSearch] = (),
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    columns: Sequence[str] = JOB_COLUMNS,
+    hydrator=None,
+    **filters: Any,
+) -> int:
+    """
+    Write the stored jobs matching ``filters`` (see ``JobStore.query``) to a text stream.
+
+    Each chunk of ``chunk_size`` rows is written before the next one is read.
+    Jobs whose search isn't in ``searches`` get empty search columns. In
+    JSONL the spec is a nested object (or null); in CSV it is a JSON string.
+
+    With a ``job_hydration.JobHydrator``, each chunk's job details are
+    fetched (or taken from its cache) and added as ``DETAIL_FIELDS`` columns;
+    this costs a request per uncached job, so it is opt-in. A job whose
+    details can't be fetched is still written, with those columns empty; the
+    hydrator's ``stats()["failed"]`` counts them.
+
+    Returns the number of rows written.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    columns = tuple(columns)
+    selected = columns if "search_fingerprint" in columns else (*columns, "search_fingerprint")
+    fingerprint_index = selected.index("search_fingerprint")
+    batches = store.iter_batches(chunk_size, selected, **filters)
+    if hydrator is not None:
+        batches = _hydrated_batches(batches, hydrator, columns, fingerprint_index)
+        columns = (*columns, *(field for field in DETAIL_FIELDS if field not in columns))
+        fingerprint_index = len(columns)
+    width = len(columns)
+    # Search fingerprint -> values of the search columns
+    if fmt == "csv":
+        lookup = {search.fingerprint: (search.name, json.dumps(search.spec, ensure_ascii=False)) for search in searches}
+    else:
+        lookup = {search.fingerprint: (search.name, search.spec) for search in searches}
+    unknown = ("", "") if fmt == "csv" else ("", None)
+    written = 0
+
+    if fmt == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        writer.writerow((*columns, *SEARCH_COLUMNS))
+        for batch in batches:
+            writer.writerows((*row[:width], *lookup.get(row[fingerprint_index], unknown)) for row in batch)
+            written += len(batch)
+        return written
+
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    for batch in batches:
+        lines = []
+        for row in batch:
+            record = dict(zip(columns, row))
+            record["search_name"], record["search_spec"] = lookup.get(row[fingerprint_index], unknown)
+            lines.append(encode(record))
+        lines.append("")
+        out.write("\n".join(lines))
+        written += len(batch)
+    return written
+
+
+def _hydrated_batches(
+    batches: Iterable[list], hydrator, columns: tuple[str, ...], fingerprint_index: int
+) -> Iterator[list[tuple]]:
+    """Rows extended with their job details: ``(*columns, *missing detail fields, search_fingerprint)``."""
+    job_id_index = columns.index("job_id")
+    filled = [(index, column) for index, column in enumerate(columns) if column in DETAIL_FIELDS]
+    extra = [field for field in DETAIL_FIELDS if field not in columns]
+    for batch in batches:
+        details = hydrator.get_many(row[job_id_index] for row in batch)
+        rows = []
+        for row in batch:
+            detail = details[row[job_id_index]]
+            if isinstance(detail, Exception):
+                detail = {}  # counted by the hydrator
+            values = list(row[: len(columns)])
+            for index, column in filled:
+                values[index] = values[index] or detail.get(column, "")
+            rows.append((*values, *(detail.get(field, "") for field in extra), row[fingerprint_index]))
+        yield rows
+
+
+def export_to_path(
+    store: JobStore,
+    path: str,
+    fmt: Optional[str] = None,
+    searches: Iterable[SavedSearch] = (),
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    hydrator=None,
+    **filters: Any,
+) -> int:
+    """
+    Export to a file, compressed according to its suffix; returns the number of rows.
+
+    The file is written as ``<path>.tmp`` and renamed when complete.
+    """
+    inferred, compression = output_format(path)
+    opener = COMPRESSORS.get(compression, open)
+    temporary = f"{path}.tmp"
+    try:
+        with opener(temporary, "wt", encoding="utf-8", newline="") as out:
+            rows = export_jobs(store, out, fmt or inferred, searches, chunk_size, hydrator=hydrator, **filters)
+        os.replace(temporary, path)
+    except BaseException:
+        Path(temporary).unlink(missing_ok=True)
+        raise
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export stored jobs to CSV or JSONL (optionally .gz/.bz2/.xz)")
+    parser.add_argument("--output", "-o", required=True, help="Output file, format from its suffix ('-' for stdout)")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help=f"Job store path (default: {DEFAULT_STORE_PATH})")
+    parser.add_argument("--format", choices=FORMATS, help="Output format (default: from the output name, else csv)")
+    parser.add_argument("--searches", "-f", help="Saved searches JSON, to include each job's search name and spec")
+    parser.add_argument(
+        "--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help=f"Rows read per chunk (default: {DEFAULT_CHUNK_SIZE})"
+    )
+    parser.add_argument("--days", type=float, help="Only jobs posted in the last N days")
+    parser.add_argument("--company", help="Only jobs whose company contains this text")
+    parser.add_argument(
+        "--details", action="store_true", help="Fetch each job's page for its description and criteria (one request per job)"
+    )
+    parser.add_argument("--max-attempts", type=int, default=3, help="Attempts per job page with --details (default: 3)")
+    parser.add_argument("--backoff", type=float, default=2.0, help="Backoff ceiling for the first retry in seconds")
+    parser.add_argument("--retry-budget", type=float, default=0.2, help="Retries allowed per job page fetched (default: 0.2)")
+    args = parser.parse_args()
+
+    try:
+        searches = load_saved_searches(args.searches) if args.searches else []
+    except (OSError, ValueError) as e:
+        print(f"Error loading saved searches: {e}", file=sys.stderr)
+        sys.exit(1)
+    filters = {"company": args.company}
+    if args.days is not None:
+        filters["posted_since"] = time.time() - args.days * 86400
+
+    hydrator = None
+    if args.details:
+        # Same backoff and retry budget as poller.py, so a throttled export backs off instead of blanking rows
+        retry = RetryPolicy(args.max_attempts, base_delay=args.backoff, budget=RetryBudget(args.retry_budget))
+        hydrator = JobHydrator(retry=retry)
+    store = JobStore(args.store)
+    started = time.perf_counter()
+    if args.output == "-":
+        rows = export_jobs(store, sys.stdout, args.format or "csv", searches, args.chunk_size, hydrator=hydrator, **filters)
+    else:
+        rows = export_to_path(store, args.output, args.format, searches, args.chunk_size, hydrator, **filters)
+    elapsed = time.perf_counter() - started
+    rate = rows / max(elapsed, 1e-9)
+    missing = f", {hydrator.stats()['failed']} without details (fetch failed)" if hydrator is not None else ""
+    print(f"[EXPORT] {rows} jobs in {elapsed:.1f}s ({rate:,.0f} rows/s){missing} -> {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
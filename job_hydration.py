@@ -0,0 +1,320 @@
+"""
+Lazy hydration of job details, keyed by LinkedIn job ID (``currentJobId``).
+
+Results pages only carry a job's title, company, location and link. The
+description and criteria (seniority, employment type, ...) are on the job's
+own page, and fetching that page for every posting up front would multiply
+the request volume. ``JobHydrator`` fetches a job's details the first time
+someone asks for them:
+
+* results are kept in a bounded LRU cache for ``ttl`` seconds,
+* concurrent requests for the same job ID share one fetch (the first caller
+  fetches, the others wait for its result),
+* ``get_many`` deduplicates IDs and fetches the misses on a few threads,
+* with a ``retry_policy.RetryPolicy``, transient failures (429, 5xx, network
+  errors) are retried with backoff, honouring ``Retry-After``.
+
+``LazyJob`` wraps a stored job so that reading a detail field (``job["description"]``)
+hydrates it on first access and reading the stored fields costs nothing.
+
+Example:
+    hydrator = JobHydrator()
+    job = LazyJob(store.get(4185657072), hydrator)
+    job["title"]        # stored field, no request
+    job["seniority"]    # fetches https://www.linkedin.com/jobs/view/4185657072/ once
+"""
+
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import Any, Optional, Union
+
+from fetch_pipeline import DEFAULT_TIMEOUT, FetchError, Transport, urllib_transport
+from linkedin_url_builder import LinkedInURLBuilder
+
+DETAIL_URL = "https://www.linkedin.com/jobs/view/{job_id}/"
+
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_TTL = 6 * 3600.0
+
+# Fields found on a job's own page
+DETAIL_FIELDS = ("description", "seniority", "employment_type", "job_function", "industries", "applicants")
+
+# Tags without an end tag
+_VOID_TAGS = {"area", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "wbr"}
+
+# Tags that start a new line of description text
+_BREAK_TAGS = {"br", "p", "li", "ul", "ol", "div"}
+
+
+def job_id_from_url(url: str) -> Optional[int]:
+    """
+    The job a LinkedIn URL points at: its ``currentJobId`` or a ``/jobs/view/`` path.
+
+    Example:
+        >>> job_id_from_url("https://www.linkedin.com/jobs/search/?keywords=Python&currentJobId=4185657072")
+        4185657072
+        >>> job_id_from_url("https://www.linkedin.com/jobs/view/senior-python-developer-at-acme-4185657072?trk=x")
+        4185657072
+    """
+    current = LinkedInURLBuilder.from_url(url).params.get("currentJobId")
+    if current and current.isdigit():
+        return int(current)
+    path = urllib.parse.urlsplit(url).path.rstrip("/")
+    if "/jobs/view/" in path:
+        last = path.rsplit("/", 1)[1].rsplit("-", 1)[-1]
+        if last.isdigit():
+            return int(last)
+    return None
+
+
+class JobDetailParser(HTMLParser):
+    """Collect the description and criteria from a LinkedIn job page."""
+
+    DESCRIPTION_CLASS = "show-more-less-html__markup"
+    # Criteria subheader text -> detail field
+    CRITERIA = {
+        "seniority level": "seniority",
+        "employment type": "employment_type",
+        "job function": "job_function",
+        "industries": "industries",
+    }
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.detail: dict[str, str] = dict.fromkeys(DETAIL_FIELDS, "")
+        self._description_depth = 0
+        self._description: list[str] = []
+        self._field: Optional[str] = None
+        self._field_tag = ""
+        self._text: list[str] = []
+        self._criterion: Optional[str] = None
+
+    def handle_starttag(self, tag, attrs):
+        if self._description_depth:
+            if tag not in _VOID_TAGS:
+                self._description_depth += 1
+            if tag in _BREAK_TAGS:
+                self._description.append("\n")
+            return
+        classes = (dict(attrs).get("class") or "").split()
+        if self.DESCRIPTION_CLASS in classes and not self.detail["description"]:
+            self._description_depth = 1
+        elif self._field is None:
+            if "description__job-criteria-subheader" in classes:
+                self._field = "_criterion"
+            elif "description__job-criteria-text" in classes:
+                self._field = "_criterion_value"
+            elif "num-applicants__caption" in classes:
+                self._field = "applicants"
+            if self._field is not None:
+                self._field_tag, self._text = tag, []
+
+    def handle_startendtag(self, tag, attrs):
+        # A self-closing tag (<div/>) gets no end tag, so it must not open a level or a field
+        if self._description_depth and tag in _BREAK_TAGS:
+            self._description.append("\n")
+
+    def handle_data(self, data):
+        if self._description_depth:
+            self._description.append(data)
+        elif self._field is not None:
+            self._text.append(data)
+
+    def handle_endtag(self, tag):
+        if self._description_depth:
+            self._description_depth -= 1
+            if not self._description_depth:
+                lines = (" ".join(line.split()) for line in "".join(self._description).splitlines())
+                self.detail["description"] = "\n".join(line for line in lines if line)
+            return
+        if self._field is None or tag != self._field_tag:
+            return
+        text = " ".join("".join(self._text).split())
+        if self._field == "_criterion":
+            self._criterion = self.CRITERIA.get(text.lower())
+        elif self._field == "_criterion_value":
+            if self._criterion:
+                self.detail[self._criterion] = text
+            self._criterion = None
+        else:
+            self.detail[self._field] = text
+        self._field = None
+
+
+def parse_job_detail(page: bytes) -> dict[str, str]:
+    """Parse a job page into ``DETAIL_FIELDS`` (empty strings for anything missing)."""
+    parser = JobDetailParser()
+    parser.feed(page.decode("utf-8", errors="replace"))
+    parser.close()
+    return parser.detail
+
+
+class JobHydrator:
+    """
+    Fetch job details on demand, with an LRU+TTL cache and one fetch per job ID at a time.
+
+    Args:
+        transport: ``transport(url, timeout) -> bytes`` (see ``fetch_pipeline``).
+        max_entries: Job details kept in memory.
+        ttl: Seconds before cached details are fetched again.
+        timeout: Per-request timeout in seconds.
+        workers: Threads ``get_many`` fetches with.
+        retry: Optional ``retry_policy.RetryPolicy`` for failed fetches.
+
+    Failed fetches (after any retries) raise ``FetchError`` to every caller
+    waiting for them, are counted as ``failed`` and are not cached.
+    """
+
+    def __init__(
+        self,
+        transport: Transport = urllib_transport,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        timeout: float = DEFAULT_TIMEOUT,
+        workers: int = 4,
+        retry=None,
+    ):
+        self.transport = transport
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.timeout = timeout
+        self.workers = workers
+        self.retry = retry
+        self.clock = time.monotonic
+        self.sleep = time.sleep
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.failed = 0
+        self._entries: OrderedDict[int, tuple[float, dict[str, str]]] = OrderedDict()  # job ID -> (expiry, details)
+        self._inflight: dict[int, Future] = {}
+        self._lock = threading.Lock()
+
+    def get(self, job_id: Union[int, str]) -> dict[str, str]:
+        """Details of one job, fetched only if they aren't cached (or are expired)."""
+        job_id = int(job_id)
+        with self._lock:
+            entry = self._entries.get(job_id)
+            if entry is not None and entry[0] > self.clock():
+                self.hits += 1
+                self._entries.move_to_end(job_id)
+                return entry[1]
+            future = self._inflight.get(job_id)
+            owner = future is None
+            if owner:
+                self.misses += 1
+                future = self._inflight[job_id] = Future()
+            else:
+                self.coalesced += 1
+        if not owner:
+            return future.result()
+
+        # Fetch outside the lock; callers asking for the same job meanwhile wait on the future
+        try:
+            detail = self._fetch(job_id)
+        except BaseException as e:
+            with self._lock:
+                del self._inflight[job_id]
+                self.failed += 1
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._inflight[job_id]
+            self._entries[job_id] = (self.clock() + self.ttl, detail)
+            self._entries.move_to_end(job_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        future.set_result(detail)
+        return detail
+
+    def _fetch(self, job_id: int) -> dict[str, str]:
+        url = DETAIL_URL.format(job_id=job_id)
+        if self.retry is not None and self.retry.budget is not None:
+            self.retry.budget.record_attempt()
+        attempt = 1
+        while True:
+            try:
+                return parse_job_detail(self.transport(url, self.timeout))
+            except FetchError as e:
+                if self.retry is None or not self.retry.should_retry(e, attempt):
+                    raise
+                self.sleep(self.retry.delay(attempt, e.retry_after))
+                attempt += 1
+
+    def get_many(self, job_ids: Iterable[Union[int, str]]) -> dict[int, Union[dict[str, str], Exception]]:
+        """
+        ``{job ID: details}`` for many jobs, each distinct ID fetched at most once.
+
+        A job whose fetch failed maps to the exception instead.
+        """
+        unique = list(dict.fromkeys(int(job_id) for job_id in job_ids))
+
+        def fetch(job_id: int) -> Union[dict[str, str], Exception]:
+            try:
+                return self.get(job_id)
+            except Exception as e:
+                return e
+
+        if len(unique) <= 1 or self.workers <= 1:
+            return {job_id: fetch(job_id) for job_id in unique}
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(unique)), thread_name_prefix="hydrate") as pool:
+            return dict(zip(unique, pool.map(fetch, unique)))
+
+    def invalidate(self, job_id: Optional[Union[int, str]] = None) -> None:
+        """Forget one job's cached details, or all of them."""
+        with self._lock:
+            if job_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(int(job_id), None)
+
+    def stats(self) -> dict[str, int]:
+        """Hit/miss/coalesced/failed counters and the current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "failed": self.failed,
+                "size": len(self._entries),
+            }
+
+
+class LazyJob(Mapping):
+    """
+    A stored job whose ``DETAIL_FIELDS`` are hydrated on first access.
+
+    Stored fields that are already filled (e.g. a description the store has)
+    are returned as-is without a request.
+    """
+
+    def __init__(self, job: Mapping[str, Any], hydrator: JobHydrator):
+        self._job = job
+        self._hydrator = hydrator
+        self._detail: Optional[dict[str, str]] = None
+
+    @property
+    def hydrated(self) -> bool:
+        return self._detail is not None
+
+    def __getitem__(self, key: str) -> Any:
+        if key in DETAIL_FIELDS and not self._job.get(key):
+            if self._detail is None:
+                self._detail = self._hydrator.get(self._job["job_id"])
+            return self._detail[key]
+        return self._job[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._job
+        yield from (field for field in DETAIL_FIELDS if field not in self._job)
+
+    def __len__(self) -> int:
+        return len(self._job) + sum(1 for field in DETAIL_FIELDS if field not in self._job)
+
+    def __repr__(self) -> str:
+        return f"LazyJob({self._job.get('job_id')!r}, hydrated={self.hydrated})"
@@ -0,0 +1,548 @@
+#!/usr/bin/env python3
+"""
+Incremental inverted index over stored job postings.
+
+Answers local queries such as ``kotlin ankara`` or ``"data engineer" AND
+(remote OR hybrid) -intern`` without building another LinkedIn URL.
+
+Each posting's title, company, location and description are tokenized.
+Documents get dense numbers in insertion order, so every postings list only
+ever grows at the end and is kept delta-encoded as varints in a
+``bytearray``. Single terms store document gaps only. Phrases are answered
+from biword postings (pairs of adjacent tokens within one field), which also
+store the positions of each pair. A two-word phrase is therefore a single
+lookup, and longer phrases are verified with the pair positions. Decoded
+document sets of the most recently queried terms are cached, so repeated
+queries over a million postings are set operations on cached sets.
+
+Replaced and removed postings are only hidden until ``compact`` renumbers
+the documents without them, which ``add_jobs`` does once more than
+``compact_ratio`` of the documents are dead. ``load_index`` keeps the index
+in a file next to the store (``jobs.db.index``) and only rebuilds it when
+the store has changed since it was saved, so the command line doesn't
+re-tokenize every posting on each run.
+
+Query syntax:
+    kotlin ankara              both terms (AND is implicit)
+    kotlin OR scala            either term
+    -intern / NOT intern       exclude
+    "site reliability"         phrase (consecutive tokens)
+    (remote OR hybrid) python  grouping
+
+Command line (loads or rebuilds the index of the job store, then runs one query):
+    python job_index.py 'kotlin ankara' --days 7
+    python job_index.py '"data engineer" (remote OR hybrid) -intern' --limit 20
+    python job_index.py 'kotlin' --rebuild  # ignore the saved index
+
+Example:
+    >>> index = JobIndex()
+    >>> index.add_job({"job_id": 1, "title": "Kotlin Android Developer", "location": "Ankara, Turkey"})
+    >>> index.search('kotlin "android developer" ankara')
+    [1]
+"""
+
+import argparse
+import heapq
+import os
+import pickle
+import re
+import time
+import unicodedata
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from itertools import accumulate, count
+from operator import add
+from typing import Any, Optional, Union
+
+from job_store import DEFAULT_STORE_PATH, JobStore
+from resolver_cache import LookupCache
+
+INDEXED_FIELDS = ("title", "company", "location", "description")
+
+# Position gap between fields (biwords never span fields; this keeps positions distinct)
+FIELD_GAP = 1000
+
+# Fraction of dead (replaced or removed) documents at which add_jobs compacts the index
+DEFAULT_COMPACT_RATIO = 0.25
+
+# Bumped whenever the pickled layout of a saved index changes
+INDEX_FORMAT = 1
+
+_TOKEN_RE = re.compile(r"[^\W_]+[+#]*")
+_QUERY_RE = re.compile(r'"([^"]*)"|(\()|(\))|(-)(?=\S)|([^\s()"]+)')
+
+# Letters NFKD doesn't decompose
+_FOLD = str.maketrans({"ı": "i", "ß": "ss", "ø": "o", "ł": "l"})
+
+Query = Union[tuple, str]
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Lower-cased, accent-folded word tokens; keeps ``c++``/``c#`` style suffixes.
+
+    Folding makes ``İstanbul``, ``Istanbul`` and ``istanbul`` (or ``Çankaya``
+    and ``Cankaya``) the same token.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.casefold().translate(_FOLD))
+    return _TOKEN_RE.findall("".join(char for char in decomposed if not unicodedata.combining(char)))
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varints(buffer: bytearray) -> Iterator[int]:
+    value = shift = 0
+    for byte in buffer:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = shift = 0
+
+
+def _decode_docs(buffer: bytearray) -> Iterator[int]:
+    """Documents from varint gaps (``doc - previous - 1``): document i is the sum of the first i + 1 gaps, plus i."""
+    # When every gap fits in one byte (typical for frequent terms) the bytes are the gaps,
+    # and the documents are computed without a Python-level loop
+    gaps = buffer if buffer.isascii() else _read_varints(buffer)
+    return map(add, accumulate(gaps), count())
+
+
+class Postings:
+    """Delta-encoded postings for one term, optionally with positions."""
+
+    __slots__ = ("docs", "positions", "last_doc", "count")
+
+    def __init__(self, with_positions: bool = False):
+        self.docs = bytearray()  # varint document gaps
+        # per document: varint frequency, then varint position gaps
+        self.positions = bytearray() if with_positions else None
+        self.last_doc = -1
+        self.count = 0
+
+    def add(self, doc: int, positions: Optional[list[int]] = None) -> None:
+        """Append ``doc`` (must be greater than every document added before)."""
+        _write_varint(self.docs, doc - self.last_doc - 1)
+        if self.positions is not None:
+            _write_varint(self.positions, len(positions))
+            previous = 0
+            for position in positions:
+                _write_varint(self.positions, position - previous)
+                previous = position
+        self.last_doc = doc
+        self.count += 1
+
+    def iter_docs(self) -> Iterator[int]:
+        return _decode_docs(self.docs)
+
+    def iter_positions(self) -> Iterator[tuple[int, list[int]]]:
+        """Yield ``(doc, positions)`` for every document containing the term."""
+        values = _read_varints(self.positions)
+        for doc in self.iter_docs():
+            position = 0
+            positions = []
+            for _ in range(next(values)):
+                position += next(values)
+                positions.append(position)
+            yield doc, positions
+
+    def memory_bytes(self) -> int:
+        return len(self.docs) + (len(self.positions) if self.positions is not None else 0)
+
+
+def parse_query(query: str) -> Query:
+    """
+    Parse a query into a tree of ``("and", ...)``, ``("or", ...)``, ``("not", q)``,
+    ``("phrase", tokens)`` and plain term strings.
+    """
+    tokens = []
+    for phrase, open_paren, close_paren, minus, word in _QUERY_RE.findall(query):
+        if open_paren or close_paren:
+            tokens.append(open_paren or close_paren)
+        elif minus:
+            tokens.append("NOT")
+        elif word in ("AND", "OR", "NOT"):
+            tokens.append(word)
+        elif word:
+            tokens.extend(("TERM", term) for term in tokenize(word))
+        else:
+            terms = tokenize(phrase)
+            if len(terms) == 1:
+                tokens.append(("TERM", terms[0]))
+            elif terms:
+                tokens.append(("PHRASE", tuple(terms)))
+    parser = _QueryParser(tokens)
+    tree = parser.parse_or()
+    if parser.position != len(tokens):
+        raise ValueError(f"Unexpected {tokens[parser.position]!r} in query: {query}")
+    return tree
+
+
+class _QueryParser:
+    def __init__(self, tokens: list):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def parse_or(self) -> Query:
+        operands = [self.parse_and()]
+        while self.peek() == "OR":
+            self.position += 1
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else ("or", *operands)
+
+    def parse_and(self) -> Query:
+        operands = []
+        while self.peek() not in (None, "OR", ")"):
+            if self.peek() == "AND":
+                self.position += 1
+                continue
+            operands.append(self.parse_unary())
+        if not operands:
+            raise ValueError("Empty query (or empty group)")
+        return operands[0] if len(operands) == 1 else ("and", *operands)
+
+    def parse_unary(self) -> Query:
+        token = self.peek()
+        self.position += 1
+        if token == "NOT":
+            return ("not", self.parse_unary())
+        if token == "(":
+            inner = self.parse_or()
+            if self.peek() != ")":
+                raise ValueError("Unbalanced parentheses in query")
+            self.position += 1
+            return inner
+        if isinstance(token, tuple):
+            return token[1] if token[0] == "TERM" else ("phrase", token[1])
+        raise ValueError(f"Unexpected {token!r} in query")
+
+
+class JobIndex:
+    """
+    Positional inverted index over job postings, updated incrementally.
+
+    Re-adding a job ID replaces the earlier version of the posting.
+
+    Args:
+        fields: Job fields to index.
+        cache_terms: Decoded postings kept for repeated queries.
+        compact_ratio: Fraction of dead documents at which ``add_jobs`` compacts (None: never).
+    """
+
+    def __init__(
+        self,
+        fields: tuple[str, ...] = INDEXED_FIELDS,
+        cache_terms: int = 256,
+        compact_ratio: Optional[float] = DEFAULT_COMPACT_RATIO,
+    ):
+        self.fields = fields
+        self.compact_ratio = compact_ratio
+        self.postings: dict[str, Postings] = {}
+        self.biwords: dict[str, Postings] = {}  # "first second" -> postings with positions
+        self.doc_job_ids = array("q")
+        self.doc_posted_at = array("q")
+        self._doc_by_job: dict[int, int] = {}
+        self._deleted: set[int] = set()
+        self._decoded = LookupCache(max_entries=cache_terms)
+
+    def __len__(self) -> int:
+        return len(self._doc_by_job)
+
+    def __contains__(self, job_id: int) -> bool:
+        return job_id in self._doc_by_job
+
+    @classmethod
+    def from_store(cls, store, **filters: Any) -> "JobIndex":
+        """Index every posting in a ``JobStore`` (see ``JobStore.query`` for filters)."""
+        index = cls()
+        index.add_jobs(store.iter_jobs(**filters))
+        return index
+
+    def add_job(self, job: Mapping[str, Any]) -> None:
+        """Index one posting (a job dict as stored by ``JobStore``)."""
+        job_id = int(job["job_id"])
+        self.remove(job_id)
+        doc = len(self.doc_job_ids)
+        self.doc_job_ids.append(job_id)
+        self.doc_posted_at.append(int(job.get("posted_at") or 0))
+        self._doc_by_job[job_id] = doc
+
+        terms: set[str] = set()
+        biword_positions: dict[str, list[int]] = {}
+        offset = 0
+        for field in self.fields:
+            tokens = tokenize(str(job.get(field) or ""))
+            terms.update(tokens)
+            for position in range(len(tokens) - 1):
+                biword_positions.setdefault(f"{tokens[position]} {tokens[position + 1]}", []).append(offset + position)
+            offset += len(tokens) + FIELD_GAP
+        for term in terms:
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = Postings()
+            postings.add(doc)
+        for biword, positions in biword_positions.items():
+            postings = self.biwords.get(biword)
+            if postings is None:
+                postings = self.biwords[biword] = Postings(with_positions=True)
+            postings.add(doc, positions)
+
+    def add_jobs(self, jobs: Iterable[Mapping[str, Any]]) -> int:
+        """Index many postings, then compact if too many documents are dead; returns how many were added."""
+        added = 0
+        for job in jobs:
+            self.add_job(job)
+            added += 1
+        if self.compact_ratio is not None and len(self._deleted) > self.compact_ratio * len(self.doc_job_ids):
+            self.compact()
+        return added
+
+    def remove(self, job_id: int) -> bool:
+        """Drop a posting from query results; returns whether it was indexed."""
+        doc = self._doc_by_job.pop(job_id, None)
+        if doc is None:
+            return False
+        self._deleted.add(doc)
+        return True
+
+    def compact(self) -> int:
+        """
+        Rewrite the postings without replaced or removed documents; returns how many were dropped.
+
+        Live documents are renumbered in order, so every postings list stays
+        sorted and delta-encoded; terms left without documents are dropped.
+        """
+        dropped = len(self._deleted)
+        if not dropped:
+            return 0
+        # Old document number -> new one (-1 for dead documents)
+        renumbered = array("q", [-1]) * len(self.doc_job_ids)
+        job_ids, posted_at = array("q"), array("q")
+        for doc, job_id in enumerate(self.doc_job_ids):
+            if doc not in self._deleted:
+                renumbered[doc] = len(job_ids)
+                job_ids.append(job_id)
+                posted_at.append(self.doc_posted_at[doc])
+
+        postings_by_term: dict[str, Postings] = {}
+        for term, postings in self.postings.items():
+            compacted = Postings()
+            for doc in postings.iter_docs():
+                if renumbered[doc] >= 0:
+                    compacted.add(renumbered[doc])
+            if compacted.count:
+                postings_by_term[term] = compacted
+        biwords: dict[str, Postings] = {}
+        for biword, postings in self.biwords.items():
+            compacted = Postings(with_positions=True)
+            for doc, positions in postings.iter_positions():
+                if renumbered[doc] >= 0:
+                    compacted.add(renumbered[doc], positions)
+            if compacted.count:
+                biwords[biword] = compacted
+
+        self.postings, self.biwords = postings_by_term, biwords
+        self.doc_job_ids, self.doc_posted_at = job_ids, posted_at
+        self._doc_by_job = {job_id: doc for doc, job_id in enumerate(job_ids)}
+        self._deleted = set()
+        # Cached sets hold old document numbers
+        self._decoded.clear(reset_stats=False)
+        return dropped
+
+    def _term_docs(self, term: str, postings_by_term: Optional[dict[str, Postings]] = None) -> frozenset:
+        postings = (self.postings if postings_by_term is None else postings_by_term).get(term)
+        if postings is None:
+            return frozenset()
+        # Keyed by the postings length so cached sets go stale as soon as the term gets new documents
+        return self._decoded.get_or_compute((term, postings.count), lambda: frozenset(postings.iter_docs()))
+
+    def _phrase_docs(self, terms: tuple[str, ...]) -> Union[set[int], frozenset]:
+        pairs = [f"{first} {second}" for first, second in zip(terms, terms[1:])]
+        pair_docs = sorted((self._term_docs(pair, self.biwords) for pair in pairs), key=len)
+        if len(pairs) == 1:
+            return pair_docs[0]
+        candidates = set(pair_docs[0]).intersection(*pair_docs[1:])
+        if not candidates:
+            return candidates
+        # Longer phrases: pair i must start i positions after the first pair
+        pair_positions = [
+            {doc: set(positions) for doc, positions in self.biwords[pair].iter_positions() if doc in candidates}
+            for pair in pairs
+        ]
+        return {
+            doc
+            for doc in candidates
+            if any(all(start + i in pair_positions[i][doc] for i in range(1, len(pairs))) for start in pair_positions[0][doc])
+        }
+
+    def _all_docs(self) -> set[int]:
+        return set(self._doc_by_job.values())
+
+    def _evaluate(self, node: Query) -> Union[set[int], frozenset]:
+        # Results may be cached frozensets: never mutate them, only build new sets from them
+        if isinstance(node, str):
+            return self._term_docs(node)
+        kind = node[0]
+        if kind == "phrase":
+            return self._phrase_docs(node[1])
+        if kind == "or":
+            return set().union(*(self._evaluate(child) for child in node[1:]))
+        if kind == "not":
+            return self._all_docs() - self._evaluate(node[1])
+        # "and": intersect the positive operands (smallest first), then subtract the negated ones
+        positives = [self._evaluate(child) for child in node[1:] if not (isinstance(child, tuple) and child[0] == "not")]
+        negatives = [self._evaluate(child[1]) for child in node[1:] if isinstance(child, tuple) and child[0] == "not"]
+        positives.sort(key=len)
+        result = set(positives[0]) if positives else self._all_docs()
+        for docs in positives[1:]:
+            result &= docs
+            if not result:
+                break
+        for docs in negatives:
+            result -= docs
+        return result
+
+    def search(self, query: str, posted_since: Optional[int] = None, limit: Optional[int] = None) -> list[int]:
+        """
+        Job IDs matching ``query``, newest first.
+
+        Args:
+            query: Query string (see module docstring).
+            posted_since: Only postings with ``posted_at`` at or after this epoch second.
+            limit: Maximum number of job IDs to return.
+        """
+        docs = self._evaluate(parse_query(query)) - self._deleted
+        posted_at = self.doc_posted_at
+        if posted_since is not None:
+            docs = [doc for doc in docs if posted_at[doc] >= posted_since]
+
+        def newest_first(doc: int) -> tuple[int, int]:
+            return posted_at[doc], doc
+
+        if limit is not None:
+            ordered = heapq.nlargest(limit, docs, key=newest_first)
+        else:
+            ordered = sorted(docs, key=newest_first, reverse=True)
+        return [self.doc_job_ids[doc] for doc in ordered]
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the encoded postings and per-document arrays (excluding the term dicts)."""
+        postings = sum(postings.memory_bytes() for postings in (*self.postings.values(), *self.biwords.values()))
+        return postings + self.doc_job_ids.itemsize * (len(self.doc_job_ids) + len(self.doc_posted_at))
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The decoded-postings cache holds a lock and is rebuilt on demand
+        state = self.__dict__.copy()
+        state["_decoded"] = self._decoded.max_entries
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._decoded = LookupCache(max_entries=state["_decoded"])
+
+    def save(self, path: str, signature: Any = None) -> None:
+        """
+        Write the index (compacted) to ``path``, tagged with ``signature``.
+
+        The file is a pickle: only load indexes you saved yourself.
+        """
+        self.compact()
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as out:
+            pickle.dump({"format": INDEX_FORMAT, "signature": signature, "index": self}, out, pickle.HIGHEST_PROTOCOL)
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str, signature: Any = None) -> Optional["JobIndex"]:
+        """The index saved at ``path``, or None if it is missing, unreadable or saved under another signature."""
+        try:
+            with open(path, "rb") as saved:
+                data = pickle.load(saved)
+        except (OSError, pickle.PickleError, EOFError, AttributeError, ImportError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("format") != INDEX_FORMAT or data.get("signature") != signature:
+            return None
+        return data["index"] if isinstance(data["index"], cls) else None
+
+
+def store_signature(path: str) -> Optional[tuple]:
+    """
+    Size and modification time of a store's database and WAL files, or None for ``:memory:``.
+
+    Any committed write changes one of them, so an index saved under the
+    same signature is still up to date. An empty WAL file (a connection is
+    open, nothing written since the last checkpoint) counts as missing.
+    """
+    if path == ":memory:":
+        return None
+    signature = []
+    for name in (path, f"{path}-wal"):
+        try:
+            stat = os.stat(name)
+        except FileNotFoundError:
+            signature.append(None)
+        else:
+            signature.append((stat.st_size, stat.st_mtime_ns) if stat.st_size else None)
+    return tuple(signature)
+
+
+def load_index(store: JobStore, path: Optional[str] = None, rebuild: bool = False) -> tuple[JobIndex, bool]:
+    """
+    ``(index, rebuilt)``: the saved index of ``store`` if the store hasn't changed since, else a fresh one.
+
+    A rebuilt index is saved to ``path`` (default: ``<store path>.index``)
+    for the next run; an in-memory store is always indexed from scratch.
+    """
+    signature = store_signature(store.path)
+    if signature is None:
+        return JobIndex.from_store(store), True
+    path = path or f"{store.path}.index"
+    index = None if rebuild else JobIndex.load(path, signature)
+    if index is not None:
+        return index, False
+    index = JobIndex.from_store(store)
+    index.save(path, signature)
+    return index, True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query stored jobs with the local full-text index")
+    parser.add_argument("query", help="Query, e.g. 'kotlin ankara' or '\"data engineer\" -intern'")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help=f"Job store path (default: {DEFAULT_STORE_PATH})")
+    parser.add_argument("--index", help="Saved index file (default: <store>.index)")
+    parser.add_argument("--rebuild", action="store_true", help="Re-index the store even if the saved index is current")
+    parser.add_argument("--days", type=float, help="Only jobs posted within this many days")
+    parser.add_argument("--limit", type=int, default=50, help="Maximum number of results (default: 50)")
+    args = parser.parse_args()
+
+    store = JobStore(args.store)
+    started = time.perf_counter()
+    index, rebuilt = load_index(store, args.index, args.rebuild)
+    indexed = time.perf_counter()
+    posted_since = int(time.time() - args.days * 86400) if args.days else None
+    try:
+        job_ids = index.search(args.query, posted_since=posted_since, limit=args.limit)
+    except ValueError as e:
+        parser.error(str(e))
+    searched = time.perf_counter()
+
+    for job_id in job_ids:
+        job = store.get(job_id)
+        print(f"{job['title']} | {job['company']} | {job['location']} | {job['url']}")
+    print(
+        f"[INDEX] {len(job_ids)} results from {len(index)} jobs "
+        f"({'indexed' if rebuilt else 'loaded'} in {indexed - started:.2f}s, query {1000 * (searched - indexed):.1f}ms)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+SQLite-backed store for fetched job postings.
+
+Queries are filtered, sorted and paged inside SQLite so callers (the web UI,
+exports) only ever hold one page of rows in memory. Pages are addressed by
+keyset, the ``(sort value, job_id)`` of the last row shown, so a deep page
+costs the same as the first one.
+"""
+
+import os
+import sqlite3
+import threading
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any, Optional
+
+DEFAULT_STORE_PATH = os.environ.get("LINKEDIN_JOB_STORE", "jobs.db")
+
+# Seconds a write waits for another process's transaction (e.g. sharded pollers sharing a store)
+DEFAULT_BUSY_TIMEOUT = 30.0
+
+JOB_COLUMNS = (
+    "job_id",
+    "title",
+    "company",
+    "location",
+    "description",
+    "posted_at",
+    "url",
+    "search_fingerprint",
+    "experience",
+    "job_type",
+    "workplace",
+    "fetched_at",
+)
+
+# Columns the UI may sort by (anything else is rejected to keep ORDER BY safe)
+SORT_COLUMNS = ("posted_at", "title", "company", "location", "job_id")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    company TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    posted_at INTEGER NOT NULL DEFAULT 0,
+    url TEXT NOT NULL DEFAULT '',
+    search_fingerprint TEXT NOT NULL DEFAULT '',
+    experience TEXT NOT NULL DEFAULT '',
+    job_type TEXT NOT NULL DEFAULT '',
+    workplace TEXT NOT NULL DEFAULT '',
+    fetched_at INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_posted_at ON jobs (posted_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs (company);
+CREATE INDEX IF NOT EXISTS idx_jobs_search ON jobs (search_fingerprint);
+"""
+
+
+class JobStore:
+    """
+    Persistent job postings keyed by LinkedIn job ID.
+
+    The database is opened in WAL mode, which needs a local disk (not a
+    network filesystem). Several processes may share it: a write waits up
+    to ``busy_timeout`` seconds for another one to finish.
+
+    Example:
+        >>> store = JobStore(":memory:")
+        >>> store.add_jobs([{"job_id": 4185657072, "title": "Python Developer", "company": "Acme"}])
+        1
+        >>> store.query(text="python")[0]["company"]
+        'Acme'
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH, busy_timeout: float = DEFAULT_BUSY_TIMEOUT):
+        self.path = path
+        # One connection shared by all threads (Streamlit sessions), serialized by a lock
+        self._conn = sqlite3.connect(path, timeout=busy_timeout, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            # WAL: readers (web UI, exports) don't block the pollers' writes, nor the other way round
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def add_jobs(self, jobs: Iterable[Mapping[str, Any]]) -> int:
+        """Insert or update job records; returns the number of records written."""
+        placeholders = ", ".join("?" for _ in JOB_COLUMNS)
+        updates = ", ".join(f"{column} = excluded.{column}" for column in JOB_COLUMNS[1:])
+        sql = (
+            f"INSERT INTO jobs ({', '.join(JOB_COLUMNS)}) VALUES ({placeholders}) "
+            f"ON CONFLICT (job_id) DO UPDATE SET {updates}"
+        )
+        rows = (tuple(_column_value(job, column) for column in JOB_COLUMNS) for job in jobs)
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(sql, rows)
+        return cursor.rowcount
+
+    def add_new_jobs(self, jobs: Iterable[Mapping[str, Any]]) -> list[Mapping[str, Any]]:
+        """Insert only jobs whose IDs aren't stored yet; returns the newly inserted jobs."""
+        batch = {int(job["job_id"]): job for job in jobs}
+        if not batch:
+            return []
+        placeholders = ", ".join("?" for _ in JOB_COLUMNS)
+        sql = f"INSERT OR IGNORE INTO jobs ({', '.join(JOB_COLUMNS)}) VALUES ({placeholders})"
+        new_jobs = []
+        with self._lock, self._conn:
+            for job in batch.values():
+                cursor = self._conn.execute(sql, tuple(_column_value(job, column) for column in JOB_COLUMNS))
+                if cursor.rowcount:
+                    new_jobs.append(job)
+        return new_jobs
+
+    def version(self) -> tuple[int, int]:
+        """
+        Token that changes whenever the store does, without reading any rows.
+
+        ``data_version`` moves on commits by other connections (the pollers),
+        ``total_changes`` on this connection's own writes; callers can cache
+        counts and pages until it changes.
+        """
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            return data_version, self._conn.total_changes
+
+    def count(self, **filters: Any) -> int:
+        """Number of jobs matching ``filters`` (see ``query``)."""
+        where, args = _where_clause(filters)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM jobs{where}", args).fetchone()[0]
+
+    def query(
+        self,
+        sort_by: str = "posted_at",
+        descending: bool = True,
+        limit: int = 50,
+        offset: int = 0,
+        after: Optional[Sequence[Any]] = None,
+        **filters: Any,
+    ) -> list[dict[str, Any]]:
+        """
+        Return one page of jobs.
+
+        Pass ``after``, the ``(sort value, job_id)`` of the previous page's last
+        row (see ``page_key`` and ``seek``), to page by keyset; ``offset``
+        still works but costs a scan of every skipped row.
+
+        Filters:
+            text: Case-insensitive substring of the title or company.
+            company, location: Case-insensitive substring match.
+            search_fingerprint: Exact originating search.
+            posted_since: Minimum ``posted_at`` (epoch seconds).
+        """
+        where, args, order = _page_clauses(sort_by, descending, after, filters)
+        sql = f"SELECT * FROM jobs{where}{order} LIMIT ? OFFSET ?"
+        with self._lock:
+            return [dict(row) for row in self._conn.execute(sql, [*args, limit, offset])]
+
+    def seek(
+        self,
+        sort_by: str = "posted_at",
+        descending: bool = True,
+        skip: int = 0,
+        after: Optional[Sequence[Any]] = None,
+        **filters: Any,
+    ) -> Optional[tuple[Any, int]]:
+        """
+        Keyset of the row ``skip`` rows past ``after``, for jumping ahead several pages.
+
+        Only the sort value and ``job_id`` of the skipped rows are read. Returns
+        ``after`` when ``skip`` is 0 and None if fewer than ``skip`` rows are left.
+        """
+        if skip <= 0:
+            return tuple(after) if after is not None else None
+        where, args, order = _page_clauses(sort_by, descending, after, filters)
+        sql = f"SELECT {sort_by}, job_id FROM jobs{where}{order} LIMIT 1 OFFSET ?"
+        with self._lock:
+            row = self._conn.execute(sql, [*args, skip - 1]).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def get(self, job_id: int) -> Optional[dict[str, Any]]:
+        """Return a single job by ID, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def iter_jobs(self, batch_size: int = 1000, **filters: Any) -> Iterator[dict[str, Any]]:
+        """Iterate over every matching job in ``job_id`` order, holding one batch at a time."""
+        for batch in self.iter_batches(batch_size, **filters):
+            yield from (dict(row) for row in batch)
+
+    def iter_batches(
+        self, batch_size: int = 1000, columns: Sequence[str] = JOB_COLUMNS, **filters: Any
+    ) -> Iterator[list[sqlite3.Row]]:
+        """
+        Matching jobs as batches of rows in ``job_id`` order.
+
+        Paging is by keyset (``job_id > last``), so every batch costs the same
+        however deep into the table it is, and the lock is only held while a
+        batch is read. ``columns`` must include ``job_id``.
+        """
+        unknown = set(columns) - set(JOB_COLUMNS)
+        if unknown or "job_id" not in columns:
+            raise ValueError(f"Columns must be job columns including job_id, got: {', '.join(columns)}")
+        where, args = _where_clause(filters)
+        connector = " AND " if where else " WHERE "
+        selected = ", ".join(columns)
+        last_id = None
+        while True:
+            keyset = f"{connector}job_id > ?" if last_id is not None else ""
+            sql = f"SELECT {selected} FROM jobs{where}{keyset} ORDER BY job_id LIMIT ?"
+            params = [*args, *([last_id] if last_id is not None else []), batch_size]
+            with self._lock:
+                batch = self._conn.execute(sql, params).fetchall()
+            if not batch:
+                return
+            yield batch
+            last_id = batch[-1]["job_id"]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def page_key(row: Mapping[str, Any], sort_by: str) -> tuple[Any, int]:
+    """The keyset of a result row: pass it as ``after`` to get the next page."""
+    return row[sort_by], row["job_id"]
+
+
+def _column_value(job: Mapping[str, Any], column: str) -> Any:
+    value = job.get(column)
+    if column == "job_id":
+        return int(value)
+    if column in ("posted_at", "fetched_at"):
+        return int(value or 0)
+    return "" if value is None else str(value)
+
+
+def _page_clauses(
+    sort_by: str, descending: bool, after: Optional[Sequence[Any]], filters: Mapping[str, Any]
+) -> tuple[str, list[Any], str]:
+    """WHERE clause (filters plus keyset), its arguments and the ORDER BY clause of a page query."""
+    if sort_by not in SORT_COLUMNS:
+        raise ValueError(f"Cannot sort by {sort_by!r}; choose one of {', '.join(SORT_COLUMNS)}")
+    where, args = _where_clause(filters)
+    direction = "DESC" if descending else "ASC"
+    if after is not None:
+        where += (" AND " if where else " WHERE ") + f"({sort_by}, job_id) {'<' if descending else '>'} (?, ?)"
+        args += list(after)
+    return where, args, f" ORDER BY {sort_by} {direction}, job_id {direction}"
+
+
+def _like_pattern(value: Any) -> str:
+    """A ``LIKE ... ESCAPE '\\'`` pattern matching ``value`` literally anywhere in the column."""
+    escaped = str(value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _where_clause(filters: Mapping[str, Any]) -> tuple[str, list[Any]]:
+    """Translate keyword filters into a parameterized WHERE clause."""
+    conditions = []
+    args: list[Any] = []
+    for name, value in filters.items():
+        if value in (None, ""):
+            continue
+        if name == "text":
+            conditions.append("(title LIKE ? ESCAPE '\\' OR company LIKE ? ESCAPE '\\')")
+            args += [_like_pattern(value)] * 2
+        elif name in ("company", "location"):
+            conditions.append(f"{name} LIKE ? ESCAPE '\\'")
+            args.append(_like_pattern(value))
+        elif name == "search_fingerprint":
+            conditions.append("search_fingerprint = ?")
+            args.append(value)
+        elif name == "posted_since":
+            conditions.append("posted_at >= ?")
+            args.append(int(value))
+        else:
+            raise ValueError(f"Unknown job filter: {name}")
+    if not conditions:
+        return "", args
+    return " WHERE " + " AND ".join(conditions), args
@@ -0,0 +1,322 @@
+"""
+Structured boolean keyword queries with URL-length-aware splitting.
+
+LinkedIn's ``keywords`` parameter understands ``AND``, ``OR``, ``NOT``,
+"quoted phrases" and parentheses. Queries are modelled as small trees, in the
+same shape as ``job_index.parse_query`` produces:
+
+* a plain string: one or more bare words, rendered as-is (``Python``, ``C++``),
+  or in parentheses where several words are an operand of OR or NOT,
+* ``("phrase", text)``: rendered in double quotes,
+* ``("and", *operands)``, ``("or", *operands)`` and ``("not", operand)``.
+
+Long OR-lists of technologies quickly produce URLs that browsers, proxies
+or LinkedIn itself truncate. ``split_query`` partitions the OR-terms of a query
+across as few queries as possible so that every resulting URL stays within
+``max_url_length``; together they match the same jobs as the original,
+because ``A AND (x OR y)`` is ``(A AND x) OR (A AND y)``. Only OR groups outside
+``NOT`` are split, the largest one first.
+
+Alternatives of several words should be phrases or groups
+(``"data engineer" OR (machine learning)``): bare words next to each other
+are kept together as written, and rendered back as a group.
+
+Example:
+    >>> query = all_of(phrase("backend engineer"), any_of("Python", "Go", "Kotlin"), exclude("intern"))
+    >>> render(query)
+    '"backend engineer" AND (Python OR Go OR Kotlin) NOT intern'
+    >>> [render(part) for part in split_query(query, max_url_length=170)]
+    ['"backend engineer" AND (Python OR Kotlin) NOT intern', '"backend engineer" AND Go NOT intern']
+"""
+
+import math
+import re
+import urllib.parse
+from collections.abc import Mapping
+from typing import Any, Optional, Union
+
+from linkedin_url_builder import LinkedInURLBuilder, build_from_spec
+
+# Well below the ~8 KB limits of common servers; long URLs also get cut when shared
+DEFAULT_MAX_URL_LENGTH = 2000
+
+_TOKEN_RE = re.compile(r'"([^"]*)"|(\()|(\))|(-)(?=\S)|([^\s()"]+)')
+
+Query = Union[tuple, str]
+
+
+def phrase(text: str) -> Query:
+    """An exact phrase (quotes in ``text`` are dropped)."""
+    return ("phrase", " ".join(text.replace('"', " ").split()))
+
+
+def all_of(*operands: Query) -> Query:
+    """Operands that must all match (nested ANDs are flattened)."""
+    return _combine("and", operands)
+
+
+def any_of(*operands: Query) -> Query:
+    """Operands of which at least one must match (nested ORs are flattened)."""
+    return _combine("or", operands)
+
+
+def exclude(operand: Query) -> Query:
+    """Jobs that don't match ``operand``."""
+    return ("not", operand)
+
+
+def _combine(kind: str, operands: tuple) -> Query:
+    flat: list[Query] = []
+    for operand in operands:
+        if isinstance(operand, tuple) and operand[0] == kind:
+            flat.extend(operand[1:])
+        elif operand:
+            flat.append(operand)
+    if not flat:
+        raise ValueError(f"{kind.upper()} needs at least one operand")
+    return flat[0] if len(flat) == 1 else (kind, *flat)
+
+
+def parse_keywords(text: str) -> Query:
+    """
+    Parse LinkedIn keyword syntax into a query tree, keeping the original spelling.
+
+    ``-word`` is read as ``NOT word``.
+
+    Example:
+        >>> parse_keywords('Senior (Python OR "Go developer") NOT intern')
+        ('and', 'Senior', ('or', 'Python', ('phrase', 'Go developer')), ('not', 'intern'))
+    """
+    tokens = []
+    for quoted, open_paren, close_paren, minus, word in _TOKEN_RE.findall(text):
+        if open_paren or close_paren:
+            tokens.append(open_paren or close_paren)
+        elif minus:
+            tokens.append("NOT")
+        elif word in ("AND", "OR", "NOT"):
+            tokens.append(word)
+        elif word:
+            tokens.append(("WORD", word))
+        elif quoted.strip():
+            tokens.append(("PHRASE", phrase(quoted)))
+    parser = _KeywordParser(tokens)
+    tree = parser.parse_or()
+    if parser.position != len(tokens):
+        raise ValueError(f"Unexpected {tokens[parser.position]!r} in keywords: {text}")
+    return tree
+
+
+class _KeywordParser:
+    def __init__(self, tokens: list):
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def parse_or(self) -> Query:
+        operands = [self.parse_and()]
+        while self.peek() == "OR":
+            self.position += 1
+            operands.append(self.parse_and())
+        return any_of(*operands)
+
+    def parse_and(self) -> Query:
+        operands: list[Query] = []
+        adjacent_words = False
+        while self.peek() not in (None, "OR", ")"):
+            token = self.peek()
+            if token == "AND":
+                self.position += 1
+                adjacent_words = False
+                continue
+            if isinstance(token, tuple) and token[0] == "WORD" and adjacent_words:
+                # Bare words without an operator between them stay one term, as written
+                self.position += 1
+                operands[-1] = f"{operands[-1]} {token[1]}"
+                continue
+            adjacent_words = isinstance(token, tuple) and token[0] == "WORD"
+            operands.append(self.parse_unary())
+        if not operands:
+            raise ValueError("Empty keywords (or empty group)")
+        return all_of(*operands)
+
+    def parse_unary(self) -> Query:
+        token = self.peek()
+        self.position += 1
+        if token == "NOT":
+            return exclude(self.parse_unary())
+        if token == "(":
+            inner = self.parse_or()
+            if self.peek() != ")":
+                raise ValueError("Unbalanced parentheses in keywords")
+            self.position += 1
+            return inner
+        if isinstance(token, tuple):
+            return token[1]
+        raise ValueError(f"Unexpected {token!r} in keywords")
+
+
+def render(query: Query) -> str:
+    """LinkedIn keyword syntax for a query tree."""
+    if isinstance(query, str):
+        return query
+    kind = query[0]
+    if kind == "phrase":
+        return f'"{query[1]}"'
+    if kind == "not":
+        return f"NOT {_render_operand(query[1], group_words=True)}"
+    if kind == "or":
+        return " OR ".join(_render_operand(operand, group_words=True) for operand in query[1:])
+    parts = []
+    for operand in query[1:]:
+        if isinstance(operand, tuple) and operand[0] == "not":
+            parts.append(render(operand))
+        else:
+            parts.append(("AND " if parts else "") + _render_operand(operand))
+    return " ".join(parts)
+
+
+def _render_operand(query: Query, group_words: bool = False) -> str:
+    if isinstance(query, tuple) and query[0] in ("and", "or"):
+        return f"({render(query)})"
+    if group_words and isinstance(query, str) and len(query.split()) > 1:
+        # Keep the group as written: NOT only binds the next word, and OR next to bare words is easy to misread
+        return f"({query})"
+    return render(query)
+
+
+def _url_length(builder: LinkedInURLBuilder, query: Query) -> int:
+    params = dict(builder.params, keywords=render(query))
+    return len(builder.BASE_URL) + 1 + len(urllib.parse.urlencode(params, quote_via=urllib.parse.quote))
+
+
+def _or_groups(query: Query, path: tuple = ()) -> list[tuple[int, tuple]]:
+    """``(rendered length, path)`` of every OR group that may be split (not under NOT)."""
+    if not isinstance(query, tuple) or query[0] not in ("and", "or"):
+        return []
+    groups = [(len(render(query)), path)] if query[0] == "or" else []
+    for index, operand in enumerate(query[1:], start=1):
+        groups.extend(_or_groups(operand, path + (index,)))
+    return groups
+
+
+def _at(query: Query, path: tuple) -> Query:
+    for index in path:
+        query = query[index]
+    return query
+
+
+def _replace(query: Query, path: tuple, replacement: Query) -> Query:
+    if not path:
+        return replacement
+    index = path[0]
+    operand = _replace(query[index], path[1:], replacement)
+    operands = (*query[1:index], operand, *query[index + 1 :])
+    return all_of(*operands) if query[0] == "and" else any_of(*operands)
+
+
+def _pack(items: list[Query], fits) -> list[list[int]]:
+    """
+    Indices of ``items`` grouped into as few bins as we can find where ``fits(bin)``.
+
+    First-fit decreasing, then fewer bins are tried by always filling the
+    emptiest one (worst-fit decreasing). Items that don't fit even alone get
+    a bin of their own.
+    """
+    sizes = [len(render(item)) + len(" OR ") for item in items]
+    order = sorted(range(len(items)), key=lambda index: sizes[index], reverse=True)
+
+    def first_fit() -> list[list[int]]:
+        bins: list[list[int]] = []
+        for index in order:
+            for group in bins:
+                if fits(group + [index]):
+                    group.append(index)
+                    break
+            else:
+                bins.append([index])
+        return bins
+
+    def worst_fit(count: int) -> Optional[list[list[int]]]:
+        bins: list[list[int]] = [[] for _ in range(count)]
+        for index in order:
+            for group in sorted(bins, key=lambda group: sum(sizes[i] for i in group)):
+                if fits(group + [index]):
+                    group.append(index)
+                    break
+            else:
+                return None
+        return bins
+
+    best = first_fit()
+    # The fullest first-fit bin estimates how much fits in one URL
+    capacity = max(sum(sizes[index] for index in group) for group in best)
+    for count in range(max(1, math.ceil(sum(sizes) / capacity)), len(best)):
+        packed = worst_fit(count)
+        if packed is not None:
+            best = packed
+            break
+    return sorted((sorted(group) for group in best if group), key=lambda group: group[0])
+
+
+def split_query(
+    query: Query, builder: Optional[LinkedInURLBuilder] = None, max_url_length: int = DEFAULT_MAX_URL_LENGTH
+) -> list[Query]:
+    """
+    Split ``query`` into queries whose URLs (with ``builder``'s other parameters) fit ``max_url_length``.
+
+    Returns ``[query]`` when it already fits. The parts match the same jobs as
+    the original query between them. The largest OR group is packed into as
+    few parts as fit; if even its single terms don't fit, it is halved and
+    the next largest group is split as well.
+
+    Raises:
+        ValueError: If a part cannot be made short enough (no OR group left to split).
+    """
+    builder = builder or LinkedInURLBuilder()
+    if _url_length(builder, query) <= max_url_length:
+        return [query]
+    groups = _or_groups(query)
+    if not groups:
+        raise ValueError(f"Keywords too long for a {max_url_length}-character URL, no OR group to split: {render(query)}")
+    path = max(groups)[1]
+    items = list(_at(query, path)[1:])
+
+    def with_items(indices: list[int]) -> Query:
+        return _replace(query, path, any_of(*(items[index] for index in indices)))
+
+    def fits(indices: list[int]) -> bool:
+        return _url_length(builder, with_items(indices)) <= max_url_length
+
+    if any(fits([index]) for index in range(len(items))):
+        bins = _pack(items, fits)
+    else:
+        # Other OR groups must be split too: halve this one and let the recursion pick the next largest
+        middle = len(items) // 2
+        bins = [list(range(middle)), list(range(middle, len(items)))]
+    parts = []
+    for indices in bins:
+        parts.extend(split_query(with_items(indices), builder, max_url_length))
+    return parts
+
+
+def split_builder(builder: LinkedInURLBuilder, max_url_length: int = DEFAULT_MAX_URL_LENGTH) -> list[LinkedInURLBuilder]:
+    """Copies of ``builder`` whose keywords partition its OR-terms so every URL fits ``max_url_length``."""
+    keywords = builder.params.get("keywords")
+    if not keywords or len(builder.build_url()) <= max_url_length:
+        return [builder]
+    builders = []
+    for part in split_query(parse_keywords(keywords), builder, max_url_length):
+        copy = LinkedInURLBuilder(resolver=builder.resolver)
+        copy.params = dict(builder.params, keywords=render(part))
+        builders.append(copy)
+    return builders
+
+
+def split_spec(spec: Mapping[str, Any], max_url_length: int = DEFAULT_MAX_URL_LENGTH) -> list[dict[str, Any]]:
+    """Search specs (see ``build_from_spec``) with the keywords split as needed to keep every URL short enough."""
+    builders = split_builder(build_from_spec(spec), max_url_length)
+    if len(builders) == 1:
+        return [dict(spec)]
+    return [dict(spec, keywords=builder.params["keywords"]) for builder in builders]
@@ -0,0 +1,166 @@
+"""
+Compact log-bucketed latency histograms (HdrHistogram-style).
+
+Values are recorded in whole microseconds into a fixed array of counters:
+exact below ``2 ** (precision_bits + 1)`` µs, then ``2 ** precision_bits``
+linear sub-buckets per power of two. With the default 4 precision bits every
+bucket is within ~6% of the true value and a histogram covering 1µs to ~71
+minutes takes under 2 KB, however many values it records.
+"""
+
+import math
+import threading
+from array import array
+from collections.abc import Iterable
+from typing import Optional
+
+DEFAULT_PRECISION_BITS = 4
+DEFAULT_MAX_VALUE_BITS = 32  # 2**32 µs ≈ 71 minutes
+
+PERCENTILES = (50.0, 95.0, 99.0)
+
+
+class LogHistogram:
+    """
+    Fixed-memory histogram of durations.
+
+    Example:
+        >>> histogram = LogHistogram()
+        >>> for ms in range(1, 101):
+        ...     histogram.record(ms / 1000)
+        >>> round(histogram.percentile(50), 3)
+        0.051
+    """
+
+    __slots__ = ("precision_bits", "max_value", "counts", "count", "total", "min_value", "max_seen")
+
+    def __init__(self, precision_bits: int = DEFAULT_PRECISION_BITS, max_value_bits: int = DEFAULT_MAX_VALUE_BITS):
+        if not 1 <= precision_bits < max_value_bits:
+            raise ValueError("precision_bits must be between 1 and max_value_bits - 1")
+        self.precision_bits = precision_bits
+        self.max_value = (1 << max_value_bits) - 1
+        sub_buckets = 1 << precision_bits
+        size = 2 * sub_buckets + (max_value_bits - precision_bits - 1) * sub_buckets
+        self.counts = array("I", bytes(4 * size))
+        self.count = 0
+        self.total = 0  # µs
+        self.min_value = 0
+        self.max_seen = 0
+
+    def _index(self, value: int) -> int:
+        exact_limit = 2 << self.precision_bits
+        if value < exact_limit:
+            return value
+        shift = value.bit_length() - self.precision_bits - 1
+        top = value >> shift  # in [2**precision_bits, 2**(precision_bits + 1))
+        return exact_limit + (shift - 1) * (1 << self.precision_bits) + top - (1 << self.precision_bits)
+
+    def _upper_bound(self, index: int) -> int:
+        exact_limit = 2 << self.precision_bits
+        if index < exact_limit:
+            return index
+        sub_buckets = 1 << self.precision_bits
+        shift, offset = divmod(index - exact_limit, sub_buckets)
+        shift += 1
+        top = offset + sub_buckets
+        return ((top + 1) << shift) - 1
+
+    def record(self, seconds: float, times: int = 1) -> None:
+        """Record a duration; values beyond the histogram's range are clamped to its maximum."""
+        value = min(max(int(round(seconds * 1_000_000)), 0), self.max_value)
+        self.counts[self._index(value)] += times
+        if self.count == 0 or value < self.min_value:
+            self.min_value = value
+        if value > self.max_seen:
+            self.max_seen = value
+        self.count += times
+        self.total += value * times
+
+    def percentile(self, percentile: float) -> float:
+        """Return the value (in seconds) at or below which ``percentile`` percent of recordings fall."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(percentile / 100 * self.count))
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count:
+                continue
+            seen += bucket_count
+            if seen >= rank:
+                return min(self._upper_bound(index), self.max_seen) / 1_000_000
+        return self.max_seen / 1_000_000
+
+    def percentiles(self, percentiles: Iterable[float] = PERCENTILES) -> dict[str, float]:
+        """Return e.g. ``{"p50": ..., "p95": ..., "p99": ...}`` in seconds."""
+        return {f"p{p:g}": self.percentile(p) for p in percentiles}
+
+    @property
+    def total_seconds(self) -> float:
+        return self.total / 1_000_000
+
+    def merge(self, other: "LogHistogram") -> None:
+        """Add another histogram with the same layout into this one."""
+        if len(other.counts) != len(self.counts) or other.precision_bits != self.precision_bits:
+            raise ValueError("Cannot merge histograms with different layouts")
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                self.counts[index] += bucket_count
+        if other.count:
+            self.min_value = other.min_value if not self.count else min(self.min_value, other.min_value)
+            self.max_seen = max(self.max_seen, other.max_seen)
+        self.count += other.count
+        self.total += other.total
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes used by the counter array."""
+        return self.counts.itemsize * len(self.counts)
+
+
+class LatencyTracker:
+    """
+    Per-search, per-stage latency histograms, keyed by search fingerprint.
+
+    Thread-safe; memory is one ``LogHistogram`` per (fingerprint, stage) pair.
+    """
+
+    def __init__(self, precision_bits: int = DEFAULT_PRECISION_BITS):
+        self.precision_bits = precision_bits
+        self._histograms: dict[tuple[str, str], LogHistogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, fingerprint: str, stage: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get((fingerprint, stage))
+            if histogram is None:
+                histogram = self._histograms[(fingerprint, stage)] = LogHistogram(self.precision_bits)
+            histogram.record(seconds)
+
+    def histogram(self, fingerprint: str, stage: str) -> Optional[LogHistogram]:
+        with self._lock:
+            return self._histograms.get((fingerprint, stage))
+
+    def summary(self, fingerprint: Optional[str] = None) -> dict[str, dict[str, dict[str, float]]]:
+        """
+        Return ``{fingerprint: {stage: {"count", "total", "p50", "p95", "p99"}}}``.
+
+        Pass ``fingerprint`` to limit the summary to one search.
+        """
+        with self._lock:
+            items = [(key, hist) for key, hist in self._histograms.items() if fingerprint in (None, key[0])]
+            result: dict[str, dict[str, dict[str, float]]] = {}
+            for (search, stage), histogram in sorted(items):
+                result.setdefault(search, {})[stage] = {
+                    "count": histogram.count,
+                    "total": histogram.total_seconds,
+                    **histogram.percentiles(),
+                }
+        return result
+
+    def dominant_searches(self, limit: int = 10) -> list[tuple[str, float]]:
+        """Searches ranked by total recorded time across all stages (seconds), slowest first."""
+        totals: dict[str, float] = {}
+        with self._lock:
+            for (search, _stage), histogram in self._histograms.items():
+                totals[search] = totals.get(search, 0.0) + histogram.total_seconds
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
@@ -3,8 +3,19 @@ LinkedIn Job Searcher - URL Builder Tool
 This application helps you create optimized LinkedIn job search URLs with advanced filtering options.
 """
 
+import hashlib
+import math
 import urllib.parse
-from typing import Optional
+from collections.abc import Mapping
+from typing import Any, Optional, Protocol
+
+
+class Resolver(Protocol):
+    """Lookups a builder can delegate to (implemented by ``resolver_cache.SharedResolver``)."""
+
+    def resolve_location(self, location_name: str) -> Optional[str]: ...
+
+    def encode_facet(self, param: str, values: list[str]) -> str: ...
 
 
 class LinkedInURLBuilder:
@@ -44,7 +55,52 @@ class LinkedInURLBuilder:
         "remote": "0",  # For remote jobs
     }
 
-    def __init__(self):
+    # Facet vocabularies: user-facing option name -> LinkedIn code
+    # Experience levels: 1=Internship, 2=Entry level, 3=Associate, 4=Mid-Senior level, 5=Director, 6=Executive
+    EXPERIENCE_LEVELS = {
+        "internship": "1",
+        "entry": "2",
+        "associate": "3",
+        "mid_senior": "4",
+        "director": "5",
+        "executive": "6",
+    }
+
+    # Job types: F=Full-time, P=Part-time, C=Contract, T=Temporary, I=Internship, V=Volunteer, O=Other
+    JOB_TYPES = {
+        "full_time": "F",
+        "part_time": "P",
+        "contract": "C",
+        "temporary": "T",
+        "internship": "I",
+        "volunteer": "V",
+        "other": "O",
+    }
+
+    # Remote: 1=On-site, 2=Remote, 3=Hybrid
+    REMOTE_OPTIONS = {"on_site": "1", "remote": "2", "hybrid": "3"}
+
+    # URL parameter -> vocabulary, used by the facet codecs
+    FACETS = {"f_E": EXPERIENCE_LEVELS, "f_JT": JOB_TYPES, "f_WT": REMOTE_OPTIONS}
+
+    # Special mappings for common location name variations
+    LOCATION_ALIASES = {
+        "turkey": "turkey",
+        "turkey_all": "turkey",
+        "türkiye": "turkey",
+        "united_states": "united_states",
+        "usa": "united_states",
+        "us": "united_states",
+    }
+
+    def __init__(self, resolver: Optional[Resolver] = None) -> None:
+        """
+        Args:
+            resolver: Optional shared lookup cache (see ``resolver_cache.SharedResolver``).
+                When given, location and facet lookups go through it instead of being
+                recomputed for every builder.
+        """
+        self.resolver = resolver
         self.params = {}
         # Add required LinkedIn parameters for proper functionality
         self.params["origin"] = "JOB_SEARCH_PAGE_JOB_FILTER"
@@ -99,52 +155,44 @@ class LinkedInURLBuilder:
 
     def set_experience_level(self, levels: list[str]) -> "LinkedInURLBuilder":
         """Set experience level filters."""
-        # Experience levels: 1=Internship, 2=Entry level, 3=Associate, 4=Mid-Senior level, 5=Director, 6=Executive
-        level_map = {
-            "internship": "1",
-            "entry": "2",
-            "associate": "3",
-            "mid_senior": "4",
-            "director": "5",
-            "executive": "6",
-        }
-
         if levels:
-            level_codes = [level_map.get(level.lower()) for level in levels if level.lower() in level_map]
+            level_codes = self._encode_facet("f_E", levels)
             if level_codes:
-                self.params["f_E"] = ",".join(level_codes)
+                self.params["f_E"] = level_codes
         return self
 
     def set_job_type(self, job_types: list[str]) -> "LinkedInURLBuilder":
         """Set job type filters."""
-        # Job types: F=Full-time, P=Part-time, C=Contract, T=Temporary, I=Internship, V=Volunteer, O=Other
-        type_map = {
-            "full_time": "F",
-            "part_time": "P",
-            "contract": "C",
-            "temporary": "T",
-            "internship": "I",
-            "volunteer": "V",
-            "other": "O",
-        }
-
         if job_types:
-            type_codes = [type_map.get(jt.lower()) for jt in job_types if jt.lower() in type_map]
+            type_codes = self._encode_facet("f_JT", job_types)
             if type_codes:
-                self.params["f_JT"] = ",".join(type_codes)
+                self.params["f_JT"] = type_codes
         return self
 
     def set_remote_options(self, remote_types: list[str]) -> "LinkedInURLBuilder":
         """Set remote work options."""
-        # Remote: 1=On-site, 2=Remote, 3=Hybrid
-        remote_map = {"on_site": "1", "remote": "2", "hybrid": "3"}
-
         if remote_types:
-            remote_codes = [remote_map.get(rt.lower()) for rt in remote_types if rt.lower() in remote_map]
+            remote_codes = self._encode_facet("f_WT", remote_types)
             if remote_codes:
-                self.params["f_WT"] = ",".join(remote_codes)
+                self.params["f_WT"] = remote_codes
         return self
 
+    def _encode_facet(self, param: str, values: list[str]) -> str:
+        """Encode facet option names to LinkedIn's comma-separated codes, via the resolver if set."""
+        if self.resolver is not None:
+            return self.resolver.encode_facet(param, values)
+        return self.encode_facet(param, values)
+
+    @classmethod
+    def encode_facet(cls, param: str, values: list[str]) -> str:
+        """
+        Encode facet option names for ``param`` ("f_E", "f_JT" or "f_WT").
+
+        Unknown option names are ignored, e.g. ``encode_facet("f_WT", ["remote", "hybrid"])`` -> ``"2,3"``.
+        """
+        vocabulary = cls.FACETS[param]
+        return ",".join(vocabulary[value.lower()] for value in values if value.lower() in vocabulary)
+
     def set_salary_range(self, min_salary: Optional[int] = None, max_salary: Optional[int] = None) -> "LinkedInURLBuilder":
         """Set salary range filter."""
         if min_salary or max_salary:
@@ -160,6 +208,22 @@ class LinkedInURLBuilder:
             self.params["currentJobId"] = job_id
         return self
 
+    @classmethod
+    def from_url(cls, url: str, resolver: Optional[Resolver] = None) -> "LinkedInURLBuilder":
+        """
+        Parse a LinkedIn job search URL back into a builder.
+
+        Query parameters are taken as-is, so ``from_url(url).build_url() == url``
+        for URLs produced by this class.
+
+        Example:
+            >>> LinkedInURLBuilder.from_url("https://www.linkedin.com/jobs/search/?keywords=C%2B%2B&geoId=0").params
+            {'keywords': 'C++', 'geoId': '0'}
+        """
+        builder = cls(resolver=resolver)
+        builder.params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query))
+        return builder
+
     def build_url(self) -> str:
         """Build the complete LinkedIn job search URL."""
         if not self.params:
@@ -169,6 +233,20 @@ class LinkedInURLBuilder:
         query_string = urllib.parse.urlencode(self.params, quote_via=urllib.parse.quote)
         return f"{self.BASE_URL}?{query_string}"
 
+    # Parameters that don't change which jobs a search returns
+    FINGERPRINT_IGNORED_PARAMS = ("origin", "refresh", "currentJobId")
+
+    def fingerprint(self) -> str:
+        """
+        Stable short ID of the search, independent of parameter order.
+
+        Two builders that would return the same job list share a fingerprint,
+        so it can key per-search statistics, caches and shards.
+        """
+        items = sorted((key, value) for key, value in self.params.items() if key not in self.FINGERPRINT_IGNORED_PARAMS)
+        canonical = urllib.parse.urlencode(items, quote_via=urllib.parse.quote)
+        return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
     def get_params_summary(self) -> dict[str, str]:
         """Get a human-readable summary of current parameters."""
         summary = {}
@@ -214,6 +292,22 @@ class LinkedInURLBuilder:
         if not location_name:
             return self
 
+        if self.resolver is not None:
+            geo_id = self.resolver.resolve_location(location_name)
+        else:
+            geo_id = self.lookup_geo_id(location_name)
+
+        # Only use verified geo IDs to avoid wrong mappings
+        if geo_id:
+            self.set_geo_id(geo_id)
+        else:
+            # Use text location - more reliable than wrong geo IDs
+            self.set_location(location_name)
+        return self
+
+    @staticmethod
+    def normalize_location_key(location_name: str) -> str:
+        """Normalize a location name to a lookup key, e.g. "Turkey (All)" -> "turkey"."""
         location_key = (
             location_name.lower()
             .replace(" ", "_")
@@ -223,27 +317,15 @@ class LinkedInURLBuilder:
             .replace("all", "")
             .strip("_")
         )
-
-        # Special mappings for common variations
-        location_mappings = {
-            "turkey": "turkey",
-            "turkey_all": "turkey",
-            "türkiye": "turkey",
-            "united_states": "united_states",
-            "usa": "united_states",
-            "us": "united_states",
-        }
-
         # Use mapping if available, otherwise use direct key
-        final_key = location_mappings.get(location_key, location_key)
+        return LinkedInURLBuilder.LOCATION_ALIASES.get(location_key, location_key)
 
-        # Only use verified geo IDs to avoid wrong mappings
-        if final_key in self.VERIFIED_GEO_IDS:
-            self.set_geo_id(self.VERIFIED_GEO_IDS[final_key])
-        else:
-            # Use text location - more reliable than wrong geo IDs
-            self.set_location(location_name)
-        return self
+    @classmethod
+    def lookup_geo_id(cls, location_name: str, geo_ids: Optional[Mapping[str, str]] = None) -> Optional[str]:
+        """Return the verified geo ID for a location name, or None if it is not known."""
+        if geo_ids is None:
+            geo_ids = cls.VERIFIED_GEO_IDS
+        return geo_ids.get(cls.normalize_location_key(location_name))
 
 
 def create_optimized_url(
@@ -252,9 +334,9 @@ def create_optimized_url(
     distance: int = 25,
     time_filter: str = "24 hours",
     sort_by: str = "date_posted",
-    experience_levels: list[str] = None,
-    job_types: list[str] = None,
-    remote_options: list[str] = None,
+    experience_levels: Optional[list[str]] = None,
+    job_types: Optional[list[str]] = None,
+    remote_options: Optional[list[str]] = None,
 ) -> tuple[str, dict[str, str]]:
     """
     Create an optimized LinkedIn job search URL with common settings.
@@ -284,6 +366,63 @@ def create_optimized_url(
     return url.build_url(), url.get_params_summary()
 
 
+def _as_list(value: Any) -> list[str]:
+    """Accept either a list of strings or a comma/semicolon separated string."""
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.replace(";", ",").split(",") if item.strip()]
+    return [str(item).strip() for item in value if str(item).strip()]
+
+
+def build_from_spec(spec: Mapping[str, Any], resolver: Optional[Resolver] = None) -> LinkedInURLBuilder:
+    """
+    Create a configured builder from a flat search specification.
+
+    The spec uses the same field names as ``create_optimized_url`` plus
+    ``geo_id``, ``custom_hours`` and ``job_id``. Values may be strings (as read
+    from a CSV file) or native types; list fields accept comma/semicolon
+    separated strings. Only fields present in the spec are applied. ``resolver``
+    is passed through to the builder.
+
+    Example:
+        >>> build_from_spec({"keywords": "Python Developer", "distance": "50"}).params["distance"]
+        '50'
+
+    Raises:
+        ValueError: If ``distance`` or ``custom_hours`` is not numeric (or ``custom_hours`` is not finite).
+    """
+    builder = LinkedInURLBuilder(resolver=resolver)
+    builder.set_keywords(spec.get("keywords") or "")
+
+    if spec.get("geo_id"):
+        builder.set_geo_id(str(spec["geo_id"]).strip())
+    elif spec.get("location"):
+        builder.set_location_by_name(str(spec["location"]).strip())
+
+    if spec.get("distance"):
+        builder.set_distance(int(spec["distance"]))
+
+    if spec.get("custom_hours"):
+        hours = float(spec["custom_hours"])
+        if not math.isfinite(hours):
+            raise ValueError(f"custom_hours must be a finite number, got {spec['custom_hours']!r}")
+        builder.set_custom_time_hours(hours)
+    elif spec.get("time_filter"):
+        builder.set_time_filter(str(spec["time_filter"]).strip())
+
+    if spec.get("sort_by"):
+        builder.set_sort_by(str(spec["sort_by"]).strip())
+
+    builder.set_experience_level(_as_list(spec.get("experience_levels")))
+    builder.set_job_type(_as_list(spec.get("job_types")))
+    builder.set_remote_options(_as_list(spec.get("remote_options")))
+
+    if spec.get("job_id"):
+        builder.set_job_id(str(spec["job_id"]).strip())
+    return builder
+
+
 if __name__ == "__main__":
     # Example usage
     builder = LinkedInURLBuilder()
@@ -19,9 +19,9 @@ def main():
 
     parser.add_argument(
         "--mode",
-        choices=["web", "cli"],
+        choices=["web", "cli", "poll"],
         default="web",
-        help="Run mode: web (Streamlit UI) or cli (command line)",
+        help="Run mode: web (Streamlit UI), cli (command line) or poll (saved-search poller)",
     )
 
     parser.add_argument("--port", type=int, default=8501, help="Port for web interface (default: 8501)")
@@ -37,11 +37,10 @@ def main():
         import subprocess
 
         try:
-            # Run Streamlit app
+            # Run Streamlit app through the warm-start entry point (prewarms imports and caches)
             cmd = [
                 sys.executable,
-                "-m",
-                "streamlit",
+                str(project_dir / "warmup.py"),
                 "run",
                 str(project_dir / "app.py"),
                 "--server.port",
@@ -64,6 +63,13 @@ def main():
         sys.argv = ["cli.py"] + unknown
         cli_main()
 
+    elif args.mode == "poll":
+        # Forward to the polling daemon
+        from poller import main as poller_main
+
+        sys.argv = ["poller.py"] + unknown
+        poller_main()
+
 
 if __name__ == "__main__":
     main()
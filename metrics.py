@@ -0,0 +1,362 @@
+"""
+Opt-in instrumentation with a Prometheus text-format exporter.
+
+Nothing is measured until ``enable()`` is called: builder methods are only
+wrapped while metrics are enabled (``disable()`` restores the originals), and
+``stage_timer()`` hands out a shared no-op context manager when disabled, so
+instrumented code costs one attribute check when metrics are off.
+
+Example:
+    metrics.enable()
+    LinkedInURLBuilder().set_keywords("python").build_url()
+    print(metrics.render_prometheus())
+    # linkedin_builder_operations_total{operation="build_url"} 1
+"""
+
+import contextlib
+import functools
+import math
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+from linkedin_url_builder import LinkedInURLBuilder
+
+# Latency buckets in seconds: 10µs .. 10s
+DEFAULT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+# Set by ``start_app.py`` to the 0-based number of each instance it launches
+INSTANCE_ENV = "LINKEDIN_INSTANCE"
+
+# Builder methods wrapped by enable()
+INSTRUMENTED_METHODS = ("build_url", "get_params_summary", "set_location_by_name")
+
+Sample = tuple[str, dict[str, str], float]
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield self.name, dict(zip(self.labelnames, labels)), value
+
+
+class Histogram:
+    """Fixed-bucket latency histogram with optional labels."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [count per bucket..., +Inf count, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+            for index, upper in enumerate(self.buckets):
+                if value <= upper:
+                    state[index] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-1] += value
+
+    def count(self, *labels: str) -> int:
+        with self._lock:
+            state = self._values.get(labels)
+            return int(sum(state[:-1])) if state else 0
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            items = [(labels, list(state)) for labels, state in self._values.items()]
+        for labels, state in items:
+            base = dict(zip(self.labelnames, labels))
+            cumulative = 0.0
+            for upper, bucket_count in zip((*self.buckets, math.inf), state[:-1]):
+                cumulative += bucket_count
+                le = "+Inf" if upper == math.inf else repr(upper)
+                yield f"{self.name}_bucket", {**base, "le": le}, cumulative
+            yield f"{self.name}_sum", base, state[-1]
+            yield f"{self.name}_count", base, cumulative
+
+
+class Registry:
+    """Collection of metrics plus collector callbacks evaluated at export time."""
+
+    def __init__(self):
+        self._metrics: dict[str, object] = {}
+        self._collectors: list[Callable[[], Iterable[tuple[str, str, str, list[Sample]]]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """Return the counter called ``name``, creating it on first use."""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Counter(name, help_text, labelnames)
+            return self._metrics[name]
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Return the histogram called ``name``, creating it on first use."""
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = Histogram(name, help_text, labelnames, buckets)
+            return self._metrics[name]
+
+    def add_collector(self, collector: Callable[[], Iterable[tuple[str, str, str, list[Sample]]]]) -> None:
+        """
+        Register a callback producing ``(name, kind, help, samples)`` families at export time.
+
+        Used for values owned by other objects, e.g. cache hit counters.
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def families(self) -> Iterator[tuple[str, str, str, list[Sample]]]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        for metric in metrics:
+            yield metric.name, metric.kind, metric.help_text, list(metric.samples())
+        for collector in collectors:
+            yield from collector()
+
+
+REGISTRY = Registry()
+
+_enabled = False
+_active_registry = REGISTRY
+_originals: dict[str, Callable] = {}
+_state_lock = threading.Lock()
+
+
+def is_enabled() -> bool:
+    """Whether instrumentation is currently active."""
+    return _enabled
+
+
+def _builder_metrics(registry: Registry) -> tuple[Counter, Histogram]:
+    operations = registry.counter(
+        "linkedin_builder_operations_total",
+        "LinkedInURLBuilder operations performed",
+        ("operation",),
+    )
+    latency = registry.histogram(
+        "linkedin_builder_operation_seconds",
+        "LinkedInURLBuilder operation latency",
+        ("operation",),
+    )
+    return operations, latency
+
+
+def _instrumented(method: Callable, operation: str, operations: Counter, latency: Histogram) -> Callable:
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            latency.observe(time.perf_counter() - start, operation)
+            operations.inc(operation)
+
+    return wrapper
+
+
+def enable(registry: Registry = REGISTRY) -> None:
+    """Start collecting metrics into ``registry`` (idempotent)."""
+    global _enabled, _active_registry
+    with _state_lock:
+        if _enabled:
+            return
+        _active_registry = registry
+        operations, latency = _builder_metrics(registry)
+        for name in INSTRUMENTED_METHODS:
+            original = getattr(LinkedInURLBuilder, name)
+            _originals[name] = original
+            setattr(LinkedInURLBuilder, name, _instrumented(original, name, operations, latency))
+        _enabled = True
+
+
+def disable() -> None:
+    """Stop collecting metrics and restore the uninstrumented builder methods."""
+    global _enabled
+    with _state_lock:
+        for name, original in _originals.items():
+            setattr(LinkedInURLBuilder, name, original)
+        _originals.clear()
+        _enabled = False
+
+
+def enable_from_env(registry: Registry = REGISTRY) -> bool:
+    """Enable metrics when ``LINKEDIN_METRICS`` is set to a truthy value; returns whether enabled."""
+    if os.environ.get("LINKEDIN_METRICS", "").lower() in ("1", "true", "yes", "on"):
+        enable(registry)
+    return _enabled
+
+
+_NOOP_TIMER = contextlib.nullcontext()
+
+
+class _StageTimer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: tuple[str, ...]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start, *self.labels)
+        return False
+
+
+def stage_timer(stage: str):
+    """
+    Context manager timing a pipeline stage (fetch, parse, store, ...).
+
+    Returns a shared no-op context manager while metrics are disabled.
+    """
+    if not _enabled:
+        return _NOOP_TIMER
+    histogram = _active_registry.histogram("linkedin_pipeline_stage_seconds", "Pipeline stage latency", ("stage",))
+    return _StageTimer(histogram, (stage,))
+
+
+def register_resolver(resolver, registry: Registry = REGISTRY) -> None:
+    """Export a ``SharedResolver``'s cache hit/miss counters and sizes."""
+
+    def collect():
+        stats = resolver.stats()
+        for field, kind, help_text in (
+            ("hits", "counter", "Resolver cache hits"),
+            ("misses", "counter", "Resolver cache misses"),
+            ("size", "gauge", "Resolver cache entries"),
+        ):
+            suffix = "_total" if kind == "counter" else ""
+            name = f"linkedin_resolver_cache_{field}{suffix}"
+            samples = [(name, {"cache": cache}, float(values[field])) for cache, values in stats.items()]
+            yield name, kind, help_text, samples
+
+    registry.add_collector(collect)
+
+
+def _escape_label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_prometheus(registry: Registry = REGISTRY) -> str:
+    """Render every metric in the Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for name, kind, help_text, samples in registry.families():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for sample_name, labels, value in samples:
+            lines.append(f"{sample_name}{_format_labels(labels)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str, registry: Registry = REGISTRY) -> None:
+    """Atomically write the metrics to ``path`` (for node_exporter's textfile collector)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile("w", dir=directory, delete=False, suffix=".tmp") as handle:
+        handle.write(render_prometheus(registry))
+    os.replace(handle.name, path)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: Registry = REGISTRY
+
+    def do_GET(self):  # noqa: N802 (http.server naming)
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus(self.registry).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1", registry: Registry = REGISTRY) -> ThreadingHTTPServer:
+    """Serve ``/metrics`` on a daemon thread; returns the server (call ``shutdown()`` to stop)."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, name=f"metrics-{port}", daemon=True)
+    thread.start()
+    return server
+
+
+def metrics_port_from_env() -> Optional[int]:
+    """
+    Port from ``LINKEDIN_METRICS_PORT``, if set, offset by this instance's number.
+
+    Instances started by ``start_app.py --instances N`` share the environment,
+    so instance ``i`` (``LINKEDIN_INSTANCE``) serves on the base port + ``i``.
+    """
+    value = os.environ.get("LINKEDIN_METRICS_PORT")
+    if not value:
+        return None
+    return int(value) + int(os.environ.get(INSTANCE_ENV) or 0)
@@ -0,0 +1,275 @@
+"""
+Batched, coalescing webhook notifications for new postings.
+
+A poll that finds 300 new jobs across 40 searches shouldn't send 300
+notifications. ``Notifier.publish`` only puts the new jobs of one search on a
+bounded queue; a worker thread groups them per destination and sends each
+destination one JSON POST per ``window`` seconds (or as soon as ``max_batch``
+jobs are waiting), so the number of requests grows with destinations, not
+with jobs:
+
+    {"count": 2, "searches": {"py-ankara": 2}, "jobs": [{"job_id": 3912345678, "title": ..., "search": "py-ankara"}, ...]}
+
+A destination receives every search unless it lists the search names or
+fingerprints it wants. When the queue is full (a slow webhook), new events
+are dropped and counted instead of blocking the poller. Failed POSTs are
+retried with a ``retry_policy.RetryPolicy`` if one is given: the retry is
+scheduled for when its backoff ends rather than slept through, so the other
+destinations keep their windows. A destination's new jobs wait until its
+retry is settled, at most ``max_pending`` of them; beyond that the oldest are
+dropped and counted.
+
+Destinations file (``poller.py --notify-config``):
+    [{"url": "https://hooks.example.com/jobs"}, {"url": "http://127.0.0.1:9000/", "searches": ["py-ankara"]}]
+
+Example:
+    notifier = Notifier([Destination("https://hooks.example.com/jobs")], window=5.0)
+    poller = SearchPoller(JobStore("jobs.db"), notifier=notifier)
+    poller.poll_all(searches)
+    notifier.close()  # deliver what's still waiting
+"""
+
+import json
+import queue
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from fetch_pipeline import USER_AGENT, FetchError
+
+DEFAULT_WINDOW = 5.0
+DEFAULT_MAX_BATCH = 500
+DEFAULT_MAX_QUEUE = 10_000
+DEFAULT_MAX_PENDING = 50_000
+
+# Job fields included in notifications
+SUMMARY_FIELDS = ("job_id", "title", "company", "location", "posted_at", "url")
+
+# sender(url, payload, timeout); raises FetchError on failure
+Sender = Callable[[str, Mapping[str, Any], float], None]
+
+_STOP = object()
+
+
+class Destination:
+    """
+    A webhook URL, optionally limited to some searches (by name or fingerprint).
+
+    Raises:
+        ValueError: If ``url`` isn't an ``http://`` or ``https://`` URL with a host.
+    """
+
+    def __init__(self, url: str, searches: Optional[Iterable[str]] = None):
+        parts = urllib.parse.urlsplit(str(url))
+        if parts.scheme not in ("http", "https") or not parts.netloc:
+            raise ValueError(f"Webhook URL must start with http:// or https://: {url!r}")
+        self.url = url
+        self.searches = frozenset(searches) if searches is not None else None
+
+    def wants(self, search) -> bool:
+        return self.searches is None or search.name in self.searches or search.fingerprint in self.searches
+
+    def __repr__(self) -> str:
+        return f"Destination({self.url!r})" if self.searches is None else f"Destination({self.url!r}, {sorted(self.searches)})"
+
+
+def load_destinations(path: str) -> list[Destination]:
+    """Load destinations from a JSON list of ``{"url": ..., "searches": [...]}`` objects."""
+    entries = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not isinstance(entries, list) or not all(isinstance(entry, dict) and entry.get("url") for entry in entries):
+        raise ValueError(f"{path}: expected a list of objects with a url")
+    try:
+        return [Destination(entry["url"], entry.get("searches")) for entry in entries]
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from e
+
+
+def post_json(url: str, payload: Mapping[str, Any], timeout: float) -> None:
+    """POST ``payload`` as JSON; HTTP and network failures raise ``FetchError``."""
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    request = urllib.request.Request(
+        url, data=body, method="POST", headers={"Content-Type": "application/json", "User-Agent": USER_AGENT}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            response.read()
+    except urllib.error.HTTPError as e:
+        retry_after = e.headers.get("Retry-After") if e.headers else None
+        raise FetchError(
+            f"HTTP {e.code} from {url}",
+            status=e.code,
+            retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+        ) from e
+    except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+        raise FetchError(f"Could not notify {url}: {e}") from e
+
+
+class Notifier:
+    """
+    Coalesce new-job events per destination and deliver them in batches from a worker thread.
+
+    Args:
+        destinations: Webhooks to notify.
+        window: Seconds a destination's first waiting job may wait for more to join its batch.
+        max_batch: Jobs per POST; a full batch is sent without waiting for the window.
+        max_queue: Events (one per ``publish``) that may wait for the worker before new ones are dropped.
+        max_pending: Jobs that may wait per destination (e.g. while it is being retried) before the oldest are dropped.
+        retry: Optional ``retry_policy.RetryPolicy`` for failed POSTs.
+        sender: ``sender(url, payload, timeout)``, ``post_json`` by default.
+        timeout: Per-request timeout in seconds.
+
+    ``stats`` counts jobs published, dropped (queue full, or per destination
+    over ``max_pending``), delivered and failed, and the batches (POSTs) sent.
+    """
+
+    def __init__(
+        self,
+        destinations: Iterable[Destination],
+        window: float = DEFAULT_WINDOW,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        retry=None,
+        sender: Sender = post_json,
+        timeout: float = 10.0,
+    ):
+        if max_batch < 1:
+            raise ValueError("max_batch must be at least 1")
+        if max_pending < 1:
+            raise ValueError("max_pending must be at least 1")
+        self.destinations = list(destinations)
+        self.window = window
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self.retry = retry
+        self.sender = sender
+        self.timeout = timeout
+        self.clock = time.monotonic
+        self.stats = {"published": 0, "dropped": 0, "batches": 0, "delivered": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+        self._routes: dict[str, tuple[int, ...]] = {}  # search fingerprint -> indices of its destinations
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="notifier", daemon=True)
+        self._worker.start()
+
+    def _count(self, **increments: int) -> None:
+        with self._stats_lock:
+            for key, value in increments.items():
+                self.stats[key] += value
+
+    def publish(self, search, jobs: Iterable[Mapping[str, Any]]) -> bool:
+        """
+        Queue the new ``jobs`` of ``search`` for its destinations without blocking.
+
+        Returns False if the event was dropped because the queue is full.
+        """
+        routes = self._routes.get(search.fingerprint)
+        if routes is None:
+            routes = tuple(index for index, destination in enumerate(self.destinations) if destination.wants(search))
+            self._routes[search.fingerprint] = routes
+        summaries = [dict({field: job.get(field) for field in SUMMARY_FIELDS}, search=search.name) for job in jobs]
+        if not routes or not summaries:
+            return True
+        if self._closed:
+            raise RuntimeError("Notifier is closed")
+        try:
+            self._queue.put_nowait((routes, summaries))
+        except queue.Full:
+            self._count(dropped=len(summaries))
+            return False
+        self._count(published=len(summaries))
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Deliver everything published so far now; returns False if that took longer than ``timeout``."""
+        if self._closed:
+            return not self._worker.is_alive()
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Deliver what's waiting and stop the worker."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+        self._worker.join(timeout)
+
+    def _run(self) -> None:
+        pending: dict[int, list[dict[str, Any]]] = {}  # destination index -> waiting jobs
+        due: dict[int, float] = {}  # destination index -> when its batch must go out
+        # destination index -> (retry time, attempt number, failed batch and the jobs after it)
+        retrying: dict[int, tuple[float, int, list[dict[str, Any]]]] = {}
+        waiters: list[Any] = []  # flush events and _STOP, released once nothing is pending or retrying
+        while True:
+            deadlines = [when for index, when in due.items() if index not in retrying]
+            deadlines.extend(retry_at for retry_at, _, _ in retrying.values())
+            wait = max(0.0, min(deadlines) - self.clock()) if deadlines else None
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                item = None
+            if item is _STOP or isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not None:
+                routes, summaries = item
+                for index in routes:
+                    batch = pending.setdefault(index, [])
+                    batch.extend(summaries)
+                    if len(batch) > self.max_pending:
+                        overflow = len(batch) - self.max_pending
+                        del batch[:overflow]
+                        self._count(dropped=overflow)
+                    due.setdefault(index, self.clock() + self.window)
+            now = self.clock()
+            for index, (retry_at, attempt, jobs) in list(retrying.items()):
+                if retry_at <= now:
+                    del retrying[index]
+                    self._deliver(index, jobs, retrying, attempt)
+            ready = [
+                index
+                for index, batch in pending.items()
+                if index not in retrying and (waiters or len(batch) >= self.max_batch or due[index] <= now)
+            ]
+            for index in ready:
+                del due[index]
+                self._deliver(index, pending.pop(index), retrying)
+            if waiters and not pending and not retrying:
+                for waiter in waiters:
+                    if waiter is not _STOP:
+                        waiter.set()
+                if _STOP in waiters:
+                    return
+                waiters.clear()
+
+    def _deliver(self, index: int, jobs: list[dict[str, Any]], retrying: dict, attempt: int = 1) -> None:
+        """POST ``jobs`` in batches; a retryable failure parks the rest in ``retrying`` until its backoff ends."""
+        url = self.destinations[index].url
+        for start in range(0, len(jobs), self.max_batch):
+            batch = jobs[start : start + self.max_batch]
+            searches: dict[str, int] = {}
+            for job in batch:
+                searches[job["search"]] = searches.get(job["search"], 0) + 1
+            payload = {"count": len(batch), "searches": searches, "jobs": batch}
+            try:
+                self.sender(url, payload, self.timeout)
+            except FetchError as e:
+                if self.retry is not None and self.retry.should_retry(e, attempt):
+                    retry_at = self.clock() + self.retry.delay(attempt, e.retry_after)
+                    retrying[index] = (retry_at, attempt + 1, jobs[start:])
+                    return
+                self._count(failed=len(batch))
+            except Exception as e:
+                # A broken sender or payload must not kill the worker and stall every later batch
+                print(f"[NOTIFY] Could not deliver to {url}: {e!r}", file=sys.stderr)
+                self._count(failed=len(batch))
+            else:
+                self._count(batches=1, delivered=len(batch))
+            attempt = 1
@@ -0,0 +1,51 @@
+"""
+Admin page: health of the process-wide caches shared by all sessions
+"""
+
+import streamlit as st
+
+import metrics
+from app_resources import get_metrics_server, get_resolver
+
+
+def main():
+    st.set_page_config(page_title="Admin - LinkedIn Job Searcher", page_icon="🛠️", layout="wide")
+    st.title("🛠️ Admin")
+
+    resolver = get_resolver()
+
+    st.header("Shared Resolver Cache")
+    st.caption(f"{resolver.geo_id_count} known geo IDs. Counters cover every session served by this process.")
+
+    for name, stats in resolver.stats().items():
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / lookups if lookups else 0.0
+
+        st.subheader(name.title())
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Hits", f"{stats['hits']:,}")
+        col2.metric("Misses", f"{stats['misses']:,}")
+        col3.metric("Hit Rate", f"{hit_rate:.1%}")
+        col4.metric("Entries", f"{stats['size']:,}")
+
+    if st.button("🧹 Clear caches"):
+        resolver.locations.clear()
+        resolver.facets.clear()
+        st.rerun()
+
+    st.header("Metrics")
+    server = get_metrics_server()
+    if not metrics.is_enabled():
+        st.info("Instrumentation is off. Start the app with `LINKEDIN_METRICS=1` (and optionally `LINKEDIN_METRICS_PORT`).")
+        return
+    if server is not None:
+        st.caption(f"Prometheus endpoint: http://{server.server_address[0]}:{server.server_address[1]}/metrics")
+    elif metrics.metrics_port_from_env():
+        st.warning(f"Port {metrics.metrics_port_from_env()} could not be bound for `/metrics`; see the server log.")
+    exposition = metrics.render_prometheus()
+    st.code(exposition, language=None)
+    st.download_button("⬇️ Download metrics", data=exposition, file_name="metrics.prom", mime="text/plain")
+
+
+if __name__ == "__main__":
+    main()
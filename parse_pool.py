@@ -0,0 +1,108 @@
+"""
+Process-pool parse stage for fetched results pages.
+
+Parsing job cards is pure-Python, CPU-bound work, so with several fetchers it
+serializes on the GIL. ``ParsePool`` fans pages out to worker processes: the
+raw response bytes are sent as-is (decoded only in the worker) and each page
+comes back as a list of compact tuples rather than dicts, which keeps the
+pickling cost in both directions low.
+
+``SearchPoller(parse_pool=pool)`` overlaps the two stages: ``poll_all`` hands
+each fetched page to the pool and fetches the next search while it is parsed
+(``poller.py --parse-workers N``).
+
+Example:
+    with ParsePool(workers=4) as pool:
+        poller = SearchPoller(JobStore("jobs.db"), parse_pool=pool)
+        poller.poll_all(searches)
+        ...
+        for records in pool.parse_many(pages):  # batch use, in input order
+            ...
+"""
+
+import multiprocessing
+import os
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Optional
+
+from fetch_pipeline import parse_job_cards
+
+# Field order of a compact record
+COMPACT_FIELDS = ("job_id", "title", "company", "location", "url", "posted_at")
+
+CompactRecord = tuple[int, str, str, str, str, int]
+
+
+def parse_compact(page: bytes) -> list[CompactRecord]:
+    """Parse a results page into ``COMPACT_FIELDS`` tuples (runs in the worker processes)."""
+    return [
+        (job["job_id"], job["title"], job["company"], job["location"], job["url"], job.get("posted_at", 0))
+        for job in parse_job_cards(page, fetched_at=0)
+    ]
+
+
+def expand_records(
+    records: Iterable[CompactRecord], fingerprint: str = "", fetched_at: Optional[int] = None
+) -> list[dict[str, Any]]:
+    """Turn compact records back into job dicts, as returned by ``parse_job_cards``."""
+    fetched_at = int(time.time()) if fetched_at is None else fetched_at
+    jobs = []
+    for record in records:
+        job = dict(zip(COMPACT_FIELDS, record))
+        job["search_fingerprint"] = fingerprint
+        job["fetched_at"] = fetched_at
+        jobs.append(job)
+    return jobs
+
+
+class ParsePool:
+    """
+    Parse pages in a pool of worker processes.
+
+    Workers are started with the ``spawn`` method so the pool is safe to use
+    from a process that already runs threads (metrics server, fetchers).
+
+    Args:
+        workers: Number of worker processes (default: CPU count).
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def warm(self) -> None:
+        """Start every worker process now instead of on first use."""
+        list(self._executor.map(parse_compact, [b""] * self.workers))
+
+    def parse(self, page: bytes, fingerprint: str = "", fetched_at: Optional[int] = None) -> list[dict[str, Any]]:
+        """Drop-in replacement for ``parse_job_cards`` that parses in a worker process."""
+        return self.submit(page, fingerprint, fetched_at).result()
+
+    def submit(self, page: bytes, fingerprint: str = "", fetched_at: Optional[int] = None) -> Future:
+        """Start parsing ``page`` in a worker; the future resolves to the same job dicts as ``parse``."""
+        jobs: Future = Future()
+
+        def expand(records: Future) -> None:
+            try:
+                jobs.set_result(expand_records(records.result(), fingerprint, fetched_at))
+            except BaseException as e:
+                jobs.set_exception(e)
+
+        self._executor.submit(parse_compact, page).add_done_callback(expand)
+        return jobs
+
+    def parse_many(self, pages: Iterable[bytes], chunksize: int = 1) -> Iterator[list[CompactRecord]]:
+        """Parse many pages in parallel, yielding compact records per page in input order."""
+        return self._executor.map(parse_compact, pages, chunksize=chunksize)
+
+    def close(self) -> None:
+        """Shut the worker processes down."""
+        self._executor.shutdown()
+
+    def __enter__(self) -> "ParsePool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
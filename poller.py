@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Polling daemon: periodically runs saved searches through the fetch pipeline.
+
+Examples:
+  python poller.py --searches searches.json --once --report
+  python poller.py --searches searches.json --interval 300 --metrics-port 9102
+  python poller.py --searches searches.json --once --base-url http://127.0.0.1:8765  # replay server
+  python poller.py --searches searches.json --dedup 0.8  # flag reposted near-duplicates
+  python poller.py --searches searches.json --top 5  # best keyword matches of searches with new jobs
+  python poller.py --searches searches.json --webhook https://hooks.example.com/jobs --notify-window 10
+  python poller.py --searches searches.json --coordinator /shared/shards.db  # poll this worker's shard only
+  python poller.py --searches searches.json --parse-workers 4  # parse in worker processes while fetching
+"""
+
+import argparse
+import sys
+import time
+from typing import Optional
+
+import metrics
+from fetch_pipeline import STAGES, CircuitOpenError, FetchError, SearchPoller, load_saved_searches, urllib_transport
+from job_store import DEFAULT_STORE_PATH, JobStore
+from latency_histogram import LatencyTracker
+from retry_policy import CircuitBreaker, RetryBudget, RetryPolicy
+
+
+def format_report(tracker: LatencyTracker, names: dict[str, str], limit: int = 10) -> str:
+    """Per-search, per-stage latency table, slowest searches first."""
+    summary = tracker.summary()
+    lines = [f"{'search':<30} {'stage':<6} {'count':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'total':>9}"]
+    for fingerprint, total in tracker.dominant_searches(limit):
+        label = names.get(fingerprint, fingerprint)[:30]
+        for stage in STAGES:
+            stats = summary[fingerprint].get(stage)
+            if not stats:
+                continue
+            lines.append(
+                f"{label:<30} {stage:<6} {stats['count']:>6} "
+                f"{stats['p50'] * 1000:>7.1f}ms {stats['p95'] * 1000:>7.1f}ms {stats['p99'] * 1000:>7.1f}ms "
+                f"{stats['total']:>8.2f}s"
+            )
+            label = ""
+        lines.append(f"{'':<30} {'all':<6} {'':>6} {'':>9} {'':>9} {'':>9} {total:>8.2f}s")
+    return "\n".join(lines)
+
+
+def format_notify_stats(stats: dict[str, int]) -> str:
+    """One-line summary of webhook deliveries so far."""
+    return (
+        f"[NOTIFY] {stats['delivered']} jobs sent in {stats['batches']} batches, "
+        f"{stats['failed']} failed, {stats['dropped']} dropped"
+    )
+
+
+def register_search_latency(tracker: LatencyTracker, names: dict[str, str]) -> None:
+    """Export per-search stage quantiles as a Prometheus summary."""
+
+    def collect():
+        samples = []
+        for fingerprint, stages in tracker.summary().items():
+            for stage, stats in stages.items():
+                labels = {"search": names.get(fingerprint, fingerprint), "fingerprint": fingerprint, "stage": stage}
+                for quantile, key in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+                    samples.append(("linkedin_search_stage_seconds", {**labels, "quantile": quantile}, stats[key]))
+                samples.append(("linkedin_search_stage_seconds_sum", labels, stats["total"]))
+                samples.append(("linkedin_search_stage_seconds_count", labels, stats["count"]))
+        yield "linkedin_search_stage_seconds", "summary", "Per-search pipeline stage latency", samples
+
+    metrics.REGISTRY.add_collector(collect)
+
+
+def register_resilience(poller: SearchPoller, names: dict[str, str]) -> None:
+    """Export retry counts, the retry budget and parked (circuit-open) searches."""
+
+    def collect():
+        yield "linkedin_poll_retries_total", "counter", "Fetch retries scheduled", [
+            ("linkedin_poll_retries_total", {}, float(poller.retries))
+        ]
+        if poller.retry is not None and poller.retry.budget is not None:
+            yield "linkedin_poll_retry_budget_tokens", "gauge", "Retries currently affordable", [
+                ("linkedin_poll_retry_budget_tokens", {}, poller.retry.budget.tokens)
+            ]
+        if poller.breaker is not None:
+            parked = poller.breaker.parked()
+            samples = [
+                ("linkedin_search_circuit_open", {"search": name}, 1.0 if fingerprint in parked else 0.0)
+                for fingerprint, name in names.items()
+            ]
+            yield "linkedin_search_circuit_open", "gauge", "Whether a search is parked by its circuit breaker", samples
+
+    metrics.REGISTRY.add_collector(collect)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Poll saved LinkedIn searches into the job store",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument("--searches", "-f", required=True, help="JSON file with saved search specs")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help=f"Job store path (default: {DEFAULT_STORE_PATH})")
+    parser.add_argument("--interval", type=float, default=300.0, help="Seconds between polling cycles (default: 300)")
+    parser.add_argument("--once", action="store_true", help="Run a single polling cycle and exit")
+    parser.add_argument("--timeout", type=float, default=15.0, help="Per-request timeout in seconds")
+    parser.add_argument("--report", action="store_true", help="Print per-search latency percentiles after each cycle")
+    parser.add_argument("--metrics-port", type=int, help="Serve Prometheus metrics on this port")
+    parser.add_argument("--base-url", help="Fetch from this replay server (replay_server.py) instead of LinkedIn")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Fetch attempts per search per cycle (default: 3)")
+    parser.add_argument("--backoff", type=float, default=2.0, help="Backoff ceiling for the first retry in seconds")
+    parser.add_argument(
+        "--retry-budget", type=float, default=0.2, help="Retries allowed per first attempt across all searches (default: 0.2)"
+    )
+    parser.add_argument(
+        "--breaker-threshold", type=int, default=3, help="Consecutive failures before a search is parked (default: 3)"
+    )
+    parser.add_argument(
+        "--breaker-cooldown", type=float, default=900.0, help="Seconds a failing search stays parked (default: 900)"
+    )
+    parser.add_argument(
+        "--dedup",
+        type=float,
+        nargs="?",
+        const=0.8,
+        metavar="THRESHOLD",
+        help="Flag new jobs whose text is this similar to a stored job (default threshold: 0.8)",
+    )
+    parser.add_argument("--top", type=int, metavar="N", help="After each cycle, print the N best BM25 keyword matches")
+    parser.add_argument("--webhook", action="append", default=[], metavar="URL", help="POST new jobs to this URL (repeatable)")
+    parser.add_argument("--notify-config", help="JSON file of webhook destinations, optionally per search")
+    parser.add_argument(
+        "--notify-window", type=float, default=5.0, help="Seconds to coalesce new jobs per webhook before sending (default: 5)"
+    )
+    parser.add_argument(
+        "--parse-workers", type=int, metavar="N", help="Parse pages in N worker processes while the next search is fetched"
+    )
+
+    parser.add_argument("--coordinator", help="Shard coordination database shared with other pollers (sharding.py)")
+    parser.add_argument("--worker-id", help="This poller's name in the coordinator (default: host name and PID)")
+    parser.add_argument(
+        "--shard-ttl", type=float, default=90.0, help="Seconds without a heartbeat before a worker's shard moves (default: 90)"
+    )
+    return parser
+
+
+def build_notifier(args: argparse.Namespace):
+    """``notifier.Notifier`` for ``--webhook``/``--notify-config``, or None; exits if the destinations are invalid."""
+    if not (args.webhook or args.notify_config):
+        return None
+    from notifier import Destination, Notifier, load_destinations
+
+    try:
+        destinations = load_destinations(args.notify_config) if args.notify_config else []
+        destinations += [Destination(url) for url in args.webhook]
+    except (OSError, ValueError) as e:
+        print(f"Error loading notification destinations: {e}", file=sys.stderr)
+        sys.exit(1)
+    notify_retry = RetryPolicy(args.max_attempts, base_delay=args.backoff)
+    notifier = Notifier(destinations, window=args.notify_window, retry=notify_retry)
+    print(f"[NOTIFY] {len(destinations)} webhook destinations, {args.notify_window:g}s window")
+    return notifier
+
+
+def build_poller(args: argparse.Namespace, store: JobStore) -> SearchPoller:
+    """``SearchPoller`` with the transport, retries and optional dedup, ranking, notifications and parse pool of ``args``."""
+    transport = urllib_transport
+    if args.base_url:
+        from replay_server import replay_transport
+
+        transport = replay_transport(args.base_url)
+    retry = RetryPolicy(args.max_attempts, base_delay=args.backoff, budget=RetryBudget(args.retry_budget))
+    breaker = CircuitBreaker(args.breaker_threshold, args.breaker_cooldown, max_cooldown=max(args.breaker_cooldown, 6 * 3600))
+    dedup = None
+    if args.dedup is not None:
+        from dedup import NearDuplicateIndex
+
+        dedup = NearDuplicateIndex.from_store(store, threshold=args.dedup)
+        print(f"[DEDUP] Indexed {len(dedup)} stored jobs")
+    ranker = None
+    if args.top:
+        from bm25_ranker import BM25Ranker
+
+        ranker = BM25Ranker.from_store(store)
+    notifier = build_notifier(args)
+    parse_pool = None
+    if args.parse_workers:
+        from parse_pool import ParsePool
+
+        parse_pool = ParsePool(args.parse_workers)
+        parse_pool.warm()
+        print(f"[PARSE] {parse_pool.workers} parse worker processes")
+    return SearchPoller(
+        store,
+        transport,
+        timeout=args.timeout,
+        retry=retry,
+        breaker=breaker,
+        dedup=dedup,
+        ranker=ranker,
+        notifier=notifier,
+        parse_pool=parse_pool,
+    )
+
+
+def start_coordinator(args: argparse.Namespace):
+    """Join the ``--coordinator`` shard ring as ``--worker-id`` and start heartbeats, or None without one."""
+    if not args.coordinator:
+        return None
+    from sharding import ShardCoordinator
+
+    coordinator = ShardCoordinator(args.coordinator, args.worker_id, ttl=args.shard_ttl)
+    coordinator.start()
+    print(f"[SHARD] Worker {coordinator.worker_id}, coordinator: {args.coordinator}")
+    return coordinator
+
+
+def print_cycle(poller: SearchPoller, results: dict, active: list, names: dict[str, str], top: Optional[int]) -> None:
+    """Print each search's outcome, the near-duplicates found and, with ``top``, the best new matches."""
+    for fingerprint, outcome in results.items():
+        if isinstance(outcome, CircuitOpenError):
+            print(f"[PARKED] {names[fingerprint]}: {outcome}")
+        elif isinstance(outcome, FetchError):
+            print(f"[ERROR] {names[fingerprint]}: {outcome}")
+        elif outcome:
+            print(f"[NEW] {names[fingerprint]}: {outcome} new jobs")
+    store = poller.store
+    for job_id, original_id in poller.duplicates.items():
+        job, original = store.get(job_id), store.get(original_id)
+        print(f"[DUPLICATE] {job['title']} ({job['company']}, {job_id}) ~ {original['company']}, {original_id}")
+    poller.duplicates.clear()
+    if poller.ranker is None:
+        return
+    for search in active:
+        if isinstance(results.get(search.fingerprint), int) and results[search.fingerprint]:
+            for job_id, score in poller.ranker.rank_search(search, top):
+                job = store.get(job_id)
+                print(f"[TOP] {search.name}: {score:.2f} {job['title']} | {job['company']} | {job['url']}")
+
+
+def main():
+    args = build_parser().parse_args()
+
+    try:
+        searches = load_saved_searches(args.searches)
+    except (OSError, ValueError) as e:
+        print(f"Error loading saved searches: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    names = {search.fingerprint: search.name for search in searches}
+    store = JobStore(args.store)
+    poller = build_poller(args, store)
+
+    if args.metrics_port:
+        metrics.enable()
+        register_search_latency(poller.tracker, names)
+        register_resilience(poller, names)
+        metrics.start_metrics_server(args.metrics_port)
+        print(f"[METRICS] Serving http://127.0.0.1:{args.metrics_port}/metrics")
+
+    coordinator = start_coordinator(args)
+
+    print(f"[POLL] {len(searches)} saved searches, store: {args.store}")
+    try:
+        while True:
+            started = time.monotonic()
+            active = searches
+            if coordinator is not None:
+                active = coordinator.my_searches(searches)
+                workers = len(coordinator.ring())
+                print(f"[SHARD] {coordinator.worker_id}: {len(active)} of {len(searches)} searches, {workers} workers")
+            results = poller.poll_all(active)
+            print_cycle(poller, results, active, names, args.top)
+            print(f"[POLL] Cycle finished in {time.monotonic() - started:.1f}s")
+            if args.report:
+                print(format_report(poller.tracker, names))
+            if args.once:
+                break
+            if poller.notifier is not None:
+                print(format_notify_stats(poller.notifier.stats))
+            time.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        print("\n[STOP] Poller stopped by user.")
+    finally:
+        if coordinator is not None:
+            coordinator.leave()
+        if poller.notifier is not None:
+            poller.notifier.close()
+            print(format_notify_stats(poller.notifier.stats))
+        if poller.parse_pool is not None:
+            poller.parse_pool.close()
+
+
+if __name__ == "__main__":
+    main()
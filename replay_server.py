@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Record/replay stand-in for LinkedIn job search pages.
+
+``RecordingTransport`` wraps a real transport and saves every results page it
+fetches, keyed by the builder fingerprint of the URL (so ``origin`` /
+``refresh`` don't matter). ``start_replay_server`` serves those recordings on
+localhost with configurable latency, error rate and 429 rate-limit responses,
+and ``replay_transport`` points the fetch pipeline at it, so the pipeline can
+be tested and benchmarked offline and reproducibly.
+
+Examples:
+  python replay_server.py record --searches searches.json --dir recordings
+  python replay_server.py serve --dir recordings --port 8765 --latency 0.2 --jitter 0.1 --error-rate 0.05
+  python replay_server.py serve --synthesize --rate-limit-rate 0.1 --retry-after 2
+  python poller.py --searches searches.json --once --base-url http://127.0.0.1:8765
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import random
+import sys
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+from fetch_pipeline import DEFAULT_TIMEOUT, FetchError, Transport, load_saved_searches, urllib_transport
+from linkedin_url_builder import LinkedInURLBuilder
+
+LINKEDIN_ORIGIN = "https://www.linkedin.com"
+INDEX_FILE = "index.json"
+DEFAULT_REPLAY_PORT = 8765
+
+
+def url_fingerprint(url: str) -> str:
+    """Fingerprint of the search a URL encodes (see ``LinkedInURLBuilder.fingerprint``)."""
+    return LinkedInURLBuilder.from_url(url).fingerprint()
+
+
+class Recordings:
+    """
+    Directory of recorded results pages: ``<fingerprint>.html`` plus an ``index.json`` of their URLs.
+
+    Example:
+        >>> import tempfile
+        >>> recordings = Recordings(tempfile.mkdtemp())
+        >>> fingerprint = recordings.save("https://www.linkedin.com/jobs/search/?keywords=Python", b"<html>...</html>")
+        >>> recordings.get("https://www.linkedin.com/jobs/search/?keywords=Python&refresh=true")
+        b'<html>...</html>'
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self._lock = threading.Lock()
+        try:
+            self._index: dict[str, str] = json.loads((self.directory / INDEX_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._index = {}
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, url: str) -> bool:
+        return url_fingerprint(url) in self._index
+
+    def save(self, url: str, page: bytes) -> str:
+        """Store ``page`` as the response for ``url``; returns its fingerprint."""
+        fingerprint = url_fingerprint(url)
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            (self.directory / f"{fingerprint}.html").write_bytes(page)
+            self._index[fingerprint] = url
+            index_path = self.directory / INDEX_FILE
+            tmp_path = index_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self._index, indent=2, sort_keys=True), encoding="utf-8")
+            tmp_path.replace(index_path)
+        return fingerprint
+
+    def get(self, url: str) -> Optional[bytes]:
+        """The recorded page for ``url``, or None."""
+        fingerprint = url_fingerprint(url)
+        if fingerprint not in self._index:
+            return None
+        try:
+            return (self.directory / f"{fingerprint}.html").read_bytes()
+        except OSError:
+            return None
+
+
+class RecordingTransport:
+    """Transport that fetches through ``transport`` and records every successful response."""
+
+    def __init__(self, recordings: Recordings, transport: Transport = urllib_transport):
+        self.recordings = recordings
+        self.transport = transport
+
+    def __call__(self, url: str, timeout: float = DEFAULT_TIMEOUT) -> bytes:
+        page = self.transport(url, timeout)
+        self.recordings.save(url, page)
+        return page
+
+
+def synthetic_results_page(url: str, count: int = 25) -> bytes:
+    """
+    A deterministic results page for ``url`` in LinkedIn's guest search markup.
+
+    The same search always yields the same job IDs, titles and dates.
+    """
+    params = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(url).query))
+    keywords = params.get("keywords", "Software Engineer")
+    location = params.get("location", "Remote")
+    seed = int(hashlib.sha1(url_fingerprint(url).encode("ascii")).hexdigest()[:12], 16)
+    rng = random.Random(seed)
+    cards = []
+    for index in range(count):
+        job_id = 3_000_000_000 + (seed + index * 7919) % 1_000_000_000
+        day = 1 + rng.randrange(28)
+        cards.append(
+            f'<li><div class="base-card job-search-card" data-entity-urn="urn:li:jobPosting:{job_id}">'
+            f'<a class="base-card__full-link" href="{LINKEDIN_ORIGIN}/jobs/view/{job_id}?refId=replay"></a>'
+            f'<h3 class="base-search-card__title">{html.escape(keywords)} {index + 1}</h3>'
+            f'<h4 class="base-search-card__subtitle"><a href="#">Company {rng.randrange(1000)}</a></h4>'
+            f'<span class="job-search-card__location">{html.escape(location)}</span>'
+            f'<time class="job-search-card__listdate" datetime="2024-05-{day:02d}">{day} days ago</time>'
+            "</div></li>"
+        )
+    return ('<ul class="jobs-search__results-list">' + "".join(cards) + "</ul>").encode("utf-8")
+
+
+class ReplayBehavior:
+    """
+    How the stand-in server misbehaves.
+
+    Args:
+        latency: Seconds added to every response.
+        jitter: Extra random latency, uniform in ``[0, jitter]`` seconds.
+        error_rate: Fraction of requests answered with HTTP 500.
+        rate_limit_rate: Fraction of requests answered with HTTP 429 and ``Retry-After``.
+        retry_after: ``Retry-After`` value (seconds) sent with 429 responses.
+        synthesize: Serve ``synthetic_results_page`` for searches that weren't recorded (else 404).
+        seed: Seed for the latency/error draws, for reproducible runs.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: int = 1,
+        synthesize: bool = False,
+        seed: Optional[int] = None,
+    ):
+        if not 0 <= error_rate + rate_limit_rate <= 1:
+            raise ValueError("error_rate + rate_limit_rate must be between 0 and 1")
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.synthesize = synthesize
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def draw(self) -> tuple[float, Optional[int]]:
+        """Delay for the next request and the failure status to answer with, if any."""
+        with self._lock:
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            roll = self._rng.random()
+        if roll < self.error_rate:
+            return delay, 500
+        if roll < self.error_rate + self.rate_limit_rate:
+            return delay, 429
+        return delay, None
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    recordings: Optional[Recordings] = None
+    behavior: ReplayBehavior = ReplayBehavior()
+
+    def do_GET(self):  # noqa: N802 (http.server naming)
+        server = self.server
+        with server.stats_lock:
+            server.stats["requests"] += 1
+
+        delay, failure = self.behavior.draw()
+        if delay:
+            time.sleep(delay)
+        if failure == 429:
+            self._respond(429, b"Too Many Requests", {"Retry-After": str(self.behavior.retry_after)})
+            return
+        if failure:
+            self._respond(failure, b"Internal Server Error")
+            return
+
+        url = LINKEDIN_ORIGIN + self.path
+        page = self.recordings.get(url) if self.recordings is not None else None
+        if page is None and self.behavior.synthesize:
+            page = synthetic_results_page(url)
+        if page is None:
+            self._respond(404, b"No recording for this search")
+            return
+        self._respond(200, page, {"Content-Type": "text/html; charset=utf-8"})
+
+    def _respond(self, status: int, body: bytes, headers: Optional[dict[str, str]] = None) -> None:
+        with self.server.stats_lock:
+            self.server.stats[status] = self.server.stats.get(status, 0) + 1
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_replay_server(
+    recordings: Optional[Recordings] = None,
+    port: int = 0,
+    host: str = "127.0.0.1",
+    behavior: Optional[ReplayBehavior] = None,
+) -> ThreadingHTTPServer:
+    """
+    Serve recorded pages on a daemon thread; returns the server (call ``shutdown()`` to stop).
+
+    ``port=0`` picks a free port; the chosen address is in ``server.base_url``.
+    ``server.stats`` counts requests and responses per status code.
+    """
+    handler = type("ReplayHandler", (_ReplayHandler,), {"recordings": recordings, "behavior": behavior or ReplayBehavior()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.stats = {"requests": 0}
+    server.stats_lock = threading.Lock()
+    server.base_url = f"http://{host}:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, name=f"replay-{server.server_address[1]}", daemon=True)
+    thread.start()
+    return server
+
+
+def replay_transport(base_url: str, transport: Transport = urllib_transport) -> Transport:
+    """Transport that sends LinkedIn URLs to ``base_url`` (a replay server) instead."""
+    base_url = base_url.rstrip("/")
+
+    def fetch(url: str, timeout: float = DEFAULT_TIMEOUT) -> bytes:
+        if url.startswith(LINKEDIN_ORIGIN):
+            url = base_url + url[len(LINKEDIN_ORIGIN) :]
+        return transport(url, timeout)
+
+    return fetch
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Record LinkedIn search pages and replay them from a local server",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record = subparsers.add_parser("record", help="Fetch saved searches from LinkedIn and record the pages")
+    record.add_argument("--searches", "-f", required=True, help="JSON file with saved search specs")
+    record.add_argument("--dir", default="recordings", help="Recordings directory (default: recordings)")
+    record.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-request timeout in seconds")
+
+    serve = subparsers.add_parser("serve", help="Replay recorded pages on localhost")
+    serve.add_argument("--dir", default="recordings", help="Recordings directory (default: recordings)")
+    serve.add_argument("--host", default="127.0.0.1", help="Interface to listen on (default: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=DEFAULT_REPLAY_PORT, help=f"Port (default: {DEFAULT_REPLAY_PORT})")
+    serve.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    serve.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, up to this many seconds")
+    serve.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    serve.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 429")
+    serve.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429 responses")
+    serve.add_argument("--synthesize", action="store_true", help="Serve synthetic pages for searches not recorded")
+    serve.add_argument("--seed", type=int, help="Seed for reproducible latency and error draws")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        try:
+            searches = load_saved_searches(args.searches)
+        except (OSError, ValueError) as e:
+            print(f"Error loading saved searches: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        transport = RecordingTransport(Recordings(args.dir))
+        failed = 0
+        for search in searches:
+            try:
+                page = transport(search.url, args.timeout)
+                print(f"[RECORD] {search.name}: {len(page)} bytes")
+            except FetchError as e:
+                failed += 1
+                print(f"[ERROR] {search.name}: {e}")
+        print(f"[RECORD] {len(searches) - failed}/{len(searches)} searches recorded in {args.dir}")
+        sys.exit(1 if failed else 0)
+
+    try:
+        behavior = ReplayBehavior(
+            args.latency, args.jitter, args.error_rate, args.rate_limit_rate, args.retry_after, args.synthesize, args.seed
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    recordings = Recordings(args.dir)
+    server = start_replay_server(recordings, args.port, args.host, behavior)
+    print(f"[REPLAY] {len(recordings)} recorded searches at {server.base_url}")
+    print("[INFO] Press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"\n[STOP] Replay server stopped. Responses: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
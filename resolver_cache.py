@@ -0,0 +1,175 @@
+"""
+Shared, thread-safe lookup cache for location and facet resolution.
+
+One ``SharedResolver`` is meant to live for the whole process (the web app
+creates it through ``st.cache_resource``) and be handed to every
+``LinkedInURLBuilder`` so concurrent sessions reuse the same geo ID, location
+alias and facet code lookups instead of rebuilding them per session.
+
+Only the steps that cost more than a dict lookup are memoized: normalizing a
+location alias to its key and encoding facet option names. Those are pure
+functions, so ``MemoTable`` can serve hits without taking a lock. The geo ID
+lookup itself is a dict access and stays uncached, which is why registering
+new geo IDs doesn't invalidate anything.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable, Mapping
+from typing import Any, Callable, Optional
+
+from linkedin_url_builder import LinkedInURLBuilder
+
+DEFAULT_MAX_ENTRIES = 10_000
+
+
+class LookupCache:
+    """Bounded LRU cache with hit/miss counters, safe to share between threads."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, computing and storing it on a miss."""
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+            generation = self._generation
+
+        # Compute outside the lock: lookups are pure, so a concurrent duplicate is harmless
+        value = compute()
+        with self._lock:
+            if generation != self._generation:
+                # Cleared while computing; the value may be stale, so don't keep it
+                return value
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self, reset_stats: bool = True) -> None:
+        """Drop all entries and, unless told otherwise, reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            if reset_stats:
+                self.hits = 0
+                self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+class MemoTable:
+    """
+    Bounded memo table for a pure function of one hashable argument.
+
+    Hits are a plain dict read with no lock; misses compute outside the lock and
+    store under it, evicting the oldest entry once ``max_entries`` is reached.
+    The unlocked read is safe because a single ``dict.__getitem__`` is atomic
+    (under the GIL, and behind the dict's own lock on free-threaded builds),
+    every write happens under ``_lock``, and ``clear`` swaps in a new dict rather
+    than emptying the one a reader may hold. A reader racing an eviction either
+    gets the value or a ``KeyError`` and recomputes it, which is harmless for a
+    pure function. The hit counter is updated without a lock, so it may
+    undercount slightly while threads race; it only feeds the admin page and
+    metrics.
+    """
+
+    def __init__(self, compute: Callable[[Hashable], Any], max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.compute = compute
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Return ``compute(key)``, from the table when it has been computed before."""
+        # Lock-free on purpose, see the class docstring
+        try:
+            value = self._entries[key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            return value
+        value = self.compute(key)
+        with self._lock:
+            self.misses += 1
+            # Only this lock inserts, so iterating for the oldest key is safe next to lock-free reads
+            while len(self._entries) >= self.max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = value
+        return value
+
+    def clear(self, reset_stats: bool = True) -> None:
+        """Drop all entries and, unless told otherwise, reset the counters."""
+        with self._lock:
+            self._entries = {}
+            if reset_stats:
+                self.hits = 0
+                self.misses = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss counters and the current size."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+class SharedResolver:
+    """
+    Process-wide resolver for geo IDs, location aliases and facet codes.
+
+    Example:
+        >>> resolver = SharedResolver()
+        >>> LinkedInURLBuilder(resolver=resolver).set_location_by_name("USA").params["geoId"]
+        '103644278'
+    """
+
+    def __init__(self, geo_ids: Optional[Mapping[str, str]] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self._geo_ids = dict(LinkedInURLBuilder.VERIFIED_GEO_IDS)
+        if geo_ids:
+            self._geo_ids.update(geo_ids)
+        self._geo_lock = threading.Lock()
+        # Location name -> normalized key, and (param, option names) -> facet codes
+        self.locations = MemoTable(LinkedInURLBuilder.normalize_location_key, max_entries)
+        self.facets = MemoTable(lambda key: LinkedInURLBuilder.encode_facet(key[0], key[1]), max_entries)
+
+    def resolve_location(self, location_name: str) -> Optional[str]:
+        """Return the geo ID for a location name, or None to fall back to a text location."""
+        return self._geo_ids.get(self.locations.get(location_name))
+
+    def encode_facet(self, param: str, values: list[str]) -> str:
+        """Return LinkedIn codes for facet option names (see ``LinkedInURLBuilder.encode_facet``)."""
+        return self.facets.get((param, tuple(values)))
+
+    def add_geo_ids(self, geo_ids: Mapping[str, str]) -> None:
+        """Register additional location key -> geo ID pairs (later lookups see them immediately)."""
+        with self._geo_lock:
+            merged = dict(self._geo_ids)
+            merged.update(geo_ids)
+            self._geo_ids = merged
+
+    @property
+    def geo_id_count(self) -> int:
+        """Number of known location key -> geo ID pairs."""
+        return len(self._geo_ids)
+
+    def new_builder(self) -> LinkedInURLBuilder:
+        """Create a builder that resolves through this cache."""
+        return LinkedInURLBuilder(resolver=self)
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Return counters for each cache, keyed by cache name."""
+        return {"locations": self.locations.stats(), "facets": self.facets.stats()}
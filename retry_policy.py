@@ -0,0 +1,203 @@
+"""
+Retry, backoff and circuit breaking for polling saved searches.
+
+``RetryPolicy`` decides whether a failed fetch is worth retrying and how long
+to wait (exponential backoff with full jitter, never less than the server's
+``Retry-After``). ``RetryBudget`` caps retries to a fraction of first attempts
+so a few failing searches can't spend the whole request budget.
+``CircuitBreaker`` parks a search after repeated consecutive failures and lets
+a single trial request through once its cooldown has passed.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+from fetch_pipeline import CircuitOpenError, FetchError
+
+# HTTP statuses worth retrying (network errors without a status are retried too)
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to ``ratio`` of first attempts.
+
+    Every first attempt deposits ``ratio`` tokens (up to ``max_tokens``) and
+    every retry withdraws one; the bucket starts with ``min_tokens`` so a quiet
+    poller can still retry.
+
+    Example:
+        >>> budget = RetryBudget(ratio=0.5, min_tokens=0)
+        >>> budget.record_attempt(); budget.record_attempt()
+        >>> budget.try_spend(), budget.try_spend()
+        (True, False)
+    """
+
+    def __init__(self, ratio: float = 0.2, min_tokens: float = 3.0, max_tokens: float = 50.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = min(min_tokens, max_tokens)
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+    def record_attempt(self) -> None:
+        """Credit the budget for a first (non-retry) attempt."""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one retry from the budget; False when it is exhausted."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter.
+
+    The n-th retry waits a uniform random time in ``[0, min(max_delay, base_delay * multiplier ** (n - 1))]``,
+    but at least the server's ``Retry-After``.
+
+    Args:
+        max_attempts: Attempts per search per cycle, including the first.
+        base_delay: Backoff ceiling for the first retry, in seconds.
+        max_delay: Upper bound of any backoff, in seconds.
+        multiplier: Growth of the ceiling per retry.
+        budget: Optional ``RetryBudget`` shared by all searches.
+        rng: Random source for the jitter (seed it for reproducible runs).
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        multiplier: float = 2.0,
+        budget: Optional[RetryBudget] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.budget = budget
+        self._rng = rng or random.Random()
+
+    @staticmethod
+    def is_retryable(error: FetchError) -> bool:
+        """Transient failures: network errors, timeouts, 429 and 5xx responses."""
+        if isinstance(error, CircuitOpenError):
+            return False
+        return error.status is None or error.status in RETRYABLE_STATUSES
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait after failed attempt number ``attempt`` (1-based)."""
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        wait = self._rng.uniform(0, ceiling)
+        if retry_after is not None:
+            wait = max(wait, min(retry_after, self.max_delay))
+        return wait
+
+    def should_retry(self, error: FetchError, attempt: int) -> bool:
+        """Whether to schedule another attempt (spends from the budget if there is one)."""
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return False
+        return self.budget is None or self.budget.try_spend()
+
+
+class CircuitBreaker:
+    """
+    Per-search circuit breaker keyed by search fingerprint.
+
+    After ``failure_threshold`` consecutive failures a search is parked
+    (open) for ``cooldown`` seconds. The first request after that is a trial
+    (half-open): success closes the circuit, failure parks the search again
+    with the cooldown doubled, up to ``max_cooldown``.
+
+    Example:
+        >>> breaker = CircuitBreaker(failure_threshold=2, cooldown=60)
+        >>> breaker.record_failure("abc"); breaker.record_failure("abc")
+        >>> breaker.allow("abc")
+        False
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        cooldown: float = 300.0,
+        max_cooldown: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+        # fingerprint -> [consecutive failures, open until, current cooldown, trial in flight]
+        self._circuits: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def state(self, fingerprint: str) -> str:
+        """``closed``, ``open`` or ``half-open``."""
+        with self._lock:
+            circuit = self._circuits.get(fingerprint)
+            if circuit is None or circuit[1] is None:
+                return CLOSED
+            return OPEN if self.clock() < circuit[1] else HALF_OPEN
+
+    def retry_in(self, fingerprint: str) -> float:
+        """Seconds until a parked search gets its trial request (0 if not parked)."""
+        with self._lock:
+            circuit = self._circuits.get(fingerprint)
+            if circuit is None or circuit[1] is None:
+                return 0.0
+            return max(0.0, circuit[1] - self.clock())
+
+    def allow(self, fingerprint: str) -> bool:
+        """Whether a request for the search may go out now."""
+        with self._lock:
+            circuit = self._circuits.get(fingerprint)
+            if circuit is None or circuit[1] is None:
+                return True
+            if self.clock() < circuit[1] or circuit[3]:
+                return False
+            circuit[3] = True  # let exactly one trial through
+            return True
+
+    def record_success(self, fingerprint: str) -> None:
+        with self._lock:
+            self._circuits.pop(fingerprint, None)
+
+    def record_failure(self, fingerprint: str) -> None:
+        with self._lock:
+            circuit = self._circuits.setdefault(fingerprint, [0, None, self.cooldown, False])
+            circuit[0] += 1
+            if circuit[3]:  # failed trial: park again for longer
+                circuit[2] = min(circuit[2] * 2, self.max_cooldown)
+            elif circuit[0] < self.failure_threshold:
+                return
+            circuit[1] = self.clock() + circuit[2]
+            circuit[3] = False
+
+    def parked(self) -> dict[str, float]:
+        """``{fingerprint: seconds until trial}`` for every search whose circuit is open."""
+        now = self.clock()
+        with self._lock:
+            return {
+                fingerprint: circuit[1] - now
+                for fingerprint, circuit in self._circuits.items()
+                if circuit[1] is not None and now < circuit[1]
+            }
@@ -0,0 +1,77 @@
+"""
+Synthetic search specs drawn from the builder's parameter space.
+
+Used by the load generator, benchmarks and memory tests to produce realistic,
+reproducible mixes of keywords, locations, time filters, sort orders and
+facets without materializing them up front.
+"""
+
+import random
+from collections.abc import Iterator
+from typing import Optional
+
+from linkedin_url_builder import LinkedInURLBuilder
+
+KEYWORDS = (
+    "Python Developer",
+    "Software Engineer",
+    "Data Scientist",
+    "Data Engineer",
+    "DevOps Engineer",
+    "Product Manager",
+    "Kotlin Android Developer",
+    "Frontend Developer React",
+    "Machine Learning Engineer",
+    "Site Reliability Engineer",
+    "C++ Embedded Engineer",
+    "Director Sales Operations",
+)
+
+LOCATIONS = (
+    "Turkey (All)",
+    "Ankara",
+    "Istanbul",
+    "Izmir",
+    "United States (All)",
+    "USA",
+    "New York",
+    "San Francisco",
+    "London",
+    "Berlin",
+    "Remote",
+)
+
+
+def _subset(rng: random.Random, options: list[str], probability: float) -> str:
+    if rng.random() >= probability:
+        return ""
+    return ",".join(rng.sample(options, rng.randint(1, min(3, len(options)))))
+
+
+def random_spec(rng: random.Random) -> dict[str, str]:
+    """One search spec; roughly mirrors how the web UI is used (most fields optional)."""
+    spec = {
+        "keywords": rng.choice(KEYWORDS),
+        "time_filter": rng.choice(list(LinkedInURLBuilder.TIME_FILTERS)),
+        "sort_by": rng.choice(list(LinkedInURLBuilder.SORT_OPTIONS)),
+    }
+    if rng.random() < 0.8:
+        spec["location"] = rng.choice(LOCATIONS)
+    if rng.random() < 0.3:
+        spec["distance"] = str(rng.choice((5, 10, 25, 50, 100)))
+    facets = {
+        "experience_levels": _subset(rng, list(LinkedInURLBuilder.EXPERIENCE_LEVELS), 0.5),
+        "job_types": _subset(rng, list(LinkedInURLBuilder.JOB_TYPES), 0.4),
+        "remote_options": _subset(rng, list(LinkedInURLBuilder.REMOTE_OPTIONS), 0.6),
+    }
+    spec.update({key: value for key, value in facets.items() if value})
+    return spec
+
+
+def iter_search_mix(count: Optional[int] = None, seed: int = 0) -> Iterator[dict[str, str]]:
+    """Yield ``count`` specs (endlessly if None); the same seed always gives the same mix."""
+    rng = random.Random(seed)
+    produced = 0
+    while count is None or produced < count:
+        yield random_spec(rng)
+        produced += 1
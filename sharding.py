@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Sharded polling: spread saved searches over worker processes and machines.
+
+Workers register in a small SQLite coordination database (``ShardCoordinator``)
+and send heartbeats from a background thread. Each worker builds the same consistent-hash
+ring (``HashRing``) from the live workers and polls only the searches whose
+fingerprints land on it. When a worker joins, or stops sending heartbeats for
+``ttl`` seconds, the ring changes and only about ``1/workers`` of the searches
+move.
+
+While workers briefly disagree about the ring, a fingerprint could map to
+two of them. To keep shards disjoint, a worker must also claim a search in the
+database before polling it. A claim is a lease that its owner renews with
+every heartbeat, and another worker can take the search over once the lease
+expires (the owner died) or the owner releases it (the ring moved it away).
+
+Workers on other machines take part by opening the same database on a shared
+filesystem. The coordinator uses SQLite's rollback journal, which (unlike WAL)
+works across hosts as long as the filesystem has working file locks; avoid NFS
+mounts without them. Each machine should keep its own job store on a local
+disk (``poller.py --store``), since the store uses WAL.
+
+Command line (four local workers; add more with ``poller.py --coordinator`` elsewhere):
+    python sharding.py --searches searches.json --coordinator shards.db --workers 4
+    python poller.py --searches searches.json --coordinator /shared/shards.db --worker-id host-b
+
+Example:
+    >>> ring = HashRing(["worker-1", "worker-2", "worker-3"])
+    >>> ring.node_for("3f2a9c0d1b7e6f54") in ring.nodes
+    True
+"""
+
+import argparse
+import bisect
+import hashlib
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_REPLICAS = 128
+DEFAULT_TTL = 90.0
+DEFAULT_COORDINATOR_PATH = "shards.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    heartbeat REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS claims (
+    fingerprint TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    lease_until REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_claims_owner ON claims (owner);
+"""
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+
+class HashRing:
+    """
+    Consistent hashing of keys onto nodes, ``replicas`` virtual points per node.
+
+    Adding or removing a node only moves the keys between it and its
+    neighbours on the ring, about ``1/len(nodes)`` of them.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = DEFAULT_REPLICAS):
+        self.replicas = replicas
+        self._points: list[int] = []
+        self._owners: list[str] = []
+        self.nodes: set[str] = set()
+        for node in nodes:
+            self.add(node)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self.nodes
+
+    def add(self, node: str) -> None:
+        if node in self.nodes:
+            return
+        self.nodes.add(node)
+        for replica in range(self.replicas):
+            point = _hash(f"{node}#{replica}")
+            index = bisect.bisect(self._points, point)
+            self._points.insert(index, point)
+            self._owners.insert(index, node)
+
+    def remove(self, node: str) -> None:
+        if node not in self.nodes:
+            return
+        self.nodes.discard(node)
+        kept = [(point, owner) for point, owner in zip(self._points, self._owners) if owner != node]
+        self._points = [point for point, _ in kept]
+        self._owners = [owner for _, owner in kept]
+
+    def node_for(self, key: str) -> str:
+        """The node owning ``key``: the first virtual point clockwise from its hash."""
+        if not self._points:
+            raise LookupError("Hash ring has no nodes")
+        index = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[index]
+
+    def assign(self, keys: Iterable[str]) -> dict[str, list[str]]:
+        """``{node: keys it owns}`` for every node (nodes without keys map to an empty list)."""
+        shards: dict[str, list[str]] = {node: [] for node in self.nodes}
+        for key in keys:
+            shards[self.node_for(key)].append(key)
+        return shards
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class ShardCoordinator:
+    """
+    SQLite-backed membership and search claims for one worker.
+
+    Args:
+        path: Coordination database, shared by every worker.
+        worker_id: This worker's name (host name and PID by default).
+        ttl: Seconds without a heartbeat after which a worker counts as dead.
+        lease: Seconds a claim lasts without renewal (default: ``ttl``).
+        replicas: Virtual points per worker on the hash ring.
+
+    Example:
+        coordinator = ShardCoordinator("shards.db")
+        coordinator.start()
+        while True:
+            poller.poll_all(coordinator.my_searches(searches))
+            time.sleep(300)
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_COORDINATOR_PATH,
+        worker_id: Optional[str] = None,
+        ttl: float = DEFAULT_TTL,
+        lease: Optional[float] = None,
+        replicas: int = DEFAULT_REPLICAS,
+    ):
+        self.path = path
+        self.worker_id = worker_id or default_worker_id()
+        self.ttl = ttl
+        self.lease = ttl if lease is None else lease
+        self.replicas = replicas
+        self.clock = time.time
+        self.rebalances = 0
+        self._ring: Optional[HashRing] = None
+        self._stopped = threading.Event()
+        self._heartbeats: Optional[threading.Thread] = None
+        self._conn = sqlite3.connect(path, timeout=30.0, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            # Not WAL: its shared-memory index only works on one host, and other machines join over a network filesystem
+            self._conn.execute("PRAGMA journal_mode = DELETE")
+            self._conn.executescript(_SCHEMA)
+
+    def heartbeat(self) -> None:
+        """Register this worker or refresh its heartbeat, and renew the leases it holds."""
+        now = self.clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO workers (worker_id, heartbeat) VALUES (?, ?) "
+                "ON CONFLICT (worker_id) DO UPDATE SET heartbeat = excluded.heartbeat",
+                (self.worker_id, now),
+            )
+            self._conn.execute("UPDATE claims SET lease_until = ? WHERE owner = ?", (now + self.lease, self.worker_id))
+
+    def start(self) -> None:
+        """Heartbeat now and then every ``ttl / 3`` seconds from a daemon thread, also while a cycle is running."""
+        self.heartbeat()
+        if self._heartbeats is None:
+            self._stopped.clear()
+            self._heartbeats = threading.Thread(target=self._beat, name=f"heartbeat-{self.worker_id}", daemon=True)
+            self._heartbeats.start()
+
+    def _beat(self) -> None:
+        while not self._stopped.wait(self.ttl / 3):
+            try:
+                self.heartbeat()
+            except sqlite3.Error:
+                pass  # try again next time; missing a few beats is what the ttl allows for
+
+    def live_workers(self) -> list[str]:
+        """Workers whose heartbeat is recent, after dropping the dead ones."""
+        cutoff = self.clock() - self.ttl
+        with self._lock:
+            self._conn.execute("DELETE FROM workers WHERE heartbeat < ?", (cutoff,))
+            return [row[0] for row in self._conn.execute("SELECT worker_id FROM workers ORDER BY worker_id")]
+
+    def ring(self) -> HashRing:
+        """The hash ring of the live workers (rebuilt only when membership changes)."""
+        workers = self.live_workers()
+        if self._ring is None or self._ring.nodes != set(workers):
+            if self._ring is not None:
+                self.rebalances += 1
+            self._ring = HashRing(workers, self.replicas)
+        return self._ring
+
+    def claim(self, fingerprints: Iterable[str]) -> set[str]:
+        """
+        Take or renew the lease on ``fingerprints``; returns the ones this worker now holds.
+
+        A fingerprint held by another worker whose lease hasn't expired is not taken.
+        """
+        now = self.clock()
+        rows = [(fingerprint, self.worker_id, now + self.lease) for fingerprint in fingerprints]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO claims (fingerprint, owner, lease_until) VALUES (?, ?, ?) "
+                    "ON CONFLICT (fingerprint) DO UPDATE SET owner = excluded.owner, lease_until = excluded.lease_until "
+                    "WHERE claims.owner = excluded.owner OR claims.lease_until < ?",
+                    [(*row, now) for row in rows],
+                )
+                held = {
+                    row[0] for row in self._conn.execute("SELECT fingerprint FROM claims WHERE owner = ?", (self.worker_id,))
+                }
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return held & {row[0] for row in rows}
+
+    def release(self, fingerprints: Optional[Iterable[str]] = None) -> None:
+        """Give up claims (all of this worker's by default) so others needn't wait for the lease."""
+        with self._lock:
+            if fingerprints is None:
+                self._conn.execute("DELETE FROM claims WHERE owner = ?", (self.worker_id,))
+            else:
+                self._conn.executemany(
+                    "DELETE FROM claims WHERE owner = ? AND fingerprint = ?",
+                    [(self.worker_id, fingerprint) for fingerprint in fingerprints],
+                )
+
+    def my_searches(self, searches: Sequence):
+        """
+        Heartbeat, then return this worker's shard of ``searches`` (``SavedSearch`` objects).
+
+        Searches this worker used to own but no longer does are released.
+        """
+        self.heartbeat()
+        ring = self.ring()
+        mine, others = [], []
+        for search in searches:
+            if ring.node_for(search.fingerprint) == self.worker_id:
+                mine.append(search)
+            else:
+                others.append(search.fingerprint)
+        self.release(others)
+        held = self.claim(search.fingerprint for search in mine)
+        return [search for search in mine if search.fingerprint in held]
+
+    def leave(self) -> None:
+        """Stop heartbeats, deregister and release every claim, so the others take over at once."""
+        self._stopped.set()
+        if self._heartbeats is not None:
+            self._heartbeats.join()
+            self._heartbeats = None
+        self.release()
+        with self._lock:
+            self._conn.execute("DELETE FROM workers WHERE worker_id = ?", (self.worker_id,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def worker_command(args: argparse.Namespace, worker_id: str) -> list[str]:
+    command = [
+        sys.executable,
+        str(Path(__file__).resolve().parent / "poller.py"),
+        "--searches",
+        args.searches,
+        "--coordinator",
+        args.coordinator,
+        "--worker-id",
+        worker_id,
+        "--store",
+        args.store,
+        "--interval",
+        str(args.interval),
+    ]
+    if args.once:
+        command.append("--once")
+    if args.base_url:
+        command += ["--base-url", args.base_url]
+    return command
+
+
+def main():
+    from job_store import DEFAULT_STORE_PATH
+
+    parser = argparse.ArgumentParser(description="Run sharded saved-search pollers as local worker processes")
+    parser.add_argument("--searches", "-f", required=True, help="JSON file with saved search specs")
+    parser.add_argument(
+        "--coordinator", default=DEFAULT_COORDINATOR_PATH, help=f"Coordination database (default: {DEFAULT_COORDINATOR_PATH})"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help=f"Job store path (default: {DEFAULT_STORE_PATH})")
+    parser.add_argument("--interval", type=float, default=300.0, help="Seconds between polling cycles (default: 300)")
+    parser.add_argument("--once", action="store_true", help="Run a single polling cycle per worker and exit")
+    parser.add_argument("--base-url", help="Fetch from this replay server (replay_server.py) instead of LinkedIn")
+    parser.add_argument("--show", action="store_true", help="Print the live workers and their shard sizes, then exit")
+    args = parser.parse_args()
+
+    if args.show:
+        from fetch_pipeline import load_saved_searches
+
+        observer = ShardCoordinator(args.coordinator, worker_id="observer")
+        ring = HashRing(observer.live_workers(), observer.replicas)
+        if not ring:
+            print("[SHARDS] No live workers")
+            return
+        shards = ring.assign(search.fingerprint for search in load_saved_searches(args.searches))
+        for worker, fingerprints in sorted(shards.items()):
+            print(f"[SHARD] {worker}: {len(fingerprints)} searches")
+        return
+
+    worker_ids = [f"{socket.gethostname()}-w{index}" for index in range(args.workers)]
+    # Register every worker up front so none of them starts out owning the whole ring
+    for worker_id in worker_ids:
+        registration = ShardCoordinator(args.coordinator, worker_id)
+        registration.heartbeat()
+        registration.close()
+    processes = [subprocess.Popen(worker_command(args, worker_id)) for worker_id in worker_ids]
+    print(f"[SHARDS] Started {len(processes)} workers, coordinator: {args.coordinator}")
+    try:
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+        print("\n[STOP] Workers stopped by user.")
+
+
+if __name__ == "__main__":
+    main()
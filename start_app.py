@@ -1,61 +1,423 @@
 #!/usr/bin/env python3
 """
 LinkedIn Job Searcher - Application Starter
-Handles starting, stopping, and managing the Streamlit web application
+Handles starting, stopping, and managing the Streamlit web application.
+
+Background instances are tracked with PID files in ``.run/`` so they can be
+stopped or restarted individually without touching other Streamlit processes
+on the host. ``--instances N`` launches several instances on consecutive free
+ports (for running behind a local reverse proxy) and waits until each one
+answers its health endpoint. A PID is only signalled while its command line
+is still that of the instance it was recorded for, so a stale or reused PID
+is never touched.
 """
+
 import argparse
+import itertools
+import json
 import os
+import signal
+import socket
 import subprocess
 import sys
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Optional
+
+from metrics import INSTANCE_ENV
+from warmup import LAUNCH_TS_ENV, REPORT_ENV, update_report
+
+PROJECT_DIR = Path(__file__).parent
+RUN_DIR = PROJECT_DIR / ".run"
+DEFAULT_PORT = 8501
+HEALTH_PATH = "/_stcore/health"
+
 
+def pid_file(port: int) -> Path:
+    """Path of the PID file for the instance on ``port``."""
+    return RUN_DIR / f"streamlit-{port}.pid"
 
-def stop_streamlit():
-    """Stop running Streamlit processes using taskkill on Windows."""
+
+def read_pid(port: int) -> Optional[int]:
+    """Return the PID recorded for ``port``, or None if there is no (valid) PID file."""
+    try:
+        return int(pid_file(port).read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def is_running(pid: int) -> bool:
+    """Check whether a process with ``pid`` exists."""
     if os.name == "nt":  # Windows
+        result = subprocess.run(["tasklist", "/FI", f"PID eq {pid}"], capture_output=True, text=True)
+        return str(pid) in result.stdout
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def process_command(pid: int) -> Optional[list[str]]:
+    """
+    Command line (argv) of process ``pid``, or None if it can't be read (no such process, or no ``/proc``/``ps``).
+
+    ``/proc`` gives the exact arguments; ``ps`` only a space-joined line, so
+    there an argument containing whitespace comes back split.
+    """
+    proc = Path(f"/proc/{pid}/cmdline")
+    if proc.parent.parent.is_dir():
         try:
-            # Kill streamlit processes
-            subprocess.run(["taskkill", "/F", "/IM", "python.exe", "/FI", "WINDOWTITLE eq streamlit*"], capture_output=True)
-            subprocess.run(["taskkill", "/F", "/IM", "python.exe", "/FI", "COMMANDLINE eq *streamlit*"], capture_output=True)
-            print("[STOP] Attempted to stop Streamlit processes.")
-        except Exception as e:
-            print(f"[ERROR] Failed to stop processes: {e}")
+            raw = proc.read_bytes()
+        except OSError:
+            return None
+        return [arg.decode("utf-8", errors="replace") for arg in raw.split(b"\0")[:-1]] or None
+    if os.name == "nt":
+        return None
+    try:
+        result = subprocess.run(["ps", "-o", "command=", "-p", str(pid)], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.split() or None
+
+
+def is_managed_instance(pid: int, port: int) -> bool:
+    """
+    Check that ``pid`` is still the instance this launcher started on ``port``.
+
+    A PID file can outlive its process and the PID can be reused by an
+    unrelated one, so the process's arguments must include the warm-start
+    entry point and ``--server.port=<port>`` of ``build_command(port)``, as
+    whole arguments. Where the command line can't be read (Windows), only
+    liveness is checked.
+    """
+    if not is_running(pid):
+        return False
+    argv = process_command(pid)
+    if argv is None:
+        return os.name == "nt"
+    return str(PROJECT_DIR / "warmup.py") in argv and f"--server.port={port}" in argv
+
+
+def wait_for_exit(pid: int, timeout: float) -> bool:
+    """Poll until process ``pid`` is gone or ``timeout`` expires; True if it exited."""
+    deadline = time.monotonic() + timeout
+    while is_running(pid):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.1)
+    return True
+
+
+def wait_for_port(port: int, timeout: float) -> bool:
+    """Poll until nothing listens on ``port`` or ``timeout`` expires; True if it is free."""
+    deadline = time.monotonic() + timeout
+    while not port_is_free(port):
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.1)
+    return True
+
+
+def managed_ports() -> list[int]:
+    """Ports of all instances that have a PID file."""
+    if not RUN_DIR.exists():
+        return []
+    ports = []
+    for path in RUN_DIR.glob("streamlit-*.pid"):
+        try:
+            ports.append(int(path.stem.split("-", 1)[1]))
+        except ValueError:
+            continue
+    return sorted(ports)
+
+
+def port_is_free(port: int) -> bool:
+    """Check whether nothing is listening on ``port`` locally."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind(("127.0.0.1", port))
+        except OSError:
+            return False
+    return True
+
+
+def allocate_ports(count: int, base_port: int = DEFAULT_PORT) -> list[int]:
+    """Pick ``count`` free ports starting at ``base_port``, skipping ports that are busy or managed."""
+    taken = set(managed_ports())
+    ports = []
+    port = base_port
+    while len(ports) < count:
+        if port > 65535:
+            raise RuntimeError(f"Could not find {count} free ports starting at {base_port}")
+        if port not in taken and port_is_free(port):
+            ports.append(port)
+        port += 1
+    return ports
+
+
+def report_file(port: int) -> Path:
+    """Path of the startup timing report for the instance on ``port``."""
+    return RUN_DIR / f"startup-{port}.json"
+
+
+def build_command(port: int) -> list[str]:
+    """Streamlit command line for an instance on ``port`` (run through the warm-start entry point)."""
+    return [
+        sys.executable,
+        str(PROJECT_DIR / "warmup.py"),
+        "run",
+        str(PROJECT_DIR / "app.py"),
+        f"--server.port={port}",
+        "--server.headless=true",
+    ]
+
+
+def wait_until_ready(port: int, timeout: float = 30.0, interval: float = 0.25) -> bool:
+    """Poll the instance's health endpoint until it answers ``ok`` or ``timeout`` expires."""
+    url = f"http://127.0.0.1:{port}{HEALTH_PATH}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=interval * 4) as response:
+                if response.status == 200:
+                    return True
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            pass
+        time.sleep(interval)
+    return False
+
+
+def instance_number(port: int) -> int:
+    """Number the instance on ``port`` was launched with (kept in its startup report), 0 if unknown."""
+    try:
+        return int(json.loads(report_file(port).read_text()).get("instance", 0))
+    except (OSError, ValueError, TypeError, AttributeError):
+        return 0
+
+
+def free_instance_numbers() -> Iterator[int]:
+    """Instance numbers not used by any managed instance, lowest first."""
+    in_use = {instance_number(port) for port in managed_ports()}
+    return (number for number in itertools.count() if number not in in_use)
+
+
+def launch_env(port: int, instance: int = 0) -> dict[str, str]:
+    """
+    Environment for a new instance: launch timestamp, a fresh startup report and its number.
+
+    The number offsets per-instance ports such as ``LINKEDIN_METRICS_PORT``.
+    """
+    launched_at = time.time()
+    RUN_DIR.mkdir(exist_ok=True)
+    report_file(port).write_text(json.dumps({"port": port, "instance": instance, "launched_at": launched_at}, indent=2))
+    return {
+        **os.environ,
+        LAUNCH_TS_ENV: repr(launched_at),
+        REPORT_ENV: str(report_file(port)),
+        INSTANCE_ENV: str(instance),
+    }
+
+
+def start_instance(port: int, instance: int = 0) -> subprocess.Popen:
+    """
+    Start background instance number ``instance`` on ``port`` and record its PID file.
+
+    Raises:
+        RuntimeError: If the PID file belongs to an instance that is still running.
+    """
+    pid = read_pid(port)
+    if pid is not None and is_managed_instance(pid, port):
+        raise RuntimeError(f"An instance is already running on port {port} (PID {pid}); stop it first")
+    cmd = build_command(port)
+    env = launch_env(port, instance)
+    if os.name == "nt":  # Windows
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
+        )
     else:  # Unix/Linux
+        process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env, start_new_session=True)
+    pid_file(port).write_text(str(process.pid))
+    return process
+
+
+def wait_and_report(port: int, timeout: float = 30.0) -> Optional[float]:
+    """
+    Wait for the instance on ``port`` to become healthy and record its time-to-ready.
+
+    Returns the seconds from launch to a healthy response, or None on timeout.
+    """
+    if not wait_until_ready(port, timeout):
+        return None
+    try:
+        launched = float(json.loads(report_file(port).read_text())["launched_at"])
+    except (OSError, ValueError, KeyError):
+        return None
+    time_to_ready = round(time.time() - launched, 4)
+    update_report({"time_to_ready": time_to_ready}, str(report_file(port)))
+    return time_to_ready
+
+
+def stop_instance(port: int, timeout: float = 10.0) -> bool:
+    """
+    Stop the managed instance on ``port``: SIGTERM first, SIGKILL after ``timeout``.
+
+    Only the PID recorded in the instance's PID file (and its process group) is
+    signalled, and only while that PID is still our Streamlit instance (see
+    ``is_managed_instance``). The PID file is removed once the process is
+    known to be gone (or never was ours), so an instance that survives is
+    still tracked. Returns True if an instance was stopped.
+    """
+    pid = read_pid(port)
+    if pid is None or not is_managed_instance(pid, port):
+        pid_file(port).unlink(missing_ok=True)
+        return False
+
+    if os.name == "nt":  # Windows
+        subprocess.run(["taskkill", "/PID", str(pid), "/T", "/F"], capture_output=True)
+    else:
         try:
-            subprocess.run(["pkill", "-f", "streamlit"], capture_output=True)
-            print("[STOP] Attempted to stop Streamlit processes.")
+            if os.getpgid(pid) != pid:
+                # Instances lead their own session; anything else isn't ours to signal as a group
+                return False
+            os.killpg(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pid_file(port).unlink(missing_ok=True)
+            return False
+        if not wait_for_exit(pid, timeout):
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+    if not wait_for_exit(pid, timeout):
+        raise RuntimeError(f"Instance on port {port} (PID {pid}) is still running")
+    pid_file(port).unlink(missing_ok=True)
+    return True
+
+
+def stop_streamlit(port: Optional[int] = None):
+    """Stop one managed instance (``port``) or all of them."""
+    ports = [port] if port else managed_ports()
+    if not ports:
+        print("[STOP] No managed instances found.")
+        return
+    for instance_port in ports:
+        try:
+            if stop_instance(instance_port):
+                print(f"[STOP] Stopped instance on port {instance_port}.")
+            else:
+                print(f"[STOP] No running instance on port {instance_port} (stale PID file removed).")
         except Exception as e:
-            print(f"[ERROR] Failed to stop processes: {e}")
+            print(f"[ERROR] Failed to stop instance on port {instance_port}: {e}")
+
+
+def launch_instances(count: int, base_port: int = DEFAULT_PORT, timeout: float = 30.0) -> list[int]:
+    """Start ``count`` background instances and wait for each to pass its health check."""
+    ports = allocate_ports(count, base_port)
+    for port, instance in zip(ports, free_instance_numbers()):
+        process = start_instance(port, instance)
+        print(f"[START] Instance on port {port} (PID: {process.pid})")
+
+    ready = []
+    for port in ports:
+        time_to_ready = wait_and_report(port, timeout)
+        if time_to_ready is not None:
+            print(f"[READY] http://localhost:{port} (ready in {time_to_ready:.2f}s)")
+            ready.append(port)
+        else:
+            print(f"[ERROR] Instance on port {port} did not become healthy within {timeout:.0f}s; stopping it")
+            try:
+                stop_instance(port)
+            except RuntimeError as e:
+                print(f"[ERROR] {e}")
+    return ready
+
+
+def restart_instances(port: Optional[int] = None, timeout: float = 30.0):
+    """
+    Restart one managed instance or all of them, one at a time.
+
+    An instance is stopped, its port waited for until it is released, and the
+    new process started there must be healthy before the next one is stopped.
+    Behind a reverse proxy at most one backend is down at a time; a single
+    instance is unavailable while it restarts. The rollout stops at the first
+    instance whose port is not released within ``timeout``.
+    """
+    ports = [port] if port else managed_ports()
+    if not ports:
+        print("[RESTART] No managed instances found.")
+        return
+    for instance_port in ports:
+        instance = instance_number(instance_port)
+        try:
+            stop_instance(instance_port)
+        except RuntimeError as e:
+            print(f"[ERROR] {e}; restart aborted")
+            return
+        if not wait_for_port(instance_port, timeout):
+            print(f"[ERROR] Port {instance_port} is still in use after stopping its instance; restart aborted")
+            return
+        process = start_instance(instance_port, instance)
+        time_to_ready = wait_and_report(instance_port, timeout)
+        if time_to_ready is not None:
+            print(f"[RESTART] Instance on port {instance_port} is back in {time_to_ready:.2f}s (PID: {process.pid})")
+        else:
+            print(f"[ERROR] Instance on port {instance_port} did not become healthy after restart")
+
+
+def show_status():
+    """Print PID, liveness and health of every managed instance."""
+    ports = managed_ports()
+    if not ports:
+        print("[STATUS] No managed instances.")
+        return
+    for port in ports:
+        pid = read_pid(port)
+        alive = pid is not None and is_managed_instance(pid, port)
+        healthy = alive and wait_until_ready(port, timeout=1.0)
+        state = "healthy" if healthy else ("starting/unhealthy" if alive else "dead")
+        print(f"[STATUS] port {port}  PID {pid}  {state}")
+        try:
+            report = json.loads(report_file(port).read_text())
+        except (OSError, ValueError):
+            continue
+        timings = ", ".join(
+            f"{key}={report[key]:.2f}s"
+            for key in ("prewarm_seconds", "time_to_ready", "time_to_first_render")
+            if key in report
+        )
+        if timings:
+            print(f"         {timings}")
 
 
-def start_streamlit(background=False):
+def start_streamlit(background=False, port: int = DEFAULT_PORT):
     """Start the Streamlit application."""
-    # Prepare command
-    python_exe = sys.executable
-    cmd = [python_exe, "-m", "streamlit", "run", "app.py", "--server.port=8501"]
+    cmd = build_command(port)
 
     print("[START] Starting LinkedIn Job Searcher...")
     print(f"[INFO] Command: {' '.join(cmd)}")
 
     try:
         if background:
-            # Start in background
-            if os.name == "nt":  # Windows
-                process = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.DEVNULL,
-                    stderr=subprocess.DEVNULL,
-                    creationflags=subprocess.CREATE_NEW_PROCESS_GROUP,
-                )
-            else:  # Unix/Linux
-                process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, preexec_fn=os.setsid)
+            process = start_instance(port, next(free_instance_numbers()))
             print(f"[SUCCESS] Started in background (PID: {process.pid})")
-            print("[WEB] Access at: http://localhost:8501")
-            print("[STOP] Use 'python start_app.py --stop' to stop")
+            print(f"[WEB] Access at: http://localhost:{port}")
+            print(f"[STOP] Use 'python start_app.py --stop --port {port}' to stop")
         else:
             # Start in foreground
-            print("[WEB] Starting web interface at: http://localhost:8501")
+            print(f"[WEB] Starting web interface at: http://localhost:{port}")
             print("[INFO] Press Ctrl+C to stop")
-            subprocess.run(cmd)
+            subprocess.run(cmd, env=launch_env(port, next(free_instance_numbers())))
     except KeyboardInterrupt:
         print("\n[STOP] Application stopped by user.")
     except Exception as e:
@@ -66,14 +428,29 @@ def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(description="LinkedIn Job Searcher - Application Manager")
     parser.add_argument("--background", action="store_true", help="Run in background")
-    parser.add_argument("--stop", action="store_true", help="Stop running instances")
+    parser.add_argument("--port", type=int, help=f"Port of a single instance (default: {DEFAULT_PORT})")
+    parser.add_argument("--instances", type=int, help="Launch N background instances on free ports and wait for health")
+    parser.add_argument("--base-port", type=int, default=DEFAULT_PORT, help="First port to try with --instances")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for an instance to become healthy")
+    parser.add_argument("--stop", action="store_true", help="Stop managed instances (all, or only --port)")
+    parser.add_argument("--restart", action="store_true", help="Rolling restart of managed instances (all, or only --port)")
+    parser.add_argument("--status", action="store_true", help="Show managed instances and their startup timings")
 
     args = parser.parse_args()
 
     if args.stop:
-        stop_streamlit()
+        stop_streamlit(args.port)
+    elif args.restart:
+        restart_instances(args.port, args.timeout)
+    elif args.status:
+        show_status()
+    elif args.instances:
+        ready = launch_instances(args.instances, args.base_port, args.timeout)
+        print(f"[INFO] {len(ready)}/{args.instances} instances healthy: {', '.join(map(str, ready)) or 'none'}")
+        if len(ready) < args.instances:
+            sys.exit(1)
     else:
-        start_streamlit(background=args.background)
+        start_streamlit(background=args.background, port=args.port or DEFAULT_PORT)
 
 
 if __name__ == "__main__":
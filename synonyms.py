@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Synonym expansion of saved searches.
+
+"SWE", "Software Engineer" and "Software Developer" find different postings
+for the same role. Instead of maintaining each variant by hand, a synonym
+dictionary lists the equivalent titles once:
+
+    [["Software Engineer", "Software Developer", "SWE"], ["Kubernetes", "K8s"]]
+
+and ``SynonymExpander`` turns one spec into the specs for every variant of its
+keywords ("Senior SWE" -> "Senior Software Engineer", "Senior Software
+Developer", "Senior SWE"). Matching ignores case and accents, and longer
+synonyms win over shorter ones.
+
+Expanding large title taxonomies must not multiply the poll volume:
+
+* expansions are memoized per keyword string, so specs sharing keywords
+  (the same title in many locations) are expanded once,
+* variant specs whose URLs would be identical (same fingerprint) are
+  emitted once, even across different input specs,
+* ``combine=True`` ORs the variants into a single search instead (the
+  keywords as written in a group, multi-word synonyms as exact phrases),
+  split across URLs only when it gets too long (see
+  ``keyword_query.split_spec``),
+* ``max_variants`` caps the variants per spec.
+
+Command line (writes a saved-searches file for ``poller.py``):
+    python synonyms.py --synonyms titles.json --searches searches.json --output expanded.json --combine
+
+Example:
+    >>> expander = SynonymExpander([["Software Engineer", "Software Developer", "SWE"]])
+    >>> expander.variants("Senior SWE")
+    ('Senior SWE', 'Senior Software Engineer', 'Senior Software Developer')
+"""
+
+import argparse
+import itertools
+import json
+import sys
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+from typing import Any, Union
+
+from fetch_pipeline import load_saved_searches
+from job_index import tokenize
+from keyword_query import DEFAULT_MAX_URL_LENGTH, any_of, phrase, render, split_spec
+from linkedin_url_builder import build_from_spec
+from resolver_cache import LookupCache
+
+DEFAULT_MAX_VARIANTS = 20
+
+# Keywords with boolean syntax are left alone: substituting inside them could change their meaning
+_SYNTAX_CHARS = set('"()')
+_OPERATORS = {"AND", "OR", "NOT"}
+
+SynonymGroups = Union[Iterable[Iterable[str]], Mapping[str, Iterable[str]]]
+
+
+def load_synonyms(path: str) -> list[list[str]]:
+    """
+    Load synonym groups from JSON: a list of groups, or an object mapping a
+    title to its synonyms (``{"Software Engineer": ["SWE", "Software Developer"]}``).
+    """
+    data = json.loads(Path(path).read_text(encoding="utf-8"))
+    if isinstance(data, dict):
+        return [[title, *synonyms] for title, synonyms in data.items()]
+    if not isinstance(data, list) or not all(isinstance(group, list) for group in data):
+        raise ValueError(f"{path}: expected a list of synonym groups or an object of title -> synonyms")
+    return data
+
+
+class SynonymExpander:
+    """
+    Expand keywords and search specs with a synonym dictionary.
+
+    A term listed in several groups gets the synonyms of all of them.
+    """
+
+    def __init__(self, groups: SynonymGroups, max_variants: int = DEFAULT_MAX_VARIANTS, cache_entries: int = 10_000):
+        if isinstance(groups, Mapping):
+            groups = [[title, *synonyms] for title, synonyms in groups.items()]
+        self.max_variants = max_variants
+        self._synonyms: dict[tuple[str, ...], list[str]] = {}  # normalized term -> spellings, in dictionary order
+        for group in groups:
+            spellings = [" ".join(str(term).split()) for term in group if str(term).strip()]
+            for term in spellings:
+                key = tuple(tokenize(term))
+                if not key:
+                    continue
+                known = self._synonyms.setdefault(key, [])
+                known.extend(spelling for spelling in spellings if spelling not in known)
+        self.longest_term = max((len(key) for key in self._synonyms), default=0)
+        self.cache = LookupCache(max_entries=cache_entries)
+        self._fingerprints: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._synonyms)
+
+    def variants(self, keywords: str) -> tuple[str, ...]:
+        """Every spelling of ``keywords`` (the original first), at most ``max_variants``."""
+        key = " ".join(keywords.split())
+        return self.cache.get_or_compute(key, lambda: self._expand(key))
+
+    def _expand(self, keywords: str) -> tuple[str, ...]:
+        words = keywords.split()
+        if not words or _SYNTAX_CHARS & set(keywords) or _OPERATORS & set(words):
+            return (keywords,)
+        normalized = [tuple(tokenize(word)) for word in words]
+        # Alternatives for each segment: a matched synonym span, or a single word kept as written
+        segments: list[list[str]] = []
+        position = 0
+        while position < len(words):
+            for length in range(min(self.longest_term, len(words) - position), 0, -1):
+                key = tuple(token for word in normalized[position : position + length] for token in word)
+                spellings = self._synonyms.get(key)
+                if spellings:
+                    original = " ".join(words[position : position + length])
+                    segments.append([original] + [spelling for spelling in spellings if tuple(tokenize(spelling)) != key])
+                    position += length
+                    break
+            else:
+                segments.append([words[position]])
+                position += 1
+        variants = []
+        seen = set()
+        for combination in itertools.islice(itertools.product(*segments), self.max_variants * 4):
+            variant = " ".join(combination)
+            folded = variant.casefold()
+            if folded not in seen:
+                seen.add(folded)
+                variants.append(variant)
+                if len(variants) == self.max_variants:
+                    break
+        return tuple(variants)
+
+    def expand_spec(
+        self, spec: Mapping[str, Any], combine: bool = False, max_url_length: int = DEFAULT_MAX_URL_LENGTH
+    ) -> list[dict[str, Any]]:
+        """
+        Specs for every keyword variant of ``spec``, without duplicate URLs.
+
+        With ``combine``, the variants are ORed into one search (more than one
+        only if the URL would exceed ``max_url_length``). Specs whose URL was
+        already produced by this expander (see ``reset``) are skipped.
+        """
+        variants = self.variants(str(spec.get("keywords") or ""))
+        if combine and len(variants) > 1:
+            # The user's own keywords stay as written; only substituted spellings become phrases
+            query = any_of(variants[0], *(phrase(variant) if " " in variant else variant for variant in variants[1:]))
+            candidates = split_spec(dict(spec, keywords=render(query)), max_url_length)
+        else:
+            candidates = [dict(spec, keywords=variant) for variant in variants]
+        expanded = []
+        for candidate in candidates:
+            fingerprint = build_from_spec(candidate).fingerprint()
+            if fingerprint not in self._fingerprints:
+                self._fingerprints.add(fingerprint)
+                expanded.append(candidate)
+        return expanded
+
+    def expand_specs(
+        self, specs: Iterable[Mapping[str, Any]], combine: bool = False, max_url_length: int = DEFAULT_MAX_URL_LENGTH
+    ) -> Iterator[dict[str, Any]]:
+        """Expand many specs lazily; each distinct URL is emitted once across all of them."""
+        for spec in specs:
+            yield from self.expand_spec(spec, combine, max_url_length)
+
+    def reset(self) -> None:
+        """Forget which URLs were emitted (the expansion cache is kept)."""
+        self._fingerprints.clear()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Expand saved searches with a synonym dictionary")
+    parser.add_argument("--synonyms", required=True, help="JSON file with synonym groups")
+    parser.add_argument("--searches", "-f", required=True, help="JSON file with saved search specs")
+    parser.add_argument("--output", "-o", default="-", help="Expanded saved searches JSON (default: stdout)")
+    parser.add_argument("--combine", action="store_true", help="OR the variants into one search instead of one per variant")
+    parser.add_argument(
+        "--max-variants", type=int, default=DEFAULT_MAX_VARIANTS, help=f"Variants per search (default: {DEFAULT_MAX_VARIANTS})"
+    )
+    parser.add_argument(
+        "--max-url-length", type=int, default=DEFAULT_MAX_URL_LENGTH, help="Split combined searches above this URL length"
+    )
+    args = parser.parse_args()
+
+    try:
+        expander = SynonymExpander(load_synonyms(args.synonyms), max_variants=args.max_variants)
+        searches = load_saved_searches(args.searches)
+    except (OSError, ValueError) as e:
+        print(f"Error loading input: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    expanded = []
+    for search in searches:
+        parts = expander.expand_spec(search.spec, args.combine, args.max_url_length)
+        for index, part in enumerate(parts):
+            if len(parts) == 1:
+                label = search.name
+            elif args.combine:
+                label = f"{search.name} [{index + 1}/{len(parts)}]"
+            else:
+                label = f"{search.name} [{part['keywords']}]"
+            expanded.append({"name": label, **part})
+
+    text = json.dumps(expanded, indent=2, ensure_ascii=False) + "\n"
+    if args.output == "-":
+        sys.stdout.write(text)
+    else:
+        Path(args.output).write_text(text, encoding="utf-8")
+    stats = expander.cache.stats()
+    print(
+        f"[EXPAND] {len(searches)} searches -> {len(expanded)} "
+        f"({stats['hits']} cached expansions, {len(expander)} synonym terms)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
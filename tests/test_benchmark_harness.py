@@ -0,0 +1,30 @@
+"""
+Tests for the benchmark baseline comparison
+"""
+
+from benchmarks.harness import compare_to_baseline, load_baseline, report, save_baseline
+
+
+class TestBenchmarkHarness:
+    """Test cases for baseline storage and regression detection."""
+
+    def test_regression_needs_ratio_and_delta(self):
+        """Test that only slowdowns beyond both tolerance and min delta count."""
+        baseline = {"fast": 0.000010, "slow": 1.0, "new_metric_missing": 1.0}
+        metrics = {"fast": 0.000100, "slow": 1.6, "unbaselined": 5.0}
+
+        regressions = compare_to_baseline(metrics, baseline, tolerance=0.5, min_delta=0.001)
+
+        assert len(regressions) == 1
+        assert regressions[0].startswith("slow:")
+
+    def test_baseline_roundtrip_and_exit_code(self, tmp_path):
+        """Test that a recorded baseline is used for the pass/fail decision."""
+        path = tmp_path / "bench.json"
+        assert load_baseline(path) == {}
+
+        save_baseline(path, {"op[1000]": 0.5})
+        assert load_baseline(path) == {"op[1000]": 0.5}
+
+        assert report("bench", {"op[1000]": 0.6}, path, tolerance=0.5) == 0
+        assert report("bench", {"op[1000]": 0.9}, path, tolerance=0.5) == 1
@@ -0,0 +1,98 @@
+"""
+Tests for incremental BM25 ranking
+"""
+
+import math
+
+import pytest
+
+from bm25_ranker import BM25Ranker
+from fetch_pipeline import SavedSearch
+from job_index import tokenize
+from job_store import JobStore
+
+JOBS = [
+    {"job_id": 1, "title": "Python Developer", "company": "Acme", "search_fingerprint": "a"},
+    {"job_id": 2, "title": "Senior Python Python Engineer", "company": "Globex", "search_fingerprint": "a"},
+    {"job_id": 3, "title": "Java Developer", "company": "Initech", "search_fingerprint": "b"},
+    {
+        "job_id": 4,
+        "title": "Data Engineer",
+        "company": "Hooli",
+        "description": "Python is a plus in this long description of a data platform role",
+        "search_fingerprint": "b",
+    },
+]
+
+
+def reference_scores(jobs: list[dict], keywords: str, k1: float = 1.2, b: float = 0.75) -> dict[int, float]:
+    """BM25 computed from scratch over ``jobs`` for comparison."""
+    documents = {
+        job["job_id"]: tokenize(" ".join(job.get(field, "") for field in ("title", "company", "description"))) for job in jobs
+    }
+    average = sum(map(len, documents.values())) / len(documents)
+    scores = {}
+    for job_id, tokens in documents.items():
+        score = 0.0
+        for term in set(tokenize(keywords)):
+            df = sum(term in other for other in documents.values())
+            tf = tokens.count(term)
+            if tf:
+                idf = math.log(1 + (len(documents) - df + 0.5) / (df + 0.5))
+                score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(tokens) / average))
+        if score:
+            scores[job_id] = score
+    return scores
+
+
+@pytest.fixture
+def ranker():
+    bm25 = BM25Ranker()
+    bm25.add_jobs(JOBS)
+    return bm25
+
+
+class TestBM25Ranker:
+    """Test cases for BM25 ranking with incremental statistics."""
+
+    def test_scores_match_reference(self, ranker):
+        """Test that scores equal BM25 computed from scratch, best first."""
+        expected = reference_scores(JOBS, "python developer")
+        ranked = ranker.rank("Python developer")
+
+        assert [job_id for job_id, _ in ranked] == sorted(expected, key=expected.get, reverse=True)
+        assert dict(ranked) == pytest.approx(expected)
+        assert ranker.rank("cobol") == []
+
+    def test_limit_and_search_filter(self, ranker):
+        """Test limiting results and ranking one search's jobs against its keywords."""
+        assert len(ranker.rank("python developer", limit=2)) == 2
+        assert [job_id for job_id, _ in ranker.rank("python", search_fingerprint="b")] == [4]
+        assert ranker.rank("python", search_fingerprint="unknown") == []
+
+        search = SavedSearch("py", {"keywords": "Python"})
+        ranker.add_job({"job_id": 5, "title": "Python Developer", "search_fingerprint": search.fingerprint})
+        assert [job_id for job_id, _ in ranker.rank_search(search)] == [5]
+
+    def test_incremental_updates_match_rebuild(self, ranker):
+        """Test that adding, replacing and removing jobs gives the same scores as a rebuild."""
+        ranker.add_job({"job_id": 3, "title": "Python Backend Developer", "company": "Initech"})
+        ranker.add_job({"job_id": 6, "title": "Go Developer", "company": "Umbrella"})
+        assert ranker.remove(1)
+        assert not ranker.remove(1)
+
+        current = [dict(JOBS[1]), {"job_id": 3, "title": "Python Backend Developer", "company": "Initech"}, dict(JOBS[3])]
+        current.append({"job_id": 6, "title": "Go Developer", "company": "Umbrella"})
+        rebuilt = BM25Ranker()
+        rebuilt.add_jobs(current)
+
+        assert len(ranker) == 4
+        assert ranker.total_length == rebuilt.total_length
+        assert dict(ranker.rank("python developer")) == pytest.approx(dict(rebuilt.rank("python developer")))
+        assert dict(ranker.rank("python developer")) == pytest.approx(reference_scores(current, "python developer"))
+
+    def test_from_store(self):
+        """Test ranking every stored job."""
+        store = JobStore(":memory:")
+        store.add_jobs(JOBS)
+        assert BM25Ranker.from_store(store).rank("java")[0][0] == 3
@@ -0,0 +1,152 @@
+"""
+Tests for bulk URL generation from CSV uploads
+"""
+
+import gc
+import io
+import json
+
+import pytest
+
+from bulk_generator import BulkJob, ResultSpool, generate_into_spool, iter_chunks, iter_csv_specs
+from linkedin_url_builder import build_from_spec
+
+
+def make_csv(rows: int) -> io.StringIO:
+    lines = ["Keywords,Location,Experience_Levels,Distance"]
+    for i in range(rows):
+        lines.append(f'Engineer {i},Ankara,"entry,associate",50')
+    return io.StringIO("\n".join(lines) + "\n")
+
+
+class TestBuildFromSpec:
+    """Test cases for building URLs from flat search specs."""
+
+    def test_spec_fields_are_applied(self):
+        """Test that string values from a CSV row map onto builder parameters."""
+        builder = build_from_spec(
+            {
+                "keywords": "Data Engineer",
+                "location": "Istanbul",
+                "distance": "10",
+                "custom_hours": "1.5",
+                "experience_levels": "entry; mid_senior",
+                "remote_options": ["remote"],
+            }
+        )
+
+        assert builder.params["keywords"] == "Data Engineer"
+        assert builder.params["location"] == "Istanbul"
+        assert builder.params["distance"] == "10"
+        assert builder.params["f_TPR"] == "r5400"
+        assert builder.params["f_E"] == "2,4"
+        assert builder.params["f_WT"] == "2"
+
+    def test_geo_id_wins_over_location(self):
+        """Test that an explicit geo ID replaces the text location."""
+        builder = build_from_spec({"keywords": "x", "location": "Ankara", "geo_id": "105149290"})
+
+        assert builder.params["geoId"] == "105149290"
+        assert "location" not in builder.params
+
+    def test_non_finite_hours_are_rejected(self):
+        """Test that inf/nan custom hours raise ValueError instead of overflowing."""
+        for hours in ("inf", "nan", "-inf"):
+            with pytest.raises(ValueError):
+                build_from_spec({"keywords": "x", "custom_hours": hours})
+
+
+class TestBulkGenerator:
+    """Test cases for chunked bulk generation and the result spool."""
+
+    def test_csv_headers_are_case_insensitive(self):
+        """Test that only known columns are kept regardless of header case."""
+        stream = io.StringIO("KEYWORDS,Unknown\nPython,ignored\n")
+
+        assert list(iter_csv_specs(stream)) == [{"keywords": "Python"}]
+
+    def test_chunks_and_row_errors(self):
+        """Test chunk sizes and that bad rows are reported instead of raised."""
+        specs = [{"keywords": "a"}, {"location": "Ankara"}, {"keywords": "b", "distance": "far"}]
+        chunks = list(iter_chunks(specs, chunk_size=2))
+
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        assert chunks[0][0]["url"].startswith("https://www.linkedin.com/jobs/search/?")
+        assert chunks[0][1]["error"] == "missing keywords"
+        assert chunks[1][0]["row"] == 3
+        assert chunks[1][0]["error"]
+
+    def test_overflowing_row_is_reported(self):
+        """Test that a row whose hours overflow is an error row, not an aborted upload."""
+        chunk = next(iter_chunks([{"keywords": "x", "custom_hours": "1e308"}, {"keywords": "y"}]))
+
+        assert chunk[0]["error"]
+        assert chunk[1]["url"]
+
+    def test_spool_paging_and_exports(self):
+        """Test that results can be paged and streamed back out."""
+        spool = ResultSpool()
+        progress = list(generate_into_spool(make_csv(120), spool, chunk_size=50))
+
+        assert progress == [50, 100, 120]
+        assert spool.page_count(50) == 3
+        assert [row["row"] for row in spool.page(2, 50)] == list(range(101, 121))
+        assert spool.page(3, 50) == []
+
+        csv_lines = spool.export_file("csv").read().decode("utf-8").splitlines()
+        assert csv_lines[0] == "row,keywords,location,url,error"
+        assert len(csv_lines) == 121
+
+        jsonl = spool.export_file("jsonl").read().decode("utf-8").splitlines()
+        assert json.loads(jsonl[-1])["keywords"] == "Engineer 119"
+        spool.close()
+
+    def test_empty_spool_exports_header(self):
+        """Test that an empty upload still produces a valid CSV."""
+        spool = ResultSpool()
+
+        assert spool.export_file("csv").read() == b"row,keywords,location,url,error\r\n"
+        assert spool.page(0, 50) == []
+        spool.close()
+
+
+class TestBulkJob:
+    """Test cases for background bulk generation."""
+
+    def test_job_fills_spool_in_background(self):
+        """Test that the job generates every row and reports completion."""
+        source = io.BytesIO(make_csv(120).getvalue().encode("utf-8"))
+        job = BulkJob(source, len(source.getvalue()), chunk_size=50)
+
+        assert job.wait(10)
+        assert job.error is None
+        assert job.processed == len(job.spool) == 120
+        assert job.fraction == 1.0
+        assert not source.closed
+        job.close()
+
+    def test_exports_are_written_once_and_cleaned_up(self):
+        """Test that downloads reuse one export file per format, and a dropped job deletes its files."""
+        source = io.BytesIO(make_csv(30).getvalue().encode("utf-8"))
+        job = BulkJob(source, len(source.getvalue()))
+        assert job.wait(10)
+
+        csv_export = job.export_file("csv")
+        assert csv_export.read().count(b"\n") == 31
+        assert job.export_file("csv") is csv_export and csv_export.tell() == 0
+        jsonl_export = job.export_file("jsonl")
+        spool = job.spool
+
+        del job
+        gc.collect()
+        assert csv_export.closed and jsonl_export.closed
+        with pytest.raises(ValueError):
+            spool.page(0, 10)
+
+    def test_unreadable_upload_is_kept_as_error(self):
+        """Test that a file that isn't UTF-8 ends the job with an error instead of raising."""
+        job = BulkJob(io.BytesIO(b"keywords\n\xff\xfe\n"), 12)
+
+        assert job.wait(10)
+        assert isinstance(job.error, UnicodeDecodeError)
+        job.close()
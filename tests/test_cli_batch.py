@@ -0,0 +1,41 @@
+"""
+Tests for the CLI batch mode
+"""
+
+import json
+
+from cli import run_batch
+
+
+class TestCliBatch:
+    """Test cases for streaming a searches CSV through the CLI."""
+
+    def test_batch_to_jsonl(self, tmp_path, capsys):
+        """Test that every row is written and errors are counted."""
+        source = tmp_path / "searches.csv"
+        source.write_text("keywords,location,distance\nPython,Ankara,10\n,Izmir,\nGo,USA,far\n", encoding="utf-8")
+        output = tmp_path / "urls.jsonl"
+
+        assert run_batch(str(source), str(output), "jsonl") == 0
+
+        rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+        assert [row["row"] for row in rows] == [1, 2, 3]
+        assert "distance=10" in rows[0]["url"]
+        assert rows[1]["error"] == "missing keywords"
+        assert rows[2]["error"]
+        assert "Generated 1 URLs (2 rows with errors)" in capsys.readouterr().err
+
+    def test_batch_uses_harvested_geo_ids(self, tmp_path, monkeypatch):
+        """Test that locations in the geo ID store resolve to their geo IDs in batch output."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "geo_ids.json").write_text(json.dumps({"ankara_turkey": "105215666"}), encoding="utf-8")
+        source = tmp_path / "searches.csv"
+        source.write_text('keywords,location\nPython,"Ankara, Turkey"\n', encoding="utf-8")
+        output = tmp_path / "urls.jsonl"
+
+        assert run_batch(str(source), str(output), "jsonl") == 0
+        assert "geoId=105215666" in json.loads(output.read_text(encoding="utf-8"))["url"]
+
+    def test_missing_file(self, tmp_path):
+        """Test that an unreadable input file is reported, not raised."""
+        assert run_batch(str(tmp_path / "missing.csv")) == 1
@@ -0,0 +1,76 @@
+"""
+Tests for near-duplicate posting detection
+"""
+
+import random
+
+import pytest
+
+from dedup import NearDuplicateIndex, optimal_bands
+from job_store import JobStore
+
+WORDS = (
+    "python kotlin java data pipeline build team remote cloud aws sql analytics platform engineer senior lead "
+    "backend api design mentor ownership customers scale reliability testing review deploy kubernetes docker"
+).split()
+
+
+def posting(job_id: int, seed: int, **overrides) -> dict:
+    rng = random.Random(seed)
+    job = {
+        "job_id": job_id,
+        "title": f"{rng.choice(['Senior', 'Lead', 'Staff'])} {rng.choice(['Python', 'Kotlin', 'Data'])} Engineer",
+        "company": f"Company {seed}",
+        "description": " ".join(rng.choice(WORDS) for _ in range(80)),
+    }
+    job.update(overrides)
+    return job
+
+
+class TestNearDuplicateIndex:
+    """Test cases for MinHash/LSH near-duplicate detection."""
+
+    def test_band_layout(self):
+        """Test that the band layout fits the signature and a higher threshold needs more rows per band."""
+        bands, rows = optimal_bands(0.8, 128)
+        assert bands * rows <= 128
+        assert optimal_bands(0.9, 128)[1] > optimal_bands(0.5, 128)[1]
+        with pytest.raises(ValueError):
+            NearDuplicateIndex(threshold=0)
+
+    def test_reposts_are_flagged(self):
+        """Test that lightly edited reposts match and unrelated postings don't."""
+        index = NearDuplicateIndex()
+        assert index.add_jobs(posting(job_id, seed=job_id) for job_id in range(1, 501)) == {}
+
+        original = posting(7, seed=7)
+        repost = dict(original, job_id=1000, description=original["description"] + " apply today")
+        agency = dict(original, job_id=1001, company="Talent Agency")
+        matches = index.add_job(repost)
+
+        assert [job_id for job_id, _ in matches] == [7]
+        assert matches[0][1] >= 0.8
+        assert {job_id for job_id, _ in index.query(agency)} == {7, 1000}
+        assert index.similarity(7, 1000) >= 0.8
+
+    def test_replace_and_remove(self):
+        """Test that re-adding a job ID replaces it and removal drops it from the buckets."""
+        index = NearDuplicateIndex()
+        index.add_job(posting(1, seed=1))
+        assert index.add_job(posting(1, seed=1)) == []
+        assert len(index) == 1
+
+        assert index.remove(1)
+        assert not index.remove(1)
+        assert index.query(posting(2, seed=1)) == []
+        assert all(not buckets for buckets in index._buckets)
+        assert index.add_job({"job_id": 3}) == [] and 3 not in index
+
+    def test_from_store(self):
+        """Test indexing stored jobs and flagging duplicates among them."""
+        store = JobStore(":memory:")
+        store.add_jobs([posting(1, seed=1), posting(2, seed=2), dict(posting(1, seed=1), job_id=3, company="Recruiter")])
+        index = NearDuplicateIndex.from_store(store)
+
+        assert len(index) == 3
+        assert [job_id for job_id, _ in index.query(dict(posting(1, seed=1), job_id=4))] == [1, 3]
@@ -0,0 +1,63 @@
+"""
+Tests for offline facet filtering
+"""
+
+from facet_filter import FacetFilter, facet_params
+from job_collection import JobCollection
+from linkedin_url_builder import LinkedInURLBuilder
+
+NOW = 1_715_000_000
+DAY = 86_400
+
+JOBS = [
+    {"job_id": 1, "experience": "2", "job_type": "F", "workplace": "2", "posted_at": NOW - 2 * 3600},
+    {"job_id": 2, "experience": "4", "job_type": "F", "workplace": "1", "posted_at": NOW - 3 * DAY},
+    {"job_id": 3, "experience": "3,4", "job_type": "C", "workplace": "2,3", "posted_at": NOW - 20 * DAY},
+    {"job_id": 4, "experience": "", "job_type": "", "workplace": "", "posted_at": 0},
+]
+
+
+def job_ids(collection: JobCollection) -> list[int]:
+    return list(collection.ints["job_id"])
+
+
+class TestFacetFilter:
+    """Test cases for evaluating builder facets locally."""
+
+    def setup_method(self):
+        self.jobs = JobCollection.from_jobs(JOBS)
+        self.facets = FacetFilter(self.jobs)
+
+    def test_facet_params(self):
+        """Test that specs and builders map to the same URL facet parameters."""
+        spec = {"keywords": "Python", "experience_levels": "entry,associate", "time_filter": "1 week"}
+        builder = LinkedInURLBuilder().set_experience_level(["entry", "associate"]).set_time_filter("1 week")
+
+        assert facet_params(spec) == {"f_E": "2,3", "f_TPR": "r604800"}
+        assert facet_params(builder) == facet_params(spec)
+
+    def test_single_facets(self):
+        """Test each facet on its own, including multi-valued recorded codes."""
+        assert job_ids(self.facets.apply({"experience_levels": "mid_senior"}, NOW)) == [2, 3]
+        assert job_ids(self.facets.apply({"job_types": "contract"}, NOW)) == [3]
+        assert job_ids(self.facets.apply({"remote_options": "remote"}, NOW)) == [1, 3]
+        assert job_ids(self.facets.apply({"time_filter": "1 week"}, NOW)) == [1, 2]
+
+    def test_combined_facets_and_unknown(self):
+        """Test that facets are ANDed and unknown values are opt-in."""
+        spec = {"experience_levels": "entry,mid_senior", "job_types": "full_time", "time_filter": "24 hours"}
+        assert job_ids(self.facets.apply(spec, NOW)) == [1]
+        assert self.facets.count({}, NOW) == 4
+
+        lenient = FacetFilter(self.jobs, include_unknown=True)
+        assert job_ids(lenient.apply({"remote_options": "remote", "time_filter": "1 month"}, NOW)) == [1, 3, 4]
+
+    def test_appended_rows_and_result_collection(self):
+        """Test that later appends are seen and results keep every column."""
+        self.jobs.append({"job_id": 5, "title": "Kotlin Dev", "workplace": "2", "posted_at": NOW})
+        remote = self.facets.apply({"remote_options": "remote"}, NOW)
+
+        assert job_ids(remote) == [1, 3, 5]
+        assert remote[2].title == "Kotlin Dev"
+        assert remote[0].experience == "2"
+        assert len(FacetFilter(JobCollection()).apply({"remote_options": "remote"}, NOW)) == 0
@@ -0,0 +1,151 @@
+"""
+Tests for the fetch → parse → store pipeline
+"""
+
+import json
+
+import pytest
+
+from dedup import NearDuplicateIndex
+from fetch_pipeline import FetchError, SavedSearch, SearchPoller, load_saved_searches, parse_job_cards
+from job_store import JobStore
+from notifier import Destination, Notifier
+
+SAMPLE_PAGE = b"""
+<ul class="jobs-search__results-list">
+  <li>
+    <div class="base-card job-search-card" data-entity-urn="urn:li:jobPosting:3912345678">
+      <a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/python-dev-3912345678?refId=x"></a>
+      <h3 class="base-search-card__title">
+        Senior Python &amp; Django Developer
+      </h3>
+      <h4 class="base-search-card__subtitle"><a href="#">Acme Teknoloji</a></h4>
+      <span class="job-search-card__location">Ankara, Turkey</span>
+      <time class="job-search-card__listdate" datetime="2024-05-01">2 days ago</time>
+    </div>
+  </li>
+  <li>
+    <div class="base-card job-search-card" data-entity-urn="urn:li:jobPosting:3912345679">
+      <h3 class="base-search-card__title">Kotlin Engineer</h3>
+      <h4 class="base-search-card__subtitle">Globex</h4>
+      <span class="job-search-card__location">Istanbul, Turkey</span>
+    </div>
+  </li>
+</ul>
+"""
+
+
+class TestParser:
+    """Test cases for job card parsing."""
+
+    def test_parse_job_cards(self):
+        """Test that every field of a job card is extracted."""
+        jobs = parse_job_cards(SAMPLE_PAGE, fingerprint="abc", fetched_at=1)
+
+        assert [job["job_id"] for job in jobs] == [3912345678, 3912345679]
+        assert jobs[0]["title"] == "Senior Python & Django Developer"
+        assert jobs[0]["company"] == "Acme Teknoloji"
+        assert jobs[0]["location"] == "Ankara, Turkey"
+        assert jobs[0]["url"] == "https://www.linkedin.com/jobs/view/python-dev-3912345678"
+        assert jobs[0]["posted_at"] == 1714521600
+        assert jobs[1]["company"] == "Globex"
+        assert all(job["search_fingerprint"] == "abc" for job in jobs)
+
+    def test_malformed_urn_card_is_skipped(self):
+        """Test that a card with a non-numeric job ID is dropped without breaking the page."""
+        page = SAMPLE_PAGE.replace(b"urn:li:jobPosting:3912345678", b"urn:li:jobPosting:promoted-abc")
+        jobs = parse_job_cards(page)
+
+        assert [(job["job_id"], job["title"]) for job in jobs] == [(3912345679, "Kotlin Engineer")]
+
+    def test_empty_page(self):
+        """Test that a page without cards yields no jobs."""
+        assert parse_job_cards(b"<html><body>No matching jobs</body></html>") == []
+
+
+class TestSearchPoller:
+    """Test cases for polling saved searches."""
+
+    def test_poll_stores_new_jobs_and_tracks_stages(self):
+        """Test that only new jobs are returned and every stage is timed per search."""
+        store = JobStore(":memory:")
+        requested = []
+
+        def transport(url, timeout):
+            requested.append(url)
+            return SAMPLE_PAGE
+
+        poller = SearchPoller(store, transport=transport)
+        search = SavedSearch("py-ankara", {"keywords": "Python", "location": "Ankara"})
+
+        assert len(poller.poll_search(search)) == 2
+        assert poller.poll_search(search) == []
+        assert requested == [search.url, search.url]
+        assert store.count(search_fingerprint=search.fingerprint) == 2
+
+        stages = poller.tracker.summary(search.fingerprint)[search.fingerprint]
+        assert set(stages) == {"fetch", "parse", "store"}
+        assert stages["fetch"]["count"] == 2
+
+    def test_poll_tags_jobs_with_search_facets(self):
+        """Test that stored jobs record the facet codes their search was restricted to."""
+        store = JobStore(":memory:")
+        poller = SearchPoller(store, transport=lambda url, timeout: SAMPLE_PAGE)
+        search = SavedSearch("remote", {"keywords": "Python", "remote_options": "remote,hybrid", "job_types": "full_time"})
+
+        assert search.facets == {"job_type": "F", "workplace": "2,3"}
+        jobs = poller.poll_search(search)
+        assert all(job["workplace"] == "2,3" and job["job_type"] == "F" for job in jobs)
+        assert all(job["experience"] == "" for job in store.iter_jobs())
+
+    def test_poll_flags_near_duplicates(self):
+        """Test that a repost under a new job ID is recorded as a near-duplicate of the stored posting."""
+        store = JobStore(":memory:")
+        store.add_jobs([{"job_id": 1, "title": "Senior Python & Django Developer", "company": "Acme Teknoloji"}])
+        poller = SearchPoller(store, transport=lambda url, timeout: SAMPLE_PAGE, dedup=NearDuplicateIndex.from_store(store))
+
+        assert len(poller.poll_search(SavedSearch("py", {"keywords": "Python"}))) == 2
+        assert poller.duplicates == {3912345678: 1}
+
+    def test_poll_notifies_new_jobs_once(self):
+        """Test that new jobs are published to the notifier, and a repeat poll with nothing new isn't."""
+        sent = []
+        notifier = Notifier([Destination("http://hooks.invalid/")], sender=lambda url, payload, timeout: sent.append(payload))
+        poller = SearchPoller(JobStore(":memory:"), transport=lambda url, timeout: SAMPLE_PAGE, notifier=notifier)
+        search = SavedSearch("py", {"keywords": "Python"})
+        poller.poll_search(search)
+        poller.poll_search(search)
+        notifier.close()
+
+        assert [payload["searches"] for payload in sent] == [{"py": 2}]
+        assert [job["job_id"] for job in sent[0]["jobs"]] == [3912345678, 3912345679]
+
+    def test_poll_all_reports_failures(self):
+        """Test that a failing search doesn't stop the others."""
+
+        def transport(url, timeout):
+            if "Broken" in url:
+                raise FetchError("HTTP 500", status=500)
+            return SAMPLE_PAGE
+
+        poller = SearchPoller(JobStore(":memory:"), transport=transport)
+        broken, healthy = SavedSearch("a", {"keywords": "Broken"}), SavedSearch("b", {"keywords": "Fine"})
+        results = poller.poll_all([broken, healthy])
+
+        assert isinstance(results[broken.fingerprint], FetchError)
+        assert results[healthy.fingerprint] == 2
+
+    def test_load_saved_searches(self, tmp_path):
+        """Test loading named specs from JSON."""
+        path = tmp_path / "searches.json"
+        path.write_text(json.dumps([{"name": "py", "keywords": "Python"}, {"keywords": "Go"}]))
+
+        searches = load_saved_searches(str(path))
+
+        assert [search.name for search in searches] == ["py", "Go"]
+        assert "keywords=Python" in searches[0].url
+
+        for content in ({"name": "py", "keywords": "Python"}, ["Python"]):
+            path.write_text(json.dumps(content))
+            with pytest.raises(ValueError):
+                load_saved_searches(str(path))
@@ -0,0 +1,119 @@
+"""
+Tests for harvesting geo IDs from browser exports
+"""
+
+import gzip
+import json
+import sqlite3
+
+import pytest
+
+from geo_harvest import GeoHarvest, iter_linkedin_urls, load_geo_ids, load_resolver, merge_geo_ids, scan_urls
+from linkedin_url_builder import LinkedInURLBuilder
+from resolver_cache import SharedResolver
+
+ANKARA = "https://www.linkedin.com/jobs/search/?keywords=Python&location=Ankara%2C%20Turkey&geoId=105215666"
+BERLIN = "https://de.linkedin.com/jobs/search?keywords=Kotlin&location=Berlin&geoId=106967730&trk=public_jobs"
+
+BOOKMARKS_HTML = f"""<!DOCTYPE NETSCAPE-Bookmark-file-1>
+<DL><p>
+    <DT><A HREF="{ANKARA.replace("&", "&amp;")}" ADD_DATE="1714521600">Python jobs</A>
+    <DT><A HREF="https://www.linkedin.com/jobs/view/3912345678/">A single job</A>
+    <DT><A HREF="https://example.com/jobs/?location=Nowhere&geoId=1">Not LinkedIn</A>
+</DL><p>
+"""
+
+
+class TestScanning:
+    """Test cases for finding LinkedIn jobs URLs in exports."""
+
+    def test_urls_split_across_chunks(self):
+        """Test that every URL is found once whatever the chunk boundaries."""
+        text = ("filler " * 50 + ANKARA + '\n"' + BERLIN + '",').encode() * 3
+        for chunk_size in (1, 7, 64, len(text)):
+            chunks = [text[start : start + chunk_size] for start in range(0, len(text), chunk_size)]
+            assert list(scan_urls(chunks)) == [ANKARA, BERLIN] * 3
+
+    def test_export_formats(self, tmp_path):
+        """Test HTML bookmarks (with escaped ampersands), gzipped JSON and a Chrome history database."""
+        bookmarks = tmp_path / "bookmarks.html"
+        bookmarks.write_text(BOOKMARKS_HTML)
+        assert list(iter_linkedin_urls(str(bookmarks))) == [ANKARA, "https://www.linkedin.com/jobs/view/3912345678/"]
+
+        history = tmp_path / "history.json.gz"
+        with gzip.open(history, "wt") as handle:
+            json.dump([{"url": BERLIN, "title": "Kotlin jobs"}], handle)
+        assert list(iter_linkedin_urls(str(history), chunk_size=16)) == [BERLIN]
+
+        database = tmp_path / "History"
+        connection = sqlite3.connect(database)
+        connection.execute("CREATE TABLE urls (id INTEGER PRIMARY KEY, url TEXT)")
+        connection.executemany("INSERT INTO urls (url) VALUES (?)", [(ANKARA,), ("https://example.com/",)])
+        connection.commit()
+        connection.close()
+        assert list(iter_linkedin_urls(str(database))) == [ANKARA]
+
+    def test_locked_and_unexpected_history(self, tmp_path):
+        """Test that a history database locked by the browser is read, and schema errors other than a missing table surface."""
+        database = tmp_path / "History"
+        browser = sqlite3.connect(database)
+        browser.execute("CREATE TABLE urls (id INTEGER PRIMARY KEY, url TEXT)")
+        browser.execute("INSERT INTO urls (url) VALUES (?)", (BERLIN,))
+        browser.commit()
+        browser.execute("BEGIN EXCLUSIVE")  # what a running browser holds
+        try:
+            assert list(iter_linkedin_urls(str(database))) == [BERLIN]
+        finally:
+            browser.rollback()
+            browser.close()
+
+        broken = tmp_path / "broken.sqlite"
+        connection = sqlite3.connect(broken)
+        connection.execute("CREATE TABLE urls (id INTEGER PRIMARY KEY, address TEXT)")
+        connection.commit()
+        connection.close()
+        with pytest.raises(sqlite3.OperationalError, match="no such column"):
+            list(iter_linkedin_urls(str(broken)))
+
+
+class TestGeoHarvest:
+    """Test cases for harvesting and storing location -> geo ID pairs."""
+
+    def test_pairs_and_conflicts(self):
+        """Test that only URLs with a location and a numeric geo ID count, and the most frequent ID wins."""
+        harvest = GeoHarvest()
+        stale = ANKARA.replace("105215666", "999")
+        for url in (ANKARA, stale, ANKARA, BERLIN, "https://www.linkedin.com/jobs/search/?geoId=1", ANKARA + "x"):
+            harvest.add_url(url)
+
+        assert harvest.urls == 6
+        assert harvest.pairs_seen == 4
+        assert harvest.geo_ids() == {"ankara_turkey": "105215666", "berlin": "106967730"}
+        assert harvest.conflicts() == {"ankara_turkey": ["105215666", "999"]}
+
+    def test_merge_into_store_and_resolver(self, tmp_path):
+        """Test merging into the JSON store and resolving harvested locations through the shared resolver."""
+        path = str(tmp_path / "geo_ids.json")
+        assert load_geo_ids(path) == {}
+        assert merge_geo_ids({"berlin": "1", "ankara_turkey": "105215666"}, path) == {"added": 2, "changed": 0, "unchanged": 0}
+        assert merge_geo_ids({"berlin": "106967730", "ankara_turkey": "105215666"}, path) == {
+            "added": 0,
+            "changed": 1,
+            "unchanged": 1,
+        }
+
+        resolver = SharedResolver(load_geo_ids(path))
+        assert LinkedInURLBuilder(resolver=resolver).set_location_by_name("Ankara, Turkey").params["geoId"] == "105215666"
+        assert resolver.resolve_location("Berlin") == "106967730"
+
+    def test_load_resolver_skips_a_broken_store(self, tmp_path, capsys):
+        """Test that load_resolver serves the stored geo IDs, and only the built-in ones if the store is unreadable."""
+        path = tmp_path / "geo_ids.json"
+        merge_geo_ids({"ankara_turkey": "105215666"}, str(path))
+        assert load_resolver(str(path)).resolve_location("Ankara, Turkey") == "105215666"
+
+        path.write_text("[]", encoding="utf-8")
+        resolver = load_resolver(str(path))
+        assert resolver.resolve_location("Ankara, Turkey") is None
+        assert resolver.resolve_location("USA") == LinkedInURLBuilder.VERIFIED_GEO_IDS["united_states"]
+        assert "[GEO] Ignoring the geo ID store" in capsys.readouterr().err
@@ -0,0 +1,81 @@
+"""
+Tests for the column-oriented job collection
+"""
+
+import random
+
+import pytest
+
+from job_collection import JobCollection, JobRow, dicts_memory_bytes
+from job_store import JobStore
+
+
+def synthetic_jobs(count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "job_id": 3_900_000_000 + index,
+            "title": f"Senior Python Developer {rng.randrange(10**6)}",
+            "company": f"Company {rng.randrange(5000)}",
+            "location": rng.choice(["Ankara, Turkey", "Istanbul, Turkey", "Berlin, Germany", "Remote"]),
+            "posted_at": 1_714_521_600 + rng.randrange(10**6),
+            "url": f"https://www.linkedin.com/jobs/view/{3_900_000_000 + index}",
+            "search_fingerprint": f"{rng.randrange(50):016x}",
+            "experience": rng.choice(["2", "3", "4"]),
+            "job_type": "F",
+            "workplace": rng.choice(["1", "2", "3"]),
+            "fetched_at": 1_714_600_000,
+        }
+        for index in range(count)
+    ]
+
+
+class TestJobCollection:
+    """Test cases for JobCollection."""
+
+    def test_append_and_row_views(self):
+        """Test that rows read back every field, including defaults for missing ones."""
+        jobs = JobCollection.from_jobs(synthetic_jobs(3))
+        jobs.append({"job_id": 1, "title": "Kotlin Engineer"})
+
+        assert len(jobs) == 4
+        assert jobs[0].as_dict() == dict(synthetic_jobs(1)[0])
+        assert jobs[-1].company == ""
+        assert jobs[-1].posted_at == 0
+        assert isinstance(jobs[1], JobRow)
+        with pytest.raises(IndexError):
+            _ = jobs[4]
+        with pytest.raises(AttributeError):
+            _ = jobs[0].salary
+
+    def test_slice_filter_and_where(self):
+        """Test slicing, predicate filters and pooled-column equality."""
+        source = synthetic_jobs(200)
+        jobs = JobCollection.from_jobs(source)
+
+        assert [row.job_id for row in jobs[10:13]] == [job["job_id"] for job in source[10:13]]
+        recent = jobs.filter(lambda row: row.posted_at >= 1_715_000_000)
+        assert len(recent) == sum(job["posted_at"] >= 1_715_000_000 for job in source)
+        remote = jobs.where("location", "Remote")
+        assert len(remote) == sum(job["location"] == "Remote" for job in source)
+        assert remote.pools is jobs.pools
+        assert len(jobs.where("location", "Mars")) == 0
+
+    def test_from_store(self):
+        """Test loading a collection from the job store."""
+        store = JobStore(":memory:")
+        store.add_jobs(synthetic_jobs(50))
+        jobs = JobCollection.from_store(store, location="Ankara")
+
+        assert len(jobs) == store.count(location="Ankara")
+        assert all(row.location == "Ankara, Turkey" for row in jobs)
+
+    def test_bytes_per_record(self):
+        """Test that the collection needs well under half the memory of a list of dicts."""
+        source = synthetic_jobs(100_000)
+        jobs = JobCollection.from_jobs(source)
+
+        per_record = jobs.memory_bytes() / len(jobs)
+        per_dict = dicts_memory_bytes(source) / len(source)
+        assert per_record < 300
+        assert per_record < per_dict * 0.4
@@ -0,0 +1,76 @@
+"""
+Tests for streaming job export
+"""
+
+import bz2
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from fetch_pipeline import SavedSearch
+from job_export import export_jobs, export_to_path, output_format
+from job_store import JOB_COLUMNS, JobStore
+
+SEARCHES = [SavedSearch("py-ankara", {"keywords": "Python", "location": "Ankara"}), SavedSearch("go", {"keywords": "Go"})]
+
+
+@pytest.fixture
+def store():
+    store = JobStore(":memory:")
+    store.add_jobs(
+        {
+            "job_id": job_id,
+            "title": f"Developer {job_id}",
+            "company": "Acme, Inc." if job_id % 2 else 'The "Quoted" Co',
+            "description": "Line one\nline two",
+            "posted_at": 1_714_521_600 + job_id,
+            "search_fingerprint": SEARCHES[job_id % 3].fingerprint if job_id % 3 < 2 else "unknown",
+        }
+        for job_id in range(1, 26)
+    )
+    return store
+
+
+class TestJobExport:
+    """Test cases for exporting stored jobs."""
+
+    def test_csv_roundtrip_with_search_columns(self, store):
+        """Test that CSV quoting survives commas, quotes and newlines, and rows carry their search."""
+        out = io.StringIO()
+        assert export_jobs(store, out, "csv", SEARCHES, chunk_size=4) == 25
+        rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+
+        assert [int(row["job_id"]) for row in rows] == list(range(1, 26))
+        assert list(rows[0]) == [*JOB_COLUMNS, "search_name", "search_spec"]
+        assert rows[1]["company"] == 'The "Quoted" Co' and rows[1]["description"] == "Line one\nline two"
+        assert rows[2]["search_name"] == "py-ankara"
+        assert json.loads(rows[2]["search_spec"]) == {"keywords": "Python", "location": "Ankara"}
+        assert rows[0]["search_name"] == "go" and rows[1]["search_spec"] == ""
+
+    def test_jsonl_columns_and_filters(self, store):
+        """Test nested specs in JSONL, a column subset and store filters."""
+        out = io.StringIO()
+        count = export_jobs(store, out, "jsonl", SEARCHES, 3, columns=("job_id", "title"), posted_since=1_714_521_620)
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+
+        assert count == len(records) == 6
+        assert records[0] == {"job_id": 20, "title": "Developer 20", "search_name": "", "search_spec": None}
+        assert records[1]["search_spec"] == {"keywords": "Python", "location": "Ankara"}
+        with pytest.raises(ValueError):
+            export_jobs(store, out, "xml")
+
+    def test_compressed_files(self, store, tmp_path):
+        """Test that the format and compression follow the file name and no temporary file is left behind."""
+        assert output_format("jobs.csv.bz2") == ("csv", ".bz2") and output_format("jobs.out") == ("csv", "")
+
+        assert export_to_path(store, str(tmp_path / "jobs.jsonl.gz"), searches=SEARCHES, chunk_size=10) == 25
+        with gzip.open(tmp_path / "jobs.jsonl.gz", "rt", encoding="utf-8") as handle:
+            assert sum(1 for _ in handle) == 25
+
+        export_to_path(store, str(tmp_path / "jobs.csv.bz2"))
+        with bz2.open(tmp_path / "jobs.csv.bz2", "rt", encoding="utf-8", newline="") as handle:
+            assert len(list(csv.DictReader(handle))) == 25
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["jobs.csv.bz2", "jobs.jsonl.gz"]
@@ -0,0 +1,194 @@
+"""
+Tests for lazy job-detail hydration
+"""
+
+import io
+import json
+import threading
+
+import pytest
+
+from fetch_pipeline import FetchError
+from job_export import export_jobs
+from job_hydration import JobHydrator, LazyJob, job_id_from_url, parse_job_detail
+from job_store import JobStore
+from retry_policy import RetryPolicy
+
+DETAIL_PAGE = b"""
+<section class="top-card-layout"><h1 class="top-card-layout__title">Senior Python Developer</h1>
+  <span class="num-applicants__caption topcard__flavor--metadata">
+    Over 200 applicants
+  </span>
+</section>
+<div class="description__text description__text--rich">
+  <div class="show-more-less-html__markup show-more-less-html__markup--clamp-after-5">
+    <p>We build <strong>data pipelines</strong> &amp; APIs.</p><br>
+    <ul><li>Python</li><li>SQL</li></ul>
+    <img src="x.png"/>
+  </div>
+</div>
+<ul class="description__job-criteria-list">
+  <li class="description__job-criteria-item">
+    <h3 class="description__job-criteria-subheader">Seniority level</h3>
+    <span class="description__job-criteria-text description__job-criteria-text--criteria">Mid-Senior level</span>
+  </li>
+  <li class="description__job-criteria-item">
+    <h3 class="description__job-criteria-subheader">Employment type</h3>
+    <span class="description__job-criteria-text description__job-criteria-text--criteria">Full-time</span>
+  </li>
+  <li class="description__job-criteria-item">
+    <h3 class="description__job-criteria-subheader">Industries</h3>
+    <span class="description__job-criteria-text description__job-criteria-text--criteria">Software Development</span>
+  </li>
+</ul>
+"""
+
+
+class CountingTransport:
+    """Serve ``DETAIL_PAGE`` for every URL, counting requests; ``gate`` holds fetches back until set."""
+
+    def __init__(self, fail_for=()):
+        self.requests = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.fail_for = set(fail_for)
+        self._lock = threading.Lock()
+
+    def __call__(self, url, timeout):
+        with self._lock:
+            self.requests.append(url)
+        self.gate.wait(10)
+        if any(str(job_id) in url for job_id in self.fail_for):
+            raise FetchError(f"HTTP 404 for {url}", status=404)
+        return DETAIL_PAGE
+
+
+class TestParsing:
+    """Test cases for job pages and job URLs."""
+
+    def test_parse_job_detail(self):
+        """Test description text with line breaks, criteria and the applicant count."""
+        detail = parse_job_detail(DETAIL_PAGE)
+        assert detail == {
+            "description": "We build data pipelines & APIs.\nPython\nSQL",
+            "seniority": "Mid-Senior level",
+            "employment_type": "Full-time",
+            "job_function": "",
+            "industries": "Software Development",
+            "applicants": "Over 200 applicants",
+        }
+        assert parse_job_detail(b"<html></html>")["description"] == ""
+
+    def test_self_closing_tags_in_description(self):
+        """Test that self-closing tags inside the description neither swallow the criteria nor lose line breaks."""
+        page = DETAIL_PAGE.replace(b"<ul><li>Python", b"<div/><span/><ul><li>Python").replace(b"</p><br>", b"</p><br/>")
+        detail = parse_job_detail(page)
+        assert detail["description"] == "We build data pipelines & APIs.\nPython\nSQL"
+        assert detail["seniority"] == "Mid-Senior level"
+
+    def test_job_id_from_url(self):
+        """Test currentJobId, /jobs/view/ paths with and without a slug, and URLs without a job."""
+        assert job_id_from_url("https://www.linkedin.com/jobs/view/3912345678/") == 3912345678
+        assert job_id_from_url("https://www.linkedin.com/jobs/search/?currentJobId=12&keywords=Go") == 12
+        assert job_id_from_url("https://www.linkedin.com/jobs/search/?keywords=Go") is None
+
+
+class TestJobHydrator:
+    """Test cases for on-demand fetching, caching and coalescing."""
+
+    def test_lazy_job_fetches_on_first_detail_access(self):
+        """Test that stored fields cost nothing and details are fetched once per job."""
+        transport = CountingTransport()
+        hydrator = JobHydrator(transport)
+        job = LazyJob({"job_id": 3912345678, "title": "Senior Python Developer", "description": ""}, hydrator)
+
+        assert job["title"] == "Senior Python Developer" and not job.hydrated
+        assert transport.requests == []
+        assert job["seniority"] == "Mid-Senior level" and job["description"].startswith("We build")
+        assert transport.requests == ["https://www.linkedin.com/jobs/view/3912345678/"]
+        assert LazyJob({"job_id": 3912345678}, hydrator)["applicants"] == "Over 200 applicants"
+        assert len(transport.requests) == 1
+        assert hydrator.stats() == {"hits": 1, "misses": 1, "coalesced": 0, "failed": 0, "size": 1}
+        assert set(job) >= {"title", "seniority", "industries"}
+
+    def test_concurrent_requests_share_one_fetch(self):
+        """Test that threads asking for the same job while it is being fetched wait for that fetch."""
+        transport = CountingTransport()
+        transport.gate.clear()
+        hydrator = JobHydrator(transport)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(hydrator.get(7))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        while hydrator.stats()["coalesced"] < 7:
+            threading.Event().wait(0.005)
+        transport.gate.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(transport.requests) == 1
+        assert len(results) == 8 and all(result is results[0] for result in results)
+
+    def test_ttl_lru_and_failures(self):
+        """Test expiry after the TTL, eviction of the least recently used job, and uncached failures."""
+        transport = CountingTransport(fail_for=[404404])
+        hydrator = JobHydrator(transport, max_entries=2, ttl=60)
+        now = [0.0]
+        hydrator.clock = lambda: now[0]
+
+        hydrator.get(1), hydrator.get(2), hydrator.get(1), hydrator.get(3)  # 2 is least recently used
+        assert len(transport.requests) == 3
+        hydrator.get(1)
+        hydrator.get(2)
+        assert len(transport.requests) == 4
+        now[0] = 61.0
+        hydrator.get(2)
+        assert len(transport.requests) == 5
+
+        with pytest.raises(FetchError):
+            hydrator.get(404404)
+        with pytest.raises(FetchError):
+            hydrator.get(404404)
+        assert len(transport.requests) == 7
+
+    def test_get_many_and_export_details(self):
+        """Test deduplicated batch hydration, and opt-in detail columns in exports."""
+        transport = CountingTransport(fail_for=[13])
+        hydrator = JobHydrator(transport, workers=3)
+        details = hydrator.get_many([11, 12, 11, "12", 13])
+        assert sorted(details) == [11, 12, 13] and len(transport.requests) == 3
+        assert isinstance(details[13], FetchError) and details[11]["seniority"] == "Mid-Senior level"
+
+        store = JobStore(":memory:")
+        store.add_jobs([{"job_id": 11, "title": "A"}, {"job_id": 12, "title": "B", "description": "Stored"}, {"job_id": 13}])
+        out = io.StringIO()
+        export_jobs(store, out, "jsonl", hydrator=hydrator, columns=("job_id", "title", "description"))
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+
+        assert records[0]["description"].startswith("We build") and records[0]["employment_type"] == "Full-time"
+        assert records[1]["description"] == "Stored"
+        assert records[2]["seniority"] == ""
+        assert len(transport.requests) == 4  # only the failed job was retried
+        assert hydrator.stats()["failed"] == 2
+
+    def test_transient_failures_are_retried(self):
+        """Test that 503s are retried with the policy's backoff, and a 404 fails at once and is counted."""
+        transport = CountingTransport(fail_for=[404404])
+        responses = [FetchError("HTTP 503", status=503, retry_after=7), FetchError("HTTP 503", status=503)]
+
+        def flaky(url, timeout):
+            if "/1/" in url and responses:
+                transport.requests.append(url)
+                raise responses.pop(0)
+            return transport(url, timeout)
+
+        hydrator = JobHydrator(flaky, retry=RetryPolicy(3, base_delay=0))
+        waits = []
+        hydrator.sleep = waits.append
+
+        assert hydrator.get(1)["seniority"] == "Mid-Senior level"
+        assert len(transport.requests) == 3 and waits[0] == 7
+        with pytest.raises(FetchError):
+            hydrator.get(404404)
+        assert len(transport.requests) == 4
+        assert hydrator.stats()["failed"] == 1
@@ -0,0 +1,176 @@
+"""
+Tests for the inverted job index
+"""
+
+import pytest
+
+from job_index import JobIndex, Postings, load_index, parse_query, tokenize
+from job_store import JobStore
+
+JOBS = [
+    {"job_id": 1, "title": "Kotlin Android Developer", "company": "Acme", "location": "Ankara, Turkey", "posted_at": 300},
+    {"job_id": 2, "title": "Senior Kotlin Engineer", "company": "Globex", "location": "Istanbul, Turkey", "posted_at": 200},
+    {"job_id": 3, "title": "Site Reliability Engineer", "company": "Initech", "location": "Ankara, Turkey", "posted_at": 100},
+    {
+        "job_id": 4,
+        "title": "C++ Developer",
+        "company": "Android Inc",
+        "location": "Remote",
+        "description": "Embedded developer role, site reliability experience a plus",
+        "posted_at": 400,
+    },
+]
+
+
+@pytest.fixture
+def index():
+    job_index = JobIndex()
+    job_index.add_jobs(JOBS)
+    return job_index
+
+
+class TestTokenizer:
+    """Test cases for tokenizing and query parsing."""
+
+    def test_tokenize(self):
+        """Test case and accent folding and c++/c# style tokens."""
+        assert tokenize("Senior C++ / C# Developer (İstanbul)") == ["senior", "c++", "c#", "developer", "istanbul"]
+        assert tokenize("Çankaya, Eskişehir, Diyarbakır") == ["cankaya", "eskisehir", "diyarbakir"]
+
+    def test_parse_query(self):
+        """Test operator precedence, negation and phrases."""
+        assert parse_query('kotlin OR scala -intern "data engineer"') == (
+            "or",
+            "kotlin",
+            ("and", "scala", ("not", "intern"), ("phrase", ("data", "engineer"))),
+        )
+        assert parse_query("(remote OR hybrid) AND python") == ("and", ("or", "remote", "hybrid"), "python")
+        with pytest.raises(ValueError):
+            parse_query("(kotlin")
+        with pytest.raises(ValueError):
+            parse_query("kotlin OR")
+
+    def test_postings_roundtrip(self):
+        """Test that delta-encoded postings decode to the same documents and positions."""
+        postings = Postings(with_positions=True)
+        postings.add(0, [3])
+        postings.add(200, [1, 150, 10_000])
+        postings.add(100_000, [0])
+        postings.add(100_001, [0])
+
+        assert list(postings.iter_docs()) == [0, 200, 100_000, 100_001]
+        assert list(postings.iter_positions()) == [(0, [3]), (200, [1, 150, 10_000]), (100_000, [0]), (100_001, [0])]
+
+    def test_single_byte_gaps(self):
+        """Test the fast path for postings whose gaps all fit in one byte."""
+        postings = Postings()
+        for doc in (0, 1, 5, 132, 259):
+            postings.add(doc)
+
+        assert postings.docs.isascii()
+        assert list(postings.iter_docs()) == [0, 1, 5, 132, 259]
+
+
+class TestJobIndex:
+    """Test cases for querying the index."""
+
+    def test_boolean_queries(self, index):
+        """Test AND, OR and NOT; results are newest first."""
+        assert index.search("kotlin ankara") == [1]
+        assert index.search("kotlin") == [1, 2]
+        assert index.search("engineer OR android") == [4, 1, 2, 3]
+        assert index.search("turkey -kotlin") == [3]
+        assert index.search("NOT turkey") == [4]
+        assert index.search("unknownterm") == []
+
+    def test_phrase_queries(self, index):
+        """Test phrases, including three-word phrases and field boundaries."""
+        assert index.search('"site reliability"') == [4, 3]
+        assert index.search('"site reliability engineer"') == [3]
+        assert index.search('"kotlin engineer"') == [2]
+        assert index.search('"engineer kotlin"') == []
+        # "developer" ends the title and "android" starts the company: not adjacent
+        assert index.search('"developer android"') == []
+
+    def test_filters_and_limit(self, index):
+        """Test posted_since and limit."""
+        assert index.search("turkey", posted_since=150) == [1, 2]
+        assert index.search("turkey", limit=1) == [1]
+
+    def test_incremental_updates(self, index):
+        """Test that re-adding replaces a posting and removal hides it."""
+        index.search("kotlin")  # warm the decoded-postings cache
+        index.add_job({"job_id": 2, "title": "Scala Engineer", "location": "Istanbul", "posted_at": 500})
+        index.add_job({"job_id": 5, "title": "Kotlin Backend Engineer", "posted_at": 50})
+
+        assert index.search("kotlin") == [1, 5]
+        assert index.search("scala") == [2]
+        assert index.remove(1)
+        assert not index.remove(1)
+        assert index.search("kotlin") == [5]
+        assert len(index) == 4
+
+    def test_from_store(self):
+        """Test indexing every stored job."""
+        store = JobStore(":memory:")
+        store.add_jobs(JOBS)
+        index = JobIndex.from_store(store)
+        assert index.search("android") == [4, 1]
+
+    def test_compact(self, index):
+        """Test that compaction drops dead documents without changing any result."""
+        index.add_job({"job_id": 2, "title": "Scala Engineer", "location": "Istanbul", "posted_at": 500})
+        index.remove(3)
+        queries = ["kotlin", "engineer OR android", '"site reliability"', "turkey -kotlin", "NOT turkey", "scala"]
+        before = {query: index.search(query) for query in queries}
+
+        assert index.compact() == 2
+        assert index.compact() == 0
+        assert len(index.doc_job_ids) == len(index) == 3
+        assert "initech" not in index.postings
+        assert {query: index.search(query) for query in queries} == before
+
+    def test_add_jobs_compacts(self):
+        """Test that add_jobs compacts once dead documents pass compact_ratio."""
+        index = JobIndex(compact_ratio=0.4)
+        index.add_jobs(JOBS)
+        index.add_jobs([JOBS[0]])
+        assert len(index.doc_job_ids) == 5
+        index.add_jobs(JOBS[1:])
+        assert len(index.doc_job_ids) == len(index) == 4
+        assert index.search("kotlin") == [1, 2]
+
+
+class TestSavedIndex:
+    """Test cases for saving and reloading the index next to the store."""
+
+    def test_save_and_load(self, index, tmp_path):
+        """Test that a saved index answers the same queries and checks its signature."""
+        path = str(tmp_path / "jobs.index")
+        index.search("kotlin")
+        index.save(path, signature=("a",))
+
+        loaded = JobIndex.load(path, signature=("a",))
+        assert loaded.search("kotlin") == [1, 2]
+        assert loaded.search('"site reliability engineer"') == [3]
+        assert JobIndex.load(path, signature=("b",)) is None
+        assert JobIndex.load(str(tmp_path / "missing.index")) is None
+        (tmp_path / "corrupt.index").write_bytes(b"not a pickle")
+        assert JobIndex.load(str(tmp_path / "corrupt.index")) is None
+
+    def test_load_index_rebuilds_when_store_changes(self, tmp_path):
+        """Test that the saved index is reused until the store is written to."""
+        store = JobStore(str(tmp_path / "jobs.db"))
+        store.add_jobs(JOBS)
+
+        index, rebuilt = load_index(store)
+        assert rebuilt and (tmp_path / "jobs.db.index").exists()
+        index, rebuilt = load_index(store)
+        assert not rebuilt
+        assert index.search("android") == [4, 1]
+
+        store.add_jobs([{"job_id": 5, "title": "Android Engineer", "posted_at": 500}])
+        index, rebuilt = load_index(store)
+        assert rebuilt
+        assert index.search("android") == [5, 4, 1]
+        assert load_index(store, rebuild=True)[1]
@@ -0,0 +1,127 @@
+"""
+Tests for the SQLite job store
+"""
+
+import threading
+
+import pytest
+
+from job_store import JobStore, page_key
+
+
+@pytest.fixture
+def store():
+    job_store = JobStore(":memory:")
+    job_store.add_jobs(
+        {
+            "job_id": 1000 + i,
+            "title": f"{'Python' if i % 2 else 'Kotlin'} Developer {i}",
+            "company": f"Company {i % 5}",
+            "location": "Ankara" if i % 3 else "Istanbul",
+            "posted_at": 1_700_000_000 + i * 60,
+        }
+        for i in range(250)
+    )
+    yield job_store
+    job_store.close()
+
+
+class TestJobStore:
+    """Test cases for filtering, sorting and paging in the job store."""
+
+    def test_count_and_filters(self, store):
+        """Test that filters are applied server-side."""
+        assert store.count() == 250
+        assert store.count(text="python") == 125
+        assert store.count(text="python", location="istanbul") == 42
+        assert store.count(posted_since=1_700_000_000 + 200 * 60) == 50
+
+    def test_sorted_pages(self, store):
+        """Test that pages are sorted and do not overlap."""
+        first = store.query(sort_by="posted_at", descending=True, limit=100)
+        second = store.query(sort_by="posted_at", descending=True, limit=100, offset=100)
+
+        assert len(first) == 100
+        assert first[0]["job_id"] == 1249
+        assert first[-1]["posted_at"] > second[0]["posted_at"]
+        assert not {row["job_id"] for row in first} & {row["job_id"] for row in second}
+
+    def test_keyset_pages_match_offset_pages(self, store):
+        """Test that paging by keyset and seeking ahead give the same pages as OFFSET."""
+        for sort_by, descending in (("posted_at", True), ("title", False), ("company", True)):
+            after = None
+            for page in range(3):
+                rows = store.query(sort_by=sort_by, descending=descending, limit=40, after=after, text="python")
+                expected = store.query(sort_by=sort_by, descending=descending, limit=40, offset=page * 40, text="python")
+                assert rows == expected
+                after = page_key(rows[-1], sort_by)
+
+            jumped = store.seek(sort_by, descending, skip=120, text="python")
+            assert jumped == after
+        assert store.seek("title", skip=1000) is None
+
+    def test_like_wildcards_are_literal(self, store):
+        """Test that % and _ in a filter match themselves, not any text."""
+        store.add_jobs([{"job_id": 1, "title": "QA", "company": "100% Remote_Co"}, {"job_id": 2, "company": "100 xRemotexCo"}])
+
+        assert store.count(company="100%") == 1
+        assert store.count(company="remote_co") == 1
+        assert store.count(text="_") == 1
+        assert store.count(company="\\") == 0
+
+    def test_upsert(self, store):
+        """Test that re-adding a job updates it in place."""
+        store.add_jobs([{"job_id": 1000, "title": "Renamed", "posted_at": 5}])
+
+        assert store.count() == 250
+        assert store.get(1000)["title"] == "Renamed"
+        assert store.get(42) is None
+
+    def test_iter_jobs_batches(self, store):
+        """Test that keyset iteration visits every matching job once."""
+        job_ids = [job["job_id"] for job in store.iter_jobs(batch_size=7, text="kotlin")]
+
+        assert len(job_ids) == 125
+        assert job_ids == sorted(job_ids)
+
+    def test_rejects_unknown_sort_and_filter(self, store):
+        """Test that only whitelisted sort columns and filters are accepted."""
+        with pytest.raises(ValueError):
+            store.query(sort_by="description; DROP TABLE jobs")
+        with pytest.raises(ValueError):
+            store.count(salary=1)
+
+    def test_add_new_jobs_returns_only_new(self, store):
+        """Test that existing jobs are left alone and not reported as new."""
+        new_jobs = store.add_new_jobs([{"job_id": 1000, "title": "Changed"}, {"job_id": 1, "title": "Fresh"}])
+
+        assert [job["job_id"] for job in new_jobs] == [1]
+        assert store.get(1000)["title"] != "Changed"
+        assert store.add_new_jobs([]) == []
+
+    def test_writers_in_other_processes_wait_instead_of_failing(self, tmp_path):
+        """Test that the store uses WAL and a write waits for another connection's transaction instead of raising."""
+        path = str(tmp_path / "jobs.db")
+        poller, other = JobStore(path), JobStore(path, busy_timeout=10)
+        assert poller._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+        poller._conn.execute("BEGIN IMMEDIATE")
+        poller._conn.execute("INSERT INTO jobs (job_id, title) VALUES (1, 'Held')")
+        threading.Timer(0.3, poller._conn.commit).start()
+        assert other.add_jobs([{"job_id": 2, "title": "Waited"}]) == 1
+        assert other.count() == 2
+
+    def test_version_changes_on_writes_from_any_connection(self, tmp_path):
+        """Test that the version moves on this connection's writes and on other connections' commits only."""
+        path = str(tmp_path / "jobs.db")
+        app, poller = JobStore(path), JobStore(path)
+        before = app.version()
+        app.count()
+        assert app.version() == before
+
+        app.add_jobs([{"job_id": 1, "title": "Own write"}])
+        after_own = app.version()
+        assert after_own != before
+
+        poller.add_jobs([{"job_id": 2, "title": "Poller write"}])
+        assert app.version() != after_own
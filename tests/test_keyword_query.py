@@ -0,0 +1,116 @@
+"""
+Tests for boolean keyword queries and URL-length-aware splitting
+"""
+
+import re
+
+import pytest
+
+from keyword_query import all_of, any_of, exclude, parse_keywords, phrase, render, split_builder, split_query, split_spec
+from linkedin_url_builder import LinkedInURLBuilder, build_from_spec
+
+TECHNOLOGIES = [f"Tech{i}" for i in range(60)] + [phrase(f"framework {i}") for i in range(20)]
+
+
+def url_length(part, builder=None) -> int:
+    copy = LinkedInURLBuilder()
+    copy.params = dict((builder or LinkedInURLBuilder()).params, keywords=render(part))
+    return len(copy.build_url())
+
+
+def alternatives(query) -> set:
+    """The OR alternatives of every OR group in a query, as rendered text."""
+    if not isinstance(query, tuple) or query[0] == "phrase":
+        return set()
+    found = {render(operand) for operand in query[1:]} if query[0] == "or" else set()
+    for operand in query[1:]:
+        found |= alternatives(operand)
+    return found
+
+
+class TestKeywordQuery:
+    """Test cases for building, rendering and parsing keyword queries."""
+
+    def test_render(self):
+        """Test operators, phrases, grouping and NOT rendering."""
+        query = all_of("Senior", any_of("C++", phrase('"embedded" linux')), exclude(any_of("intern", "junior")))
+        assert render(query) == 'Senior AND (C++ OR "embedded linux") NOT (intern OR junior)'
+        assert render(any_of("Go", all_of("Python", "Django"))) == "Go OR (Python AND Django)"
+        assert all_of(all_of("a", "b"), "c") == ("and", "a", "b", "c")
+        with pytest.raises(ValueError):
+            any_of()
+
+    def test_parse_roundtrip(self):
+        """Test that parsing keeps spelling and adjacent bare words, and rendering parses back to the same tree."""
+        query = parse_keywords('Senior Python Developer (Django OR "FastAPI framework") -intern')
+        assert query == (
+            "and",
+            "Senior Python Developer",
+            ("or", "Django", ("phrase", "FastAPI framework")),
+            ("not", "intern"),
+        )
+        assert parse_keywords(render(query)) == query
+        assert parse_keywords("Python Developer") == "Python Developer"
+        with pytest.raises(ValueError):
+            parse_keywords("(Python OR Go")
+
+    def test_word_groups_keep_their_parentheses(self):
+        """Test that bare words grouped under OR or NOT are rendered as a group and parse back to the same tree."""
+        text = '"data engineer" OR (machine learning) OR Go'
+        query = parse_keywords(text)
+        assert query == ("or", ("phrase", "data engineer"), "machine learning", "Go")
+        assert render(query) == text
+        assert parse_keywords(render(query)) == query
+
+        query = parse_keywords("Python NOT (data science) AND Django")
+        assert render(query) == "Python NOT (data science) AND Django"
+        assert parse_keywords(render(query)) == query
+        assert render(all_of("Senior Python Developer", "Remote")) == "Senior Python Developer AND Remote"
+
+
+class TestSplitting:
+    """Test cases for partitioning OR-terms across URLs."""
+
+    def test_short_query_is_unchanged(self):
+        """Test that a query that fits stays a single query."""
+        query = all_of("Python", any_of("Django", "Flask"))
+        assert split_query(query) == [query]
+
+    def test_split_covers_every_term_within_the_limit(self):
+        """Test that every part fits, every OR-term appears exactly once, and the fixed parts are kept."""
+        builder = build_from_spec({"location": "Ankara, Turkey", "time_filter": "1 week"})
+        query = all_of(phrase("software engineer"), any_of(*TECHNOLOGIES), exclude("intern"))
+        parts = split_query(query, builder, max_url_length=600)
+
+        assert len(parts) > 1
+        assert max(url_length(part, builder) for part in parts) <= 600
+        assert sorted(term for part in parts for term in alternatives(part)) == sorted(map(render, TECHNOLOGIES))
+        for part in parts:
+            assert render(part).startswith('"software engineer" AND (') and render(part).endswith(") NOT intern")
+        # No two parts could share a URL
+        for first, second in zip(parts, parts[1:]):
+            merged = all_of(phrase("software engineer"), any_of(first[2], second[2]), exclude("intern"))
+            assert url_length(merged, builder) > 600
+
+    def test_nested_groups_and_impossible_splits(self):
+        """Test splitting a second OR group when one is not enough, and failing when nothing can be split."""
+        query = all_of(any_of(*[f"Lang{i}" for i in range(30)]), any_of(*[f"City{i}" for i in range(30)]))
+        parts = split_query(query, max_url_length=250)
+        assert max(url_length(part) for part in parts) <= 250
+        words = [set(re.findall(r"\w+", render(part))) for part in parts]
+        assert all(any({f"Lang{i}", f"City{j}"} <= part for part in words) for i in range(30) for j in range(30))
+
+        with pytest.raises(ValueError):
+            split_query(all_of("Python", exclude(any_of(*TECHNOLOGIES))), max_url_length=300)
+
+    def test_split_builder_and_spec(self):
+        """Test splitting a configured builder or a search spec, keeping every other parameter."""
+        keywords = render(any_of(*TECHNOLOGIES))
+        spec = {"keywords": keywords, "location": "Remote", "job_types": "full_time"}
+        specs = split_spec(spec, max_url_length=500)
+        builders = split_builder(build_from_spec(spec), max_url_length=500)
+
+        assert len(specs) == len(builders) > 1
+        assert all(part["job_types"] == "full_time" for part in specs)
+        assert [build_from_spec(part).build_url() for part in specs] == [builder.build_url() for builder in builders]
+        assert split_spec({"keywords": "Python"}) == [{"keywords": "Python"}]
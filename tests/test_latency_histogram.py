@@ -0,0 +1,74 @@
+"""
+Tests for log-bucketed latency histograms
+"""
+
+import random
+
+import pytest
+
+from latency_histogram import LatencyTracker, LogHistogram
+
+
+class TestLogHistogram:
+    """Test cases for the fixed-memory histogram."""
+
+    def test_percentiles_within_precision(self):
+        """Test that percentiles stay within the bucket precision of the exact values."""
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(-3, 1) for _ in range(20_000))
+        histogram = LogHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for percentile in (50, 95, 99):
+            exact = values[int(percentile / 100 * len(values)) - 1]
+            assert histogram.percentile(percentile) == pytest.approx(exact, rel=1 / 16)
+
+    def test_fixed_memory(self):
+        """Test that memory does not grow with the number of recordings."""
+        histogram = LogHistogram()
+        size = histogram.memory_bytes
+        for i in range(10_000):
+            histogram.record(i / 1000)
+
+        assert histogram.memory_bytes == size < 2048
+        assert histogram.count == 10_000
+
+    def test_small_values_are_exact_and_large_values_clamped(self):
+        """Test the exact low range and clamping at the top of the range."""
+        histogram = LogHistogram()
+        histogram.record(0.000007)
+        assert histogram.percentile(100) == pytest.approx(0.000007)
+
+        histogram.record(10 * 24 * 3600)
+        assert histogram.percentile(100) == pytest.approx(histogram.max_value / 1_000_000)
+
+    def test_merge(self):
+        """Test that merged histograms combine counts and extremes."""
+        first, second = LogHistogram(), LogHistogram()
+        first.record(0.001)
+        second.record(0.5)
+        first.merge(second)
+
+        assert first.count == 2
+        assert first.percentile(100) == pytest.approx(0.5, rel=1 / 16)
+        with pytest.raises(ValueError):
+            first.merge(LogHistogram(precision_bits=5))
+
+
+class TestLatencyTracker:
+    """Test cases for per-search stage tracking."""
+
+    def test_summary_and_dominant_searches(self):
+        """Test per-fingerprint percentiles and ranking by total time."""
+        tracker = LatencyTracker()
+        for _ in range(10):
+            tracker.record("fast", "fetch", 0.01)
+            tracker.record("slow", "fetch", 0.5)
+            tracker.record("slow", "parse", 0.02)
+
+        summary = tracker.summary("slow")
+        assert set(summary) == {"slow"}
+        assert summary["slow"]["fetch"]["count"] == 10
+        assert summary["slow"]["fetch"]["p99"] == pytest.approx(0.5, rel=1 / 16)
+        assert [name for name, _ in tracker.dominant_searches()] == ["slow", "fast"]
@@ -0,0 +1,143 @@
+"""
+Memory-budget tests for the streaming bulk paths.
+
+Each scenario runs under ``tracemalloc`` at two input sizes; peak memory must
+stay under a fixed budget and must not grow with the input, so any accidental
+list materialization (of specs, results or URLs) fails here. The million-row
+runs are marked ``slow`` and only run when ``LINKEDIN_MEMORY_MILLIONS=1`` is
+set (they take several minutes under ``tracemalloc``).
+"""
+
+import csv
+import os
+import tracemalloc
+import urllib.parse
+from itertools import chain
+
+import pytest
+
+from bulk_generator import SPEC_COLUMNS, iter_chunks, write_results
+from cli import run_batch
+from job_export import export_jobs
+from job_store import JobStore
+from linkedin_url_builder import LinkedInURLBuilder
+from search_mix import iter_search_mix
+
+# Peak traced allocation allowed for any streaming run, whatever its size
+PEAK_BUDGET = 2 * 1024 * 1024
+
+# The larger run may use at most this much more than the smaller one (allocator noise)
+GROWTH_ALLOWANCE = 256 * 1024
+
+WARMUP, SMALL, LARGE = 200, 1_000, 10_000
+MILLIONS = 2_000_000
+
+millions = pytest.mark.skipif(
+    os.environ.get("LINKEDIN_MEMORY_MILLIONS") != "1", reason="set LINKEDIN_MEMORY_MILLIONS=1 to run"
+)
+
+
+class NullSink:
+    """Text sink that counts characters instead of keeping them."""
+
+    def __init__(self):
+        self.chars = 0
+
+    def write(self, text: str) -> int:
+        self.chars += len(text)
+        return len(text)
+
+
+def peak_bytes(func, count: int) -> int:
+    """Peak traced memory while running ``func(count)``."""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        func(count)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def generate_and_write(count: int) -> None:
+    sink = NullSink()
+    written, _ = write_results(chain.from_iterable(iter_chunks(iter_search_mix(count))), sink, "csv")
+    assert written == count
+
+
+def generate_and_parse(count: int) -> None:
+    parsed = 0
+    for chunk in iter_chunks(iter_search_mix(count)):
+        for result in chunk:
+            builder = LinkedInURLBuilder.from_url(result["url"])
+            assert builder.params["keywords"] == result["keywords"]
+            parsed += len(urllib.parse.parse_qsl(urllib.parse.urlsplit(result["url"]).query))
+    assert parsed >= count
+
+
+def assert_flat(scenario, small: int, large: int) -> None:
+    scenario(WARMUP)  # fill module-level caches so they aren't attributed to either run
+    small_peak = peak_bytes(scenario, small)
+    large_peak = peak_bytes(scenario, large)
+    assert large_peak < PEAK_BUDGET, f"peak {large_peak} bytes exceeds budget for {large} rows"
+    assert large_peak <= small_peak + GROWTH_ALLOWANCE, f"peak grew from {small_peak} to {large_peak} bytes"
+
+
+def write_spec_csv(path, count: int) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as handle:
+        writer = csv.DictWriter(handle, fieldnames=SPEC_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(iter_search_mix(count))
+
+
+class TestMemoryBudget:
+    """Test that bulk generation and parsing run in constant memory."""
+
+    def test_generate_and_write_is_flat(self):
+        """Test generating URLs into a CSV sink at two sizes."""
+        assert_flat(generate_and_write, SMALL, LARGE)
+
+    def test_generate_and_parse_is_flat(self):
+        """Test generating URLs and parsing them back at two sizes."""
+        assert_flat(generate_and_parse, SMALL, LARGE)
+
+    def test_cli_batch_is_flat(self, tmp_path, capsys):
+        """Test the CLI batch mode streaming a CSV file to disk."""
+        inputs = {}
+        for count in (WARMUP, SMALL, LARGE):
+            inputs[count] = tmp_path / f"searches-{count}.csv"
+            write_spec_csv(inputs[count], count)
+
+        def batch(count):
+            assert run_batch(str(inputs[count]), os.devnull) == 0
+
+        assert_flat(batch, SMALL, LARGE)
+
+    def test_job_export_is_flat(self, tmp_path):
+        """Test exporting job stores of two sizes as CSV and JSONL, one chunk in memory at a time."""
+        stores = {}
+        for count in (WARMUP, SMALL, LARGE):
+            stores[count] = JobStore(str(tmp_path / f"jobs-{count}.db"))
+            stores[count].add_jobs(
+                {"job_id": job_id, "title": f"Python Developer {job_id}", "company": "Acme", "description": "x" * 200}
+                for job_id in range(count)
+            )
+
+        def export(count):
+            for fmt in ("csv", "jsonl"):
+                assert export_jobs(stores[count], NullSink(), fmt, chunk_size=500) == count
+
+        assert_flat(export, SMALL, LARGE)
+
+    @pytest.mark.slow
+    @millions
+    def test_millions_generate_and_write(self):
+        """Test that generating millions of URLs stays within the same budget."""
+        assert_flat(generate_and_write, SMALL, MILLIONS)
+
+    @pytest.mark.slow
+    @millions
+    def test_millions_generate_and_parse(self):
+        """Test that generating and parsing millions of URLs stays within the same budget."""
+        assert_flat(generate_and_parse, SMALL, MILLIONS)
@@ -0,0 +1,107 @@
+"""
+Tests for opt-in instrumentation and the Prometheus exporter
+"""
+
+import socket
+import urllib.request
+
+import pytest
+
+import metrics
+from linkedin_url_builder import LinkedInURLBuilder
+from resolver_cache import SharedResolver
+
+
+@pytest.fixture
+def registry():
+    registry = metrics.Registry()
+    metrics.enable(registry)
+    yield registry
+    metrics.disable()
+
+
+class TestMetrics:
+    """Test cases for instrumentation hooks and text exposition."""
+
+    def test_disabled_is_uninstrumented(self):
+        """Test that nothing is wrapped or timed while metrics are off."""
+        original = LinkedInURLBuilder.build_url
+
+        metrics.enable(metrics.Registry())
+        assert LinkedInURLBuilder.build_url is not original
+        metrics.disable()
+
+        assert LinkedInURLBuilder.build_url is original
+        assert metrics.stage_timer("fetch") is metrics.stage_timer("parse")
+
+    def test_builder_operations_counted(self, registry):
+        """Test that builder calls increment counters and histograms."""
+        builder = LinkedInURLBuilder().set_location_by_name("USA")
+        builder.build_url()
+        builder.build_url()
+
+        operations = registry.counter("linkedin_builder_operations_total", "")
+        latency = registry.histogram("linkedin_builder_operation_seconds", "")
+        assert operations.value("build_url") == 2
+        assert latency.count("set_location_by_name") == 1
+
+    def test_prometheus_format(self, registry):
+        """Test histogram buckets are cumulative and labels are escaped."""
+        histogram = registry.histogram("demo_seconds", "Demo", ("stage",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 5.0):
+            histogram.observe(value, 'fe"tch')
+        metrics.register_resolver(SharedResolver(), registry)
+
+        text = metrics.render_prometheus(registry)
+
+        assert "# TYPE demo_seconds histogram" in text
+        assert 'demo_seconds_bucket{stage="fe\\"tch",le="0.1"} 1' in text
+        assert 'demo_seconds_bucket{stage="fe\\"tch",le="1.0"} 2' in text
+        assert 'demo_seconds_bucket{stage="fe\\"tch",le="+Inf"} 3' in text
+        assert 'demo_seconds_count{stage="fe\\"tch"} 3' in text
+        assert 'linkedin_resolver_cache_hits_total{cache="locations"} 0' in text
+
+    def test_stage_timer_and_http_exporter(self, registry):
+        """Test that stage timings are served on /metrics."""
+        with metrics.stage_timer("parse"):
+            pass
+
+        server = metrics.start_metrics_server(0, registry=registry)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+                body = response.read().decode("utf-8")
+        finally:
+            server.shutdown()
+
+        assert 'linkedin_pipeline_stage_seconds_count{stage="parse"} 1' in body
+
+    def test_metrics_port_is_offset_per_instance(self, monkeypatch):
+        """Test that each launched instance gets its own metrics port."""
+        monkeypatch.delenv(metrics.INSTANCE_ENV, raising=False)
+        monkeypatch.delenv("LINKEDIN_METRICS_PORT", raising=False)
+        assert metrics.metrics_port_from_env() is None
+
+        monkeypatch.setenv("LINKEDIN_METRICS_PORT", "9101")
+        assert metrics.metrics_port_from_env() == 9101
+        monkeypatch.setenv(metrics.INSTANCE_ENV, "2")
+        assert metrics.metrics_port_from_env() == 9103
+
+    def test_busy_metrics_port_is_reported_once(self, monkeypatch, capsys):
+        """Test that the app's metrics factory returns None instead of raising when its port is taken."""
+        app_resources = pytest.importorskip("app_resources")
+        with socket.socket() as busy:
+            busy.bind(("127.0.0.1", 0))
+            busy.listen()
+            monkeypatch.setenv("LINKEDIN_METRICS", "1")
+            monkeypatch.setenv("LINKEDIN_METRICS_PORT", str(busy.getsockname()[1]))
+            monkeypatch.delenv(metrics.INSTANCE_ENV, raising=False)
+            app_resources.get_metrics_server.clear()
+            try:
+                assert app_resources.get_metrics_server() is None
+                assert app_resources.get_metrics_server() is None
+            finally:
+                app_resources.get_metrics_server.clear()
+                metrics.disable()
+
+        assert capsys.readouterr().err.count("[METRICS] Could not serve /metrics") == 1
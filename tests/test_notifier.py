@@ -0,0 +1,199 @@
+"""
+Tests for batched webhook notifications
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from fetch_pipeline import FetchError, SavedSearch
+from notifier import Destination, Notifier, load_destinations, post_json
+from retry_policy import RetryPolicy
+
+SEARCHES = [SavedSearch(f"search-{i}", {"keywords": f"Python {i}"}) for i in range(40)]
+
+
+class _Receiver(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with self.server.lock:
+            status = self.server.statuses.pop(0) if self.server.statuses else 200
+            if status == 200:
+                self.server.received.append((self.path, json.loads(body)))
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def receiver():
+    """Local webhook receiver; ``received`` holds ``(path, payload)`` per POST, ``statuses`` queues error responses."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Receiver)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.received = []
+    server.statuses = []
+    server.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def new_jobs(start: int, count: int) -> list[dict]:
+    return [{"job_id": job_id, "title": f"Job {job_id}", "company": "Acme"} for job_id in range(start, start + count)]
+
+
+class TestNotifier:
+    """Test cases for coalescing and delivering new-job events."""
+
+    def test_one_post_per_destination(self, receiver):
+        """Test that 300 new jobs from 40 searches become one POST per destination, filtered by search."""
+        destinations = [
+            Destination(f"{receiver.base_url}/all"),
+            Destination(f"{receiver.base_url}/some", ["search-0", SEARCHES[1].fingerprint]),
+        ]
+        notifier = Notifier(destinations, window=60)
+        for index, search in enumerate(SEARCHES):
+            assert notifier.publish(search, new_jobs(index * 10, 10 if index < 30 else 0))
+        assert notifier.flush(timeout=10)
+        notifier.close()
+
+        payloads = dict(receiver.received)
+        assert len(receiver.received) == 2
+        assert payloads["/all"]["count"] == 300
+        assert len(payloads["/all"]["searches"]) == 30
+        assert payloads["/some"]["searches"] == {"search-0": 10, "search-1": 10}
+        assert payloads["/some"]["jobs"][0] == {
+            "job_id": 0,
+            "title": "Job 0",
+            "company": "Acme",
+            "location": None,
+            "posted_at": None,
+            "url": None,
+            "search": "search-0",
+        }
+        assert notifier.stats == {"published": 300, "dropped": 0, "batches": 2, "delivered": 320, "failed": 0}
+
+    def test_window_and_batch_size(self, receiver):
+        """Test that batches go out when the window elapses, and full batches without waiting."""
+        notifier = Notifier([Destination(receiver.base_url)], window=0.05, max_batch=4)
+        notifier.publish(SEARCHES[0], new_jobs(0, 3))
+        notifier.publish(SEARCHES[1], new_jobs(3, 7))
+        deadline = time.monotonic() + 10
+        while notifier.stats["delivered"] < 10 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        notifier.close()
+
+        assert sorted(payload["count"] for _, payload in receiver.received) == [2, 4, 4]
+        assert sorted(job["job_id"] for _, payload in receiver.received for job in payload["jobs"]) == list(range(10))
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test that events are dropped and counted while a slow destination holds up the worker."""
+        sending, release = threading.Event(), threading.Event()
+
+        def slow_sender(url, payload, timeout):
+            sending.set()
+            release.wait(10)
+
+        notifier = Notifier([Destination("http://hooks.invalid/")], window=0, max_queue=2, sender=slow_sender)
+        notifier.publish(SEARCHES[0], new_jobs(0, 1))
+        assert sending.wait(10)
+        assert notifier.publish(SEARCHES[1], new_jobs(1, 1)) and notifier.publish(SEARCHES[2], new_jobs(2, 1))
+        assert not notifier.publish(SEARCHES[3], new_jobs(3, 5))
+        release.set()
+        notifier.close()
+
+        assert notifier.stats["dropped"] == 5
+        assert notifier.stats["delivered"] == 3
+
+    def test_failed_posts_are_retried(self, receiver):
+        """Test retrying a 503, and counting a rejected (400) batch as failed."""
+        receiver.statuses = [503, 400]
+        notifier = Notifier([Destination(receiver.base_url)], window=60, retry=RetryPolicy(3, base_delay=0))
+        notifier.publish(SEARCHES[0], new_jobs(0, 2))
+        notifier.flush()
+        notifier.publish(SEARCHES[0], new_jobs(2, 2))
+        notifier.close()
+
+        assert [payload["count"] for _, payload in receiver.received] == [2]
+        assert notifier.stats["failed"] == 2
+        with pytest.raises(RuntimeError):
+            notifier.publish(SEARCHES[0], new_jobs(4, 1))
+
+    def test_retry_backoff_does_not_hold_up_other_destinations(self):
+        """Test that a destination waiting to retry neither delays the others nor grows past max_pending."""
+        sent = []
+
+        def sender(url, payload, timeout):
+            if url == "http://a.invalid/" and not any(sent_url == url for sent_url, _ in sent):
+                sent.append((url, None))
+                raise FetchError("HTTP 503", status=503, retry_after=1.0)
+            sent.append((url, [job["job_id"] for job in payload["jobs"]]))
+
+        destinations = [Destination("http://a.invalid/"), Destination("http://b.invalid/")]
+        notifier = Notifier(destinations, window=0.02, max_pending=3, retry=RetryPolicy(3, base_delay=0), sender=sender)
+        notifier.publish(SEARCHES[0], new_jobs(0, 2))
+        deadline = time.monotonic() + 10
+        while notifier.stats["delivered"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        for start, delivered in ((2, 5), (5, 7)):
+            notifier.publish(SEARCHES[1], new_jobs(start, delivered - start))
+            while notifier.stats["delivered"] < delivered and time.monotonic() < deadline:
+                time.sleep(0.01)
+        assert ("http://a.invalid/", [0, 1]) not in sent  # the retry is still waiting for its backoff
+        notifier.close(10)
+
+        assert [ids for url, ids in sent if url == "http://b.invalid/"] == [[0, 1], [2, 3, 4], [5, 6]]
+        assert [ids for url, ids in sent if url == "http://a.invalid/"] == [None, [0, 1], [4, 5, 6]]
+        assert notifier.stats["dropped"] == 2
+        assert notifier.stats["delivered"] == 12
+
+    def test_unexpected_sender_error_keeps_the_worker(self, receiver):
+        """Test that a sender raising something other than FetchError counts as failed and later batches still go out."""
+        calls = []
+
+        def flaky_sender(url, payload, timeout):
+            calls.append(url)
+            if len(calls) == 1:
+                raise ValueError("unknown url type")
+            post_json(url, payload, timeout)
+
+        notifier = Notifier([Destination(receiver.base_url)], window=60, sender=flaky_sender)
+        notifier.publish(SEARCHES[0], new_jobs(0, 2))
+        assert notifier.flush(10)
+        notifier.publish(SEARCHES[0], new_jobs(2, 3))
+        notifier.close(10)
+
+        assert notifier.stats["failed"] == 2
+        assert notifier.stats["delivered"] == 3
+        assert [payload["count"] for _, payload in receiver.received] == [3]
+
+    def test_load_destinations(self, tmp_path):
+        """Test reading destinations and rejecting entries without a URL."""
+        path = tmp_path / "hooks.json"
+        path.write_text(json.dumps([{"url": "http://a/"}, {"url": "http://b/", "searches": ["search-2"]}]))
+        first, second = load_destinations(str(path))
+        assert first.wants(SEARCHES[5]) and second.wants(SEARCHES[2]) and not second.wants(SEARCHES[5])
+
+        path.write_text(json.dumps([{"searches": []}]))
+        with pytest.raises(ValueError):
+            load_destinations(str(path))
+        path.write_text(json.dumps([{"url": "hooks.example.com/jobs"}]))
+        with pytest.raises(ValueError, match="http"):
+            load_destinations(str(path))
+        for url in ("ftp://hooks.example.com/", "https://", "hooks.example.com"):
+            with pytest.raises(ValueError):
+                Destination(url)
+
+    def test_unreachable_webhook_raises_fetch_error(self):
+        """Test that an unreachable webhook raises FetchError, which the retry policy understands."""
+        with pytest.raises(FetchError) as raised:
+            post_json("http://127.0.0.1:1/", {"count": 0}, timeout=1)
+        assert raised.value.status is None
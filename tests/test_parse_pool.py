@@ -0,0 +1,71 @@
+"""
+Tests for the process-pool parse stage
+"""
+
+import pytest
+
+from fetch_pipeline import FetchError, SavedSearch, SearchPoller, parse_job_cards
+from job_store import JobStore
+from parse_pool import ParsePool, expand_records, parse_compact
+from replay_server import synthetic_results_page
+from tests.test_fetch_pipeline import SAMPLE_PAGE
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ParsePool(workers=2) as parse_pool:
+        yield parse_pool
+
+
+class TestCompactRecords:
+    """Test cases for compact record conversion."""
+
+    def test_roundtrip_matches_parse_job_cards(self):
+        """Test that compact records expand to exactly what parse_job_cards returns."""
+        expected = parse_job_cards(SAMPLE_PAGE, "abc", fetched_at=5)
+        records = parse_compact(SAMPLE_PAGE)
+
+        assert all(isinstance(record, tuple) for record in records)
+        expected = [{**job, "posted_at": job.get("posted_at", 0)} for job in expected]
+        assert expand_records(records, "abc", fetched_at=5) == expected
+
+
+class TestParsePool:
+    """Test cases for parsing in worker processes."""
+
+    def test_parse_is_drop_in(self, pool):
+        """Test that pool.parse returns the same jobs as in-process parsing."""
+        assert pool.parse(SAMPLE_PAGE, "abc", fetched_at=5)[0] == parse_job_cards(SAMPLE_PAGE, "abc", fetched_at=5)[0]
+
+    def test_parse_many_keeps_order(self, pool):
+        """Test that batch parsing yields one result per page in input order."""
+        pages = [synthetic_results_page(SavedSearch(str(i), {"keywords": f"Job {i}"}).url, count=i + 1) for i in range(8)]
+        results = list(pool.parse_many(pages, chunksize=3))
+
+        assert [len(records) for records in results] == list(range(1, 9))
+        assert results[3][0][1] == "Job 3 1"
+
+    def test_poller_with_pool(self, pool):
+        """Test that the poller can parse through the pool."""
+        poller = SearchPoller(JobStore(":memory:"), lambda url, timeout: SAMPLE_PAGE, parse=pool.parse)
+        assert len(poller.poll_search(SavedSearch("py", {"keywords": "Python"}))) == 2
+
+    def test_pipelined_poll_all_matches_sequential(self, pool):
+        """Test that parsing in the pool while fetching stores the same jobs and reports the same results."""
+        searches = [SavedSearch(str(i), {"keywords": f"Job {i}"}) for i in range(6)]
+        failing = searches[2]
+
+        def transport(url, timeout):
+            if url == failing.url:
+                raise FetchError("down", status=503)
+            return synthetic_results_page(url, count=5)
+
+        sequential = SearchPoller(JobStore(":memory:"), transport)
+        pipelined = SearchPoller(JobStore(":memory:"), transport, parse_pool=pool)
+        expected, results = sequential.poll_all(searches), pipelined.poll_all(searches)
+
+        assert set(results) == set(expected)
+        assert isinstance(results.pop(failing.fingerprint), FetchError)
+        assert results == dict.fromkeys(results, 5)
+        assert pipelined.store.count() == sequential.store.count() == 25
+        assert pipelined.tracker.summary()[searches[0].fingerprint]["parse"]["count"] == 1
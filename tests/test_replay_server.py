@@ -0,0 +1,106 @@
+"""
+Tests for the record/replay stand-in server
+"""
+
+import pytest
+
+from fetch_pipeline import FetchError, SavedSearch, SearchPoller, parse_job_cards, urllib_transport
+from job_store import JobStore
+from replay_server import (
+    Recordings,
+    RecordingTransport,
+    ReplayBehavior,
+    replay_transport,
+    start_replay_server,
+    synthetic_results_page,
+)
+from tests.test_fetch_pipeline import SAMPLE_PAGE
+
+SEARCH = SavedSearch("py", {"keywords": "Python", "location": "Ankara", "time_filter": "1 hour"})
+
+
+@pytest.fixture
+def replay():
+    servers = []
+
+    def start(recordings=None, **behavior):
+        server = start_replay_server(recordings, behavior=ReplayBehavior(**behavior))
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class TestRecordings:
+    """Test cases for recording pages."""
+
+    def test_recording_transport_saves_by_search(self, tmp_path):
+        """Test that recorded pages are found again regardless of origin/refresh parameters."""
+        calls = []
+
+        def transport(url, timeout):
+            calls.append(url)
+            return SAMPLE_PAGE
+
+        recorder = RecordingTransport(Recordings(str(tmp_path)), transport)
+        assert recorder(SEARCH.url, 5.0) == SAMPLE_PAGE
+        assert calls == [SEARCH.url]
+
+        reloaded = Recordings(str(tmp_path))
+        assert len(reloaded) == 1
+        assert reloaded.get(SEARCH.url.replace("refresh=true", "refresh=false")) == SAMPLE_PAGE
+        assert reloaded.get(SavedSearch("go", {"keywords": "Go"}).url) is None
+
+    def test_synthetic_page_is_deterministic(self):
+        """Test that synthetic pages parse and are stable per search."""
+        page = synthetic_results_page(SEARCH.url, count=10)
+        jobs = parse_job_cards(page)
+
+        assert page == synthetic_results_page(SEARCH.url, count=10)
+        assert len({job["job_id"] for job in jobs}) == 10
+        assert jobs[0]["title"] == "Python 1"
+        assert jobs[0]["location"] == "Ankara"
+
+
+class TestReplayServer:
+    """Test cases for replaying through the fetch pipeline."""
+
+    def test_pipeline_against_recordings(self, tmp_path, replay):
+        """Test polling a search from recordings, and 404 for unrecorded searches."""
+        recordings = Recordings(str(tmp_path))
+        recordings.save(SEARCH.url, SAMPLE_PAGE)
+        server = replay(recordings)
+        poller = SearchPoller(JobStore(":memory:"), replay_transport(server.base_url), timeout=5.0)
+
+        assert len(poller.poll_search(SEARCH)) == 2
+        with pytest.raises(FetchError) as excinfo:
+            poller.poll_search(SavedSearch("go", {"keywords": "Go"}))
+        assert excinfo.value.status == 404
+        assert server.stats[200] == 1
+
+    def test_rate_limit_and_errors(self, replay):
+        """Test injected 429s carry Retry-After and injected errors surface as 500s."""
+        limited = replay(rate_limit_rate=1.0, retry_after=7)
+        with pytest.raises(FetchError) as excinfo:
+            replay_transport(limited.base_url)(SEARCH.url, 5.0)
+        assert excinfo.value.status == 429
+        assert excinfo.value.retry_after == 7
+
+        failing = replay(error_rate=1.0)
+        with pytest.raises(FetchError) as excinfo:
+            replay_transport(failing.base_url)(SEARCH.url, 5.0)
+        assert excinfo.value.status == 500
+
+    def test_synthesize_unrecorded(self, replay):
+        """Test that --synthesize serves pages for any search."""
+        server = replay(synthesize=True)
+        page = replay_transport(server.base_url, urllib_transport)(SEARCH.url, 5.0)
+        assert page == synthetic_results_page(SEARCH.url)
+
+    def test_behavior_rejects_impossible_rates(self):
+        """Test that failure rates above 100% are rejected."""
+        with pytest.raises(ValueError):
+            ReplayBehavior(error_rate=0.7, rate_limit_rate=0.5)
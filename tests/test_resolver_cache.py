@@ -0,0 +1,80 @@
+"""
+Tests for the shared resolver cache
+"""
+
+import threading
+
+from linkedin_url_builder import LinkedInURLBuilder
+from resolver_cache import LookupCache, MemoTable, SharedResolver
+
+
+class TestSharedResolver:
+    """Test cases for the process-wide resolver."""
+
+    def test_builder_output_matches_uncached_builder(self):
+        """Test that resolving through the cache doesn't change generated URLs."""
+        resolver = SharedResolver()
+
+        for location in ["USA", "Turkey (All)", "Ankara"]:
+            cached = resolver.new_builder().set_location_by_name(location).set_remote_options(["remote", "hybrid"])
+            plain = LinkedInURLBuilder().set_location_by_name(location).set_remote_options(["remote", "hybrid"])
+            assert cached.build_url() == plain.build_url()
+
+    def test_hit_and_miss_counters(self):
+        """Test that repeated lookups are served from the cache."""
+        resolver = SharedResolver()
+        for _ in range(3):
+            resolver.new_builder().set_location_by_name("USA").set_experience_level(["entry"])
+
+        stats = resolver.stats()
+        assert stats["locations"] == {"hits": 2, "misses": 1, "size": 1}
+        assert stats["facets"] == {"hits": 2, "misses": 1, "size": 1}
+
+    def test_add_geo_ids_is_seen_by_cached_aliases(self):
+        """Test that newly registered geo IDs apply to aliases normalized before."""
+        resolver = SharedResolver()
+        assert resolver.resolve_location("Ankara") is None
+
+        resolver.add_geo_ids({"ankara": "104462004"})
+
+        assert resolver.resolve_location("Ankara") == "104462004"
+        assert resolver.stats()["locations"] == {"hits": 1, "misses": 1, "size": 1}
+
+    def test_lru_bound(self):
+        """Test that the cache never grows past its entry limit."""
+        cache = LookupCache(max_entries=2)
+        for key in "abc":
+            cache.get_or_compute(key, lambda: 1)
+
+        assert cache.stats()["size"] == 2
+        cache.get_or_compute("a", lambda: 1)
+        assert cache.stats()["misses"] == 4
+
+    def test_memo_table_bound(self):
+        """Test that the memo table evicts its oldest entry once full."""
+        table = MemoTable(str.upper, max_entries=2)
+        assert [table.get(key) for key in "abca"] == ["A", "B", "C", "A"]
+
+        assert table.stats() == {"hits": 0, "misses": 4, "size": 2}
+
+    def test_concurrent_sessions(self):
+        """Test that lookups stay correct when many threads share one resolver."""
+        resolver = SharedResolver()
+        wrong = []
+
+        def session():
+            for _ in range(200):
+                if resolver.new_builder().set_location_by_name("USA").params.get("geoId") != "103644278":
+                    wrong.append(1)
+
+        threads = [threading.Thread(target=session) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = resolver.stats()["locations"]
+        assert not wrong
+        # Hits are counted without a lock, so racing threads may lose a few increments
+        assert 0 < stats["hits"] + stats["misses"] <= 1600
+        assert stats["size"] == 1
@@ -0,0 +1,169 @@
+"""
+Tests for retry, backoff and per-search circuit breaking
+"""
+
+import random
+
+import pytest
+
+from fetch_pipeline import CircuitOpenError, FetchError, SavedSearch, SearchPoller
+from job_store import JobStore
+from retry_policy import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, RetryBudget, RetryPolicy
+from tests.test_fetch_pipeline import SAMPLE_PAGE
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestRetryPolicy:
+    """Test cases for backoff and retry decisions."""
+
+    def test_backoff_is_jittered_and_capped(self):
+        """Test that delays stay within the exponential ceiling and max_delay."""
+        policy = RetryPolicy(max_attempts=10, base_delay=1.0, max_delay=5.0, rng=random.Random(1))
+        for attempt, ceiling in ((1, 1.0), (2, 2.0), (3, 4.0), (6, 5.0)):
+            delays = [policy.delay(attempt) for _ in range(200)]
+            assert all(0 <= delay <= ceiling for delay in delays)
+            assert len(set(delays)) > 100
+
+    def test_retry_after_is_respected(self):
+        """Test that a server's Retry-After is a lower bound on the delay."""
+        policy = RetryPolicy(base_delay=0.1, rng=random.Random(1))
+        assert policy.delay(1, retry_after=7) == 7
+
+    def test_only_transient_failures_are_retried(self):
+        """Test retryable statuses and the attempt limit."""
+        policy = RetryPolicy(max_attempts=2)
+        assert policy.should_retry(FetchError("timeout"), 1)
+        assert policy.should_retry(FetchError("busy", status=503), 1)
+        assert not policy.should_retry(FetchError("gone", status=404), 1)
+        assert not policy.should_retry(FetchError("busy", status=503), 2)
+        assert not policy.should_retry(CircuitOpenError("abc", 10), 1)
+
+    def test_budget_limits_retries(self):
+        """Test that the budget allows roughly ``ratio`` retries per attempt."""
+        budget = RetryBudget(ratio=0.1, min_tokens=1)
+        for _ in range(20):
+            budget.record_attempt()
+        spent = sum(budget.try_spend() for _ in range(10))
+        assert spent == 3
+
+
+class TestCircuitBreaker:
+    """Test cases for the per-search circuit breaker."""
+
+    def test_open_half_open_close(self):
+        """Test parking, a single trial after the cooldown, and closing on success."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, cooldown=60, clock=clock)
+        breaker.record_failure("a")
+        assert breaker.state("a") == CLOSED
+        breaker.record_failure("a")
+        assert breaker.state("a") == OPEN
+        assert not breaker.allow("a")
+        assert breaker.allow("b")
+
+        clock.now = 61
+        assert breaker.state("a") == HALF_OPEN
+        assert breaker.allow("a")
+        assert not breaker.allow("a")  # only one trial at a time
+        breaker.record_success("a")
+        assert breaker.state("a") == CLOSED
+
+    def test_failed_trial_doubles_cooldown(self):
+        """Test that a failing trial parks the search for longer."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, cooldown=60, max_cooldown=100, clock=clock)
+        breaker.record_failure("a")
+        clock.now = 60
+        assert breaker.allow("a")
+        breaker.record_failure("a")
+        assert breaker.retry_in("a") == 100
+        assert breaker.parked() == {"a": 100}
+
+
+class TestResilientPolling:
+    """Test cases for retries and breakers inside poll_all."""
+
+    def make_poller(self, transport, **kwargs):
+        clock = FakeClock()
+        poller = SearchPoller(JobStore(":memory:"), transport, **kwargs)
+        poller.clock, poller.sleep = clock, clock.sleep
+        return poller, clock
+
+    def test_healthy_searches_go_before_retries(self):
+        """Test that retries are deferred until every search had its first attempt."""
+        healthy = SavedSearch("healthy", {"keywords": "Python"})
+        flaky = SavedSearch("flaky", {"keywords": "Kotlin"})
+        calls = []
+
+        def transport(url, timeout):
+            calls.append(url)
+            if url == flaky.url and calls.count(url) == 1:
+                raise FetchError("rate limited", status=429, retry_after=5)
+            return SAMPLE_PAGE
+
+        poller, clock = self.make_poller(transport, retry=RetryPolicy(rng=random.Random(0)))
+        results = poller.poll_all([flaky, healthy])
+
+        assert calls == [flaky.url, healthy.url, flaky.url]
+        assert results == {healthy.fingerprint: 2, flaky.fingerprint: 0}  # same page, already stored
+        assert poller.retries == 1
+        assert clock.now >= 5
+
+    def test_breaker_parks_failing_search(self):
+        """Test that a persistently failing search stops being fetched."""
+        failing = SavedSearch("failing", {"keywords": "Go"})
+        healthy = SavedSearch("healthy", {"keywords": "Python"})
+        calls = []
+
+        def transport(url, timeout):
+            calls.append(url)
+            if url == failing.url:
+                raise FetchError("down", status=503)
+            return SAMPLE_PAGE
+
+        poller, clock = self.make_poller(
+            transport,
+            retry=RetryPolicy(max_attempts=5, rng=random.Random(0)),
+            breaker=CircuitBreaker(failure_threshold=3, cooldown=600, clock=lambda: clock.now),
+        )
+        poller.poll_all([failing, healthy])
+        assert calls.count(failing.url) == 3
+
+        results = poller.poll_all([failing, healthy])
+        assert isinstance(results[failing.fingerprint], CircuitOpenError)
+        assert results[healthy.fingerprint] == 0
+        assert calls.count(failing.url) == 3
+        assert calls.count(healthy.url) == 2
+
+    def test_unexpected_error_settles_trial(self):
+        """Test that a trial ending in a non-fetch error re-parks the search instead of leaving it stuck."""
+        search = SavedSearch("odd", {"keywords": "Go"})
+        failures = [FetchError("down", status=503), RuntimeError("parser bug")]
+
+        def transport(url, timeout):
+            if failures:
+                raise failures.pop(0)
+            return SAMPLE_PAGE
+
+        poller, clock = self.make_poller(
+            transport, breaker=CircuitBreaker(failure_threshold=1, cooldown=60, clock=lambda: clock.now)
+        )
+        poller.poll_all([search])
+        clock.now = 60
+        with pytest.raises(RuntimeError):
+            poller.poll_all([search])  # the trial
+
+        assert poller.breaker.state(search.fingerprint) == OPEN
+        clock.now = 60 + poller.breaker.retry_in(search.fingerprint)
+        assert poller.poll_all([search]) == {search.fingerprint: 2}
+        assert poller.breaker.state(search.fingerprint) == CLOSED
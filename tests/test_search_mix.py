@@ -0,0 +1,31 @@
+"""
+Tests for synthetic search mixes
+"""
+
+from itertools import islice
+
+from linkedin_url_builder import LinkedInURLBuilder, build_from_spec
+from search_mix import iter_search_mix
+
+
+class TestSearchMix:
+    """Test cases for the synthetic workload generator."""
+
+    def test_mix_is_reproducible(self):
+        """Test that the same seed produces the same mix."""
+        assert list(iter_search_mix(50, seed=3)) == list(iter_search_mix(50, seed=3))
+        assert list(iter_search_mix(50, seed=3)) != list(iter_search_mix(50, seed=4))
+
+    def test_specs_build_valid_urls(self):
+        """Test that every generated spec uses the builder's vocabularies."""
+        for spec in iter_search_mix(500):
+            builder = build_from_spec(spec)
+            assert spec["time_filter"] in LinkedInURLBuilder.TIME_FILTERS
+            assert builder.params["keywords"] == spec["keywords"]
+            assert "f_TPR" in builder.params
+            if "remote_options" in spec:
+                assert "f_WT" in builder.params
+
+    def test_endless_mix(self):
+        """Test that the mix is lazy and unbounded without a count."""
+        assert len(list(islice(iter_search_mix(), 1000))) == 1000
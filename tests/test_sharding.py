@@ -0,0 +1,125 @@
+"""
+Tests for sharded polling with consistent hashing
+"""
+
+import multiprocessing
+
+from fetch_pipeline import SavedSearch
+from sharding import HashRing, ShardCoordinator
+
+SEARCHES = [SavedSearch(f"search-{i}", {"keywords": f"Python {i}", "location": "Ankara"}) for i in range(300)]
+KEYS = [f"{i:016x}" for i in range(3000)]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def coordinators(path, names, clock, ttl=60.0):
+    result = {}
+    for name in names:
+        result[name] = ShardCoordinator(str(path), name, ttl=ttl)
+        result[name].clock = clock
+        result[name].heartbeat()
+    return result
+
+
+def shard_of(path, worker_id):
+    """Run in a worker process: this worker's fingerprints."""
+    coordinator = ShardCoordinator(path, worker_id)
+    fingerprints = [search.fingerprint for search in coordinator.my_searches(SEARCHES)]
+    coordinator.close()
+    return fingerprints
+
+
+class TestHashRing:
+    """Test cases for the consistent-hash ring."""
+
+    def test_balance(self):
+        """Test that keys spread roughly evenly over the nodes."""
+        shards = HashRing(["a", "b", "c"]).assign(KEYS)
+        assert sum(map(len, shards.values())) == len(KEYS)
+        assert all(700 < len(keys) < 1300 for keys in shards.values())
+
+    def test_adding_and_removing_a_node_moves_few_keys(self):
+        """Test that a new node only takes keys (about 1/n) and removing it restores the old assignment."""
+        ring = HashRing(["a", "b", "c"])
+        before = {key: ring.node_for(key) for key in KEYS}
+        ring.add("d")
+        moved = [key for key in KEYS if ring.node_for(key) != before[key]]
+
+        assert all(ring.node_for(key) == "d" for key in moved)
+        assert 450 < len(moved) < 1050
+        ring.remove("d")
+        assert {key: ring.node_for(key) for key in KEYS} == before
+
+
+class TestShardCoordinator:
+    """Test cases for membership, claims and rebalancing through the coordination database."""
+
+    def test_disjoint_shards_and_rebalance_on_join(self, tmp_path):
+        """Test that workers poll disjoint shards covering every search, and a joining worker takes its share."""
+        clock = FakeClock()
+        workers = coordinators(tmp_path / "shards.db", ["w1", "w2"], clock)
+        shards = {name: {s.fingerprint for s in worker.my_searches(SEARCHES)} for name, worker in workers.items()}
+        assert not shards["w1"] & shards["w2"]
+        assert len(shards["w1"] | shards["w2"]) == len(SEARCHES)
+
+        workers.update(coordinators(tmp_path / "shards.db", ["w3"], clock))
+        # w3 waits for searches still leased by their old owners until those move them away
+        first = {s.fingerprint for s in workers["w3"].my_searches(SEARCHES)}
+        assert first == set()
+        for name in ("w1", "w2"):
+            shards[name] = {s.fingerprint for s in workers[name].my_searches(SEARCHES)}
+        shards["w3"] = {s.fingerprint for s in workers["w3"].my_searches(SEARCHES)}
+
+        assert sum(map(len, shards.values())) == len(SEARCHES)
+        assert set.union(*shards.values()) == {s.fingerprint for s in SEARCHES}
+        assert 50 < len(shards["w3"]) < 150
+        assert workers["w1"].rebalances == 1
+
+    def test_dead_worker_shard_moves_after_ttl(self, tmp_path):
+        """Test that a worker without heartbeats drops out and its searches are taken over once its leases expire."""
+        clock = FakeClock()
+        workers = coordinators(tmp_path / "shards.db", ["w1", "w2"], clock, ttl=60.0)
+        for worker in workers.values():
+            worker.my_searches(SEARCHES)
+
+        clock.now += 30
+        assert len(workers["w1"].my_searches(SEARCHES)) < len(SEARCHES)
+        clock.now += 45  # w2 last beat 75 s ago
+        assert workers["w1"].live_workers() == ["w1"]
+        assert len(workers["w1"].my_searches(SEARCHES)) == len(SEARCHES)
+
+    def test_claims_are_exclusive_until_released(self, tmp_path):
+        """Test that a claimed search can't be taken over while leased, but can after leave()."""
+        clock = FakeClock()
+        workers = coordinators(tmp_path / "shards.db", ["w1", "w2"], clock)
+        assert workers["w1"].claim(["abc", "def"]) == {"abc", "def"}
+        assert workers["w2"].claim(["abc", "xyz"]) == {"xyz"}
+        workers["w1"].leave()
+        assert workers["w2"].claim(["abc"]) == {"abc"}
+        assert workers["w2"].live_workers() == ["w2"]
+
+    def test_rollback_journal_for_shared_filesystems(self, tmp_path):
+        """Test that the coordinator doesn't use WAL, which only works between processes on one host."""
+        path = tmp_path / "shards.db"
+        worker = coordinators(path, ["w1"], FakeClock())["w1"]
+        assert worker._conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        assert not (tmp_path / "shards.db-wal").exists()
+
+    def test_worker_processes_share_the_work(self, tmp_path):
+        """Test that separate processes opening the same database get disjoint shards covering every search."""
+        path = str(tmp_path / "shards.db")
+        worker_ids = ["p1", "p2", "p3"]
+        for worker_id in worker_ids:
+            ShardCoordinator(path, worker_id).heartbeat()
+        with multiprocessing.get_context("spawn").Pool(3) as pool:
+            shards = pool.starmap(shard_of, [(path, worker_id) for worker_id in worker_ids])
+
+        assert all(shards)
+        assert sorted(fingerprint for shard in shards for fingerprint in shard) == sorted(s.fingerprint for s in SEARCHES)
@@ -0,0 +1,140 @@
+"""
+Tests for the multi-instance launcher helpers
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+import start_app
+
+
+@pytest.fixture(autouse=True)
+def run_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(start_app, "RUN_DIR", tmp_path)
+    return tmp_path
+
+
+class TestLauncher:
+    """Test cases for port allocation and PID file handling."""
+
+    def test_allocate_skips_busy_and_managed_ports(self, run_dir):
+        """Test that allocated ports avoid listening sockets and managed instances."""
+        with socket.socket() as busy:
+            busy.bind(("127.0.0.1", 0))
+            busy.listen()
+            base_port = busy.getsockname()[1]
+            (run_dir / f"streamlit-{base_port + 1}.pid").write_text("1")
+
+            ports = start_app.allocate_ports(2, base_port)
+
+        assert base_port not in ports
+        assert base_port + 1 not in ports
+        assert len(set(ports)) == 2
+
+    def test_managed_ports_and_pids(self, run_dir):
+        """Test that PID files are discovered and parsed."""
+        (run_dir / "streamlit-8502.pid").write_text("1234\n")
+        (run_dir / "streamlit-8501.pid").write_text("garbage")
+
+        assert start_app.managed_ports() == [8501, 8502]
+        assert start_app.read_pid(8502) == 1234
+        assert start_app.read_pid(8501) is None
+
+    def test_stop_removes_stale_pid_file(self, run_dir, monkeypatch):
+        """Test that stopping a dead instance only cleans up its own PID file."""
+        (run_dir / "streamlit-8501.pid").write_text("1234")
+        (run_dir / "streamlit-8502.pid").write_text("5678")
+        monkeypatch.setattr(start_app, "is_running", lambda pid: False)
+
+        assert start_app.stop_instance(8501) is False
+        assert start_app.managed_ports() == [8502]
+
+    def test_stop_ignores_reused_pid(self, run_dir, monkeypatch):
+        """Test that a PID now used by an unrelated process is not signalled."""
+        (run_dir / "streamlit-8501.pid").write_text(str(os.getpid()))
+        signalled = []
+        monkeypatch.setattr(start_app.os, "killpg", lambda pid, sig: signalled.append(pid))
+
+        assert start_app.stop_instance(8501) is False
+        assert signalled == []
+        assert start_app.managed_ports() == []
+
+    @pytest.mark.skipif(os.name == "nt", reason="command lines are not checked on Windows")
+    def test_recognizes_own_instance(self):
+        """Test that only a process started with this instance's command line counts as ours."""
+        command = [sys.executable, "-c", "import time; time.sleep(30)", str(start_app.PROJECT_DIR / "warmup.py")]
+        process = subprocess.Popen([*command, "--server.port=8765"])
+        try:
+            deadline = time.monotonic() + 5
+            while not start_app.process_command(process.pid) and time.monotonic() < deadline:
+                time.sleep(0.01)  # the command line is empty until the child has exec'd
+            assert start_app.is_managed_instance(process.pid, 8765)
+            assert not start_app.is_managed_instance(process.pid, 8766)
+            assert not start_app.is_managed_instance(process.pid, 876)  # a prefix of the real port
+            assert not start_app.is_managed_instance(os.getpid(), 8765)
+        finally:
+            process.kill()
+            process.wait()
+
+    @pytest.mark.skipif(os.name == "nt", reason="process groups are POSIX-only")
+    def test_pid_file_is_kept_until_the_instance_has_exited(self, run_dir, monkeypatch):
+        """Test that the PID file is only removed once the signalled instance is gone."""
+        (run_dir / "streamlit-8501.pid").write_text("4321")
+        alive = {4321}
+        seen = []
+        monkeypatch.setattr(start_app, "is_managed_instance", lambda pid, port: True)
+        monkeypatch.setattr(start_app, "is_running", lambda pid: pid in alive)
+        monkeypatch.setattr(start_app.os, "getpgid", lambda pid: pid)
+
+        def killpg(pid, sig):
+            seen.append((sig, start_app.read_pid(8501)))
+            if sig == start_app.signal.SIGKILL:
+                alive.discard(pid)
+
+        monkeypatch.setattr(start_app.os, "killpg", killpg)
+
+        assert start_app.stop_instance(8501, timeout=0.2) is True
+        assert seen == [(start_app.signal.SIGTERM, 4321), (start_app.signal.SIGKILL, 4321)]
+        assert start_app.managed_ports() == []
+
+    def test_restart_waits_for_the_port_to_be_released(self, run_dir, monkeypatch):
+        """Test that a rolling restart only starts the new instance once the old one's port is free."""
+        (run_dir / "streamlit-8501.pid").write_text("4321")
+        events = []
+        free_after = iter([False, False, True])
+        monkeypatch.setattr(start_app, "stop_instance", lambda port: events.append("stop"))
+        monkeypatch.setattr(start_app, "port_is_free", lambda port: events.append("probe") or next(free_after))
+        monkeypatch.setattr(start_app.time, "sleep", lambda seconds: None)
+        monkeypatch.setattr(start_app, "start_instance", lambda port, instance: events.append("start"))
+        monkeypatch.setattr(start_app, "wait_and_report", lambda port, timeout: None)
+
+        start_app.restart_instances(8501)
+        assert events == ["stop", "probe", "probe", "probe", "start"]
+
+    def test_start_refuses_to_replace_live_pid_file(self, run_dir, monkeypatch):
+        """Test that starting on a port with a live instance leaves its PID file alone."""
+        (run_dir / "streamlit-8501.pid").write_text("4321")
+        monkeypatch.setattr(start_app, "is_managed_instance", lambda pid, port: True)
+        monkeypatch.setattr(start_app.subprocess, "Popen", lambda *args, **kwargs: pytest.fail("started a second instance"))
+
+        with pytest.raises(RuntimeError, match="already running"):
+            start_app.start_instance(8501)
+        assert start_app.read_pid(8501) == 4321
+
+    def test_instances_get_distinct_numbers(self, run_dir):
+        """Test that instance numbers (which offset per-instance ports) are recorded and not reused."""
+        env = start_app.launch_env(8501, 0)
+        (run_dir / "streamlit-8501.pid").write_text("1")
+        start_app.launch_env(8502, 2)
+        (run_dir / "streamlit-8502.pid").write_text("2")
+
+        assert env[start_app.INSTANCE_ENV] == "0"
+        assert start_app.instance_number(8502) == 2
+        assert start_app.instance_number(8503) == 0
+        numbers = start_app.free_instance_numbers()
+        assert [next(numbers), next(numbers)] == [1, 3]
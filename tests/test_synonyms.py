@@ -0,0 +1,106 @@
+"""
+Tests for synonym expansion of saved searches
+"""
+
+import json
+import sys
+
+import pytest
+
+import synonyms
+from keyword_query import parse_keywords
+from linkedin_url_builder import build_from_spec
+from synonyms import SynonymExpander, load_synonyms
+
+GROUPS = [
+    ["Software Engineer", "Software Developer", "SWE"],
+    ["Senior", "Sr"],
+    ["Kubernetes", "K8s"],
+    ["Developer", "Dev"],
+]
+
+
+class TestSynonymExpander:
+    """Test cases for expanding keywords and specs."""
+
+    def test_variants(self):
+        """Test longest-match substitution, case-insensitive matching and untouched words."""
+        expander = SynonymExpander(GROUPS)
+
+        assert expander.variants("sr swe Istanbul") == (
+            "sr swe Istanbul",
+            "sr Software Engineer Istanbul",
+            "sr Software Developer Istanbul",
+            "Senior swe Istanbul",
+            "Senior Software Engineer Istanbul",
+            "Senior Software Developer Istanbul",
+        )
+        # "Software Developer" is matched as one title, not as "Software" + "Developer"
+        assert "Software Dev" not in expander.variants("Software Developer")
+        assert expander.variants("Python") == ("Python",)
+        assert expander.variants('"Software Engineer" OR Kubernetes') == ('"Software Engineer" OR Kubernetes',)
+
+    def test_memoization_and_cap(self):
+        """Test that repeated keywords hit the cache and the variant count is capped."""
+        expander = SynonymExpander(GROUPS, max_variants=3)
+        assert len(expander.variants("Senior SWE Kubernetes")) == 3
+        expander.variants("Senior  SWE   Kubernetes")
+        assert expander.cache.stats()["hits"] == 1
+
+    def test_expand_specs_deduplicates_urls(self):
+        """Test one spec per variant, with URLs already emitted (even by another spec) skipped."""
+        expander = SynonymExpander(GROUPS)
+        specs = [
+            {"keywords": "SWE", "location": "Ankara"},
+            {"keywords": "Software Developer", "location": "Ankara"},
+            {"keywords": "SWE", "location": "Berlin"},
+        ]
+        expanded = list(expander.expand_specs(specs))
+
+        assert len(expanded) == 6
+        assert len({build_from_spec(spec).fingerprint() for spec in expanded}) == 6
+        assert {spec["keywords"] for spec in expanded if spec["location"] == "Ankara"} == {
+            "SWE",
+            "Software Engineer",
+            "Software Developer",
+        }
+        assert list(expander.expand_specs(specs[:1])) == []
+        expander.reset()
+        assert len(list(expander.expand_specs(specs[:1]))) == 3
+
+    def test_combined_expansion(self):
+        """Test ORing the variants into one search, split only when the URL would be too long."""
+        expander = SynonymExpander(GROUPS)
+        (combined,) = expander.expand_spec({"keywords": "Senior SWE", "time_filter": "1 week"}, combine=True)
+
+        assert combined["time_filter"] == "1 week"
+        assert parse_keywords(combined["keywords"])[0] == "or"
+        assert combined["keywords"].startswith("(Senior SWE) OR ")
+        assert '"Sr Software Developer"' in combined["keywords"]
+
+        expander.reset()
+        split = expander.expand_spec({"keywords": "Senior SWE"}, combine=True, max_url_length=200)
+        assert len(split) > 1
+        assert all(len(build_from_spec(spec).build_url()) <= 200 for spec in split)
+
+    def test_load_synonyms(self, tmp_path):
+        """Test loading groups as a list or as a title -> synonyms object."""
+        path = tmp_path / "titles.json"
+        path.write_text(json.dumps({"Software Engineer": ["SWE"]}))
+        assert load_synonyms(str(path)) == [["Software Engineer", "SWE"]]
+
+        path.write_text(json.dumps("nope"))
+        with pytest.raises(ValueError):
+            load_synonyms(str(path))
+
+    def test_main_rejects_malformed_searches(self, tmp_path, monkeypatch, capsys):
+        """Test that the command line reports a searches file that isn't a list of objects instead of crashing."""
+        titles, searches = tmp_path / "titles.json", tmp_path / "searches.json"
+        titles.write_text(json.dumps(GROUPS))
+        searches.write_text(json.dumps({"keywords": "SWE"}))
+        monkeypatch.setattr(sys, "argv", ["synonyms.py", "--synonyms", str(titles), "--searches", str(searches)])
+
+        with pytest.raises(SystemExit) as exit_info:
+            synonyms.main()
+        assert exit_info.value.code == 1
+        assert "expected a list of saved search objects" in capsys.readouterr().err
@@ -127,3 +127,29 @@ class TestLinkedInURLBuilder:
 
         assert "C%2B%2B" in url  # + should be encoded
         assert "S%C3%A3o" in url  # ã should be encoded
+
+    def test_fingerprint(self):
+        """Test that fingerprints identify the search, not parameter order or tracking fields."""
+        first = LinkedInURLBuilder().set_keywords("Python").set_location("Ankara").set_time_filter("1 hour")
+        second = LinkedInURLBuilder().set_time_filter("1 hour").set_location("Ankara").set_keywords("Python")
+        second.set_job_id("4185657072")
+
+        assert first.fingerprint() == second.fingerprint()
+        assert len(first.fingerprint()) == 16
+        assert first.fingerprint() != LinkedInURLBuilder().set_keywords("Python").fingerprint()
+
+    def test_from_url_roundtrip(self):
+        """Test that parsing a generated URL restores the same parameters."""
+        builder = (
+            LinkedInURLBuilder()
+            .set_keywords("C++ Developer")
+            .set_location("São Paulo")
+            .set_experience_level(["entry", "associate"])
+            .set_time_filter("1 week")
+        )
+        url = builder.build_url()
+        parsed = LinkedInURLBuilder.from_url(url)
+
+        assert parsed.params == builder.params
+        assert parsed.build_url() == url
+        assert parsed.get_params_summary()["Posted Within"] == "1 week"
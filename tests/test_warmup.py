@@ -0,0 +1,47 @@
+"""
+Tests for warm-start timing reports
+"""
+
+import json
+
+import pytest
+
+import warmup
+
+
+@pytest.fixture
+def report_path(tmp_path, monkeypatch):
+    path = tmp_path / "startup.json"
+    monkeypatch.setenv(warmup.REPORT_ENV, str(path))
+    monkeypatch.setattr(warmup, "_first_render_recorded", False)
+    return path
+
+
+class TestWarmup:
+    """Test cases for startup timing reports."""
+
+    def test_update_report_merges(self, report_path):
+        """Test that report updates keep existing values."""
+        report_path.write_text(json.dumps({"launched_at": 1.0}))
+        warmup.update_report({"time_to_ready": 2.5})
+
+        assert json.loads(report_path.read_text()) == {"launched_at": 1.0, "time_to_ready": 2.5}
+
+    def test_first_render_recorded_once(self, report_path, monkeypatch):
+        """Test that only the first script run of a process is recorded."""
+        monkeypatch.setenv(warmup.LAUNCH_TS_ENV, "100.0")
+        monkeypatch.setattr(warmup.time, "time", lambda: 103.5)
+        warmup.record_first_render()
+
+        monkeypatch.setattr(warmup.time, "time", lambda: 200.0)
+        warmup.record_first_render()
+
+        report = json.loads(report_path.read_text())
+        assert report["time_to_first_render"] == 3.5
+
+    def test_no_report_without_path(self, tmp_path, monkeypatch):
+        """Test that the app runs without a launcher-provided report path."""
+        monkeypatch.delenv(warmup.REPORT_ENV, raising=False)
+        warmup.update_report({"x": 1})
+
+        assert not list(tmp_path.iterdir())
@@ -0,0 +1,111 @@
+"""
+Warm-start entry point for the Streamlit web UI.
+
+``python warmup.py run app.py [streamlit options]`` imports the app's modules
+and builds the shared caches *before* the Streamlit server starts listening,
+so the first browser session doesn't pay for them. It also records startup
+timings: the launcher passes its launch timestamp and a report path through
+the environment, and the app calls ``record_first_render()`` once its first
+script run has finished.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+# Set by the launcher (start_app.py / main.py)
+LAUNCH_TS_ENV = "LINKEDIN_LAUNCH_TS"
+REPORT_ENV = "LINKEDIN_STARTUP_REPORT"
+
+# Locations resolved during prewarm so the shared resolver starts hot
+PREWARM_LOCATIONS = ("Turkey (All)", "United States (All)", "USA", "Remote")
+
+_first_render_lock = threading.Lock()
+_first_render_recorded = False
+
+
+def launch_timestamp() -> Optional[float]:
+    """Wall-clock time the launcher started this process, if it told us."""
+    value = os.environ.get(LAUNCH_TS_ENV)
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def update_report(values: dict[str, Any], path: Optional[str] = None) -> None:
+    """Merge ``values`` into the JSON startup report (no-op when no report path is configured)."""
+    path = path or os.environ.get(REPORT_ENV)
+    if not path:
+        return
+    report_path = Path(path)
+    try:
+        report = json.loads(report_path.read_text())
+    except (OSError, ValueError):
+        report = {}
+    report.update(values)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = report_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(report, indent=2))
+    tmp_path.replace(report_path)
+
+
+def prewarm() -> float:
+    """Import the app's dependencies and build shared caches; returns the seconds spent."""
+    start = time.perf_counter()
+
+    # Heavy imports the first script run would otherwise pay for (st.dataframe pulls in pandas/pyarrow)
+    import pandas  # noqa: F401
+    import pyarrow  # noqa: F401
+    import streamlit  # noqa: F401
+
+    import app_resources
+    import bulk_generator  # noqa: F401
+
+    resolver = app_resources.get_resolver()
+    for location in PREWARM_LOCATIONS:
+        resolver.resolve_location(location)
+    app_resources.get_job_store()
+    app_resources.get_metrics_server()
+
+    elapsed = time.perf_counter() - start
+    update_report({"prewarm_seconds": round(elapsed, 4)})
+    return elapsed
+
+
+def record_first_render() -> None:
+    """Record time from launch to the end of the first completed script run (once per process)."""
+    global _first_render_recorded
+    with _first_render_lock:
+        if _first_render_recorded:
+            return
+        _first_render_recorded = True
+
+    values = {"first_render_at": time.time()}
+    launched = launch_timestamp()
+    if launched is not None:
+        values["time_to_first_render"] = round(values["first_render_at"] - launched, 4)
+    update_report(values)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Prewarm, then hand the command line over to Streamlit."""
+    argv = sys.argv[1:] if argv is None else argv
+    project_dir = Path(__file__).parent
+    sys.path.insert(0, str(project_dir))
+
+    elapsed = prewarm()
+    print(f"[WARM] Prewarmed in {elapsed:.2f}s")
+
+    from streamlit.web import cli as stcli
+
+    sys.argv = ["streamlit", *argv]
+    sys.exit(stcli.main())
+
+
+if __name__ == "__main__":
+    main()